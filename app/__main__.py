@@ -1,3 +1,8 @@
+import argparse
+import multiprocessing
+import sys
+from functools import partial
+
 import config
 import menu
 import impl
@@ -5,8 +10,10 @@ import impl
 
 def main(json_path: str,
          cmake_bin_path: str,
-         ninja_bin_path: str
-) -> None:
+         ninja_bin_path: str,
+         command: str=None,
+         build_type_name: str=None
+) -> int:
     # initialize implementation module
     impl_state = impl.ImplementationSharedState()
     impl_state.initialize(json_path,
@@ -14,18 +21,61 @@ def main(json_path: str,
                           ninja_bin_path
     )
 
+    # options shared by the menu and the non-interactive mode (label, command name, function)
+    # `build_type_name` is only set in non-interactive mode, the menu uses the manifest build type
+    options = [("Reload Manifest", "reload", impl_state.reload),
+               ("Configure Project", "configure", partial(impl_state.configure_project, False, build_type_name)),
+               ("Configure Project (Full Rescan)", "rescan", partial(impl_state.configure_project, True, build_type_name)),
+               ("Configure Project (Clean)", "clean", partial(impl_state.configure_project, False, build_type_name, True)),
+               ("Build Project", "build", partial(impl_state.build_project, build_type_name)),
+               ("Build Matrix", "matrix", impl_state.build_matrix),
+               ("Optimize Build (PGO)", "pgo", partial(impl_state.optimize_project_with_pgo, build_type_name)),
+               ("Profile Compile Times", "profile", partial(impl_state.profile_compile_times, build_type_name)),
+               ("Watch Project", "watch", impl_state.watch_project),
+               ("Analyze Includes", "analyze", impl_state.analyze_includes),
+               ("Measure Source Discovery", "discovery", impl_state.measure_source_discovery)
+               ]
+
+    # run a single operation and exit (scripts, CI)
+    if command:
+        action = next(action for _, name, action in options if name == command)
+        try:
+            action()
+        except Exception as e:
+            print(f"Operation failed: {e}")
+            return 1
+        print("Operation successful!")
+        return 0
+
     # create menu and map buttons to implementation functions
     main_menu = menu.OptionsMenu()
     main_menu.set_header_text("PyForge")
-    main_menu.add_option("Reload Manifest", impl_state.reload)
-    main_menu.add_option("Configure Project", impl_state.configure_project)
-    main_menu.add_option("Build Project", impl_state.build_project)
+    for label, _, action in options:
+        main_menu.add_option(label, action)
     main_menu.add_option("Exit", None)
     main_menu.run()
+    return 0
 
 
 if __name__ == "__main__":
-    main(config.JSON_MANIFEST_PATH,
-         config.CMAKE_BIN_PATH,
-         config.NINJA_BIN_PATH
-    )
+    # required by the process pools when running as a frozen executable
+    multiprocessing.freeze_support()
+
+    parser = argparse.ArgumentParser(prog="pyforge", description="C/C++ build automation tool powered by CMake")
+    parser.add_argument("command",
+                        nargs="?",
+                        choices=["reload", "configure", "rescan", "clean", "build", "matrix", "pgo", "profile", "watch", "analyze", "discovery"],
+                        help="run a single operation without the menu and exit (non zero exit code on failure)"
+                        )
+    parser.add_argument("--build-type",
+                        choices=["DEBUGG", "RELEASE", "DBGRELEASE", "MINRELEASE"],
+                        help="build type to configure, build, optimize or profile instead of the manifest one (each build type has its own build directory)"
+                        )
+    args = parser.parse_args()
+
+    sys.exit(main(config.JSON_MANIFEST_PATH,
+                  config.CMAKE_BIN_PATH,
+                  config.NINJA_BIN_PATH,
+                  args.command,
+                  args.build_type
+                  ))
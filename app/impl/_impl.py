@@ -1,3 +1,5 @@
+import copy
+
 from . import jsonvalid
 from . import cmake
 
@@ -10,6 +12,9 @@ _EXPECTED_JSON_STRUCTURE = {
     {
         "root_dir": str,
         "source_dirs_ignore": list,
+        "use_gitignore": jsonvalid.Optional(bool, False),
+        "use_git_index": jsonvalid.Optional(bool, False),
+        "git_include_untracked": jsonvalid.Optional(bool, False),
         "include_dirs": list,
         "imports":
         {
@@ -29,9 +34,14 @@ _EXPECTED_JSON_STRUCTURE = {
         },
 
         "language": str,
-        "product": str,
+        "product": (str, list),
         "build": str,
-        "compile_definitions": list
+        "compile_definitions": list,
+        "components": jsonvalid.Optional(
+        {
+            "enabled": bool,
+            "shared_in_debug": jsonvalid.Optional(bool, False)
+        }, {"enabled": False})
     },
 
     "compiler_settings":
@@ -39,8 +49,72 @@ _EXPECTED_JSON_STRUCTURE = {
         "compiler_path": str,
         "compiler_extensions_required": bool,
         "language_standard": int,
-        "language_standard_required": bool
-    }
+        "language_standard_required": bool,
+        "linker": jsonvalid.Optional(str, "AUTO"),
+        "fast_debug_link": jsonvalid.Optional(bool, False),
+        "unity_build": jsonvalid.Optional(
+        {
+            "enabled": bool,
+            "batch_size_kb": jsonvalid.Optional(int, 256),
+            "exclude": jsonvalid.Optional(list, [])
+        }, {"enabled": False}),
+        "precompiled_headers": jsonvalid.Optional(
+        {
+            "enabled": bool,
+            "max_count": jsonvalid.Optional(int, 10),
+            "size_budget_kb": jsonvalid.Optional(int, 0),
+            "pin": jsonvalid.Optional(list, []),
+            "exclude": jsonvalid.Optional(list, []),
+            "override": jsonvalid.Optional(list, [])
+        }, {"enabled": False}),
+        "ipo": jsonvalid.Optional(
+        {
+            "enabled": bool,
+            "build_types": jsonvalid.Optional(list, ["RELEASE", "MINRELEASE"]),
+            "thin_lto": jsonvalid.Optional(bool, False),
+            "jobs": jsonvalid.Optional(int, 0)
+        }, {"enabled": False})
+    },
+
+    "pgo": jsonvalid.Optional(
+    {
+        "enabled": bool,
+        "training_command": jsonvalid.Optional((str, list), []),
+        "max_drift_percent": jsonvalid.Optional(int, 10),
+        "keep_versions": jsonvalid.Optional(int, 3)
+    }, {"enabled": False}),
+
+    "job_pools": jsonvalid.Optional(
+    {
+        "enabled": bool,
+        "compile_jobs": jsonvalid.Optional(int, 0),
+        "link_jobs": jsonvalid.Optional(int, 0),
+        "max_jobs": jsonvalid.Optional(int, 0),
+        "max_load": jsonvalid.Optional((int, float), 0)
+    }, {"enabled": False}),
+
+    "matrix": jsonvalid.Optional(
+    {
+        "enabled": bool,
+        "compilers": jsonvalid.Optional(list, []),
+        "build_types": jsonvalid.Optional(list, ["DEBUGG", "RELEASE"]),
+        "max_parallel_cells": jsonvalid.Optional(int, 0)
+    }, {"enabled": False}),
+
+    "compiler_cache": jsonvalid.Optional(
+    {
+        "enabled": bool,
+        "program": jsonvalid.Optional(str, "ccache"),
+        "dir": jsonvalid.Optional(str, ""),
+        "max_size": jsonvalid.Optional(str, "5G")
+    }, {"enabled": False}),
+
+    "artifact_cache": jsonvalid.Optional(
+    {
+        "enabled": bool,
+        "dir": jsonvalid.Optional(str, ""),
+        "url": jsonvalid.Optional(str, "")
+    }, {"enabled": False})
 }   # END _EXPECTED_JSON_STRUCTURE
 
 
@@ -65,9 +139,21 @@ class _Dataset:
         return self._json_data['path_settings']['include_dirs']
 
     @property
-    def project_source_ignored_dir_names(self) -> list[str]:
+    def project_source_ignore_patterns(self) -> list[str]:
         return self._json_data['path_settings']['source_dirs_ignore']
 
+    @property
+    def project_use_gitignore(self) -> bool:
+        return self._json_data['path_settings']['use_gitignore']
+
+    @property
+    def project_use_git_index(self) -> bool:
+        return self._json_data['path_settings']['use_git_index']
+
+    @property
+    def project_git_include_untracked(self) -> bool:
+        return self._json_data['path_settings']['git_include_untracked']
+
     @property
     def project_imported_static_libs(self) -> list[tuple[str, str]]:
         return self._json_data['path_settings']['imports']['static']
@@ -94,19 +180,40 @@ class _Dataset:
         return cmake.Language[self._json_data['project_settings']['language']]
 
     @property
-    def project_product_type(self) -> cmake.ProductType:
-        # [] for match by enum name
-        return cmake.ProductType[self._json_data['project_settings']['product']]
+    def project_product_types(self) -> list[cmake.ProductType]:
+        # a single product or a list of products, [] for match by enum name
+        products = self._json_data['project_settings']['product']
+        if isinstance(products, str):
+            products = [products]
+        if not products:
+            raise jsonvalid.JSONStructureError("Empty list for 'project_settings.product'")
+        return [cmake.ProductType[product] for product in dict.fromkeys(products)]
 
     @property
     def project_build_type(self) -> cmake.BuildType:
         # [] for match by enum name
         return cmake.BuildType[self._json_data['project_settings']['build']]
 
+    def get_build_type(self, build_type_name: str=None) -> cmake.BuildType:
+        """
+        :param build_type_name: enum name (`DEBUGG`, `RELEASE`), `None` for the manifest build type
+        """
+        if build_type_name is None:
+            return self.project_build_type
+        return cmake.BuildType[build_type_name]
+
     @property
     def cmake_compile_definitions(self) -> list[tuple[str, str]]:
         return self._json_data['project_settings']['compile_definitions']
 
+    @property
+    def components_enabled(self) -> bool:
+        return self._json_data['project_settings']['components']['enabled']
+
+    @property
+    def components_shared_in_debug(self) -> bool:
+        return self._json_data['project_settings']['components']['shared_in_debug']
+
 # compiler_settings
     @property
     def compiler_path(self) -> str:
@@ -124,6 +231,178 @@ class _Dataset:
     def language_standard_required(self) -> bool:
         return self._json_data['compiler_settings']['language_standard_required']
 
+    @property
+    def linker_selection_enabled(self) -> bool:
+        return self._json_data['compiler_settings']['linker'] != "DEFAULT"
+
+    @property
+    def linker_requested(self) -> cmake.LinkerType | None:
+        # `None` for automatic selection, [] for match by enum name
+        linker_name = self._json_data['compiler_settings']['linker']
+        if linker_name in ("AUTO", "DEFAULT"):
+            return None
+        return cmake.LinkerType[linker_name]
+
+    @property
+    def fast_debug_link(self) -> bool:
+        return self._json_data['compiler_settings']['fast_debug_link']
+
+    @property
+    def unity_build_enabled(self) -> bool:
+        return self._json_data['compiler_settings']['unity_build']['enabled']
+
+    @property
+    def unity_build_batch_size_kb(self) -> int:
+        return self._json_data['compiler_settings']['unity_build']['batch_size_kb']
+
+    @property
+    def unity_build_excluded_files(self) -> list[str]:
+        return self._json_data['compiler_settings']['unity_build']['exclude']
+
+    @property
+    def precompiled_headers_enabled(self) -> bool:
+        return self._json_data['compiler_settings']['precompiled_headers']['enabled']
+
+    @property
+    def precompiled_headers_max_count(self) -> int:
+        return self._json_data['compiler_settings']['precompiled_headers']['max_count']
+
+    @property
+    def precompiled_headers_size_budget_kb(self) -> int:
+        return self._json_data['compiler_settings']['precompiled_headers']['size_budget_kb']
+
+    @property
+    def precompiled_headers_pinned(self) -> list[str]:
+        return self._json_data['compiler_settings']['precompiled_headers']['pin']
+
+    @property
+    def precompiled_headers_excluded(self) -> list[str]:
+        return self._json_data['compiler_settings']['precompiled_headers']['exclude']
+
+    @property
+    def precompiled_headers_override(self) -> list[str]:
+        return self._json_data['compiler_settings']['precompiled_headers']['override']
+
+    @property
+    def ipo_build_types(self) -> list[cmake.BuildType]:
+        # empty when disabled, [] for match by enum name
+        if not self._json_data['compiler_settings']['ipo']['enabled']:
+            return []
+        return [cmake.BuildType[build_type] for build_type in self._json_data['compiler_settings']['ipo']['build_types']]
+
+    @property
+    def ipo_thin_lto(self) -> bool:
+        return self._json_data['compiler_settings']['ipo']['thin_lto']
+
+    @property
+    def ipo_jobs(self) -> int:
+        return self._json_data['compiler_settings']['ipo']['jobs']
+
+# pgo
+    @property
+    def pgo_enabled(self) -> bool:
+        return self._json_data['pgo']['enabled']
+
+    @property
+    def pgo_training_command(self) -> str | list[str]:
+        return self._json_data['pgo']['training_command']
+
+    @property
+    def pgo_max_drift_percent(self) -> int:
+        return self._json_data['pgo']['max_drift_percent']
+
+    @property
+    def pgo_keep_versions(self) -> int:
+        return self._json_data['pgo']['keep_versions']
+
+# job pools
+    @property
+    def job_pools_enabled(self) -> bool:
+        return self._json_data['job_pools']['enabled']
+
+    @property
+    def job_pool_compile_jobs(self) -> int:
+        return self._json_data['job_pools']['compile_jobs']
+
+    @property
+    def job_pool_link_jobs(self) -> int:
+        return self._json_data['job_pools']['link_jobs']
+
+    @property
+    def max_jobs(self) -> int:
+        # 0 when disabled (build tool default)
+        if not self._json_data['job_pools']['enabled']:
+            return 0
+        return self._json_data['job_pools']['max_jobs']
+
+    @property
+    def max_load(self) -> float:
+        # 0 when disabled (no limit)
+        if not self._json_data['job_pools']['enabled']:
+            return 0
+        return self._json_data['job_pools']['max_load']
+
+# matrix
+    @property
+    def matrix_enabled(self) -> bool:
+        return self._json_data['matrix']['enabled']
+
+    @property
+    def matrix_compiler_paths(self) -> list[str]:
+        return self._json_data['matrix']['compilers']
+
+    @property
+    def matrix_build_types(self) -> list[cmake.BuildType]:
+        # [] for match by enum name
+        return [cmake.BuildType[build_type] for build_type in self._json_data['matrix']['build_types']]
+
+    @property
+    def matrix_max_parallel_cells(self) -> int:
+        return self._json_data['matrix']['max_parallel_cells']
+
+# compiler_cache
+    @property
+    def compiler_cache_program(self) -> str | None:
+        # `None` when disabled
+        if not self._json_data['compiler_cache']['enabled']:
+            return None
+        return self._json_data['compiler_cache']['program']
+
+    @property
+    def compiler_cache_dir_name(self) -> str:
+        return self._json_data['compiler_cache']['dir']
+
+    @property
+    def compiler_cache_max_size(self) -> str:
+        return self._json_data['compiler_cache']['max_size']
+
+# artifact_cache
+    @property
+    def artifact_cache_enabled(self) -> bool:
+        return self._json_data['artifact_cache']['enabled']
+
+    @property
+    def artifact_cache_dir_name(self) -> str:
+        return self._json_data['artifact_cache']['dir']
+
+    @property
+    def artifact_cache_url(self) -> str:
+        return self._json_data['artifact_cache']['url']
+
+# fingerprint
+    @property
+    def build_settings(self) -> dict:
+        """
+        Manifest settings that change the build outputs (not the project location, the caches setup nor the build type)
+        """
+        settings = copy.deepcopy(self._json_data)
+        del settings['path_settings']['root_dir']
+        del settings['project_settings']['build']
+        del settings['matrix']
+        del settings['compiler_cache']
+        del settings['artifact_cache']
+        return settings
+
 
 # ==========================================================================================================================
 # ==========================================================================================================================
@@ -147,6 +426,7 @@ class ImplementationSharedState:
         self._cmake_bin_path = None
         self._ninja_bin_path = None
         self._dataset = None
+        self._printed_notes: set[str] = set()
 
     def initialize(self,
                    json_path: str,
@@ -169,42 +449,353 @@ class ImplementationSharedState:
         """
         self._check_initialization()
         self._dataset = _Dataset(self._json_path)
+        self._printed_notes.clear()
 
-    def configure_project(self) -> None:
+        # build directories wiped by an interrupted run
+        cmake.remove_leftover_build_dirs(self._dataset.project_root_path)
+
+    def configure_project(self, force_rescan: bool=False, build_type_name: str=None, clean: bool=False) -> None:
+        """
+        Check if json data was parsed, generate CMakelists.txt file and run cmake configuration.
+        Each build type has its own build directory: the other build types stay configured.
+        The build directory is only wiped if the compiler, the generator or the cmake cache changed.
+
+        :param force_rescan: `True` to ignore the source index and search all source files again
+        :param build_type_name: build type to configure (`DEBUGG`, `RELEASE`), `None` for the manifest build type
+        :param clean: `True` to wipe the build directory anyway
+        """
+        self._check_initialization()
+        build_type = self._dataset.get_build_type(build_type_name)
+
+        self._generate(force_rescan)
+        wipe_reason = cmake.configure(project_root_path=self._dataset.project_root_path,
+                                      project_build_type=build_type,
+                                      c_compiler_path=self._dataset.compiler_path,
+                                      cpp_compiler_path=self._dataset.compiler_path,
+                                      cmake_bin_path=self._cmake_bin_path,
+                                      ninja_bin_path=self._ninja_bin_path,
+                                      pgo_enabled=self._dataset.pgo_enabled,
+                                      pgo_profile=self._find_pgo_profile(build_type) if self._dataset.pgo_enabled else None,
+                                      job_pools_enabled=self._dataset.job_pools_enabled,
+                                      job_pool_compile_jobs=self._dataset.job_pool_compile_jobs,
+                                      job_pool_link_jobs=self._dataset.job_pool_link_jobs,
+                                      clean=clean
+        )
+
+        if wipe_reason:
+            print(f"Build directory wiped ({wipe_reason}).")
+
+    def build_project(self, build_type_name: str=None) -> None:
+        """
+        Check if json data was parsed, apply cmd commands for cmake build and print the build summary (compiler cache, link time).
+        A build type not configured yet is configured first.
+        With the artifact cache, outputs of an already built fingerprint are restored instead of built.
+
+        :param build_type_name: build type to build (`DEBUGG`, `RELEASE`), `None` for the manifest build type
         """
-        Check if json data was parsed, generate CMakelists.txt file and run cmake configuration
+        self._check_initialization()
+        build_type = self._dataset.get_build_type(build_type_name)
+
+        if not cmake.is_configured(self._dataset.project_root_path, build_type):
+            self.configure_project(build_type_name=build_type_name)
+
+        fingerprint = None
+        if self._dataset.artifact_cache_enabled and cmake.has_split_debug_info(build_type, self._dataset.fast_debug_link):
+            self._print_note_once(f"Artifact cache not used for {build_type.value}: "
+                                  f"the fast debug link keeps the debug info next to the objects (.dwo files), not in the outputs.")
+        elif self._dataset.artifact_cache_enabled:
+            fingerprint = self._compute_build_fingerprint(build_type)
+            if self._restore_build_outputs(build_type, fingerprint):
+                return
+
+        summary = cmake.build(project_root_path=self._dataset.project_root_path,
+                              project_build_type=build_type,
+                              cmake_bin_path=self._cmake_bin_path,
+                              ninja_bin_path=self._ninja_bin_path,
+                              compiler_cache_program=self._dataset.compiler_cache_program,
+                              compiler_cache_dir_name=self._dataset.compiler_cache_dir_name,
+                              compiler_cache_max_size=self._dataset.compiler_cache_max_size,
+                              fast_debug_link=self._dataset.fast_debug_link,
+                              max_jobs=self._dataset.max_jobs,
+                              max_load=self._dataset.max_load
+        )
+
+        summary_text = summary.to_text()
+        if summary_text:
+            print(summary_text)
+
+        if fingerprint is not None:
+            self._store_build_outputs(build_type, fingerprint)
+
+    def build_matrix(self) -> None:
+        """
+        Check if json data was parsed, configure and build every compiler and build type of the matrix concurrently
+        (one build directory per cell) and print the timing table
+
+        :raises RuntimeError: if a cell failed (after the table is printed)
         """
         self._check_initialization()
+
+        if not self._dataset.matrix_enabled:
+            raise RuntimeError("Build matrix is disabled (set 'matrix.enabled' in the manifest)")
+        if not self._dataset.matrix_compiler_paths or not self._dataset.matrix_build_types:
+            raise RuntimeError("Empty build matrix (set 'matrix.compilers' and 'matrix.build_types' in the manifest)")
+
+        self._generate()
+        summary = cmake.build_matrix(project_root_path=self._dataset.project_root_path,
+                                     matrix_cells=cmake.create_matrix_cells(self._dataset.matrix_compiler_paths, self._dataset.matrix_build_types),
+                                     cmake_bin_path=self._cmake_bin_path,
+                                     ninja_bin_path=self._ninja_bin_path,
+                                     pgo_enabled=self._dataset.pgo_enabled,
+                                     job_pools_enabled=self._dataset.job_pools_enabled,
+                                     job_pool_compile_jobs=self._dataset.job_pool_compile_jobs,
+                                     job_pool_link_jobs=self._dataset.job_pool_link_jobs,
+                                     max_load=self._dataset.max_load,
+                                     max_parallel_cells=self._dataset.matrix_max_parallel_cells
+        )
+        print(summary.to_text())
+
+        if summary.failed_cell_names:
+            raise RuntimeError(f"Build matrix failed: {', '.join(summary.failed_cell_names)}")
+
+    def profile_compile_times(self, build_type_name: str=None) -> None:
+        """
+        Check if json data was parsed, compile every translation unit with the compile time traces (separate build directory)
+        and print the headers/templates/translation units ranking
+
+        :param build_type_name: build type to profile (`DEBUGG`, `RELEASE`), `None` for the manifest build type
+        """
+        self._check_initialization()
+        build_type = self._dataset.get_build_type(build_type_name)
+
+        self._generate()
+        report = cmake.profile_compile_times(project_root_path=self._dataset.project_root_path,
+                                             project_build_type=build_type,
+                                             project_language=self._dataset.project_language,
+                                             c_compiler_path=self._dataset.compiler_path,
+                                             cpp_compiler_path=self._dataset.compiler_path,
+                                             cmake_bin_path=self._cmake_bin_path,
+                                             ninja_bin_path=self._ninja_bin_path
+        )
+        print(report.to_text())
+
+    def optimize_project_with_pgo(self, build_type_name: str=None) -> None:
+        """
+        Check if json data was parsed, then run the Profile Guided Optimization pipeline:
+        build the instrumented binaries, run the training command, store the merged profiles
+        and configure/build the project with them
+
+        :param build_type_name: build type to train and build (`DEBUGG`, `RELEASE`), `None` for the manifest build type
+        """
+        self._check_initialization()
+        build_type = self._dataset.get_build_type(build_type_name)
+
+        if not self._dataset.pgo_enabled:
+            raise RuntimeError("Profile guided optimization is disabled (set 'pgo.enabled' in the manifest)")
+        if not self._dataset.pgo_training_command:
+            raise RuntimeError("No training command (set 'pgo.training_command' in the manifest)")
+
+        self._generate()
+        profile = cmake.train_pgo_profile(project_root_path=self._dataset.project_root_path,
+                                          project_build_type=build_type,
+                                          project_source_ignore_patterns=self._dataset.project_source_ignore_patterns,
+                                          project_use_gitignore=self._dataset.project_use_gitignore,
+                                          c_compiler_path=self._dataset.compiler_path,
+                                          cpp_compiler_path=self._dataset.compiler_path,
+                                          cmake_bin_path=self._cmake_bin_path,
+                                          ninja_bin_path=self._ninja_bin_path,
+                                          pgo_training_command=self._dataset.pgo_training_command,
+                                          pgo_max_versions=self._dataset.pgo_keep_versions
+        )
+        print(f"PGO profile v{profile.version} stored ({profile.kind.value}).")
+
+        self.configure_project(build_type_name=build_type_name)
+        self.build_project(build_type_name)
+
+    def analyze_includes(self) -> None:
+        """
+        Check if json data was parsed, scan the include graph and print the headers/translation units ranking
+        """
+        self._check_initialization()
+        report = cmake.analyze_includes(project_root_path=self._dataset.project_root_path,
+                                        project_include_dir_names=self._dataset.project_include_dir_names,
+                                        project_source_ignore_patterns=self._dataset.project_source_ignore_patterns,
+                                        project_use_gitignore=self._dataset.project_use_gitignore,
+                                        project_use_git_index=self._dataset.project_use_git_index,
+                                        project_git_include_untracked=self._dataset.project_git_include_untracked,
+                                        project_imported_static_libs=self._dataset.project_imported_static_libs,
+                                        project_imported_shared_libs=self._dataset.project_imported_shared_libs
+        )
+        print(report.to_text())
+
+    def measure_source_discovery(self) -> None:
+        """
+        Check if json data was parsed, time the sequential and the parallel source walkers on the project and print their files/sec
+        """
+        self._check_initialization()
+        result = cmake.measure_source_discovery(project_root_path=self._dataset.project_root_path,
+                                                project_source_ignore_patterns=self._dataset.project_source_ignore_patterns
+        )
+        print(f"Source discovery: {result['files']} source files")
+        print(f"  os.walk:  {result['walk']:.0f} files/s")
+        speedup = f" ({result['scandir'] / result['walk']:.1f}x)" if result['walk'] else ""
+        print(f"  scandir:  {result['scandir']:.0f} files/s{speedup}")
+
+    def watch_project(self) -> None:
+        """
+        Watch the project files until Ctrl+C is pressed.
+        Added/removed sources regenerate CMakelists.txt, edited files trigger an incremental build.
+        With `use_git_index`, the regenerate also adds the untracked files (the new sources are not in the git index yet).
+        """
+        self._check_initialization()
+
+        if not cmake.is_configured(self._dataset.project_root_path, self._dataset.project_build_type):
+            self.configure_project()
+
+        print("Watching project files (press Ctrl+C to stop)...")
+
+        try:
+            cmake.watch(project_root_path=self._dataset.project_root_path,
+                        project_source_ignore_patterns=self._dataset.project_source_ignore_patterns,
+                        project_use_gitignore=self._dataset.project_use_gitignore,
+                        on_sources_changed=self._watch_generate,
+                        on_sources_modified=self._watch_build
+            )
+        except KeyboardInterrupt:
+            print("Watch stopped.")
+
+    def _watch_generate(self) -> None:
+        print("Source files added or removed: generating CMakelists.txt...")
+        try:
+            self._generate(include_untracked=True)
+        except Exception as e:
+            print(f"Generate failed: {e}")
+
+    def _watch_build(self) -> None:
+        print("Source files modified: building...")
+        try:
+            self.build_project()
+        except Exception as e:
+            print(f"Build failed: {e}")
+
+    def _find_pgo_profile(self, build_type: cmake.BuildType):
+        """
+        Newest PGO profile if it was trained for the build type and the sources didn't drift too far since, else `None`
+        """
+        result = cmake.find_pgo_profile(project_root_path=self._dataset.project_root_path,
+                                        project_source_ignore_patterns=self._dataset.project_source_ignore_patterns,
+                                        project_use_gitignore=self._dataset.project_use_gitignore
+        )
+
+        if result is None:
+            self._print_note_once("No PGO profile yet: select Optimize Build (PGO) to train one.")
+            return None
+
+        profile, drift = result
+        if profile.build_type_name != build_type.value:
+            self._print_note_once(f"PGO profile v{profile.version} not used: trained for {profile.build_type_name}, not {build_type.value}.")
+            return None
+
+        if drift * 100 > self._dataset.pgo_max_drift_percent:
+            self._print_note_once(f"PGO profile v{profile.version} not used: {drift:.1%} of the project files changed since its training "
+                                  f"(max {self._dataset.pgo_max_drift_percent}%). Select Optimize Build (PGO) to train again.")
+            return None
+
+        print(f"Using PGO profile v{profile.version} from {profile.created} ({drift:.1%} of the project files changed since).")
+        return profile
+
+    def _compute_build_fingerprint(self, build_type: cmake.BuildType) -> str:
+        return cmake.compute_build_fingerprint(project_root_path=self._dataset.project_root_path,
+                                               project_build_type=build_type,
+                                               project_source_ignore_patterns=self._dataset.project_source_ignore_patterns,
+                                               project_use_gitignore=self._dataset.project_use_gitignore,
+                                               project_imported_static_libs=self._dataset.project_imported_static_libs,
+                                               project_imported_shared_libs=self._dataset.project_imported_shared_libs,
+                                               build_settings=self._dataset.build_settings,
+                                               compiler_path=self._dataset.compiler_path,
+                                               cmake_bin_path=self._cmake_bin_path
+        )
+
+    def _restore_build_outputs(self, build_type: cmake.BuildType, fingerprint: str) -> bool:
+        try:
+            restored_count = cmake.restore_build_outputs(project_root_path=self._dataset.project_root_path,
+                                                         project_build_type=build_type,
+                                                         fingerprint=fingerprint,
+                                                         artifact_cache_dir_name=self._dataset.artifact_cache_dir_name,
+                                                         artifact_cache_url=self._dataset.artifact_cache_url
+            )
+        except OSError as e:
+            print(f"Artifact cache restore failed: {e}")
+            return False
+
+        if restored_count is None:
+            return False
+
+        print(f"Artifact cache hit ({fingerprint[:12]}): {restored_count} files restored, build skipped.")
+        return True
+
+    def _store_build_outputs(self, build_type: cmake.BuildType, fingerprint: str) -> None:
+        try:
+            stored_count = cmake.store_build_outputs(project_root_path=self._dataset.project_root_path,
+                                                     project_build_type=build_type,
+                                                     fingerprint=fingerprint,
+                                                     ninja_bin_path=self._ninja_bin_path,
+                                                     artifact_cache_dir_name=self._dataset.artifact_cache_dir_name,
+                                                     artifact_cache_url=self._dataset.artifact_cache_url
+            )
+        except OSError as e:
+            print(f"Artifact cache store failed: {e}")
+            return
+
+        print(f"Artifact cache store ({fingerprint[:12]}): {stored_count} files.")
+
+    def _print_note_once(self, note: str) -> None:
+        # notes about the manifest settings would repeat on every configure and build: once until the next reload
+        if note not in self._printed_notes:
+            self._printed_notes.add(note)
+            print(note)
+
+    def _generate(self, force_rescan: bool=False, include_untracked: bool=False) -> None:
         cmake.generate( project_root_path=self._dataset.project_root_path,
                         project_include_dir_names=self._dataset.project_include_dir_names,
-                        project_source_ignored_dir_names=self._dataset.project_source_ignored_dir_names,
+                        project_source_ignore_patterns=self._dataset.project_source_ignore_patterns,
+                        project_use_gitignore=self._dataset.project_use_gitignore,
+                        project_use_git_index=self._dataset.project_use_git_index,
+                        project_git_include_untracked=self._dataset.project_git_include_untracked or include_untracked,
                         project_imported_static_libs=self._dataset.project_imported_static_libs,
                         project_imported_shared_libs=self._dataset.project_imported_shared_libs,
                         project_name=self._dataset.project_name,
-                        project_product_type=self._dataset.project_product_type,
+                        project_product_types=self._dataset.project_product_types,
                         project_version=self._dataset.project_version,
                         project_language=self._dataset.project_language,
                         language_standard=self._dataset.language_standard,
                         language_standard_required=self._dataset.language_standard_required,
                         compiler_extensions_required=self._dataset.compiler_extensions_required,
-                        cmake_compile_definitions=self._dataset.cmake_compile_definitions
-        )
-        cmake.configure(project_root_path=self._dataset.project_root_path,
-                        project_build_type=self._dataset.project_build_type,
-                        c_compiler_path=self._dataset.compiler_path,
-                        cpp_compiler_path=self._dataset.compiler_path,
-                        cmake_bin_path=self._cmake_bin_path,
-                        ninja_bin_path=self._ninja_bin_path,
-        )
-
-    def build_project(self) -> None:
-        """
-        Check if json data was parsed and apply cmd commands for cmake build
-        """
-        self._check_initialization()
-        cmake.build(project_root_path=self._dataset.project_root_path,
-                    cmake_bin_path=self._cmake_bin_path,
-                    ninja_bin_path=self._ninja_bin_path,
+                        cmake_compile_definitions=self._dataset.cmake_compile_definitions,
+                        unity_build_enabled=self._dataset.unity_build_enabled,
+                        unity_build_batch_size_kb=self._dataset.unity_build_batch_size_kb,
+                        unity_build_excluded_files=self._dataset.unity_build_excluded_files,
+                        precompiled_headers_enabled=self._dataset.precompiled_headers_enabled,
+                        precompiled_headers_max_count=self._dataset.precompiled_headers_max_count,
+                        precompiled_headers_size_budget_kb=self._dataset.precompiled_headers_size_budget_kb,
+                        precompiled_headers_pinned=self._dataset.precompiled_headers_pinned,
+                        precompiled_headers_excluded=self._dataset.precompiled_headers_excluded,
+                        precompiled_headers_override=self._dataset.precompiled_headers_override,
+                        components_enabled=self._dataset.components_enabled,
+                        components_shared_in_debug=self._dataset.components_shared_in_debug,
+                        compiler_cache_program=self._dataset.compiler_cache_program,
+                        compiler_cache_dir_name=self._dataset.compiler_cache_dir_name,
+                        compiler_cache_max_size=self._dataset.compiler_cache_max_size,
+                        ipo_build_types=self._dataset.ipo_build_types,
+                        ipo_thin_lto=self._dataset.ipo_thin_lto,
+                        ipo_jobs=self._dataset.ipo_jobs,
+                        pgo_enabled=self._dataset.pgo_enabled,
+                        linker_selection_enabled=self._dataset.linker_selection_enabled,
+                        linker_requested=self._dataset.linker_requested,
+                        compiler_path=self._dataset.compiler_path,
+                        fast_debug_link=self._dataset.fast_debug_link,
+                        job_pools_enabled=self._dataset.job_pools_enabled,
+                        force_rescan=force_rescan
         )
 
     def _check_initialization(self) -> None:
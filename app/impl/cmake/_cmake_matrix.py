@@ -0,0 +1,189 @@
+import os
+import sys
+from enum import Enum
+
+from .cmd import BuildType, CMDStepResult, IOutputSink
+
+
+# Implemented the cells of the build matrix (compilers x build types) and the timing table printed after a matrix build
+
+
+__all__ = ["MatrixCell",
+           "MatrixCellStatus",
+           "MatrixCellResult",
+           "MatrixSummary",
+           "MatrixOutputSink",
+           "create_matrix_cells"
+           ]
+
+
+class MatrixCell:
+    """
+    One compiler and one build type of the build matrix, built in its own build directory
+    """
+
+    def __init__(self, name: str, compiler_path: str, build_type: BuildType):
+        """
+        :param name: unique name of the cell (`g++-Release`), also the name of its build directory
+        :param compiler_path: full path to the C/C++ compiler (empty for the compiler found by cmake)
+        :param build_type: build type of the cell
+        """
+
+        self.name = name
+        self.compiler_path = compiler_path
+        self.build_type = build_type
+
+
+def create_matrix_cells(compiler_paths: list[str], build_types: list[BuildType]) -> list[MatrixCell]:
+    """
+    :param compiler_paths: full paths to the compilers (empty for the compiler found by cmake)
+    :param build_types: build types built with each compiler
+    :returns list[MatrixCell]: one cell per compiler and build type, named after the compiler file name and the build type
+    """
+
+    cells: list[MatrixCell] = []
+    used_names: set[str] = set()
+
+    for compiler_path in dict.fromkeys(compiler_paths):
+        compiler_name = os.path.basename(compiler_path) if compiler_path else "default"
+        # only the windows executable extension: versions are part of the name (`gcc-13.2`)
+        if compiler_name.lower().endswith(".exe"):
+            compiler_name = compiler_name[:-len(".exe")]
+        # same file name in different directories (`/usr/bin/g++`, `/opt/gcc-13/bin/g++`)
+        unique_compiler_name = compiler_name
+        suffix = 2
+        while any(f"{unique_compiler_name}-{build_type.value}" in used_names for build_type in build_types):
+            unique_compiler_name = f"{compiler_name}.{suffix}"
+            suffix += 1
+
+        for build_type in dict.fromkeys(build_types):
+            cell = MatrixCell(f"{unique_compiler_name}-{build_type.value}", compiler_path, build_type)
+            used_names.add(cell.name)
+            cells.append(cell)
+
+    return cells
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+class MatrixCellStatus(Enum):
+    OK = "ok"
+    FAILED = "failed"
+    CANCELLED = "cancelled"   # stopped because another cell failed
+    SKIPPED = "skipped"       # not started because another cell failed
+
+
+class MatrixCellResult:
+    """
+    What the configuration and the build of a cell did
+    """
+
+    def __init__(self, cell: MatrixCell, configure_result: CMDStepResult | None, build_result: CMDStepResult | None):
+        """
+        :param cell: the cell
+        :param configure_result: result of the cmake configuration (`None` if not started)
+        :param build_result: result of the cmake build (`None` if not started)
+        """
+
+        self.cell = cell
+        self.configure_result = configure_result
+        self.build_result = build_result
+
+    @property
+    def status(self) -> MatrixCellStatus:
+        for result in (self.configure_result, self.build_result):
+            if result is None:
+                return MatrixCellStatus.SKIPPED
+            if result.cancelled:
+                return MatrixCellStatus.CANCELLED
+            if result.exit_code != 0:
+                return MatrixCellStatus.FAILED
+        return MatrixCellStatus.OK
+
+    @property
+    def configure_seconds(self) -> float | None:
+        return self.configure_result.wall_seconds if self.configure_result is not None else None
+
+    @property
+    def build_seconds(self) -> float | None:
+        return self.build_result.wall_seconds if self.build_result is not None else None
+
+    @property
+    def build_peak_rss_bytes(self) -> int | None:
+        return self.build_result.peak_rss_bytes if self.build_result is not None else None
+
+
+class MatrixSummary:
+    """
+    Timing table of the cells of a matrix build, with the share of the machine each running cell got
+    """
+
+    def __init__(self,
+                 cell_results: list[MatrixCellResult],
+                 wall_seconds: float,
+                 parallel_cell_count: int,
+                 cell_max_jobs: int,
+                 cell_memory_bytes: int | None
+    ):
+        """
+        :param cell_results: results of the cells, in the matrix order
+        :param wall_seconds: time from the start of the first cell to the end of the last one
+        :param parallel_cell_count: cells running at the same time
+        :param cell_max_jobs: parallel build steps of the largest cell
+        :param cell_memory_bytes: available memory given to each cell (`None` if unknown)
+        """
+
+        self.cell_results = cell_results
+        self.wall_seconds = wall_seconds
+        self.parallel_cell_count = parallel_cell_count
+        self.cell_max_jobs = cell_max_jobs
+        self.cell_memory_bytes = cell_memory_bytes
+
+    @property
+    def failed_cell_names(self) -> list[str]:
+        return [cell_result.cell.name for cell_result in self.cell_results if cell_result.status is MatrixCellStatus.FAILED]
+
+    def to_text(self) -> str:
+        budget = f"up to {self.cell_max_jobs} build steps"
+        if self.cell_memory_bytes:
+            budget += f" and {self.cell_memory_bytes / 2**30:.1f} GiB"
+        serial_seconds = sum((cell_result.configure_seconds or 0) + (cell_result.build_seconds or 0) for cell_result in self.cell_results)
+
+        lines = [f"Build matrix: {len(self.cell_results)} cells, {self.parallel_cell_count} at a time ({budget} each)",
+                 f"Wall time: {self.wall_seconds:.2f} s (cells total {serial_seconds:.2f} s)",
+                 "",
+                 f"{'Cell':<30} {'Status':<10} {'Configure s':>12} {'Build s':>10} {'Peak MiB':>10}"
+                 ]
+
+        def _format(value: float | None, precision: int) -> str:
+            return "-" if value is None else f"{value:.{precision}f}"
+
+        for cell_result in self.cell_results:
+            peak_mib = cell_result.build_peak_rss_bytes / 2**20 if cell_result.build_peak_rss_bytes else None
+            lines.append(f"{cell_result.cell.name:<30} {cell_result.status.value:<10} "
+                         f"{_format(cell_result.configure_seconds, 2):>12} {_format(cell_result.build_seconds, 2):>10} {_format(peak_mib, 0):>10}")
+
+        return "\n".join(lines)
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+class MatrixOutputSink(IOutputSink):
+    """
+    Print the output lines of the concurrent cells, prefixed by the name of their cell
+    """
+
+    def __init__(self, cell_names_by_step: list[str]):
+        """
+        :param cell_names_by_step: name of the cell of each step of the cmd list, by index
+        """
+
+        self._cell_names_by_step = cell_names_by_step
+
+    def write_line(self, step_index: int, line: str) -> None:
+        sys.stdout.write(f"[{self._cell_names_by_step[step_index]}] {line}\n")
+        sys.stdout.flush()
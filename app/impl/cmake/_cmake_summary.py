@@ -0,0 +1,77 @@
+from . import buildlog
+from . import compcache
+
+
+# Implemented the summary printed after a build
+
+
+__all__ = ["BuildSummary"]
+
+
+class BuildSummary:
+    """
+    What a build did: duration, peak memory, compiler cache statistics and time spent linking,
+    compared with the last build of the other link mode (like with and without the fast debug link),
+    then the report of the build steps (slowest steps, critical path, parallelism, regressions)
+    """
+
+    def __init__(self,
+                 build_seconds: float=None,
+                 build_peak_rss_bytes: int=None,
+                 compiler_cache_stats: compcache.CompilerCacheStats=None,
+                 link_seconds: float=None,
+                 link_mode_label: str="",
+                 compared_link_seconds: float=None,
+                 compared_link_mode_label: str="",
+                 build_report: buildlog.BuildReport=None,
+                 build_report_file_path: str=""
+    ):
+        """
+        :param build_seconds: wall time of the build command
+        :param build_peak_rss_bytes: peak resident memory of the largest build process (`None` if unknown)
+        :param compiler_cache_stats: hits/misses of the compiler cache during the build (`None` if no cache is used)
+        :param link_seconds: total time of the link steps (`None` if nothing was linked or not measured)
+        :param link_mode_label: link mode of the build (like `fast debug link`)
+        :param compared_link_seconds: last link time measured with the other mode
+        :param compared_link_mode_label: the other link mode
+        :param build_report: report of the build steps (`None` if nothing was built)
+        :param build_report_file_path: full path to the report exported as json
+        """
+
+        self.build_seconds = build_seconds
+        self.build_peak_rss_bytes = build_peak_rss_bytes
+        self.compiler_cache_stats = compiler_cache_stats
+        self.link_seconds = link_seconds
+        self.link_mode_label = link_mode_label
+        self.compared_link_seconds = compared_link_seconds
+        self.compared_link_mode_label = compared_link_mode_label
+        self.build_report = build_report
+        self.build_report_file_path = build_report_file_path
+
+    def to_text(self) -> str:
+        lines = []
+
+        if self.build_seconds is not None:
+            line = f"Build time: {self.build_seconds:.2f} s"
+            if self.build_peak_rss_bytes:
+                line += f", peak memory: {self.build_peak_rss_bytes / 2**20:.0f} MiB"
+            lines.append(line)
+
+        if self.compiler_cache_stats is not None:
+            lines.append(self.compiler_cache_stats.to_text())
+
+        if self.link_seconds is not None:
+            line = f"Link time: {self.link_seconds:.2f} s"
+            if self.link_mode_label:
+                line += f" ({self.link_mode_label})"
+            if self.compared_link_seconds:
+                change = (self.link_seconds - self.compared_link_seconds) / self.compared_link_seconds
+                line += f", last build with {self.compared_link_mode_label}: {self.compared_link_seconds:.2f} s ({change:+.0%})"
+            lines.append(line)
+
+        if self.build_report is not None:
+            lines += ["", self.build_report.to_text()]
+            if self.build_report_file_path:
+                lines.append(f"Report saved to {self.build_report_file_path}")
+
+        return "\n".join(lines)
@@ -1,29 +1,350 @@
+import io
+import json
+import os
+import shutil
+import time
 from enum import Enum, auto
+from typing import Callable
 
+from . import artifacts
+from . import buildlog
+from . import compcache
 from . import devfiles
+from . import fswatch
+from . import includes
+from . import jobpool
+from . import linker
+from . import pgo
+from . import timetrace
+from . import trash
 from .cmd import *
 from .generator import *
+from .linker import LinkerType
+from ._cmake_matrix import *
+from ._cmake_summary import BuildSummary
 
 
 __all__ = ["ProductType",
            "BuildType",
            "Language",
+           "LinkerType",
+           "BuildSummary",
+           "MatrixCell",
+           "MatrixCellStatus",
+           "MatrixSummary",
+           "create_matrix_cells",
            "generate",
            "configure",
-           "build"
+           "build",
+           "build_matrix",
+           "is_configured",
+           "remove_leftover_build_dirs",
+           "watch",
+           "analyze_includes",
+           "measure_source_discovery",
+           "has_split_debug_info",
+           "compute_build_fingerprint",
+           "restore_build_outputs",
+           "store_build_outputs",
+           "profile_compile_times",
+           "train_pgo_profile",
+           "find_pgo_profile"
            ]
 
 
-def _get_next_library_name() -> str:
+# cache variables read by the generated Profile Guided Optimization part
+_PGO_MODE_CACHE_VARIABLE = "PGO_MODE"
+_PGO_PROFILE_PATH_CACHE_VARIABLE = "PGO_PROFILE_PATH"
+
+# cmake file included right after `project()` (the Compile Time Trace part of the time trace builds)
+_PROJECT_INCLUDE_CACHE_VARIABLE = "CMAKE_PROJECT_INCLUDE"
+
+# cache variables read by the generated Job Pools part
+_JOB_POOL_COMPILE_SIZE_CACHE_VARIABLE = "JOB_POOL_COMPILE_SIZE"
+_JOB_POOL_LINK_SIZE_CACHE_VARIABLE = "JOB_POOL_LINK_SIZE"
+
+# build types with debug info (using the fast debug link when enabled)
+_DEBUG_INFO_BUILD_TYPES = (BuildType.DEBUGG, BuildType.DBGRELEASE)
+_FAST_DEBUG_LINK_LABEL = "fast debug link"
+_DEFAULT_DEBUG_LINK_LABEL = "default debug link"
+
+
+def _get_library_name(index: int) -> str:
+    """
+    Generate sequential `import_lib` names (stable for the same manifest, so the generated files don't change)
+    """
+
+    return f"import_lib{index}"
+
+
+def _get_project_source_files(project_root_path: str,
+                              project_source_ignore_patterns: list[str],
+                              project_use_gitignore: bool,
+                              project_use_git_index: bool,
+                              project_git_include_untracked: bool,
+                              force_rescan: bool
+) -> list[str]:
+    """
+    Source files from the git index when enabled (and the project is a git repository),
+    else from the persistent source index (only changed directories are listed again)
+    """
+
+    if project_use_git_index:
+        return devfiles.get_git_project_source_files(project_root_path,
+                                                     project_source_ignore_patterns,
+                                                     project_git_include_untracked,
+                                                     force_rescan,
+                                                     project_use_gitignore
+                                                     )
+
+    return devfiles.get_indexed_project_source_files(project_root_path,
+                                                     project_source_ignore_patterns,
+                                                     force_rescan,
+                                                     project_use_gitignore
+                                                     )
+
+
+def _get_compiler_cache_env(project_root_path: str,
+                            compiler_cache_program: str,
+                            compiler_cache_dir_name: str,
+                            compiler_cache_max_size: str
+) -> list[tuple[str, str]]:
+    try:
+        cache_type = compcache.get_compiler_cache_type(compiler_cache_program)
+    except ValueError:
+        raise RuntimeError(f"Compiler cache not supported: {compiler_cache_program} (use ccache or sccache)")
+
+    cache_dir_path = os.path.join(project_root_path, compiler_cache_dir_name or devfiles.get_compiler_cache_dir_name()).replace("\\", "/")
+    return compcache.get_compiler_cache_env(cache_type, cache_dir_path, compiler_cache_max_size, project_root_path)
+
+
+def _create_artifact_storage(project_root_path: str, artifact_cache_dir_name: str, artifact_cache_url: str) -> artifacts.IArtifactStorage:
+    """
+    HTTP cache server if an url is set, else local directory (default in the PyForge state directory)
+    """
+
+    if artifact_cache_url:
+        return artifacts.HttpArtifactStorage(artifact_cache_url)
+    return artifacts.LocalArtifactStorage(os.path.join(project_root_path, artifact_cache_dir_name or devfiles.get_artifact_cache_dir_name()))
+
+
+def _read_cmake_cache_values(build_dir_path: str, variable_names: tuple[str, ...]) -> list[str]:
+    """
+    Values of the cache variables set during configuration (in the order of CMakeCache.txt)
+    """
+
+    values = []
+    try:
+        with open(os.path.join(build_dir_path, "CMakeCache.txt"), "r", errors="replace") as cmake_cache_file:
+            for line in cmake_cache_file:
+                if line.startswith(tuple(f"{variable_name}:" for variable_name in variable_names)):
+                    values.append(line.partition("=")[2].strip())
+    except OSError:
+        pass
+    return values
+
+
+def _get_configured_compiler_paths(build_dir_path: str) -> list[str]:
+    """
+    Compilers found by cmake during configuration (used when the manifest leaves the compiler path empty)
+    """
+
+    return _read_cmake_cache_values(build_dir_path, ("CMAKE_C_COMPILER", "CMAKE_CXX_COMPILER"))
+
+
+def _find_project_compiler(project_root_path: str, compiler_path: str, project_language: Language) -> str | None:
     """
-    Generate sequential `import_lib` names
+    Compiler driving the links: set in the manifest, else found by a cmake configuration,
+    else the one cmake would pick (`CC`/`CXX` environment variables, `cc`/`c++` in PATH)
     """
 
-    if not hasattr(_get_next_library_name, "index"):
-        _get_next_library_name.index = 0
+    if compiler_path:
+        return compiler_path
 
-    _get_next_library_name.index += 1
-    return f"import_lib{_get_next_library_name.index}"
+    for build_type in BuildType:
+        configured_compiler_paths = _read_cmake_cache_values(devfiles.get_build_dir_path(project_root_path, build_type.value), (f"CMAKE_{project_language.value}_COMPILER",))
+        if configured_compiler_paths:
+            return configured_compiler_paths[0]
+
+    if project_language == Language.CPP:
+        return shutil.which(os.environ.get("CXX", "c++"))
+    return shutil.which(os.environ.get("CC", "cc"))
+
+
+def _get_linker_candidates(project_root_path: str,
+                           project_language: Language,
+                           compiler_path: str,
+                           linker_requested: LinkerType
+) -> list[LinkerType]:
+    """
+    Fast linkers probed once per compiler (every linker is left to the cmake test link if the compiler is unknown)
+    """
+
+    project_compiler_path = _find_project_compiler(project_root_path, compiler_path, project_language)
+
+    available_linkers = None
+    if project_compiler_path:
+        available_linkers = linker.probe_linkers(project_compiler_path,
+                                                 ".cpp" if project_language == Language.CPP else ".c",
+                                                 devfiles.get_linker_probe_file_path(project_root_path)
+                                                 )
+
+    return linker.get_linker_candidates(linker_requested, available_linkers)
+
+
+def _get_configure_settings(project_root_path: str, c_compiler_path: str, cpp_compiler_path: str, cmake_bin_path: str) -> dict[str, str]:
+    """
+    Settings a cmake cache can't be reused with once changed (the compilers and the generator are fixed at the first configuration)
+    """
+
+    return {"source_dir": os.path.normpath(project_root_path),
+            "generator": GENERATOR_NAME,
+            "cmake": shutil.which("cmake", path=os.pathsep.join((cmake_bin_path, os.environ.get("PATH", "")))) or "",
+            "c_compiler": c_compiler_path or "",
+            "cpp_compiler": cpp_compiler_path or ""
+            }
+
+
+def _get_build_dir_wipe_reason(project_root_path: str, build_dir_path: str, configure_settings: dict[str, str]) -> str | None:
+    """
+    :returns str | None: why the existing build directory can't be configured again in place, `None` if it can (or doesn't exist)
+    """
+
+    if not os.path.isdir(build_dir_path):
+        return None
+
+    try:
+        with open(devfiles.get_configure_settings_file_path(build_dir_path), "r") as settings_file:
+            stored_settings = json.load(settings_file)
+    except (OSError, ValueError):
+        return "no configuration settings stored"
+
+    changed_names = [name for name, value in configure_settings.items() if stored_settings.get(name) != value]
+    if changed_names:
+        return f"{', '.join(changed_names)} changed"
+
+    home_dirs = _read_cmake_cache_values(build_dir_path, ("CMAKE_HOME_DIRECTORY",))
+    if not home_dirs or os.path.normpath(home_dirs[0]) != os.path.normpath(project_root_path):
+        return "cmake cache missing or corrupted"
+
+    return None
+
+
+def _get_pgo_cache_variables(pgo_profile: pgo.PgoProfile | None) -> list[tuple[str, str]]:
+    """
+    Cache variables of the generated Profile Guided Optimization part (`None` to build without profile)
+    """
+
+    return [(_PGO_MODE_CACHE_VARIABLE, "USE" if pgo_profile else ""),
+            (_PGO_PROFILE_PATH_CACHE_VARIABLE, pgo_profile.profile_path if pgo_profile else "")
+            ]
+
+
+def _get_job_pool_cache_variables(compile_pool_size: int, link_pool_size: int) -> list[tuple[str, str]]:
+    """
+    Cache variables of the generated Job Pools part
+    """
+
+    return [(_JOB_POOL_COMPILE_SIZE_CACHE_VARIABLE, str(compile_pool_size)),
+            (_JOB_POOL_LINK_SIZE_CACHE_VARIABLE, str(link_pool_size))
+            ]
+
+
+def _create_build_report(project_root_path: str,
+                         project_build_type: BuildType,
+                         ninja_bin_path: str,
+                         ninja_log_entries: list[buildlog.NinjaLogEntry]
+) -> buildlog.BuildReport:
+    """
+    Report of the steps of the last build. The critical path follows the dependencies of the built outputs in the ninja graph
+    (left out if ninja is not found).
+    The step durations are remembered to find the regressions of the next build.
+    """
+
+    build_dir_path = devfiles.get_build_dir_path(project_root_path, project_build_type.value)
+    ninja_path = shutil.which("ninja", path=os.pathsep.join((ninja_bin_path, os.environ.get("PATH", ""))))
+    edge_time_history = buildlog.EdgeTimeHistory(devfiles.get_edge_times_file_path(project_root_path))
+
+    # only the subgraph of the built outputs is read (a few milliseconds for the small rebuilds of the watch mode)
+    inputs_by_output = None
+    if ninja_path and ninja_log_entries:
+        inputs_by_output = buildlog.read_ninja_graph(ninja_path, build_dir_path, [entry.output for entry in ninja_log_entries])
+
+    report = buildlog.BuildReport(ninja_log_entries,
+                                  devfiles.get_build_output_dir_names(),
+                                  os.cpu_count() or 1,
+                                  inputs_by_output,
+                                  edge_time_history.get(project_build_type.value)
+                                  )
+    edge_time_history.update(project_build_type.value, report.edges)
+    return report
+
+
+def _get_pgo_file_digests(project_root_path: str, project_source_ignore_patterns: list[str], project_use_gitignore: bool) -> dict[str, str]:
+    """
+    Digests of the files a PGO profile depends on (sources, headers and generated cmake files)
+    """
+
+    input_files = devfiles.get_project_input_files(project_root_path, project_source_ignore_patterns, project_use_gitignore)
+    return artifacts.get_file_digests(project_root_path, input_files, devfiles.get_pgo_file_hashes_file_path(project_root_path))
+
+
+def _split_source_files_by_component(project_source_files: list[str]) -> tuple[list[str], dict[str, list[str]]]:
+    """
+    :returns tuple: (sources directly in the project root, sources of each top level directory)
+    """
+
+    root_source_files: list[str] = []
+    sources_by_component: dict[str, list[str]] = {}
+
+    for source in project_source_files:
+        component, separator, _ = source.partition("/")
+        if separator:
+            sources_by_component.setdefault(component, []).append(source)
+        else:
+            root_source_files.append(source)
+
+    return root_source_files, sources_by_component
+
+
+def _get_imported_include_dir_names(project_imported_static_libs: list[tuple[str, str]],
+                                    project_imported_shared_libs: list[tuple[str, str, str]]
+) -> list[str]:
+    imported_include_dir_names = [include_dir for _, include_dir in project_imported_static_libs]
+    imported_include_dir_names += [include_dir for _, _, include_dir in project_imported_shared_libs]
+    return imported_include_dir_names
+
+
+def _get_precompiled_headers(project_root_path: str,
+                             project_source_files: list[str],
+                             project_include_dir_names: list[str],
+                             project_imported_static_libs: list[tuple[str, str]],
+                             project_imported_shared_libs: list[tuple[str, str, str]],
+                             max_count: int,
+                             size_budget: int,
+                             pinned_headers: list[str],
+                             excluded_headers: list[str],
+                             override_headers: list[str]
+) -> list[str]:
+    """
+    Headers to precompile: the override list if set, else the pinned headers followed by the ones picked from the include graph
+    """
+
+    if override_headers:
+        return override_headers
+
+    graph = includes.scan_include_graph(project_root_path,
+                                        project_source_files,
+                                        project_include_dir_names,
+                                        _get_imported_include_dir_names(project_imported_static_libs, project_imported_shared_libs),
+                                        devfiles.get_include_graph_file_path(project_root_path)
+                                        )
+    selected_headers = includes.select_precompiled_headers(graph,
+                                                           max(max_count - len(pinned_headers), 0),
+                                                           size_budget,
+                                                           pinned_headers + excluded_headers
+                                                           )
+    return pinned_headers + selected_headers
 
 
 class ProductType(Enum):
@@ -32,78 +353,252 @@ class ProductType(Enum):
     DLL = auto()    # Dynamic linked library
 
 
+_PRODUCT_TARGET_SUFFIXES = {
+    ProductType.LIB: "static",
+    ProductType.DLL: "shared"
+}
+
+
+def _get_product_target_name(project_name: str, product_type: ProductType, products_count: int) -> str:
+    """
+    Target names must be unique: with several products the libraries get a suffix
+    """
+
+    if products_count == 1 or product_type == ProductType.EXE:
+        return project_name
+    return f"{project_name}_{_PRODUCT_TARGET_SUFFIXES[product_type]}"
+
+
+def _add_product_target(builder: GeneratorBuilder, name: str, product_type: ProductType) -> str:
+    """
+    :returns str: cmake variable name of the product target
+    """
+
+    match product_type:
+        case ProductType.EXE:
+            return builder.add_executable(name)
+
+        case ProductType.LIB:
+            return builder.add_library(name, CMakeLibraryType.STATIC)
+
+        case ProductType.DLL:
+            return builder.add_library(name, CMakeLibraryType.SHARED)
+
+        case _:
+            raise RuntimeError(f"Project product type not implemented: {product_type}")
+
+
 def generate(
         project_root_path: str,
         project_include_dir_names: list[str],
-        project_source_ignored_dir_names: list[str],
+        project_source_ignore_patterns: list[str],
+        project_use_gitignore: bool,
+        project_use_git_index: bool,
+        project_git_include_untracked: bool,
         project_imported_static_libs: list[tuple[str, str]],
         project_imported_shared_libs: list[tuple[str, str, str]],
         project_name: str,
-        project_product_type: ProductType,
+        project_product_types: list[ProductType],
         project_version: str,
         project_language: Language,
         language_standard: int,
         language_standard_required: bool,
         compiler_extensions_required: bool,
-        cmake_compile_definitions: list[tuple[str, str]]
+        cmake_compile_definitions: list[tuple[str, str]],
+        unity_build_enabled: bool=False,
+        unity_build_batch_size_kb: int=0,
+        unity_build_excluded_files: list[str]=None,
+        precompiled_headers_enabled: bool=False,
+        precompiled_headers_max_count: int=0,
+        precompiled_headers_size_budget_kb: int=0,
+        precompiled_headers_pinned: list[str]=None,
+        precompiled_headers_excluded: list[str]=None,
+        precompiled_headers_override: list[str]=None,
+        components_enabled: bool=False,
+        components_shared_in_debug: bool=False,
+        compiler_cache_program: str=None,
+        compiler_cache_dir_name: str=None,
+        compiler_cache_max_size: str=None,
+        ipo_build_types: list[BuildType]=None,
+        ipo_thin_lto: bool=False,
+        ipo_jobs: int=0,
+        pgo_enabled: bool=False,
+        linker_selection_enabled: bool=False,
+        linker_requested: LinkerType=None,
+        compiler_path: str=None,
+        fast_debug_link: bool=False,
+        job_pools_enabled: bool=False,
+        force_rescan: bool=False
 ) -> None:
         """
-        Generate the CMakelists.txt file
+        Generate the CMakelists.txt file (and the included fragments, like the sources list)
+
+        Use `force_rescan` to rebuild the source index from scratch.
+        With `linker_selection_enabled`, the fast linkers working with `compiler_path` (the manifest compiler,
+        empty to use the one cmake finds) are probed once and tried at configuration, `linker_requested` first.
         """
 
         cmakelists_path = devfiles.get_cmakelists_file_path(project_root_path)
-        project_source_files = devfiles.get_project_source_files(project_root_path, project_source_ignored_dir_names)
+        project_source_files = _get_project_source_files(project_root_path,
+                                                         project_source_ignore_patterns,
+                                                         project_use_gitignore,
+                                                         project_use_git_index,
+                                                         project_git_include_untracked,
+                                                         force_rescan
+                                                         )
 
         builder = GeneratorBuilder()
 
-        # Header is the same for all cases
+        # Header is the same for all cases (paths in the launcher environment are relative to the project)
         builder.add_header(project_name,
                            project_version,
                            project_language,
                            language_standard,
                            language_standard_required,
-                           compiler_extensions_required
+                           compiler_extensions_required,
+                           compiler_cache_program,
+                           _get_compiler_cache_env("${CMAKE_SOURCE_DIR}", compiler_cache_program, compiler_cache_dir_name, compiler_cache_max_size) if compiler_cache_program else None
                            )
 
-        # declare target and import libs
-        cmake_target_var_name: str = ""
+        # fast linker for every target (set before the targets are created)
+        if linker_selection_enabled:
+            builder.add_linker_selection(project_language,
+                                         [linker_type.value for linker_type in _get_linker_candidates(project_root_path, project_language, compiler_path, linker_requested)]
+                                         )
+
+        # separate compile and link pools for every target (sized at configuration)
+        if job_pools_enabled:
+            builder.add_job_pools()
+
+        # declare targets and import libs
+        cmake_product_var_names: list[str] = []
         cmake_import_lib_names: list[str] = []
 
-        # create target based on product type
-        match project_product_type:
-            case ProductType.EXE:
-                cmake_target_var_name = builder.add_executable(project_name)
+        # create one target per product type
+        for product_type in project_product_types:
+            cmake_product_var_names.append(_add_product_target(builder,
+                                                               _get_product_target_name(project_name, product_type, len(project_product_types)),
+                                                               product_type
+                                                               ))
 
-            case ProductType.LIB:
-                cmake_target_var_name = builder.add_library(project_name, CMakeLibraryType.STATIC)
+        # top level directories become component libraries, the remaining sources stay on the target
+        target_source_files = project_source_files
+        sources_by_component: dict[str, list[str]] = {}
 
-            case ProductType.DLL:
-                cmake_target_var_name = builder.add_library(project_name, CMakeLibraryType.SHARED)
+        if components_enabled:
+            target_source_files, sources_by_component = _split_source_files_by_component(project_source_files)
 
-            case _:
-                raise RuntimeError(f"Project product type not implemented: {project_product_type}")
+        # several products: compile the remaining sources once in an OBJECT library linked in each of them
+        # (none left when every source is in a component: the products link the components directly,
+        # position independent only if a shared library uses the objects)
+        position_independent_code = ProductType.DLL in project_product_types
+        cmake_target_var_name = cmake_product_var_names[0]
 
-        # add include, source and compile definitions to target
+        if len(project_product_types) > 1 and target_source_files:
+            cmake_target_var_name = builder.add_library(f"{project_name}_objects", CMakeLibraryType.OBJECT)
+            if position_independent_code:
+                builder.add_target_properties(cmake_target_var_name, [("POSITION_INDEPENDENT_CODE", "ON")])
+
+        cmake_component_lib_names: list[str] = []
+
+        if components_enabled:
+            cmake_component_lib_names = builder.add_component_libraries(project_name,
+                                                                        sources_by_component,
+                                                                        [BuildType.DEBUGG.value] if components_shared_in_debug and ProductType.LIB not in project_product_types else [],
+                                                                        position_independent_code,
+                                                                        devfiles.get_components_fragment_file_name()
+                                                                        )
+
+        # add include, source and compile definitions to target (and components)
         builder.add_target_include_directories(cmake_target_var_name, CMakeTargetVisibility.PUBLIC, project_include_dir_names)
-        builder.add_target_sources(cmake_target_var_name, CMakeTargetVisibility.PRIVATE, project_source_files)
+        builder.add_target_sources(cmake_target_var_name, CMakeTargetVisibility.PRIVATE, target_source_files, devfiles.get_sources_fragment_file_name())
         builder.add_target_compile_definitions(cmake_target_var_name, CMakeTargetVisibility.PRIVATE, cmake_compile_definitions)
 
+        for cmake_component_lib_name in cmake_component_lib_names:
+            builder.add_target_include_directories(cmake_component_lib_name, CMakeTargetVisibility.PUBLIC, project_include_dir_names)
+            builder.add_target_compile_definitions(cmake_component_lib_name, CMakeTargetVisibility.PRIVATE, cmake_compile_definitions)
+
+        # the other products only link the objects, they keep the include directories for their users
+        for cmake_product_var_name in cmake_product_var_names:
+            if cmake_product_var_name != cmake_target_var_name:
+                builder.add_target_include_directories(cmake_product_var_name, CMakeTargetVisibility.PUBLIC, project_include_dir_names)
+
+        # merge sources in unity batches (by directory, sibling directories and size)
+        if unity_build_enabled:
+            builder.add_target_unity_build([cmake_target_var_name] + cmake_component_lib_names,
+                                           devfiles.get_file_sizes(project_root_path, project_source_files),
+                                           unity_build_batch_size_kb * 1024,
+                                           unity_build_excluded_files or [],
+                                           devfiles.get_unity_fragment_file_name()
+                                           )
+
+        # precompile the most included stable headers
+        if precompiled_headers_enabled:
+            precompiled_headers = _get_precompiled_headers(project_root_path,
+                                                           project_source_files,
+                                                           project_include_dir_names,
+                                                           project_imported_static_libs,
+                                                           project_imported_shared_libs,
+                                                           precompiled_headers_max_count,
+                                                           precompiled_headers_size_budget_kb * 1024,
+                                                           precompiled_headers_pinned or [],
+                                                           precompiled_headers_excluded or [],
+                                                           precompiled_headers_override or []
+                                                           )
+            for temp_cmake_target_name in [cmake_target_var_name] + cmake_component_lib_names:
+                builder.add_target_precompiled_headers(temp_cmake_target_name, CMakeTargetVisibility.PRIVATE, precompiled_headers)
+
+        # link time and profile guided optimization of everything compiled here (imported libraries are already built)
+        cmake_compiled_target_names = list(dict.fromkeys([cmake_target_var_name] + cmake_product_var_names + cmake_component_lib_names))
+
+        if ipo_build_types:
+            builder.add_targets_interprocedural_optimization(cmake_compiled_target_names,
+                                                             project_language,
+                                                             [build_type.value for build_type in ipo_build_types],
+                                                             ipo_thin_lto,
+                                                             ipo_jobs
+                                                             )
+
+        if pgo_enabled:
+            builder.add_targets_profile_guided_optimization(cmake_compiled_target_names, project_language)
+
+        # split and compressed debug info with a gdb index for the build types with debug info
+        if fast_debug_link:
+            builder.add_targets_fast_debug_link(cmake_compiled_target_names,
+                                                project_language,
+                                                [build_type.value for build_type in _DEBUG_INFO_BUILD_TYPES]
+                                                )
+
         # create static imported libraries
-        for imported_location, imported_include_dir in project_imported_static_libs:
-            temp_cmake_target_lib_name = builder.add_imported_library(_get_next_library_name(), CMakeLibraryType.STATIC, imported_location, imported_location, imported_include_dir)
+        for index, (imported_location, imported_include_dir) in enumerate(project_imported_static_libs, start=1):
+            temp_cmake_target_lib_name = builder.add_imported_library(_get_library_name(index), CMakeLibraryType.STATIC, imported_location, imported_location, imported_include_dir)
             cmake_import_lib_names.append(temp_cmake_target_lib_name)
 
         # create shared imported libraries
-        for imported_location, imported_impl_location, imported_include_dir in project_imported_shared_libs:
-            temp_cmake_target_lib_name = builder.add_imported_library(_get_next_library_name(), CMakeLibraryType.SHARED, imported_location, imported_impl_location, imported_include_dir)
+        for index, (imported_location, imported_impl_location, imported_include_dir) in enumerate(project_imported_shared_libs, start=len(project_imported_static_libs) + 1):
+            temp_cmake_target_lib_name = builder.add_imported_library(_get_library_name(index), CMakeLibraryType.SHARED, imported_location, imported_impl_location, imported_include_dir)
             cmake_import_lib_names.append(temp_cmake_target_lib_name)
 
-        # link imported libraries
-        builder.add_target_linker(cmake_target_var_name, CMakeTargetVisibility.PRIVATE, *cmake_import_lib_names)
+        # link imported libraries (and components, objects)
+        for cmake_component_lib_name in cmake_component_lib_names:
+            builder.add_target_linker(cmake_component_lib_name, CMakeTargetVisibility.PRIVATE, *cmake_import_lib_names)
+
+        if cmake_target_var_name in cmake_product_var_names:
+            for cmake_product_var_name in cmake_product_var_names:
+                builder.add_target_linker(cmake_product_var_name, CMakeTargetVisibility.PRIVATE, *cmake_import_lib_names, *cmake_component_lib_names)
+        else:
+            builder.add_target_linker(cmake_target_var_name, CMakeTargetVisibility.PRIVATE, *cmake_import_lib_names)
+            for cmake_product_var_name in cmake_product_var_names:
+                builder.add_target_linker(cmake_product_var_name, CMakeTargetVisibility.PRIVATE, *cmake_import_lib_names, cmake_target_var_name, *cmake_component_lib_names)
 
-        # write ALL info in CMakelists.txt
-        with open(cmakelists_path, "w") as cmakelists_root_open_file:
-            builder.generator_product.run(cmakelists_root_open_file)
+        # render ALL info in memory, then only replace the files whose content changed
+        # (a rewrite bumps the mtime and forces cmake to run its whole configure step again)
+        cmakelists_content = io.StringIO()
+        builder.generator_product.run(cmakelists_content)
+        devfiles.write_file_if_changed(cmakelists_path, cmakelists_content.getvalue())
+
+        for fragment_file_name, fragment_content in builder.generator_product.get_fragments().items():
+            devfiles.write_file_if_changed(os.path.join(project_root_path, fragment_file_name), fragment_content)
 
 
 def configure(project_root_path: str,
@@ -111,38 +606,571 @@ def configure(project_root_path: str,
               c_compiler_path: str,
               cpp_compiler_path: str,
               cmake_bin_path: str,
-              ninja_bin_path: str
-) -> None:
+              ninja_bin_path: str,
+              pgo_enabled: bool=False,
+              pgo_profile: pgo.PgoProfile=None,
+              job_pools_enabled: bool=False,
+              job_pool_compile_jobs: int=0,
+              job_pool_link_jobs: int=0,
+              clean: bool=False
+) -> str | None:
     """
-    Run commands in console for cmake configuration process
+    Run commands in console for cmake configuration process (in the build directory of the build type).
+    The build directory (cmake cache, compiler checks, objects) is kept unless the settings it was configured with changed.
+
+    :param pgo_enabled: `True` if the generated CMakeLists.txt has the Profile Guided Optimization part
+    :param pgo_profile: profile optimizing the build (returned by `train_pgo_profile`, `find_pgo_profile`), `None` to build without
+    :param job_pools_enabled: `True` if the generated CMakeLists.txt has the Job Pools part
+    (sized from the available memory and the peak memory of the last builds of the build type)
+    :param job_pool_compile_jobs: compile pool size (`0` for automatic)
+    :param job_pool_link_jobs: link pool size (`0` for automatic)
+    :param clean: `True` to wipe the build directory anyway
+    :returns str | None: why the build directory was wiped, `None` if it was configured in place (or created)
     """
 
-    build_dir_path = devfiles.get_build_dir_path(project_root_path)
+    build_dir_path = devfiles.get_build_dir_path(project_root_path, project_build_type.value)
+    configure_settings = _get_configure_settings(project_root_path, c_compiler_path, cpp_compiler_path, cmake_bin_path)
+
+    wipe_reason = _get_build_dir_wipe_reason(project_root_path, build_dir_path, configure_settings)
+    if clean and os.path.isdir(build_dir_path):
+        wipe_reason = "clean reconfigure"
+
+    cache_variables = []
+    if pgo_enabled:
+        cache_variables = _get_pgo_cache_variables(pgo_profile)
+
+    if job_pools_enabled:
+        job_memory_history = jobpool.JobMemoryHistory(devfiles.get_job_memory_file_path(project_root_path))
+        compile_pool_size, link_pool_size = jobpool.compute_job_pool_sizes(jobpool.get_available_memory_bytes(),
+                                                                           job_memory_history.get(project_build_type.value),
+                                                                           os.cpu_count() or 1,
+                                                                           job_pool_compile_jobs,
+                                                                           job_pool_link_jobs
+                                                                           )
+        cache_variables += _get_job_pool_cache_variables(compile_pool_size, link_pool_size)
+
+    # the old build directory is renamed and deleted in the background: the configuration starts immediately
+    if wipe_reason:
+        trash.move_to_trash(build_dir_path)
 
     builder = CMDBuilder(cmake_bin_path, ninja_bin_path)
 
-    builder.add_remove_directory_part(build_dir_path)
     builder.add_cmake_generate_part(project_root_path,
                                     project_build_type,
                                     build_dir_path,
                                     c_compiler_path,
-                                    cpp_compiler_path
+                                    cpp_compiler_path,
+                                    cache_variables
                                     )
     builder.cmd_product.run()
 
+    # written after a successful configuration only
+    with open(devfiles.get_configure_settings_file_path(build_dir_path), "w") as settings_file:
+        json.dump(configure_settings, settings_file, indent=1)
+
+    return wipe_reason
+
 
 def build(
         project_root_path: str,
+        project_build_type: BuildType,
         cmake_bin_path: str,
         ninja_bin_path: str,
-) -> None:
+        compiler_cache_program: str=None,
+        compiler_cache_dir_name: str=None,
+        compiler_cache_max_size: str=None,
+        fast_debug_link: bool=False,
+        max_jobs: int=0,
+        max_load: float=0
+) -> BuildSummary:
     """
     Run commands in console for cmake build
+
+    :param project_build_type: build type to build (its build directory must be configured)
+    :param fast_debug_link: `True` if the generated CMakeLists.txt has the Fast Debug Link part
+    :param max_jobs: maximum parallel build steps (`0` for the build tool default)
+    :param max_load: no new build step is started above this load average (`0` for no limit)
+    :returns BuildSummary: duration and peak memory of the build, hits/misses of the compiler cache during this build (if a cache is used and found)
+    and time spent linking (if anything was linked), compared with the other debug link mode
+    """
+
+    build_dir_path = devfiles.get_build_dir_path(project_root_path, project_build_type.value)
+    compiler_cache_path = compcache.find_compiler_cache(compiler_cache_program) if compiler_cache_program else None
+
+    if compiler_cache_path:
+        compiler_cache_env = _get_compiler_cache_env(project_root_path, compiler_cache_program, compiler_cache_dir_name, compiler_cache_max_size)
+        compcache.zero_compiler_cache_stats(compiler_cache_path, compiler_cache_env)
+
+    ninja_log_offset = buildlog.get_ninja_log_size(build_dir_path)
+
+    builder = CMDBuilder(cmake_bin_path, ninja_bin_path)
+
+    build_step = builder.add_cmake_build_part(build_dir_path, max_jobs, max_load)
+    step_results = builder.cmd_product.run()
+
+    # sizes the job pools of the next configurations
+    if step_results[build_step].peak_rss_bytes:
+        job_memory_history = jobpool.JobMemoryHistory(devfiles.get_job_memory_file_path(project_root_path))
+        job_memory_history.add(project_build_type.value, step_results[build_step].peak_rss_bytes)
+
+    summary = BuildSummary(build_seconds=step_results[build_step].wall_seconds,
+                           build_peak_rss_bytes=step_results[build_step].peak_rss_bytes
+                           )
+
+    if compiler_cache_path:
+        summary.compiler_cache_stats = compcache.read_compiler_cache_stats(compiler_cache_path,
+                                                                           compcache.get_compiler_cache_type(compiler_cache_program),
+                                                                           compiler_cache_env
+                                                                           )
+
+    ninja_log_entries = buildlog.read_ninja_log(build_dir_path, ninja_log_offset)
+    summary.link_seconds = buildlog.get_link_seconds(ninja_log_entries, devfiles.get_build_output_dir_names())
+
+    if ninja_log_entries:
+        summary.build_report = _create_build_report(project_root_path, project_build_type, ninja_bin_path, ninja_log_entries)
+        summary.build_report_file_path = devfiles.get_build_report_file_path(project_root_path, project_build_type.value)
+        os.makedirs(os.path.dirname(summary.build_report_file_path), exist_ok=True)
+        with open(summary.build_report_file_path, "w") as report_file:
+            json.dump(summary.build_report.to_json(), report_file, indent=1)
+
+    # remember the link time of each debug link mode to show the gain of the other one
+    if summary.link_seconds is not None and project_build_type in _DEBUG_INFO_BUILD_TYPES:
+        link_modes = [f"{project_build_type.value} {_DEFAULT_DEBUG_LINK_LABEL}", f"{project_build_type.value} {_FAST_DEBUG_LINK_LABEL}"]
+        link_mode, compared_link_mode = link_modes[::-1] if fast_debug_link else link_modes
+
+        history = buildlog.LinkTimeHistory(devfiles.get_link_times_file_path(project_root_path))
+        history.set(link_mode, summary.link_seconds)
+
+        summary.link_mode_label = _FAST_DEBUG_LINK_LABEL if fast_debug_link else _DEFAULT_DEBUG_LINK_LABEL
+        summary.compared_link_seconds = history.get(compared_link_mode)
+        summary.compared_link_mode_label = _DEFAULT_DEBUG_LINK_LABEL if fast_debug_link else _FAST_DEBUG_LINK_LABEL
+
+    return summary
+
+
+def build_matrix(project_root_path: str,
+                 matrix_cells: list[MatrixCell],
+                 cmake_bin_path: str,
+                 ninja_bin_path: str,
+                 pgo_enabled: bool=False,
+                 job_pools_enabled: bool=False,
+                 job_pool_compile_jobs: int=0,
+                 job_pool_link_jobs: int=0,
+                 max_load: float=0,
+                 max_parallel_cells: int=0
+) -> MatrixSummary:
+    """
+    Configure and build the cells of the build matrix concurrently, each in its own build directory (kept, configured in place when possible).
+    The cells running at the same time share the machine: each one gets its part of the CPUs and of the available memory
+    (sized from the peak memory of the last builds of the cell). The first failing cell stops the others.
+
+    :param matrix_cells: returned by `create_matrix_cells`
+    :param pgo_enabled: `True` if the generated CMakeLists.txt has the Profile Guided Optimization part (the cells are built without profile)
+    :param job_pools_enabled: `True` if the generated CMakeLists.txt has the Job Pools part
+    :param job_pool_compile_jobs: compile pool size of each cell (`0` for automatic)
+    :param job_pool_link_jobs: link pool size of each cell (`0` for automatic)
+    :param max_load: no new build step is started above this load average (`0` for no limit), shared by all the cells
+    :param max_parallel_cells: maximum cells running at the same time (`0` for all of them)
+    :returns MatrixSummary: status, configuration and build time of each cell (the cells after a failure are cancelled or skipped)
     """
 
-    build_dir_path = devfiles.get_build_dir_path(project_root_path)
+    parallel_cell_count = max(1, min(len(matrix_cells), max_parallel_cells) if max_parallel_cells > 0 else len(matrix_cells))
+    cell_cpu_count = max(1, (os.cpu_count() or 1) // parallel_cell_count)
+    available_memory_bytes = jobpool.get_available_memory_bytes()
+    cell_memory_bytes = available_memory_bytes // parallel_cell_count if available_memory_bytes else None
+    job_memory_history = jobpool.JobMemoryHistory(devfiles.get_job_memory_file_path(project_root_path))
 
     builder = CMDBuilder(cmake_bin_path, ninja_bin_path)
+    cell_names_by_step: list[str] = []
+    cell_steps: list[tuple[int, int, dict[str, str]]] = []
+    cell_max_jobs = 0
+
+    for cell in matrix_cells:
+        build_dir_path = devfiles.get_matrix_build_dir_path(project_root_path, cell.name)
+        configure_settings = _get_configure_settings(project_root_path, cell.compiler_path, cell.compiler_path, cmake_bin_path)
+
+        if _get_build_dir_wipe_reason(project_root_path, build_dir_path, configure_settings):
+            trash.move_to_trash(build_dir_path)
+
+        measured_job_bytes = job_memory_history.get(cell.name) or job_memory_history.get(cell.build_type.value)
+        compile_pool_size, link_pool_size = jobpool.compute_job_pool_sizes(cell_memory_bytes,
+                                                                           measured_job_bytes,
+                                                                           cell_cpu_count,
+                                                                           job_pool_compile_jobs,
+                                                                           job_pool_link_jobs
+                                                                           )
+        cell_max_jobs = max(cell_max_jobs, compile_pool_size)
+
+        cache_variables = []
+        if pgo_enabled:
+            cache_variables = _get_pgo_cache_variables(None)
+        if job_pools_enabled:
+            cache_variables += _get_job_pool_cache_variables(compile_pool_size, link_pool_size)
+
+        configure_step = builder.add_cmake_generate_part(project_root_path,
+                                                         cell.build_type,
+                                                         build_dir_path,
+                                                         cell.compiler_path,
+                                                         cell.compiler_path,
+                                                         cache_variables,
+                                                         depends_on=[]
+                                                         )
+        # the compile pool size also bounds the parallel steps without job pools (memory share of the cell)
+        build_step = builder.add_cmake_build_part(build_dir_path, compile_pool_size, max_load, depends_on=[configure_step])
+
+        cell_names_by_step += [cell.name, cell.name]
+        cell_steps.append((configure_step, build_step, configure_settings))
+
+    start_time = time.perf_counter()
+    step_results = builder.cmd_product.run(MatrixOutputSink(cell_names_by_step), parallel_cell_count, check=False)
+    wall_seconds = time.perf_counter() - start_time
+
+    cell_results: list[MatrixCellResult] = []
+    for cell, (configure_step, build_step, configure_settings) in zip(matrix_cells, cell_steps):
+        configure_result, build_result = step_results[configure_step], step_results[build_step]
+
+        # written after a successful configuration only
+        if configure_result is not None and configure_result.exit_code == 0:
+            build_dir_path = devfiles.get_matrix_build_dir_path(project_root_path, cell.name)
+            with open(devfiles.get_configure_settings_file_path(build_dir_path), "w") as settings_file:
+                json.dump(configure_settings, settings_file, indent=1)
+
+        if build_result is not None and build_result.exit_code == 0 and build_result.peak_rss_bytes:
+            job_memory_history.add(cell.name, build_result.peak_rss_bytes)
+
+        cell_results.append(MatrixCellResult(cell, configure_result, build_result))
+
+    return MatrixSummary(cell_results, wall_seconds, parallel_cell_count, cell_max_jobs, cell_memory_bytes)
+
+
+def is_configured(project_root_path: str, project_build_type: BuildType) -> bool:
+    """
+    :param project_root_path: full path to the project
+    :param project_build_type: build type to check
+    :returns bool: `True` if the build directory of the build type exists (cmake configuration was run)
+    """
+
+    return os.path.isdir(devfiles.get_build_dir_path(project_root_path, project_build_type.value))
+
+
+def remove_leftover_build_dirs(project_root_path: str) -> int:
+    """
+    Delete in the background the wiped build directories (of the build types and of the matrix cells) an interrupted run did not finish deleting
+
+    :param project_root_path: full path to the project
+    :returns int: number of leftover build directories found
+    """
+
+    return (trash.remove_leftover_trash(devfiles.get_build_root_dir_path(project_root_path))
+            + trash.remove_leftover_trash(devfiles.get_matrix_build_root_dir_path(project_root_path)))
+
+
+def watch(project_root_path: str,
+          project_source_ignore_patterns: list[str],
+          project_use_gitignore: bool,
+          on_sources_changed: Callable[[], None],
+          on_sources_modified: Callable[[], None],
+          debounce_seconds: float=0.5,
+          use_polling: bool=False
+) -> None:
+    """
+    Watch the project tree until interrupted (Ctrl+C).
+    Bursts of events are coalesced: a `git checkout` touching thousands of files results in a single call.
+
+    :param project_root_path: full path to the project
+    :param project_source_ignore_patterns: gitignore-style patterns of the directories and files to ignore
+    :param project_use_gitignore: `True` to also apply the root `.gitignore` file
+    :param on_sources_changed: called when source files are added or removed (generate step)
+    :param on_sources_modified: called when existing sources or headers are edited (incremental build)
+    :param debounce_seconds: quiet period that ends a burst of events
+    :param use_polling: `True` to use the polling fallback instead of inotify
+    """
+
+    def _on_change(batch: fswatch.ChangeBatch) -> None:
+        if batch.structure_changed:
+            on_sources_changed()
+        if batch.content_changed:
+            on_sources_modified()
+
+    ignore_matcher = devfiles.create_project_ignore_matcher(project_root_path, project_source_ignore_patterns, project_use_gitignore)
+
+    fswatch.watch_tree(project_root_path,
+                       ignore_matcher.is_ignored,
+                       devfiles.get_source_file_extensions(),
+                       devfiles.get_header_file_extensions(),
+                       _on_change,
+                       debounce_seconds,
+                       use_polling=use_polling
+                       )
+
+
+def analyze_includes(project_root_path: str,
+                     project_include_dir_names: list[str],
+                     project_source_ignore_patterns: list[str],
+                     project_use_gitignore: bool,
+                     project_use_git_index: bool,
+                     project_git_include_untracked: bool,
+                     project_imported_static_libs: list[tuple[str, str]],
+                     project_imported_shared_libs: list[tuple[str, str, str]]
+) -> includes.IncludeReport:
+    """
+    Scan the include graph of the project (persisted in the PyForge state directory)
+    and rank headers by fan-in and translation units by transitive include cost
+    """
+
+    project_source_files = _get_project_source_files(project_root_path,
+                                                     project_source_ignore_patterns,
+                                                     project_use_gitignore,
+                                                     project_use_git_index,
+                                                     project_git_include_untracked,
+                                                     False
+                                                     )
+
+    graph = includes.scan_include_graph(project_root_path,
+                                        project_source_files,
+                                        project_include_dir_names,
+                                        _get_imported_include_dir_names(project_imported_static_libs, project_imported_shared_libs),
+                                        devfiles.get_include_graph_file_path(project_root_path)
+                                        )
+    return includes.IncludeReport(graph)
+
+
+def measure_source_discovery(project_root_path: str, project_source_ignore_patterns: list[str]) -> dict[str, float]:
+    """
+    Compare the sequential `os.walk` walker with the parallel source scanner on the project tree
+
+    :returns dict[str, float]: files/sec for each walker (keys: `walk`, `scandir`) and the number of source files found (`files`)
+    """
+
+    return devfiles.measure_project_source_discovery(project_root_path, devfiles.get_project_ignore_patterns(project_source_ignore_patterns))
+
+
+def has_split_debug_info(project_build_type: BuildType, fast_debug_link: bool) -> bool:
+    """
+    :returns bool: `True` if the outputs of the build type read their debug info from the `.dwo` files of the objects
+    (fast debug link): restoring the outputs alone would point them to the debug info of another build
+    """
 
-    builder.add_cmake_build_part(build_dir_path)
+    return fast_debug_link and project_build_type in _DEBUG_INFO_BUILD_TYPES
+
+
+def compute_build_fingerprint(project_root_path: str,
+                              project_build_type: BuildType,
+                              project_source_ignore_patterns: list[str],
+                              project_use_gitignore: bool,
+                              project_imported_static_libs: list[tuple[str, str]],
+                              project_imported_shared_libs: list[tuple[str, str, str]],
+                              build_settings: dict,
+                              compiler_path: str,
+                              cmake_bin_path: str
+) -> str:
+    """
+    Fingerprint of the manifest settings, the toolchain and the content of every build input
+    (unchanged files are not hashed again)
+
+    :param project_build_type: build type to build
+    :param build_settings: json-serializable manifest settings that change the build output (except the build type)
+    :param compiler_path: full path to the compiler set in the manifest (empty to use the one found by cmake)
+    :returns str: hex sha256 fingerprint
+    """
+
+    imported_include_dir_names = _get_imported_include_dir_names(project_imported_static_libs, project_imported_shared_libs)
+
+    input_files = devfiles.get_project_input_files(project_root_path, project_source_ignore_patterns, project_use_gitignore, imported_include_dir_names)
+    input_files += [imported_location for imported_location, _ in project_imported_static_libs]
+    input_files += [path for imported_location, imported_impl_location, _ in project_imported_shared_libs
+                    for path in (imported_location, imported_impl_location) if path]
+
+    build_dir_path = devfiles.get_build_dir_path(project_root_path, project_build_type.value)
+    compiler_paths = [compiler_path] if compiler_path else _get_configured_compiler_paths(build_dir_path)
+    cmake_path = shutil.which("cmake", path=os.pathsep.join((cmake_bin_path, os.environ.get("PATH", ""))))
+
+    # the PGO profile version is part of its path
+    pgo_settings = _read_cmake_cache_values(build_dir_path, (_PGO_MODE_CACHE_VARIABLE, _PGO_PROFILE_PATH_CACHE_VARIABLE))
+
+    return artifacts.compute_fingerprint(project_root_path,
+                                         sorted(set(input_files)),
+                                         {"build_type": project_build_type.value, "manifest": build_settings},
+                                         artifacts.get_toolchain_identity(compiler_paths + ([cmake_path] if cmake_path else [])) + pgo_settings,
+                                         devfiles.get_file_hashes_file_path(project_root_path)
+                                         )
+
+
+def restore_build_outputs(project_root_path: str,
+                          project_build_type: BuildType,
+                          fingerprint: str,
+                          artifact_cache_dir_name: str=None,
+                          artifact_cache_url: str=None
+) -> int | None:
+    """
+    Replace the executables and libraries of the build directory of the build type with the ones stored for the fingerprint
+
+    :returns int | None: number of restored files, `None` if the fingerprint is not in the cache
+    """
+
+    storage = _create_artifact_storage(project_root_path, artifact_cache_dir_name, artifact_cache_url)
+    return artifacts.restore_artifacts(storage,
+                                       fingerprint,
+                                       devfiles.get_build_dir_path(project_root_path, project_build_type.value),
+                                       devfiles.get_build_output_dir_names()
+                                       )
+
+
+def store_build_outputs(project_root_path: str,
+                        project_build_type: BuildType,
+                        fingerprint: str,
+                        ninja_bin_path: str,
+                        artifact_cache_dir_name: str=None,
+                        artifact_cache_url: str=None
+) -> int:
+    """
+    Store the executables and libraries of the build directory of the build type for the fingerprint.
+    Only the outputs of the current targets are stored (the ninja manifest lists them), not the files left by other configurations.
+
+    :returns int: number of stored files
+    :raises OSError: if the outputs can't be listed or stored
+    """
+
+    build_dir_path = devfiles.get_build_dir_path(project_root_path, project_build_type.value)
+    ninja_path = shutil.which("ninja", path=os.pathsep.join((ninja_bin_path, os.environ.get("PATH", ""))))
+    build_outputs = buildlog.read_ninja_outputs(ninja_path, build_dir_path) if ninja_path else None
+    if build_outputs is None:
+        raise OSError(f"Can't list the build outputs of {build_dir_path} with ninja")
+
+    output_prefixes = tuple(f"{output_dir_name}/" for output_dir_name in devfiles.get_build_output_dir_names())
+    storage = _create_artifact_storage(project_root_path, artifact_cache_dir_name, artifact_cache_url)
+    return artifacts.store_artifacts(storage,
+                                     fingerprint,
+                                     build_dir_path,
+                                     [output for output in build_outputs if output.replace("\\", "/").startswith(output_prefixes)]
+                                     )
+
+
+def profile_compile_times(project_root_path: str,
+                          project_build_type: BuildType,
+                          project_language: Language,
+                          c_compiler_path: str,
+                          cpp_compiler_path: str,
+                          cmake_bin_path: str,
+                          ninja_bin_path: str
+) -> timetrace.CompileTimeReport:
+    """
+    Compile every translation unit again with the compile time traces in their own build directory (kept, the configuration is reused),
+    then aggregate the traces across a process pool. The report is also saved as json.
+    The trace options come from a cmake file of the PyForge state directory included by this build directory only: CMakeLists.txt doesn't change.
+
+    :returns CompileTimeReport: headers ranked by parse time, templates by instantiation time, translation units by frontend and backend time
+    """
+
+    time_trace_build_dir_path = devfiles.get_time_trace_build_dir_path(project_root_path, project_build_type.value)
+    time_trace_include_file_path = devfiles.get_time_trace_include_file_path(project_root_path)
+
+    generator_builder = GeneratorBuilder()
+    generator_builder.add_compile_time_trace(project_language)
+    time_trace_include_content = io.StringIO()
+    generator_builder.generator_product.run(time_trace_include_content)
+    os.makedirs(os.path.dirname(time_trace_include_file_path), exist_ok=True)
+    devfiles.write_file_if_changed(time_trace_include_file_path, time_trace_include_content.getvalue())
+
+    builder = CMDBuilder(cmake_bin_path, ninja_bin_path)
+
+    builder.add_cmake_generate_part(project_root_path,
+                                    project_build_type,
+                                    time_trace_build_dir_path,
+                                    c_compiler_path,
+                                    cpp_compiler_path,
+                                    [(_PROJECT_INCLUDE_CACHE_VARIABLE, time_trace_include_file_path)]
+                                    )
+    builder.add_cmake_build_part(time_trace_build_dir_path, clean_first=True)
+
+    build_start_time = time.time()
     builder.cmd_product.run()
+
+    report = timetrace.aggregate_compile_times(timetrace.find_time_traces(time_trace_build_dir_path, build_start_time),
+                                               time_trace_build_dir_path,
+                                               project_root_path
+                                               )
+
+    report_file_path = devfiles.get_compile_time_report_file_path(project_root_path, project_build_type.value)
+    os.makedirs(os.path.dirname(report_file_path), exist_ok=True)
+    with open(report_file_path, "w") as report_file:
+        json.dump(report.to_json(), report_file, indent=1)
+
+    return report
+
+
+def train_pgo_profile(project_root_path: str,
+                      project_build_type: BuildType,
+                      project_source_ignore_patterns: list[str],
+                      project_use_gitignore: bool,
+                      c_compiler_path: str,
+                      cpp_compiler_path: str,
+                      cmake_bin_path: str,
+                      ninja_bin_path: str,
+                      pgo_training_command: str | list[str],
+                      pgo_max_versions: int=3
+) -> pgo.PgoProfile:
+    """
+    Build the instrumented binaries in their own build directory (kept for incremental rebuilds),
+    run the training command and store the merged profiles as a new version.
+    The CMakelists.txt file must be generated with `pgo_enabled`.
+
+    :param pgo_training_command: command run from the project root (`{bin_dir}` and `{lib_dir}` are replaced by the instrumented outputs directories)
+    :param pgo_max_versions: number of profile versions kept
+    :returns PgoProfile: the new profile version
+    """
+
+    instrumented_build_dir_path = devfiles.get_pgo_build_dir_path(project_root_path, project_build_type.value)
+    raw_profile_dir_path = devfiles.get_pgo_raw_profile_dir_path(project_root_path)
+
+    # digests of the files the instrumented binaries are built from
+    file_digests = _get_pgo_file_digests(project_root_path, project_source_ignore_patterns, project_use_gitignore)
+
+    shutil.rmtree(raw_profile_dir_path, ignore_errors=True)
+    os.makedirs(raw_profile_dir_path)
+
+    builder = CMDBuilder(cmake_bin_path, ninja_bin_path)
+
+    builder.add_cmake_generate_part(project_root_path,
+                                    project_build_type,
+                                    instrumented_build_dir_path,
+                                    c_compiler_path,
+                                    cpp_compiler_path,
+                                    [(_PGO_MODE_CACHE_VARIABLE, "GENERATE"), (_PGO_PROFILE_PATH_CACHE_VARIABLE, raw_profile_dir_path)]
+                                    )
+    builder.add_cmake_build_part(instrumented_build_dir_path)
+    builder.cmd_product.run()
+
+    output_dir_names = devfiles.get_build_output_dir_names()
+    pgo.run_training(pgo_training_command,
+                     project_root_path,
+                     {f"{output_dir_name}_dir": f"{instrumented_build_dir_path}/{output_dir_name}" for output_dir_name in output_dir_names}
+                     )
+
+    profile_kind = pgo.detect_profile_kind(raw_profile_dir_path)
+    if profile_kind is None:
+        raise RuntimeError("The training command wrote no profile data (it must run the instrumented binaries of {bin_dir})")
+
+    llvm_profdata_path = None
+    if profile_kind is pgo.ProfileKind.LLVM:
+        llvm_profdata_path = pgo.find_llvm_profdata(_get_configured_compiler_paths(instrumented_build_dir_path))
+        if llvm_profdata_path is None:
+            raise RuntimeError("llvm-profdata not found (next to the compiler or in PATH)")
+
+    store = pgo.PgoProfileStore(devfiles.get_pgo_profiles_dir_path(project_root_path), pgo_max_versions)
+    return store.add(raw_profile_dir_path, profile_kind, project_build_type.value, file_digests, llvm_profdata_path)
+
+
+def find_pgo_profile(project_root_path: str,
+                     project_source_ignore_patterns: list[str],
+                     project_use_gitignore: bool
+) -> tuple[pgo.PgoProfile, float] | None:
+    """
+    :returns tuple | None: (newest profile version, fraction of the project files changed since its training), `None` if nothing was trained
+    """
+
+    profile = pgo.PgoProfileStore(devfiles.get_pgo_profiles_dir_path(project_root_path)).get_latest()
+    if profile is None:
+        return None
+
+    return profile, profile.get_drift(_get_pgo_file_digests(project_root_path, project_source_ignore_patterns, project_use_gitignore))
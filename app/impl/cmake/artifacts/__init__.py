@@ -0,0 +1,3 @@
+from ._impl_artifacts import *
+
+__all__ = (_impl_artifacts.__all__)
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Implemented the content hashing of files with a stat based cache (unchanged files are not read again)
+
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path: str) -> str:
+    """
+    :returns str: hex sha256 digest of the file content
+    """
+
+    with open(file_path, "rb") as hashed_file:
+        # `hashlib.file_digest` is Python 3.11+
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(hashed_file, "sha256").hexdigest()
+
+        digest = hashlib.sha256()
+        while chunk := hashed_file.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+class FileHashCache:
+    """
+    Remembers the digest of each file with its mtime and size, like the git index does.
+    Files modified too close to the save time are not remembered (mtime granularity).
+    """
+
+    _FORMAT_VERSION = 1
+    _RACY_MTIME_WINDOW_NS = 2_000_000_000
+
+    def __init__(self, cache_file_path: str=None):
+        """
+        :param cache_file_path: full path to the persisted cache (`None` to hash everything every time)
+        """
+
+        self._cache_file_path = cache_file_path
+        self._entries: dict[str, list] = self._load() if cache_file_path else {}
+        self._used_paths: set[str] = set()
+
+    def get_digests(self, root_path: str, relative_paths: list[str], max_workers: int=None) -> dict[str, str]:
+        """
+        :param root_path: full path the relative paths start from
+        :param relative_paths: relative paths to the files (missing files get an empty digest)
+        :param max_workers: maximum number of hashing threads (hashlib releases the GIL)
+        :returns dict[str, str]: digest by relative path
+        """
+
+        digests: dict[str, str] = {}
+        to_hash: list[tuple[str, int, int]] = []
+
+        self._used_paths.update(relative_paths)
+
+        for relative_path in relative_paths:
+            try:
+                file_stat = os.stat(os.path.join(root_path, relative_path))
+            except OSError:
+                digests[relative_path] = ""
+                continue
+
+            entry = self._entries.get(relative_path)
+            if entry is not None and entry[0] == file_stat.st_mtime_ns and entry[1] == file_stat.st_size:
+                digests[relative_path] = entry[2]
+            else:
+                to_hash.append((relative_path, file_stat.st_mtime_ns, file_stat.st_size))
+
+        if to_hash:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                hashed = executor.map(hash_file, [os.path.join(root_path, relative_path) for relative_path, _, _ in to_hash])
+                for (relative_path, mtime_ns, size), digest in zip(to_hash, hashed):
+                    digests[relative_path] = digest
+                    self._entries[relative_path] = [mtime_ns, size, digest]
+
+        return digests
+
+    def save(self) -> None:
+        if not self._cache_file_path:
+            return
+
+        racy_limit_ns = time.time_ns() - FileHashCache._RACY_MTIME_WINDOW_NS
+        # files not asked for since loading (deleted, renamed) are dropped
+        cache_data = {"version": FileHashCache._FORMAT_VERSION,
+                      "files": {path: entry for path, entry in self._entries.items()
+                                if path in self._used_paths and entry[0] < racy_limit_ns}
+                      }
+
+        os.makedirs(os.path.dirname(self._cache_file_path), exist_ok=True)
+        temp_file_path = f"{self._cache_file_path}.tmp"
+        with open(temp_file_path, "w") as cache_file:
+            json.dump(cache_data, cache_file, separators=(",", ":"))
+        os.replace(temp_file_path, self._cache_file_path)
+
+    def _load(self) -> dict[str, list]:
+        try:
+            with open(self._cache_file_path, "r") as cache_file:
+                cache_data = json.load(cache_file)
+            if cache_data.get("version") == FileHashCache._FORMAT_VERSION:
+                return cache_data["files"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        return {}
@@ -0,0 +1,153 @@
+import json
+import os
+import shutil
+import urllib.error
+import urllib.request
+from abc import ABC, abstractmethod
+
+
+# Implemented the artifact storage backends (local directory, HTTP cache server)
+
+
+class IArtifactStorage(ABC):
+    """
+    Interface for artifact storage.
+    Blobs are file contents addressed by their sha256 digest, entries map a build fingerprint to the list of output files.
+    """
+
+    @abstractmethod
+    def get_entry(self, fingerprint: str) -> dict | None:
+        """
+        :returns dict | None: the entry stored for `fingerprint`, `None` if missing
+        """
+        pass
+
+    @abstractmethod
+    def put_entry(self, fingerprint: str, entry: dict) -> None:
+        pass
+
+    @abstractmethod
+    def has_blob(self, digest: str) -> bool:
+        pass
+
+    @abstractmethod
+    def get_blob(self, digest: str, file_path: str) -> bool:
+        """
+        :param file_path: full path where the blob content is written
+        :returns bool: `False` if the blob is missing
+        """
+        pass
+
+    @abstractmethod
+    def put_blob(self, digest: str, file_path: str) -> None:
+        """
+        :param file_path: full path to the file whose content has the sha256 `digest`
+        """
+        pass
+
+
+class LocalArtifactStorage(IArtifactStorage):
+    """
+    Storage in a local directory: `ac/<fingerprint>.json` for entries, `cas/<digest>` for blobs (sharded by the 2 first chars)
+    """
+
+    def __init__(self, dir_path: str):
+        """
+        :param dir_path: full path to the storage directory (created on first write)
+        """
+
+        self._dir_path = dir_path
+
+    def get_entry(self, fingerprint: str) -> dict | None:
+        try:
+            with open(self._get_path("ac", fingerprint) + ".json", "r") as entry_file:
+                return json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+
+    def put_entry(self, fingerprint: str, entry: dict) -> None:
+        self._write_atomic(self._get_path("ac", fingerprint) + ".json", json.dumps(entry, separators=(",", ":")).encode("utf-8"))
+
+    def has_blob(self, digest: str) -> bool:
+        return os.path.isfile(self._get_path("cas", digest))
+
+    def get_blob(self, digest: str, file_path: str) -> bool:
+        try:
+            shutil.copyfile(self._get_path("cas", digest), file_path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def put_blob(self, digest: str, file_path: str) -> None:
+        blob_path = self._get_path("cas", digest)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        temp_blob_path = f"{blob_path}.tmp{os.getpid()}"
+        shutil.copyfile(file_path, temp_blob_path)
+        os.replace(temp_blob_path, blob_path)
+
+    def _get_path(self, kind: str, key: str) -> str:
+        return os.path.join(self._dir_path, kind, key[:2], key)
+
+    def _write_atomic(self, file_path: str, content: bytes) -> None:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        temp_file_path = f"{file_path}.tmp{os.getpid()}"
+        with open(temp_file_path, "wb") as temp_file:
+            temp_file.write(content)
+        os.replace(temp_file_path, file_path)
+
+
+class HttpArtifactStorage(IArtifactStorage):
+    """
+    Storage on an HTTP cache server: `GET`/`PUT`/`HEAD` on `<url>/ac/<fingerprint>` and `<url>/cas/<digest>`
+    (the layout used by bazel-remote and similar cache servers)
+    """
+
+    _CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, url: str, timeout: float=30.0):
+        """
+        :param url: base url of the cache server
+        :param timeout: timeout in seconds of each request
+        """
+
+        self._url = url.rstrip("/")
+        self._timeout = timeout
+
+    def get_entry(self, fingerprint: str) -> dict | None:
+        try:
+            with self._open("GET", f"ac/{fingerprint}") as response:
+                return json.loads(response.read())
+        except (urllib.error.URLError, OSError, ValueError):
+            return None
+
+    def put_entry(self, fingerprint: str, entry: dict) -> None:
+        with self._open("PUT", f"ac/{fingerprint}", json.dumps(entry, separators=(",", ":")).encode("utf-8")):
+            pass
+
+    def has_blob(self, digest: str) -> bool:
+        try:
+            with self._open("HEAD", f"cas/{digest}"):
+                return True
+        except (urllib.error.URLError, OSError):
+            return False
+
+    def get_blob(self, digest: str, file_path: str) -> bool:
+        try:
+            with self._open("GET", f"cas/{digest}") as response, open(file_path, "wb") as blob_file:
+                shutil.copyfileobj(response, blob_file, HttpArtifactStorage._CHUNK_SIZE)
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return False
+            raise
+        return True
+
+    def put_blob(self, digest: str, file_path: str) -> None:
+        with open(file_path, "rb") as blob_file:
+            with self._open("PUT", f"cas/{digest}", blob_file, os.fstat(blob_file.fileno()).st_size):
+                pass
+
+    def _open(self, method: str, path: str, data=None, content_length: int=None):
+        request = urllib.request.Request(f"{self._url}/{path}", data=data, method=method)
+        if content_length is not None:
+            request.add_header("Content-Length", str(content_length))
+        return urllib.request.urlopen(request, timeout=self._timeout)
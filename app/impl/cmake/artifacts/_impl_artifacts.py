@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import shutil
+import stat
+import subprocess
+
+from ._artifacts_hash import FileHashCache, hash_file
+from ._artifacts_storage import IArtifactStorage, LocalArtifactStorage, HttpArtifactStorage
+
+
+__all__ = ["IArtifactStorage",
+           "LocalArtifactStorage",
+           "HttpArtifactStorage",
+           "get_toolchain_identity",
+           "get_file_digests",
+           "compute_fingerprint",
+           "restore_artifacts",
+           "store_artifacts"
+           ]
+
+
+_FINGERPRINT_FORMAT_VERSION = 1
+_ENTRY_FORMAT_VERSION = 2   # version 1 entries could hold outputs left over from other configurations
+
+
+def get_toolchain_identity(program_paths: list[str]) -> list[str]:
+    """
+    :param program_paths: full paths to the compilers and build tools
+    :returns list[str]: the `--version` banner of each program (its path if it can't be run)
+    """
+
+    identity = []
+    for program_path in program_paths:
+        try:
+            result = subprocess.run([program_path, "--version"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=30, check=True)
+            identity.append(result.stdout.decode("utf-8", errors="replace").strip())
+        except (OSError, subprocess.SubprocessError):
+            identity.append(program_path)
+    return identity
+
+
+def get_file_digests(project_root_path: str, relative_paths: list[str], hash_cache_file_path: str=None) -> dict[str, str]:
+    """
+    :param project_root_path: full path to the project
+    :param relative_paths: relative paths to the files (missing files get an empty digest)
+    :param hash_cache_file_path: full path to the persisted digests (unchanged files are not read again)
+    :returns dict[str, str]: hex sha256 digest by relative path
+    """
+
+    hash_cache = FileHashCache(hash_cache_file_path)
+    digests = hash_cache.get_digests(project_root_path, relative_paths)
+    hash_cache.save()
+    return digests
+
+
+def compute_fingerprint(project_root_path: str,
+                        input_files: list[str],
+                        settings: dict,
+                        toolchain_identity: list[str],
+                        hash_cache_file_path: str=None
+) -> str:
+    """
+    Fingerprint of everything a build depends on: the build settings, the toolchain and the content of the input files
+
+    :param project_root_path: full path to the project
+    :param input_files: relative paths to the files read by the build (sources, headers, imported libraries, generated cmake files)
+    :param settings: json-serializable build settings
+    :param toolchain_identity: returned by `get_toolchain_identity`
+    :param hash_cache_file_path: full path to the persisted digests (unchanged files are not read again)
+    :returns str: hex sha256 fingerprint
+    """
+
+    digests = get_file_digests(project_root_path, input_files, hash_cache_file_path)
+
+    fingerprint_data = {"version": _FINGERPRINT_FORMAT_VERSION,
+                        "settings": settings,
+                        "toolchain": toolchain_identity,
+                        "files": sorted(digests.items())
+                        }
+    return hashlib.sha256(json.dumps(fingerprint_data, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def restore_artifacts(storage: IArtifactStorage, fingerprint: str, output_dir_path: str, output_dir_names: list[str]) -> int | None:
+    """
+    Replace the content of the output directories with the outputs stored for `fingerprint`
+
+    :param storage: artifact storage
+    :param fingerprint: returned by `compute_fingerprint`
+    :param output_dir_path: full path to the build directory
+    :param output_dir_names: directories of the build directory holding the outputs (`bin`, `lib`), emptied first
+    :returns int | None: number of restored files, `None` if nothing is stored for this fingerprint
+    """
+
+    entry = storage.get_entry(fingerprint)
+    if not entry or entry.get("version") != _ENTRY_FORMAT_VERSION:
+        return None
+
+    # every blob must be there before touching the outputs
+    files = entry["files"]
+    if not all(storage.has_blob(digest) for _, digest, _ in files):
+        return None
+
+    # outputs of another configuration (a removed product) must not stay next to the restored ones
+    for output_dir_name in output_dir_names:
+        shutil.rmtree(os.path.join(output_dir_path, output_dir_name), ignore_errors=True)
+
+    for relative_path, digest, mode in files:
+        file_path = os.path.join(output_dir_path, relative_path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        temp_file_path = f"{file_path}.tmp"
+        if not storage.get_blob(digest, temp_file_path):
+            return None
+        os.chmod(temp_file_path, mode)
+        os.replace(temp_file_path, file_path)
+
+    return len(files)
+
+
+def store_artifacts(storage: IArtifactStorage, fingerprint: str, output_dir_path: str, output_files: list[str]) -> int:
+    """
+    Store the outputs of the build for `fingerprint` (blobs already stored are not sent again)
+
+    :param storage: artifact storage
+    :param fingerprint: returned by `compute_fingerprint`
+    :param output_dir_path: full path to the build directory
+    :param output_files: paths relative to the build directory of the files produced by the current targets
+    :returns int: number of stored files
+    :raises OSError: if an output is missing or the storage can't be written
+    """
+
+    files: list[list] = []
+
+    for relative_path in sorted(set(output_file.replace("\\", "/") for output_file in output_files)):
+        file_path = os.path.join(output_dir_path, relative_path)
+
+        digest = hash_file(file_path)
+        if not storage.has_blob(digest):
+            storage.put_blob(digest, file_path)
+
+        files.append([relative_path, digest, stat.S_IMODE(os.stat(file_path).st_mode)])
+
+    # the entry goes last: a reader never finds an entry whose blobs are missing
+    storage.put_entry(fingerprint, {"version": _ENTRY_FORMAT_VERSION, "files": files})
+    return len(files)
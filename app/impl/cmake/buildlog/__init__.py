@@ -0,0 +1,3 @@
+from ._impl_buildlog import *
+
+__all__ = (_impl_buildlog.__all__)
@@ -0,0 +1,365 @@
+import json
+import os
+import re
+import subprocess
+from enum import Enum
+
+
+# Implemented the build report: slowest edges, critical path, achieved parallelism and regressions since the last build
+
+
+__all__ = ["EdgeKind",
+           "BuildEdge",
+           "BuildReport",
+           "EdgeTimeHistory",
+           "parse_ninja_graph",
+           "read_ninja_graph"
+           ]
+
+
+_STATIC_LIBRARY_EXTENSIONS = (".a", ".lib")   # archived (or import libraries of a linked dll)
+_OBJECT_EXTENSIONS = (".o", ".obj")
+_GRAPH_TIMEOUT_SECONDS = 120
+_GRAPH_MAX_TARGETS_LENGTH = 16000   # characters of target paths per `ninja -t graph` run
+_REGRESSION_MIN_RATIO = 1.2     # slower by 20%...
+_REGRESSION_MIN_SECONDS = 0.1   # ...and by at least 100 ms (noise on small edges)
+
+_GRAPH_NODE_PATTERN = re.compile(r'^"(\w+)" \[label="(.*)"(, shape=ellipse)?\]$')
+_GRAPH_ARROW_PATTERN = re.compile(r'^"(\w+)" -> "(\w+)"')
+
+
+class EdgeKind(Enum):
+    COMPILE = "compile"
+    LINK = "link"
+    ARCHIVE = "archive"
+    OTHER = "other"     # precompiled headers, custom commands, cmake re-run
+
+
+class BuildEdge:
+    """
+    One command run by ninja (several outputs of the same command are one edge)
+    """
+
+    def __init__(self, outputs: list[str], start_ms: int, end_ms: int, kind: EdgeKind):
+        """
+        :param outputs: output paths relative to the build directory
+        :param start_ms: start time in milliseconds since the start of the build
+        :param end_ms: end time in milliseconds since the start of the build
+        :param kind: what the command does
+        """
+
+        self.outputs = outputs
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.kind = kind
+
+    @property
+    def output(self) -> str:
+        return self.outputs[0]
+
+    @property
+    def seconds(self) -> float:
+        return (self.end_ms - self.start_ms) / 1000
+
+    def to_json(self) -> dict:
+        return {"output": self.output, "kind": self.kind.value, "start_ms": self.start_ms, "end_ms": self.end_ms}
+
+
+def _get_edge_kind(output: str, output_dir_names: list[str]) -> EdgeKind:
+    output = output.replace("\\", "/")
+    if output.endswith(_OBJECT_EXTENSIONS):
+        return EdgeKind.COMPILE
+    if output.endswith(_STATIC_LIBRARY_EXTENSIONS):
+        return EdgeKind.ARCHIVE
+    if output.startswith(tuple(f"{output_dir_name}/" for output_dir_name in output_dir_names)):
+        return EdgeKind.LINK
+    return EdgeKind.OTHER
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+def parse_ninja_graph(graph_text: str) -> dict[str, list[str]]:
+    """
+    :param graph_text: output of `ninja -t graph` (graphviz)
+    :returns dict[str, list[str]]: inputs (explicit, implicit and order-only) by output path
+    """
+
+    labels: dict[str, str] = {}
+    edge_ids: set[str] = set()
+    arrows: list[tuple[str, str]] = []
+
+    for line in graph_text.splitlines():
+        if match := _GRAPH_NODE_PATTERN.match(line):
+            labels[match.group(1)] = match.group(2)
+            if match.group(3):
+                edge_ids.add(match.group(1))
+        elif match := _GRAPH_ARROW_PATTERN.match(line):
+            arrows.append((match.group(1), match.group(2)))
+
+    # edges with one input and one output are a single arrow, the others are an ellipse node
+    edge_inputs: dict[str, list[str]] = {}
+    edge_outputs: dict[str, list[str]] = {}
+    inputs_by_output: dict[str, list[str]] = {}
+
+    for from_id, to_id in arrows:
+        if to_id in edge_ids:
+            edge_inputs.setdefault(to_id, []).append(from_id)
+        elif from_id in edge_ids:
+            edge_outputs.setdefault(from_id, []).append(to_id)
+        elif from_id in labels and to_id in labels:
+            inputs_by_output.setdefault(labels[to_id], []).append(labels[from_id])
+
+    for edge_id, output_ids in edge_outputs.items():
+        input_names = [labels[input_id] for input_id in edge_inputs.get(edge_id, []) if input_id in labels]
+        for output_id in output_ids:
+            if output_id in labels:
+                inputs_by_output.setdefault(labels[output_id], []).extend(input_names)
+
+    return inputs_by_output
+
+
+def read_ninja_graph(ninja_path: str, build_dir_path: str, targets: list[str]=None) -> dict[str, list[str]] | None:
+    """
+    :param ninja_path: full path to ninja
+    :param build_dir_path: full path to the build directory
+    :param targets: outputs whose dependencies are read (like the outputs of the last build), `None` for the whole graph
+    :returns dict[str, list[str]] | None: returned by `parse_ninja_graph`, `None` if ninja failed
+    """
+
+    # split in several runs to stay below the command line length limit
+    target_batches: list[list[str]] = [[]]
+    batch_length = 0
+    for target in targets or []:
+        if batch_length + len(target) > _GRAPH_MAX_TARGETS_LENGTH and target_batches[-1]:
+            target_batches.append([])
+            batch_length = 0
+        target_batches[-1].append(target)
+        batch_length += len(target) + 1
+
+    inputs_by_output: dict[str, list[str]] = {}
+    for target_batch in target_batches:
+        try:
+            result = subprocess.run([ninja_path, "-C", build_dir_path, "-t", "graph", *target_batch],
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL,
+                                    text=True,
+                                    errors="replace",
+                                    timeout=_GRAPH_TIMEOUT_SECONDS,
+                                    check=True
+                                    )
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+        # the batches share the dependencies of their targets
+        for output, inputs in parse_ninja_graph(result.stdout).items():
+            inputs_by_output.setdefault(output, inputs)
+
+    return inputs_by_output
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+class EdgeTimeHistory:
+    """
+    Last duration of each output of each build type, persisted between runs (to find the edges that got slower)
+    """
+
+    _FORMAT_VERSION = 1
+
+    def __init__(self, history_file_path: str):
+        """
+        :param history_file_path: full path to the persisted durations
+        """
+
+        self._history_file_path = history_file_path
+        self._durations_ms: dict[str, dict[str, int]] = self._load()
+
+    def get(self, build_type_name: str) -> dict[str, int]:
+        """
+        :param build_type_name: value of `CMAKE_BUILD_TYPE`
+        :returns dict[str, int]: last duration in milliseconds by output
+        """
+
+        return self._durations_ms.get(build_type_name, {})
+
+    def update(self, build_type_name: str, edges: list[BuildEdge]) -> None:
+        """
+        Remember the durations of the edges run by a build (saved immediately, the other outputs keep their last duration)
+
+        :param build_type_name: value of `CMAKE_BUILD_TYPE`
+        :param edges: edges of the build
+        """
+
+        durations_ms = self._durations_ms.setdefault(build_type_name, {})
+        durations_ms.update({edge.output: edge.end_ms - edge.start_ms for edge in edges})
+
+        os.makedirs(os.path.dirname(self._history_file_path), exist_ok=True)
+        temp_file_path = f"{self._history_file_path}.tmp"
+        with open(temp_file_path, "w") as history_file:
+            json.dump({"version": EdgeTimeHistory._FORMAT_VERSION, "durations_ms": self._durations_ms}, history_file, separators=(",", ":"))
+        os.replace(temp_file_path, self._history_file_path)
+
+    def _load(self) -> dict[str, dict[str, int]]:
+        try:
+            with open(self._history_file_path, "r") as history_file:
+                history_data = json.load(history_file)
+            if history_data.get("version") == EdgeTimeHistory._FORMAT_VERSION:
+                return history_data["durations_ms"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        return {}
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+class BuildReport:
+    """
+    Where the time of a build went: slowest compile and link edges, critical path, achieved parallelism
+    and the edges slower than in the previous build
+    """
+
+    def __init__(self,
+                 entries: list,
+                 output_dir_names: list[str],
+                 cpu_count: int,
+                 inputs_by_output: dict[str, list[str]]=None,
+                 previous_durations_ms: dict[str, int]=None
+    ):
+        """
+        :param entries: `NinjaLogEntry` of the build (returned by `read_ninja_log`)
+        :param output_dir_names: directories of the build directory holding the linked executables and shared libraries (`bin`, `lib`)
+        :param cpu_count: logical CPUs of the machine
+        :param inputs_by_output: returned by `read_ninja_graph` (`None` if the graph is unknown: no critical path)
+        :param previous_durations_ms: returned by `EdgeTimeHistory.get`
+        """
+
+        # outputs of the same command are logged one after the other with the same times
+        edges_by_times: dict[tuple[int, int], BuildEdge] = {}
+        for entry in entries:
+            edge = edges_by_times.get((entry.start_ms, entry.end_ms))
+            if edge is None:
+                edges_by_times[(entry.start_ms, entry.end_ms)] = BuildEdge([entry.output], entry.start_ms, entry.end_ms, _get_edge_kind(entry.output, output_dir_names))
+            else:
+                edge.outputs.append(entry.output)
+
+        self.edges: list[BuildEdge] = sorted(edges_by_times.values(), key=lambda edge: (edge.start_ms, edge.end_ms))
+        self.cpu_count = max(1, cpu_count)
+        # the timings alone can't tell a dependency from an edge waiting for a free job slot
+        self.critical_path: list[BuildEdge] | None = self._find_critical_path(inputs_by_output) if inputs_by_output is not None else None
+
+        # (edge, previous seconds), largest slowdown first
+        previous_durations_ms = previous_durations_ms or {}
+        self.regressions: list[tuple[BuildEdge, float]] = sorted(((edge, previous_durations_ms[edge.output] / 1000) for edge in self.edges
+                                                                  if edge.output in previous_durations_ms
+                                                                  and edge.seconds >= previous_durations_ms[edge.output] / 1000 * _REGRESSION_MIN_RATIO
+                                                                  and edge.seconds - previous_durations_ms[edge.output] / 1000 >= _REGRESSION_MIN_SECONDS),
+                                                                 key=lambda item: item[1] - item[0].seconds)
+
+    @property
+    def wall_seconds(self) -> float:
+        if not self.edges:
+            return 0.0
+        return (max(edge.end_ms for edge in self.edges) - min(edge.start_ms for edge in self.edges)) / 1000
+
+    @property
+    def parallelism(self) -> float:
+        """
+        Average number of edges running at the same time
+        """
+
+        wall_seconds = self.wall_seconds
+        return sum(edge.seconds for edge in self.edges) / wall_seconds if wall_seconds else 0.0
+
+    @property
+    def critical_path_seconds(self) -> float | None:
+        return sum(edge.seconds for edge in self.critical_path) if self.critical_path is not None else None
+
+    def get_slowest_edges(self, top_count: int, kinds: tuple[EdgeKind, ...]=(EdgeKind.COMPILE, EdgeKind.LINK)) -> list[BuildEdge]:
+        return sorted((edge for edge in self.edges if edge.kind in kinds), key=lambda edge: -edge.seconds)[:top_count]
+
+    def to_text(self, top_count: int=10) -> str:
+        if not self.edges:
+            return "Build report: nothing was built"
+
+        lines = [f"Build report: {len(self.edges)} edges in {self.wall_seconds:.2f} s, "
+                 f"average parallelism {self.parallelism:.1f} of {self.cpu_count} cores ({self.parallelism / self.cpu_count:.0%})"]
+
+        lines += ["", f"Top {top_count} slowest compile and link edges (s):"]
+        lines += [f"{edge.seconds:>8.2f}  {edge.kind.value:<8} {edge.output}" for edge in self.get_slowest_edges(top_count)]
+
+        if self.critical_path is not None:
+            lines += ["", f"Critical path: {self.critical_path_seconds:.2f} s in {len(self.critical_path)} edges"]
+            lines += [f"{edge.seconds:>8.2f}  {edge.kind.value:<8} {edge.output}" for edge in self.critical_path]
+
+        if self.regressions:
+            lines += ["", "Slower than in the previous build (s):"]
+            lines += [f"{edge.seconds:>8.2f}  (was {previous_seconds:.2f}, {edge.seconds / previous_seconds - 1:+.0%})  {edge.output}"
+                      for edge, previous_seconds in self.regressions[:top_count]]
+
+        return "\n".join(lines)
+
+    def to_json(self, top_count: int=10) -> dict:
+        return {"wall_seconds": self.wall_seconds,
+                "edges_count": len(self.edges),
+                "cpu_count": self.cpu_count,
+                "parallelism": self.parallelism,
+                "slowest_edges": [edge.to_json() for edge in self.get_slowest_edges(top_count)],
+                "critical_path": {"seconds": self.critical_path_seconds,
+                                  "edges": [edge.to_json() for edge in self.critical_path]
+                                  } if self.critical_path is not None else None,
+                "regressions": [{**edge.to_json(), "previous_seconds": previous_seconds} for edge, previous_seconds in self.regressions],
+                "edges": [edge.to_json() for edge in self.edges]
+                }
+
+    def _find_critical_path(self, inputs_by_output: dict[str, list[str]]) -> list[BuildEdge]:
+        """
+        Longest chain of dependent edges run by this build (up-to-date and phony nodes cost nothing)
+        """
+
+        edges_by_output = {output: edge for edge in self.edges for output in edge.outputs}
+        costs: dict[str, float] = {}          # longest path ending at the node (node included)
+        best_inputs: dict[str, str | None] = {}
+
+        # iterative post-order (the graph can be deeper than the recursion limit)
+        visiting: set[str] = set()
+        for root in edges_by_output:
+            stack = [(root, False)]
+            while stack:
+                node, inputs_done = stack.pop()
+                if node in costs:
+                    continue
+                inputs = inputs_by_output.get(node, [])
+                if not inputs_done:
+                    # already on the current path: a cycle (a valid ninja graph has none)
+                    if node in visiting:
+                        continue
+                    visiting.add(node)
+                    stack.append((node, True))
+                    stack.extend((input_name, False) for input_name in inputs if input_name not in costs)
+                    continue
+
+                best_input = max(inputs, key=lambda input_name: costs.get(input_name, 0.0), default=None)
+                edge = edges_by_output.get(node)
+                costs[node] = (edge.seconds if edge else 0.0) + (costs.get(best_input, 0.0) if best_input else 0.0)
+                best_inputs[node] = best_input
+
+        if not edges_by_output:
+            return []
+
+        path: list[BuildEdge] = []
+        node = max(edges_by_output, key=lambda output: costs.get(output, 0.0))
+        visited: set[str] = set()
+        while node is not None and node not in visited:
+            visited.add(node)
+            edge = edges_by_output.get(node)
+            if edge is not None and (not path or path[-1] is not edge):
+                path.append(edge)
+            node = best_inputs.get(node)
+
+        return path[::-1]
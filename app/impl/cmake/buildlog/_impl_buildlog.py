@@ -0,0 +1,187 @@
+import json
+import os
+import subprocess
+
+from ._buildlog_report import *
+from ._buildlog_report import _STATIC_LIBRARY_EXTENSIONS
+
+
+# Implemented the reading of the ninja build log (.ninja_log), the outputs of the ninja manifest and the link time history
+
+
+__all__ = ["NinjaLogEntry",
+           "get_ninja_log_size",
+           "read_ninja_log",
+           "read_ninja_outputs",
+           "get_link_seconds",
+           "LinkTimeHistory",
+           "EdgeKind",
+           "BuildEdge",
+           "BuildReport",
+           "EdgeTimeHistory",
+           "parse_ninja_graph",
+           "read_ninja_graph"
+           ]
+
+
+_NINJA_LOG_FILE_NAME = ".ninja_log"
+_TARGETS_TIMEOUT_SECONDS = 120
+
+
+class NinjaLogEntry:
+    """
+    One output built by ninja (outputs of the same edge share their start and end times)
+    """
+
+    def __init__(self, start_ms: int, end_ms: int, output: str):
+        """
+        :param start_ms: edge start time in milliseconds since the start of the build
+        :param end_ms: edge end time in milliseconds since the start of the build
+        :param output: output path relative to the build directory
+        """
+
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.output = output
+
+    @property
+    def duration_seconds(self) -> float:
+        return (self.end_ms - self.start_ms) / 1000
+
+
+def get_ninja_log_size(build_dir_path: str) -> int:
+    """
+    :param build_dir_path: full path to the build directory
+    :returns int: current size of the build log (pass it to `read_ninja_log` to only read the next build), `0` if missing
+    """
+
+    try:
+        return os.path.getsize(os.path.join(build_dir_path, _NINJA_LOG_FILE_NAME))
+    except OSError:
+        return 0
+
+
+def read_ninja_log(build_dir_path: str, offset: int=0) -> list[NinjaLogEntry]:
+    """
+    :param build_dir_path: full path to the build directory
+    :param offset: position to start reading from (returned by `get_ninja_log_size` before a build).
+    If ninja recompacted the log in between (smaller file), nothing is returned
+    :returns list[NinjaLogEntry]: entries in the order ninja finished them
+    """
+
+    entries: list[NinjaLogEntry] = []
+    try:
+        with open(os.path.join(build_dir_path, _NINJA_LOG_FILE_NAME), "r", errors="replace") as log_file:
+            log_file.seek(0, os.SEEK_END)
+            if log_file.tell() < offset:
+                return []
+            log_file.seek(offset)
+
+            for line in log_file:
+                if line.startswith("#"):
+                    continue
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) < 4:
+                    continue
+                try:
+                    entries.append(NinjaLogEntry(int(fields[0]), int(fields[1]), fields[3]))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return entries
+
+
+def read_ninja_outputs(ninja_path: str, build_dir_path: str) -> list[str] | None:
+    """
+    :param ninja_path: full path to ninja
+    :param build_dir_path: full path to the (configured) build directory
+    :returns list[str] | None: outputs of every command of the current configuration (phony targets excluded),
+    relative to the build directory, `None` if ninja failed
+    """
+
+    try:
+        result = subprocess.run([ninja_path, "-C", build_dir_path, "-t", "targets", "all"],
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL,
+                                text=True,
+                                errors="replace",
+                                timeout=_TARGETS_TIMEOUT_SECONDS,
+                                check=True
+                                )
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    # `<output>: <rule>`
+    outputs: list[str] = []
+    for line in result.stdout.splitlines():
+        output, separator, rule = line.rpartition(": ")
+        if separator and rule != "phony":
+            outputs.append(output)
+    return outputs
+
+
+def get_link_seconds(entries: list[NinjaLogEntry], output_dir_names: list[str]) -> float | None:
+    """
+    :param entries: returned by `read_ninja_log`
+    :param output_dir_names: directories of the build directory holding the linked executables and shared libraries (`bin`, `lib`)
+    :returns float | None: total time of the link edges, `None` if nothing was linked
+    """
+
+    output_prefixes = tuple(f"{output_dir_name}/" for output_dir_name in output_dir_names)
+    link_edges = {(entry.start_ms, entry.end_ms) for entry in entries
+                  if entry.output.replace("\\", "/").startswith(output_prefixes) and not entry.output.endswith(_STATIC_LIBRARY_EXTENSIONS)}
+
+    if not link_edges:
+        return None
+    return sum(end_ms - start_ms for start_ms, end_ms in link_edges) / 1000
+
+
+class LinkTimeHistory:
+    """
+    Last measured link time of each build mode (like `Debug` with and without the fast debug link), persisted between runs
+    """
+
+    _FORMAT_VERSION = 1
+
+    def __init__(self, history_file_path: str):
+        """
+        :param history_file_path: full path to the persisted link times
+        """
+
+        self._history_file_path = history_file_path
+        self._link_seconds: dict[str, float] = self._load()
+
+    def get(self, mode: str) -> float | None:
+        """
+        :param mode: build mode name
+        :returns float | None: last link time of the mode, `None` if never measured
+        """
+
+        return self._link_seconds.get(mode)
+
+    def set(self, mode: str, link_seconds: float) -> None:
+        """
+        Remember the link time of the mode (saved immediately)
+
+        :param mode: build mode name
+        :param link_seconds: measured link time
+        """
+
+        self._link_seconds[mode] = link_seconds
+
+        os.makedirs(os.path.dirname(self._history_file_path), exist_ok=True)
+        temp_file_path = f"{self._history_file_path}.tmp"
+        with open(temp_file_path, "w") as history_file:
+            json.dump({"version": LinkTimeHistory._FORMAT_VERSION, "link_seconds": self._link_seconds}, history_file, indent=1)
+        os.replace(temp_file_path, self._history_file_path)
+
+    def _load(self) -> dict[str, float]:
+        try:
+            with open(self._history_file_path, "r") as history_file:
+                history_data = json.load(history_file)
+            if history_data.get("version") == LinkTimeHistory._FORMAT_VERSION:
+                return history_data["link_seconds"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        return {}
@@ -1,6 +1,16 @@
 from abc import ABC, abstractmethod
-import subprocess
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 import os
+import queue
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from ._cmd_sink import IOutputSink, ConsoleOutputSink
 
 
 # Implemented the cmd command generator using the builder pattern
@@ -8,28 +18,264 @@ import os
 
 class ICMDPart(ABC):
     """
-    Interface for text generator part
+    Interface for command generator part
     """
     @abstractmethod
-    def get_cmd_text(self) -> str:
+    def get_cmd_args(self) -> list[str]:
+        """
+        :returns list[str]: program and arguments, executed directly (no shell, no quoting)
+        """
         pass
 
+    def get_cmd_text(self) -> str:
+        """
+        :returns str: the command as typed in a console (for display only)
+        """
+        return subprocess.list2cmdline(self.get_cmd_args())
+
+
+class CMDStepResult:
+    """
+    What one executed command did
+    """
+
+    def __init__(self,
+                 args: list[str],
+                 exit_code: int,
+                 wall_seconds: float,
+                 peak_rss_bytes: int | None,
+                 output_tail: list[str],
+                 cancelled: bool=False
+    ):
+        """
+        :param args: program and arguments executed
+        :param exit_code: exit code of the program
+        :param wall_seconds: time from the start of the program to its exit
+        :param peak_rss_bytes: peak resident memory of the program and the children it waited for (`None` if unknown)
+        :param output_tail: last output lines
+        :param cancelled: `True` if the program was stopped because another step failed
+        """
+
+        self.args = args
+        self.exit_code = exit_code
+        self.wall_seconds = wall_seconds
+        self.peak_rss_bytes = peak_rss_bytes
+        self.output_tail = output_tail
+        self.cancelled = cancelled
+
 
 class CMDList:
     """
-    Uses a list of ICMDPart to execute sequentially cmd commands
+    Uses a list of ICMDPart to execute cmd commands.
+    Each command waits for the ones it depends on (by default the previous one): independent commands run concurrently.
+    The first failure stops the commands still running (with their child processes) and skips the ones not started.
     """
 
+    _OUTPUT_QUEUE_SIZE = 1024   # lines waiting for the sink (a full queue pauses the readers, then the programs)
+    _OUTPUT_TAIL_SIZE = 50      # lines kept in each step result
+
     def __init__(self, *env_paths: str):
         self._parts: list[ICMDPart] = []
+        self._dependencies: list[list[int]] = []
         self._env_paths: tuple[str, ...] = env_paths
 
-    def run(self) -> None:
+        # programs running, stopped if a step fails
+        self._processes_lock = threading.Lock()
+        self._processes: dict[int, subprocess.Popen] = {}
+        self._cancelled_steps: set[int] = set()
+        self._cancelled = False
+
+    def run(self, sink: IOutputSink=None, max_parallel_steps: int=None, check: bool=True) -> list[CMDStepResult | None]:
+        """
+        :param sink: destination of the output lines (printed by default)
+        :param max_parallel_steps: maximum steps running at the same time (`None` for as many as the dependencies allow)
+        :param check: `True` to raise if a step fails, `False` to return the results anyway
+        :returns list[CMDStepResult | None]: results of the steps, by index (`None` for the steps not started because a step failed)
+        :raises subprocess.CalledProcessError: if a step fails and `check` is set
+        """
+
         local_env = os.environ.copy()
         local_env['PATH'] = os.pathsep.join(self._env_paths) + os.pathsep + local_env['PATH']
 
-        for part in self._parts:
-            subprocess.check_call(part.get_cmd_text(), shell=True, env=local_env)
+        sink = sink or ConsoleOutputSink(prefix_steps=self._has_parallel_steps())
+        lines: queue.Queue[tuple[int, str] | None] = queue.Queue(CMDList._OUTPUT_QUEUE_SIZE)
+        sink_thread = threading.Thread(target=CMDList._drain_lines, args=(lines, sink), daemon=True)
+        sink_thread.start()
+
+        self._processes.clear()
+        self._cancelled_steps.clear()
+        self._cancelled = False
+
+        results: list[CMDStepResult | None] = [None] * len(self._parts)
+        try:
+            failure = self._run_steps(local_env, lines, results, max_parallel_steps or len(self._parts) or 1)
+        finally:
+            lines.put(None)
+            sink_thread.join()
+
+        if failure is not None and check:
+            raise failure
+        return results
+
+    def add_part(self, part: ICMDPart, depends_on: list[int]=None) -> int:
+        """
+        :param part: command to append
+        :param depends_on: indexes of the steps to wait for (`None` for the previous step, empty to start immediately)
+        :returns int: index of the step
+        """
+
+        if depends_on is None:
+            depends_on = [len(self._parts) - 1] if self._parts else []
+        if any(not 0 <= index < len(self._parts) for index in depends_on):
+            raise ValueError(f"Invalid step dependencies {depends_on}")
 
-    def add_part(self, part: ICMDPart) -> None:
         self._parts.append(part)
+        self._dependencies.append(list(depends_on))
+        return len(self._parts) - 1
+
+    def _has_parallel_steps(self) -> bool:
+        return any(dependencies != [index - 1] for index, dependencies in enumerate(self._dependencies) if index > 0)
+
+    def _run_steps(self, env: dict[str, str], lines: queue.Queue, results: list, max_parallel_steps: int) -> subprocess.CalledProcessError | None:
+        remaining = set(range(len(self._parts)))
+        running: dict[Future, int] = {}
+        failure: subprocess.CalledProcessError | None = None
+
+        with ThreadPoolExecutor(max_workers=max_parallel_steps) as executor:
+            try:
+                while remaining or running:
+                    if failure is None:
+                        # a failed step never unlocks the steps depending on it
+                        ready = [index for index in sorted(remaining)
+                                 if all(results[dependency] is not None and results[dependency].exit_code == 0
+                                        for dependency in self._dependencies[index])]
+                        for index in ready[:max_parallel_steps - len(running)]:
+                            remaining.discard(index)
+                            running[executor.submit(self._run_step, index, env, lines)] = index
+
+                    if not running:
+                        break
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = running.pop(future)
+                        result = results[index] = future.result()
+                        if result is not None and result.exit_code != 0 and not result.cancelled and failure is None:
+                            failure = subprocess.CalledProcessError(result.exit_code, result.args, output="\n".join(result.output_tail))
+                            self._cancel_steps()
+            except BaseException:
+                # interrupted (Ctrl+C): the programs run in their own process group and don't receive it
+                self._cancel_steps()
+                raise
+
+        return failure
+
+    def _run_step(self, step_index: int, env: dict[str, str], lines: queue.Queue) -> CMDStepResult | None:
+        args = self._parts[step_index].get_cmd_args()
+        # resolved here: on windows the PATH of `env` is not searched for the program
+        program_path = shutil.which(args[0], path=env['PATH']) or args[0]
+        output_tail: deque[str] = deque(maxlen=CMDList._OUTPUT_TAIL_SIZE)
+
+        with self._processes_lock:
+            if self._cancelled:
+                return None
+
+            start_time = time.perf_counter()
+            # own process group, so a cancellation also stops the children (compilers started by ninja)
+            process = subprocess.Popen([program_path, *args[1:]],
+                                       stdin=subprocess.DEVNULL,
+                                       stdout=subprocess.PIPE,
+                                       stderr=subprocess.STDOUT,
+                                       env=env,
+                                       text=True,
+                                       errors="replace",
+                                       bufsize=1,
+                                       start_new_session=(os.name != "nt"),
+                                       creationflags=(subprocess.CREATE_NEW_PROCESS_GROUP if os.name == "nt" else 0)
+                                       )
+            self._processes[step_index] = process
+
+        with process.stdout:
+            for line in process.stdout:
+                line = line.rstrip("\r\n")
+                output_tail.append(line)
+                lines.put((step_index, line))
+
+        # forgotten before it is reaped: its process id can't be reused by another program while it may still be signaled
+        with self._processes_lock:
+            del self._processes[step_index]
+            cancelled = step_index in self._cancelled_steps
+
+        exit_code, peak_rss_bytes = _wait_process(process)
+        return CMDStepResult(args, exit_code, time.perf_counter() - start_time, peak_rss_bytes, list(output_tail), cancelled)
+
+    def _cancel_steps(self) -> None:
+        """
+        Stop the running programs and their children, the steps not started yet won't start
+        """
+
+        with self._processes_lock:
+            self._cancelled = True
+            for step_index, process in self._processes.items():
+                self._cancelled_steps.add(step_index)
+                _terminate_process_group(process)
+
+    @staticmethod
+    def _drain_lines(lines: queue.Queue, sink: IOutputSink) -> None:
+        while (item := lines.get()) is not None:
+            try:
+                sink.write_line(*item)
+            except Exception:
+                pass   # a failing sink must not stall the programs
+
+
+def _terminate_process_group(process: subprocess.Popen) -> None:
+    try:
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            os.killpg(process.pid, signal.SIGTERM)
+    except OSError:
+        pass   # already exited
+
+
+def _wait_process(process: subprocess.Popen) -> tuple[int, int | None]:
+    """
+    :returns tuple[int, int | None]: exit code and peak resident memory in bytes (`None` if unknown)
+    """
+
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        # kilobytes on linux, bytes on macOS
+        return process.returncode, usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+    process.wait()
+    return process.returncode, _get_windows_peak_rss(process)
+
+
+def _get_windows_peak_rss(process: subprocess.Popen) -> int | None:
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class _ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD),
+                        ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t),
+                        ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t),
+                        ("PeakPagefileUsage", ctypes.c_size_t)
+                        ]
+
+        counters = _ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        if ctypes.WinDLL("psapi").GetProcessMemoryInfo(wintypes.HANDLE(int(process._handle)), ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    except (OSError, AttributeError, ImportError):
+        pass
+    return None
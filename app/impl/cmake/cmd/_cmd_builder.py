@@ -1,9 +1,15 @@
-from ._cmd_base import CMDList
+from ._cmd_base import CMDList, CMDStepResult
 from ._cmd_parts import *
+from ._cmd_sink import *
 
 
 __all__ = ["CMDBuilder",
-           "BuildType"
+           "CMDStepResult",
+           "IOutputSink",
+           "ConsoleOutputSink",
+           "NullOutputSink",
+           "BuildType",
+           "GENERATOR_NAME"
            ]
 
 
@@ -27,8 +33,10 @@ class CMDBuilder:
                                 build_type: BuildType,
                                 build_dir_path: str,
                                 c_compiler_path: str,
-                                cpp_compiler_path: str
-    ) -> None:
+                                cpp_compiler_path: str,
+                                cache_variables: list[tuple[str, str]]=None,
+                                depends_on: list[int]=None
+    ) -> int:
         """
         Append cmake generate command to cmd list
 
@@ -37,34 +45,36 @@ class CMDBuilder:
         :param build_dir_path: full path to build directory
         :param c_compiler_path: full path to C compiler exe
         :param cpp_compiler_path: full path to C++ compiler exe
+        :param cache_variables: pairs of str (first: cache variable name, second: value) set with `-D`
+        :param depends_on: indexes of the commands to wait for (`None` for the previous command, empty to start immediately)
+        :returns int: index of the command
         """
 
         part = CMakeGeneratePart(cmakelists_root_dir_path,
                                  build_type,
                                  build_dir_path,
                                  c_compiler_path,
-                                 cpp_compiler_path
+                                 cpp_compiler_path,
+                                 cache_variables
                                  )
-        self._cmd_list.add_part(part)
+        return self._cmd_list.add_part(part, depends_on)
 
     def add_cmake_build_part(self,
-                             build_dir_path: str
-    ) -> None:
+                             build_dir_path: str,
+                             max_jobs: int=0,
+                             max_load: float=0,
+                             clean_first: bool=False,
+                             depends_on: list[int]=None
+    ) -> int:
         """
         Append cmake build command to cmd list
         :param build_dir_path: full path to build directory
+        :param max_jobs: maximum parallel build steps (`0` for the build tool default)
+        :param max_load: no new build step is started above this load average (`0` for no limit)
+        :param clean_first: `True` to delete the outputs first (everything is compiled again)
+        :param depends_on: indexes of the commands to wait for (`None` for the previous command, empty to start immediately)
+        :returns int: index of the command
         """
 
-        part = CMakeBuildPart(build_dir_path)
-        self._cmd_list.add_part(part)
-
-    def add_remove_directory_part(self,
-                                  dir_path: str
-    ) -> None:
-        """
-        Append rmdir command to cmd list
-        :param dir_path: full path to directory to remove
-        """
-
-        part = RemoveDirectoryPart(dir_path)
-        self._cmd_list.add_part(part)
+        part = CMakeBuildPart(build_dir_path, max_jobs, max_load, clean_first)
+        return self._cmd_list.add_part(part, depends_on)
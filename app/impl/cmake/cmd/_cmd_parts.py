@@ -1,4 +1,3 @@
-import platform
 from enum import Enum
 from ._cmd_base import ICMDPart
 
@@ -6,15 +5,18 @@ from ._cmd_base import ICMDPart
 # Implemented ALL generator parts (as ICMDPart)
 
 
-__all__ = ["BuildType",
+__all__ = ["GENERATOR_NAME",
+           "BuildType",
            "CMakeGeneratePart",
-           "CMakeBuildPart",
-           "RemoveDirectoryPart"
+           "CMakeBuildPart"
            ]
 
 
+GENERATOR_NAME = "Ninja"
+
+
 class BuildType(Enum):
-    DEBUGG = "Debugg"
+    DEBUGG = "Debug"
     RELEASE = "Release"
     DBGRELEASE = "RelWithDebInfo"
     MINRELEASE = "MinSizeRel"
@@ -30,7 +32,8 @@ class CMakeGeneratePart(ICMDPart):
                  build_type: BuildType,
                  build_dir_path: str,
                  c_compiler_path: str=None,
-                 cpp_compiler_path: str=None
+                 cpp_compiler_path: str=None,
+                 cache_variables: list[tuple[str, str]]=None
     ):
         """
         Create cmake generate command to append to cmd list
@@ -40,6 +43,7 @@ class CMakeGeneratePart(ICMDPart):
         :param build_dir_path: full path to build directory
         :param c_compiler_path: full path to C compiler exe
         :param cpp_compiler_path: full path to C++ compiler exe
+        :param cache_variables: pairs of str (first: cache variable name, second: value) set with `-D`
         """
 
         self._cmakelists_root_dir_path = cmakelists_root_dir_path
@@ -47,19 +51,23 @@ class CMakeGeneratePart(ICMDPart):
         self._build_dir_path = build_dir_path
         self._c_compiler_path = c_compiler_path
         self._cpp_compiler_path = cpp_compiler_path
+        self._cache_variables = cache_variables or []
 
-    def get_cmd_text(self) -> str:
-        ret = "cmake"
-        ret += f" -S \"{self._cmakelists_root_dir_path}\""
-        ret += f" -G \"Ninja\""
-        ret += f" -B \"{self._build_dir_path}\""
-        ret += f" -D CMAKE_BUILD_TYPE={self._build_type.value}"
+    def get_cmd_args(self) -> list[str]:
+        ret = ["cmake"]
+        ret += ["-S", self._cmakelists_root_dir_path]
+        ret += ["-G", GENERATOR_NAME]
+        ret += ["-B", self._build_dir_path]
+        ret += ["-D", f"CMAKE_BUILD_TYPE={self._build_type.value}"]
 
         if self._c_compiler_path:
-            ret += f" -D CMAKE_C_COMPILER=\"{self._c_compiler_path}\""
+            ret += ["-D", f"CMAKE_C_COMPILER={self._c_compiler_path}"]
 
         if self._cpp_compiler_path:
-            ret += f" -D CMAKE_CXX_COMPILER=\"{self._cpp_compiler_path}\""
+            ret += ["-D", f"CMAKE_CXX_COMPILER={self._cpp_compiler_path}"]
+
+        for name, value in self._cache_variables:
+            ret += ["-D", f"{name}={value}"]
 
         return ret
 
@@ -71,37 +79,35 @@ class CMakeGeneratePart(ICMDPart):
 class CMakeBuildPart(ICMDPart):
     def __init__(self,
                  build_dir_path: str,
+                 max_jobs: int=0,
+                 max_load: float=0,
+                 clean_first: bool=False
     ):
         """
         Create cmake build command to append to cmd list
         :param build_dir_path: full path to build directory
+        :param max_jobs: maximum parallel build steps (`0` for the build tool default)
+        :param max_load: no new build step is started above this load average (`0` for no limit)
+        :param clean_first: `True` to delete the outputs first (everything is compiled again)
         """
 
         self._build_dir_path = build_dir_path
+        self._max_jobs = max_jobs
+        self._max_load = max_load
+        self._clean_first = clean_first
 
-    def get_cmd_text(self) -> str:
-        ret = f"cmake --build \"{self._build_dir_path}\""
-        return ret
+    def get_cmd_args(self) -> list[str]:
+        ret = ["cmake", "--build", self._build_dir_path]
 
+        if self._clean_first:
+            ret += ["--clean-first"]
 
-# ==========================================================================================================================
-# ==========================================================================================================================
+        if self._max_jobs > 0:
+            ret += ["--parallel", str(self._max_jobs)]
 
+        # passed to the build tool (ninja and make share the option)
+        if self._max_load > 0:
+            ret += ["--", "-l", f"{self._max_load:g}"]
 
-class RemoveDirectoryPart(ICMDPart):
-    def __init__(self,
-                 dir_path: str
-    ):
-        """
-        Create rmdir command to append to cmd list
-        :param dir_path: full path to directory to remove
-        """
-
-        self._dir_path = dir_path
-
-    def get_cmd_text(self) -> str:
-        if platform.system() == "Windows":
-            ret = f"if exist \"{self._dir_path}\" rmdir /s /q \"{self._dir_path}\""
-        elif platform.system() == "Linux":
-            ret = f"if [ -d \"{self._dir_path}\" ]; then rm -rf \"{self._dir_path}\"; fi"
         return ret
+
@@ -0,0 +1,49 @@
+import sys
+from abc import ABC, abstractmethod
+
+
+# Implemented the destinations of the command output streamed line by line
+
+
+__all__ = ["IOutputSink",
+           "ConsoleOutputSink",
+           "NullOutputSink"
+           ]
+
+
+class IOutputSink(ABC):
+    """
+    Interface for the destination of the command output.
+    Called from a single thread, in the order the lines were read (lines of concurrent steps are interleaved).
+    """
+    @abstractmethod
+    def write_line(self, step_index: int, line: str) -> None:
+        """
+        :param step_index: index of the step in the cmd list (order of `add_part`)
+        :param line: output line without the line ending (stdout and stderr merged)
+        """
+        pass
+
+
+class ConsoleOutputSink(IOutputSink):
+    """
+    Print the output lines, prefixed by the step index if several steps can run at the same time
+    """
+
+    def __init__(self, prefix_steps: bool=False):
+        self._prefix_steps = prefix_steps
+
+    def write_line(self, step_index: int, line: str) -> None:
+        if self._prefix_steps:
+            line = f"[{step_index}] {line}"
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+
+
+class NullOutputSink(IOutputSink):
+    """
+    Discard the output (the last lines of each step are still kept in its result)
+    """
+
+    def write_line(self, step_index: int, line: str) -> None:
+        pass
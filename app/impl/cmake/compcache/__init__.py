@@ -0,0 +1,3 @@
+from ._impl_compcache import *
+
+__all__ = (_impl_compcache.__all__)
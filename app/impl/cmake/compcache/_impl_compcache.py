@@ -0,0 +1,192 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+from enum import Enum
+
+
+# Implemented the compiler launcher cache integration (ccache, sccache): environment and hit/miss statistics
+
+
+__all__ = ["CompilerCacheType",
+           "CompilerCacheStats",
+           "get_compiler_cache_type",
+           "get_compiler_cache_env",
+           "find_compiler_cache",
+           "zero_compiler_cache_stats",
+           "read_compiler_cache_stats"
+           ]
+
+
+class CompilerCacheType(Enum):
+    CCACHE = "ccache"
+    SCCACHE = "sccache"
+
+
+class CompilerCacheStats:
+    """
+    Hit/miss counters of the compiler cache since the last reset
+    """
+
+    def __init__(self, hits: int, misses: int, uncacheable: int=0):
+        """
+        :param hits: compilations served from the cache
+        :param misses: compilations run and stored in the cache
+        :param uncacheable: compilations the cache could not handle (linking, unsupported flags)
+        """
+
+        self.hits = hits
+        self.misses = misses
+        self.uncacheable = uncacheable
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_text(self) -> str:
+        return (f"Compiler cache: {self.hits} hits, {self.misses} misses, {self.uncacheable} uncacheable "
+                f"({self.hit_rate * 100:.1f}% hit rate)")
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+# ccache 3.x `-s` output (ccache 4.x has `--print-stats`)
+_CCACHE_LEGACY_HIT_PATTERN = re.compile(r"^cache hit \((?:direct|preprocessed)\)\s+(\d+)", re.MULTILINE)
+_CCACHE_LEGACY_MISS_PATTERN = re.compile(r"^cache miss\s+(\d+)", re.MULTILINE)
+
+_CCACHE_HIT_KEYS = ("direct_cache_hit", "preprocessed_cache_hit")
+_CCACHE_MISS_KEYS = ("cache_miss",)
+_CCACHE_UNCACHEABLE_KEYS = ("called_for_link", "called_for_preprocessing", "compile_failed", "unsupported_compiler_option",
+                            "unsupported_source_language", "could_not_use_precompiled_header", "no_input_file")
+
+
+def _run_cache_program(program_path: str, args: list[str], env: list[tuple[str, str]]) -> str:
+    local_env = os.environ.copy()
+    local_env.update(env)
+    result = subprocess.run([program_path, *args], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=local_env, check=True)
+    return result.stdout.decode("utf-8", errors="replace")
+
+
+def _sum_counts(counts: dict) -> int:
+    # sccache counts are split by language ({"C/C++": 12})
+    return sum(value for value in counts.values() if isinstance(value, int))
+
+
+def get_compiler_cache_type(program: str) -> CompilerCacheType:
+    """
+    :param program: name or path of the compiler cache executable
+    :returns CompilerCacheType: cache kind, from the executable name
+    :raises ValueError: if the executable is not a supported compiler cache
+    """
+
+    name = os.path.splitext(os.path.basename(program))[0].lower()
+    return CompilerCacheType(name)
+
+
+def get_compiler_cache_env(cache_type: CompilerCacheType,
+                           cache_dir_path: str,
+                           max_size: str,
+                           base_dir_path: str
+) -> list[tuple[str, str]]:
+    """
+    Environment to give to the cache on every call, so a project always uses its own cache directory and size limit
+
+    :param cache_type: cache kind
+    :param cache_dir_path: path to the cache directory (can use cmake variables when written in CMakeLists.txt)
+    :param max_size: size limit (`500M`, `5G`)
+    :param base_dir_path: project root: absolute paths below it are hashed as relative ones (a moved checkout still hits)
+    :returns list[tuple[str, str]]: pairs (variable name, value)
+    """
+
+    match cache_type:
+        case CompilerCacheType.CCACHE:
+            return [("CCACHE_DIR", cache_dir_path),
+                    ("CCACHE_MAXSIZE", max_size),
+                    ("CCACHE_BASEDIR", base_dir_path),
+                    ("CCACHE_NOHASHDIR", "true"),
+                    # __DATE__/__TIME__ don't defeat the cache, precompiled headers can be cached
+                    ("CCACHE_SLOPPINESS", "time_macros,pch_defines,include_file_mtime,include_file_ctime")
+                    ]
+
+        case CompilerCacheType.SCCACHE:
+            return [("SCCACHE_DIR", cache_dir_path),
+                    ("SCCACHE_CACHE_SIZE", max_size)
+                    ]
+
+        case _:
+            raise RuntimeError(f"Compiler cache type not implemented: {cache_type}")
+
+
+def find_compiler_cache(program: str) -> str | None:
+    """
+    :param program: name or path of the compiler cache executable
+    :returns str | None: full path to the executable, `None` if not found
+    """
+
+    return shutil.which(program)
+
+
+def zero_compiler_cache_stats(program_path: str, env: list[tuple[str, str]]) -> None:
+    """
+    Reset the statistics so the next read only covers the next build (same option for ccache and sccache)
+
+    :param program_path: full path to the compiler cache executable
+    :param env: environment returned by `get_compiler_cache_env`
+    """
+
+    try:
+        _run_cache_program(program_path, ["--zero-stats"], env)
+    except (OSError, subprocess.CalledProcessError):
+        pass
+
+
+def read_compiler_cache_stats(program_path: str, cache_type: CompilerCacheType, env: list[tuple[str, str]]) -> CompilerCacheStats | None:
+    """
+    :param program_path: full path to the compiler cache executable
+    :param cache_type: cache kind
+    :param env: environment returned by `get_compiler_cache_env`
+    :returns CompilerCacheStats | None: counters since the last reset, `None` if the cache can't report them
+    """
+
+    try:
+        match cache_type:
+            case CompilerCacheType.CCACHE:
+                return _read_ccache_stats(program_path, env)
+
+            case CompilerCacheType.SCCACHE:
+                stats = json.loads(_run_cache_program(program_path, ["--show-stats", "--stats-format", "json"], env))["stats"]
+                uncacheable = stats.get("non_cacheable_calls", 0)
+                return CompilerCacheStats(_sum_counts(stats["cache_hits"]["counts"]),
+                                          _sum_counts(stats["cache_misses"]["counts"]),
+                                          uncacheable if isinstance(uncacheable, int) else 0
+                                          )
+    except (OSError, subprocess.CalledProcessError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+
+    return None
+
+
+def _read_ccache_stats(program_path: str, env: list[tuple[str, str]]) -> CompilerCacheStats:
+    try:
+        output = _run_cache_program(program_path, ["--print-stats"], env)
+    except subprocess.CalledProcessError:
+        # ccache 3.x
+        output = _run_cache_program(program_path, ["-s"], env)
+        return CompilerCacheStats(sum(int(value) for value in _CCACHE_LEGACY_HIT_PATTERN.findall(output)),
+                                  sum(int(value) for value in _CCACHE_LEGACY_MISS_PATTERN.findall(output))
+                                  )
+
+    counters: dict[str, int] = {}
+    for line in output.splitlines():
+        key, _, value = line.partition("\t")
+        if value.strip().isdigit():
+            counters[key] = int(value)
+
+    return CompilerCacheStats(sum(counters.get(key, 0) for key in _CCACHE_HIT_KEYS),
+                              sum(counters.get(key, 0) for key in _CCACHE_MISS_KEYS),
+                              sum(counters.get(key, 0) for key in _CCACHE_UNCACHEABLE_KEYS)
+                              )
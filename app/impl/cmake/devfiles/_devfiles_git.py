@@ -0,0 +1,213 @@
+import hashlib
+import os
+import shutil
+import struct
+import subprocess
+
+
+# Implemented the git index based source enumeration (direct `.git/index` parsing or `git ls-files -z`)
+
+
+class GitIndexError(Exception):
+    """Exception raised when the git index can't be used (not a repository, unsupported format, git failure)"""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+_INDEX_SIGNATURE = b"DIRC"
+_INDEX_HEADER = struct.Struct(">4sII")     # signature, version, entries count
+_ENTRY_FIXED_SIZE = 62                      # stat data (40) + sha1 (20) + flags (2)
+_ENTRY_MODE_OFFSET = 24
+_ENTRY_FLAGS_OFFSET = 60
+_FLAG_EXTENDED = 0x4000
+_FLAG_NAME_MASK = 0x0FFF
+_MODE_TYPE_MASK = 0o170000
+_MODE_DIRECTORY = 0o040000                  # sparse index directory entry
+_SHA1_SIZE = 20
+
+# split index and sparse index entries are not complete in `.git/index`: use git instead
+_UNSUPPORTED_EXTENSIONS = (b"link", b"sdir")
+
+
+def find_git_top_dir(dir_path: str) -> tuple[str, str]:
+    """
+    :param dir_path: full path to a directory inside a work tree
+    :returns tuple[str, str]: (full path to the work tree top directory, full path to the git directory)
+    :raises GitIndexError: if `dir_path` is not inside a git work tree (or its `.git` file can't be read)
+    """
+
+    current_dir_path = os.path.abspath(dir_path)
+
+    while True:
+        dot_git_path = os.path.join(current_dir_path, ".git")
+
+        if os.path.isdir(dot_git_path):
+            return current_dir_path, dot_git_path
+
+        if os.path.isfile(dot_git_path):
+            # worktrees and submodules: `.git` is a file with `gitdir: <path>`
+            try:
+                with open(dot_git_path, "r", errors="replace") as dot_git_file:
+                    content = dot_git_file.read().strip()
+            except OSError as e:
+                raise GitIndexError(f"Can't read {dot_git_path}: {e}")
+            if content.startswith("gitdir:"):
+                git_dir_path = content[len("gitdir:"):].strip()
+                return current_dir_path, os.path.normpath(os.path.join(current_dir_path, git_dir_path))
+
+        parent_dir_path = os.path.dirname(current_dir_path)
+        if parent_dir_path == current_dir_path:
+            raise GitIndexError(f"Not a git repository: {dir_path}")
+        current_dir_path = parent_dir_path
+
+
+def read_git_index(git_dir_path: str) -> list[str]:
+    """
+    Parse the `index` file of a git directory (versions 2, 3 and 4, sha1 repositories)
+
+    :param git_dir_path: full path to the git directory
+    :returns list[str]: POSIX-style paths of tracked files, relative to the work tree top directory
+    :raises GitIndexError: if the index is missing, truncated, corrupted or uses an unsupported format
+    """
+
+    if _uses_sha256_objects(git_dir_path):
+        raise GitIndexError("Git index of sha256 repositories is not supported")
+
+    try:
+        with open(os.path.join(git_dir_path, "index"), "rb") as index_file:
+            data = index_file.read()
+    except OSError as e:
+        raise GitIndexError(f"Can't read git index: {e}")
+
+    if len(data) < _INDEX_HEADER.size + _SHA1_SIZE:
+        raise GitIndexError("Git index is truncated")
+
+    signature, version, entries_count = _INDEX_HEADER.unpack_from(data, 0)
+    if signature != _INDEX_SIGNATURE or version not in (2, 3, 4):
+        raise GitIndexError(f"Unsupported git index version: {version}")
+
+    # a null checksum is written with `index.skipHash`
+    checksum = data[-_SHA1_SIZE:]
+    if checksum != bytes(_SHA1_SIZE) and hashlib.sha1(memoryview(data)[:-_SHA1_SIZE]).digest() != checksum:
+        raise GitIndexError("Git index is corrupted (checksum mismatch)")
+
+    # entries and extensions end before the checksum: every read is checked against `end`
+    end = len(data) - _SHA1_SIZE
+    paths: list[str] = []
+    previous_path = b""
+    offset = _INDEX_HEADER.size
+
+    try:
+        for _ in range(entries_count):
+            entry_offset = offset
+            if offset + _ENTRY_FIXED_SIZE > end:
+                raise GitIndexError("Git index is truncated")
+
+            mode = int.from_bytes(data[offset + _ENTRY_MODE_OFFSET:offset + _ENTRY_MODE_OFFSET + 4], "big")
+            flags = int.from_bytes(data[offset + _ENTRY_FLAGS_OFFSET:offset + _ENTRY_FLAGS_OFFSET + 2], "big")
+            offset += _ENTRY_FIXED_SIZE
+
+            if flags & _FLAG_EXTENDED:
+                offset += 2
+
+            if mode & _MODE_TYPE_MASK == _MODE_DIRECTORY:
+                raise GitIndexError("Sparse git index is not supported")
+
+            if version == 4:
+                # path is prefix-compressed: varint of bytes to strip from the previous path, then the suffix
+                strip_count, offset = _read_offset_varint(data, offset)
+                if strip_count > len(previous_path):
+                    raise GitIndexError("Git index is corrupted (invalid path compression)")
+                name_end = data.index(b"\0", offset, end)
+                path = previous_path[:len(previous_path) - strip_count] + data[offset:name_end]
+                offset = name_end + 1
+            else:
+                name_length = flags & _FLAG_NAME_MASK
+                name_end = offset + name_length if name_length < _FLAG_NAME_MASK else data.index(b"\0", offset, end)
+                path = data[offset:name_end]
+                # entries are NUL padded to a multiple of 8 bytes
+                offset = entry_offset + ((name_end - entry_offset + 8) & ~7)
+
+            if offset > end:
+                raise GitIndexError("Git index is truncated")
+
+            # conflicted files appear once per stage: keep the first one
+            if path != previous_path:
+                paths.append(path.decode("utf-8", errors="surrogateescape"))
+            previous_path = path
+
+    except (IndexError, ValueError):
+        # varint or path running past the end of the data
+        raise GitIndexError("Git index is truncated")
+
+    _check_index_extensions(data, offset)
+    return paths
+
+
+def list_git_files(work_dir_path: str, include_tracked: bool, include_untracked: bool) -> list[str]:
+    """
+    :param work_dir_path: full path to a directory inside a work tree
+    :param include_tracked: `True` to list files in the index
+    :param include_untracked: `True` to list untracked files that are not ignored by git
+    :returns list[str]: POSIX-style paths relative to `work_dir_path` (only files below it)
+    :raises GitIndexError: if git is not available or fails
+    """
+
+    git_path = shutil.which("git")
+    if git_path is None:
+        raise GitIndexError("git executable not found")
+
+    cmd = [git_path, "-C", work_dir_path, "ls-files", "-z"]
+    if include_tracked:
+        cmd.append("--cached")
+    if include_untracked:
+        cmd += ["--others", "--exclude-standard"]
+
+    try:
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise GitIndexError(f"git ls-files failed: {e}")
+
+    # --cached lists conflicted files once per stage
+    return list(dict.fromkeys(path.decode("utf-8", errors="surrogateescape")
+                              for path in result.stdout.split(b"\0") if path))
+
+
+def _uses_sha256_objects(git_dir_path: str) -> bool:
+    try:
+        with open(os.path.join(git_dir_path, "config"), "r", errors="replace") as config_file:
+            config = config_file.read().lower()
+    except OSError:
+        return False
+
+    return "objectformat" in config and "sha256" in config
+
+
+def _read_offset_varint(data: bytes, offset: int) -> tuple[int, int]:
+    # git "offset" varint: big-endian 7 bit groups, each continuation adds one
+    byte = data[offset]
+    offset += 1
+    value = byte & 0x7F
+
+    while byte & 0x80:
+        byte = data[offset]
+        offset += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+
+    return value, offset
+
+
+def _check_index_extensions(data: bytes, offset: int) -> None:
+    end = len(data) - _SHA1_SIZE
+
+    while offset + 8 <= end:
+        signature = data[offset:offset + 4]
+        size = int.from_bytes(data[offset + 4:offset + 8], "big")
+
+        if signature in _UNSUPPORTED_EXTENSIONS:
+            raise GitIndexError(f"Unsupported git index extension: {signature.decode()}")
+
+        offset += 8 + size
+        if offset > end:
+            raise GitIndexError("Git index is truncated")
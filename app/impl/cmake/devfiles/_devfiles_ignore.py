@@ -0,0 +1,190 @@
+import os
+import re
+
+
+# Implemented the gitignore-style ignore matcher (patterns are compiled once into combined regex groups)
+
+
+_GITIGNORE_FILE_NAME = ".gitignore"
+_GLOB_SPECIAL_CHARS = frozenset("*?[\\")
+
+
+def _translate_glob(glob: str) -> str:
+    """
+    Translate a gitignore glob (without anchors) into a regex body.
+    `*` and `?` never match `/`, `**` matches any number of directories.
+    """
+
+    regex = ""
+    index = 0
+    length = len(glob)
+
+    while index < length:
+        char = glob[index]
+
+        if glob.startswith("**/", index) and (index == 0 or glob[index - 1] == "/"):
+            regex += "(?:.*/)?"
+            index += 3
+        elif glob.startswith("**", index) and index + 2 == length and (index == 0 or glob[index - 1] == "/"):
+            regex += ".*"
+            index += 2
+        elif char == "*":
+            regex += "[^/]*"
+            index += 1
+        elif char == "?":
+            regex += "[^/]"
+            index += 1
+        elif char == "[":
+            closing_index = glob.find("]", index + 2 if glob.startswith("[!", index) or glob.startswith("[^", index) else index + 1)
+            if closing_index < 0:
+                regex += re.escape(char)
+                index += 1
+            else:
+                char_class = glob[index + 1:closing_index].replace("\\", "\\\\")
+                if char_class[0] in "!^":
+                    char_class = "^" + char_class[1:]
+                regex += f"[{char_class}]"
+                index = closing_index + 1
+        elif char == "\\" and index + 1 < length:
+            regex += re.escape(glob[index + 1])
+            index += 2
+        else:
+            regex += re.escape(char)
+            index += 1
+
+    return regex
+
+
+class _RuleGroup:
+    """
+    Consecutive rules with the same polarity (ignore or re-include), compiled into one regex per kind.
+    Plain names (no wildcard, no slash) are matched with a set lookup on the last path component.
+    """
+
+    def __init__(self, negated: bool):
+        self.negated = negated
+        self._names: set[str] = set()
+        self._dir_names: set[str] = set()
+        self._regexes: list[str] = []
+        self._dir_regexes: list[str] = []
+        self._compiled: re.Pattern = None
+        self._compiled_dir: re.Pattern = None
+
+    def add(self, body: str, base_prefix: str, anchored: bool, dir_only: bool) -> None:
+        if not anchored and not (_GLOB_SPECIAL_CHARS & set(body)):
+            (self._dir_names if dir_only else self._names).add(body)
+            return
+
+        regex = re.escape(base_prefix) + ("" if anchored else "(?:.*/)?") + _translate_glob(body)
+        (self._dir_regexes if dir_only else self._regexes).append(regex)
+
+    def compile(self) -> None:
+        if self._regexes:
+            self._compiled = re.compile("|".join(f"(?:{regex})" for regex in self._regexes) + r"\Z", re.DOTALL)
+        if self._dir_regexes:
+            self._compiled_dir = re.compile("|".join(f"(?:{regex})" for regex in self._dir_regexes) + r"\Z", re.DOTALL)
+
+    def matches(self, relative_path: str, name: str, is_dir: bool) -> bool:
+        if name in self._names or (self._compiled is not None and self._compiled.match(relative_path)):
+            return True
+
+        if is_dir:
+            return name in self._dir_names or (self._compiled_dir is not None and self._compiled_dir.match(relative_path))
+
+        return False
+
+
+class IgnoreMatcher:
+    """
+    Matches relative POSIX-style paths against gitignore-style patterns:
+    `name`, `*.ext`, `dir/`, `/anchored`, `a/*/b`, `**/generated/*_test.cpp`, `!re-included`.
+    The last matching pattern wins. Nested `.gitignore` files are supported with `with_gitignore_file`.
+    """
+
+    def __init__(self, patterns: list[str]=(), base_prefix: str="", parent: "IgnoreMatcher"=None):
+        """
+        :param patterns: gitignore-style patterns
+        :param base_prefix: relative path of the directory the patterns belong to (empty or ending with '/')
+        :param parent: matcher whose patterns are evaluated before these ones
+        """
+
+        self._groups: list[_RuleGroup] = list(parent._groups) if parent else []
+        self._inherited_groups_count = len(self._groups)
+
+        for pattern in patterns:
+            self._add_pattern(pattern, base_prefix)
+
+        # groups shared with the parent are already compiled
+        for group in self._groups[self._inherited_groups_count:]:
+            group.compile()
+
+    def with_gitignore_file(self, gitignore_file_path: str, base_prefix: str) -> "IgnoreMatcher":
+        """
+        :param gitignore_file_path: full path to a `.gitignore` file
+        :param base_prefix: relative path of the directory holding the file (empty or ending with '/')
+        :returns IgnoreMatcher: new matcher with the file patterns appended (self if the file can't be read)
+        """
+
+        try:
+            with open(gitignore_file_path, "r", encoding="utf-8", errors="surrogateescape") as gitignore_file:
+                patterns = gitignore_file.read().splitlines()
+        except OSError:
+            return self
+
+        return IgnoreMatcher(patterns, base_prefix, self)
+
+    def is_ignored(self, relative_path: str, is_dir: bool) -> bool:
+        """
+        :param relative_path: POSIX-style path relative to the tree root (no trailing '/')
+        :param is_dir: `True` if the path is a directory
+        :returns bool: `True` if the path is ignored
+        """
+
+        name = relative_path.rpartition("/")[2]
+
+        # the last matching group decides
+        for group in reversed(self._groups):
+            if group.matches(relative_path, name, is_dir):
+                return not group.negated
+
+        return False
+
+    def _add_pattern(self, pattern: str, base_prefix: str) -> None:
+        pattern = pattern.rstrip("\r\n")
+
+        # trailing spaces are ignored unless escaped
+        if not pattern.endswith("\\ "):
+            pattern = pattern.rstrip(" ")
+
+        if not pattern or pattern.startswith("#"):
+            return
+
+        negated = pattern.startswith("!")
+        if negated:
+            pattern = pattern[1:]
+        elif pattern.startswith(("\\!", "\\#")):
+            pattern = pattern[1:]
+
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+
+        # a slash at the beginning or in the middle anchors the pattern to the directory of its origin
+        anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+
+        if not pattern:
+            return
+
+        # never mutate a group shared with the parent matcher
+        if len(self._groups) == self._inherited_groups_count or self._groups[-1].negated != negated:
+            self._groups.append(_RuleGroup(negated))
+
+        self._groups[-1].add(pattern, base_prefix, anchored, dir_only)
+
+
+def get_gitignore_file_path(dir_path: str) -> str:
+    """
+    :param dir_path: full path to a directory
+    :returns str: full path to the `.gitignore` file of the directory (may not exist)
+    """
+    return os.path.join(dir_path, _GITIGNORE_FILE_NAME)
@@ -0,0 +1,110 @@
+import json
+import os
+import time
+
+from ._devfiles_ignore import IgnoreMatcher
+from ._devfiles_scan import DirectoryEntry, ParallelSourceScanner
+
+
+# Implemented the persistent incremental source index (per-directory mtime invalidation)
+
+
+class SourceIndex:
+    """
+    On-disk cache of a source scan. Each directory stores its mtime, the source files and the subdirectories found in it.
+    A rescan only lists directories whose mtime changed and reuses the cached entries for the rest.
+    """
+
+    _FORMAT_VERSION = 2
+
+    # directories modified this close to the save time are not trusted (mtime granularity)
+    _RACY_MTIME_WINDOW_NS = 2_000_000_000
+
+    def __init__(self,
+                 index_file_path: str,
+                 source_extensions: tuple[str, ...],
+                 ignore_patterns: list[str],
+                 use_gitignore: bool=False
+    ):
+        """
+        :param index_file_path: full path to the index file
+        :param source_extensions: file extensions considered source files
+        :param ignore_patterns: gitignore-style patterns of the directories and files to ignore
+        :param use_gitignore: `True` to also apply the `.gitignore` files found in the tree
+        """
+
+        self._index_file_path = index_file_path
+        self._source_extensions = source_extensions
+        self._ignore_patterns = ignore_patterns
+        self._use_gitignore = use_gitignore
+        self._last_scanner: ParallelSourceScanner = None
+
+    @property
+    def last_scanner(self) -> ParallelSourceScanner:
+        """
+        Scanner used by the last `get_source_files` call (for statistics)
+        """
+        return self._last_scanner
+
+    def get_source_files(self, dir_path: str, force_rescan: bool=False, max_workers: int=None) -> list[str]:
+        """
+        Scan the tree reusing unchanged directories from the index, then save the updated index
+
+        :param dir_path: root directory of the tree
+        :param force_rescan: `True` to ignore the stored index and list every directory again
+        :param max_workers: maximum number of scanning threads (default based on cpu count)
+        :returns list[str]: A sorted list of relative paths to source files
+        """
+
+        cached_dirs = {} if force_rescan else self._load()
+
+        self._last_scanner = ParallelSourceScanner(self._source_extensions,
+                                                   IgnoreMatcher(self._ignore_patterns),
+                                                   max_workers,
+                                                   cached_dirs,
+                                                   self._use_gitignore
+                                                   )
+        src_files = self._last_scanner.scan(dir_path)
+
+        self._save(self._last_scanner.scanned_dirs)
+        return src_files
+
+    def _get_settings_key(self) -> list:
+        # a change in extensions or ignore rules invalidates the whole index (pattern order matters)
+        return [sorted(self._source_extensions), list(self._ignore_patterns), self._use_gitignore]
+
+    def _load(self) -> dict[str, DirectoryEntry]:
+        try:
+            with open(self._index_file_path, "r") as index_file:
+                index_data = json.load(index_file)
+        except (OSError, ValueError):
+            return {}
+
+        if (not isinstance(index_data, dict)
+            or index_data.get("version") != SourceIndex._FORMAT_VERSION
+            or index_data.get("settings") != self._get_settings_key()):
+            return {}
+
+        try:
+            return {prefix: DirectoryEntry(mtime_ns, file_names, subdir_names, gitignore_mtime_ns)
+                    for prefix, (mtime_ns, file_names, subdir_names, gitignore_mtime_ns) in index_data["dirs"].items()}
+        except (KeyError, TypeError, ValueError):
+            return {}
+
+    def _save(self, scanned_dirs: dict[str, DirectoryEntry]) -> None:
+        racy_limit_ns = time.time_ns() - SourceIndex._RACY_MTIME_WINDOW_NS
+
+        index_data = {
+            "version": SourceIndex._FORMAT_VERSION,
+            "settings": self._get_settings_key(),
+            "dirs": {prefix: [entry.mtime_ns, entry.file_names, entry.subdir_names, entry.gitignore_mtime_ns]
+                     for prefix, entry in scanned_dirs.items()
+                     if 0 <= entry.mtime_ns < racy_limit_ns and entry.gitignore_mtime_ns < racy_limit_ns}
+        }
+
+        # write to a temporary file first so an interrupted save never leaves a corrupted index
+        os.makedirs(os.path.dirname(self._index_file_path), exist_ok=True)
+        temp_file_path = f"{self._index_file_path}.tmp"
+        with open(temp_file_path, "w") as index_file:
+            json.dump(index_data, index_file, separators=(",", ":"))
+        os.replace(temp_file_path, self._index_file_path)
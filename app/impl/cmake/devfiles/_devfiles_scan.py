@@ -0,0 +1,191 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from ._devfiles_ignore import IgnoreMatcher, get_gitignore_file_path
+
+
+# Implemented the parallel os.scandir based source discovery engine
+
+
+class DirectoryEntry:
+    """
+    Listing of a single directory: modification time, matching source file names, subdirectories to descend
+    and modification time of its `.gitignore` file (-1 if none)
+    """
+
+    __slots__ = ("mtime_ns", "file_names", "subdir_names", "gitignore_mtime_ns")
+
+    def __init__(self, mtime_ns: int, file_names: list[str], subdir_names: list[str], gitignore_mtime_ns: int=-1):
+        self.mtime_ns = mtime_ns
+        self.file_names = file_names
+        self.subdir_names = subdir_names
+        self.gitignore_mtime_ns = gitignore_mtime_ns
+
+
+def _get_default_worker_count() -> int:
+    # scanning is I/O bound: use more threads than cores, but keep the pool bounded
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+class ParallelSourceScanner:
+    """
+    Walks a directory tree with `os.scandir` using a bounded thread pool (one task per directory).
+    Relative paths are built incrementally from the parent directory prefix instead of using `os.path.relpath`.
+    Ignored directories are pruned before being descended into.
+    """
+
+    def __init__(self,
+                 source_extensions: tuple[str, ...],
+                 ignore_matcher: IgnoreMatcher,
+                 max_workers: int=None,
+                 cached_dirs: dict[str, DirectoryEntry]=None,
+                 use_gitignore: bool=False
+    ):
+        """
+        :param source_extensions: file extensions considered source files
+        :param ignore_matcher: matcher for the directories and files to ignore
+        :param max_workers: maximum number of scanning threads (default based on cpu count)
+        :param cached_dirs: previous scan results by relative prefix; directories with unchanged mtime are not listed again
+        :param use_gitignore: `True` to also apply the `.gitignore` files found in the tree
+        """
+
+        self._source_extensions = source_extensions
+        self._ignore_matcher = ignore_matcher
+        self._use_gitignore = use_gitignore
+        self._max_workers = max_workers or _get_default_worker_count()
+        self._cached_dirs = cached_dirs or {}
+        self._scanned_dirs: dict[str, DirectoryEntry] = {}
+        self._reused_dirs_count = 0
+        self._files_count = 0
+        self._dirs_count = 0
+        self._elapsed_seconds = 0.0
+
+    @property
+    def files_count(self) -> int:
+        return self._files_count
+
+    @property
+    def dirs_count(self) -> int:
+        return self._dirs_count
+
+    @property
+    def reused_dirs_count(self) -> int:
+        return self._reused_dirs_count
+
+    @property
+    def scanned_dirs(self) -> dict[str, DirectoryEntry]:
+        """
+        Directory entries of the last scan by relative prefix (can be passed as `cached_dirs` for the next scan)
+        """
+        return self._scanned_dirs
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return self._elapsed_seconds
+
+    @property
+    def files_per_second(self) -> float:
+        return self._files_count / self._elapsed_seconds if self._elapsed_seconds > 0 else 0.0
+
+    def scan(self, dir_path: str) -> list[str]:
+        """
+        :param dir_path: root directory of the tree
+        :returns list[str]: sorted list of POSIX-style relative paths to source files
+        """
+
+        start_time = time.perf_counter()
+        src_files: list[str] = []
+        self._dirs_count = 0
+        self._reused_dirs_count = 0
+        self._scanned_dirs = {}
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            pending = {executor.submit(self._scan_dir, dir_path, "", self._ignore_matcher, True)}
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    dir_path_done, relative_prefix, entry, reused, matcher, trust_cache = future.result()
+                    self._dirs_count += 1
+                    self._reused_dirs_count += reused
+                    self._scanned_dirs[relative_prefix] = entry
+                    src_files.extend(f"{relative_prefix}{name}" for name in entry.file_names)
+
+                    for subdir_name in entry.subdir_names:
+                        pending.add(executor.submit(self._scan_dir,
+                                                    os.path.join(dir_path_done, subdir_name),
+                                                    f"{relative_prefix}{subdir_name}/",
+                                                    matcher,
+                                                    trust_cache))
+
+        src_files.sort()
+
+        self._files_count = len(src_files)
+        self._elapsed_seconds = time.perf_counter() - start_time
+        return src_files
+
+    def _scan_dir(self,
+                  dir_path: str,
+                  relative_prefix: str,
+                  matcher: IgnoreMatcher,
+                  trust_cache: bool
+    ) -> tuple[str, str, DirectoryEntry, bool, IgnoreMatcher, bool]:
+        """
+        :param dir_path: full path to the directory to list
+        :param relative_prefix: relative path of the directory (empty or ending with '/')
+        :param matcher: ignore matcher inherited from the parent directory
+        :param trust_cache: `False` if the ignore rules of a parent directory changed since the cached scan
+        :returns tuple: (full path, relative prefix, directory entry, `True` if the entry was reused from cache,
+        matcher and cache trust for the subdirectories)
+        """
+
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            # same behavior as os.walk: unreadable directories are skipped
+            return dir_path, relative_prefix, DirectoryEntry(-1, [], []), False, matcher, trust_cache
+
+        gitignore_mtime_ns = -1
+        if self._use_gitignore:
+            gitignore_file_path = get_gitignore_file_path(dir_path)
+            try:
+                gitignore_mtime_ns = os.stat(gitignore_file_path).st_mtime_ns
+            except OSError:
+                pass
+            else:
+                matcher = matcher.with_gitignore_file(gitignore_file_path, relative_prefix)
+
+        cached_entry = self._cached_dirs.get(relative_prefix) if trust_cache else None
+        if cached_entry is not None:
+            if cached_entry.gitignore_mtime_ns != gitignore_mtime_ns:
+                # ignore rules changed: everything below must be listed again
+                trust_cache = False
+            elif cached_entry.mtime_ns == mtime_ns:
+                return dir_path, relative_prefix, cached_entry, True, matcher, trust_cache
+
+        file_names: list[str] = []
+        subdir_names: list[str] = []
+
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+
+                    if is_dir:
+                        # same behavior as os.walk: symlinked directories are not followed
+                        if not entry.is_symlink() and not matcher.is_ignored(f"{relative_prefix}{entry.name}", True):
+                            subdir_names.append(entry.name)
+                    elif entry.name.endswith(self._source_extensions):
+                        if not matcher.is_ignored(f"{relative_prefix}{entry.name}", False):
+                            file_names.append(entry.name)
+                    # ignore any other files
+        except OSError:
+            mtime_ns = -1
+
+        return (dir_path, relative_prefix, DirectoryEntry(mtime_ns, file_names, subdir_names, gitignore_mtime_ns),
+                False, matcher, trust_cache)
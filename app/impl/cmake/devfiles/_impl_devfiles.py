@@ -1,15 +1,83 @@
+import hashlib
 import os
+import time
+
+from ._devfiles_ignore import IgnoreMatcher, get_gitignore_file_path
+from ._devfiles_scan import ParallelSourceScanner
+from ._devfiles_index import SourceIndex
+from ._devfiles_git import GitIndexError, find_git_top_dir, read_git_index, list_git_files
 
 
 __all__ = ["get_cmakelists_file_path",
+           "get_build_root_dir_path",
            "get_build_dir_path",
-           "get_project_source_files"
+           "get_pyforge_dir_path",
+           "get_configure_settings_file_path",
+           "get_sources_fragment_file_name",
+           "get_unity_fragment_file_name",
+           "get_components_fragment_file_name",
+           "get_file_sizes",
+           "get_include_graph_file_path",
+           "get_compiler_cache_dir_name",
+           "get_artifact_cache_dir_name",
+           "get_file_hashes_file_path",
+           "get_build_output_dir_names",
+           "get_linker_probe_file_path",
+           "get_link_times_file_path",
+           "get_job_memory_file_path",
+           "get_edge_times_file_path",
+           "get_build_report_file_path",
+           "get_time_trace_build_dir_path",
+           "get_time_trace_include_file_path",
+           "get_compile_time_report_file_path",
+           "get_matrix_build_root_dir_path",
+           "get_matrix_build_dir_path",
+           "get_pgo_build_dir_path",
+           "get_pgo_raw_profile_dir_path",
+           "get_pgo_profiles_dir_path",
+           "get_pgo_file_hashes_file_path",
+           "write_file_if_changed",
+           "get_source_file_extensions",
+           "get_header_file_extensions",
+           "get_project_ignore_patterns",
+           "create_project_ignore_matcher",
+           "get_project_source_files",
+           "get_indexed_project_source_files",
+           "get_git_project_source_files",
+           "get_project_input_files",
+           "measure_project_source_discovery"
            ]
 
 
 _SOURCE_EXTENSIONS = (".c", ".cpp", ".cxx", ".cc")
+_HEADER_EXTENSIONS = (".h", ".hpp", ".hxx", ".hh", ".inl", ".ipp", ".tpp")
 _CMAKELISTS_FILE_NAME = "CMakeLists.txt"
+_SOURCES_FRAGMENT_FILE_NAME = "sources.cmake"
+_UNITY_FRAGMENT_FILE_NAME = "unity.cmake"
+_COMPONENTS_FRAGMENT_FILE_NAME = "components.cmake"
 _PROJECT_BUILD_DIR_NAME = "build"
+_PYFORGE_DIR_NAME = ".pyforge"
+_SOURCE_INDEX_FILE_NAME = "source_index.json"
+_INCLUDE_GRAPH_FILE_NAME = "include_graph.json"
+_COMPILER_CACHE_DIR_NAME = "compiler_cache"
+_ARTIFACT_CACHE_DIR_NAME = "artifacts"
+_FILE_HASHES_FILE_NAME = "file_hashes.json"
+_LINKER_PROBE_FILE_NAME = "linker_probe.json"
+_LINK_TIMES_FILE_NAME = "link_times.json"
+_JOB_MEMORY_FILE_NAME = "job_memory.json"
+_EDGE_TIMES_FILE_NAME = "edge_times.json"
+_BUILD_REPORTS_DIR_NAME = "build_reports"
+_BUILD_OUTPUT_DIR_NAMES = ("bin", "lib")   # set in the generated CMakeLists.txt
+_CONFIGURE_SETTINGS_FILE_NAME = "pyforge_configure.json"
+_TIME_TRACE_DIR_NAME = "time_trace"
+_TIME_TRACE_BUILD_DIR_NAME = "build"
+_TIME_TRACE_INCLUDE_FILE_NAME = "time_trace.cmake"
+_MATRIX_DIR_NAME = "matrix"
+_MATRIX_BUILD_DIR_NAME = "build"
+_PGO_DIR_NAME = "pgo"
+_PGO_BUILD_DIR_NAME = "build"
+_PGO_RAW_PROFILE_DIR_NAME = "raw"
+_PGO_PROFILES_DIR_NAME = "profiles"
 
 
 # ==========================================================================================================================
@@ -24,21 +92,469 @@ def get_cmakelists_file_path(project_root_path: str) -> str:
     return os.path.join(project_root_path, _CMAKELISTS_FILE_NAME).replace("\\", "/")
 
 
-def get_build_dir_path(project_root_path: str) -> str:
+def get_sources_fragment_file_name() -> str:
+    """
+    :returns str: name of the cmake fragment holding the project sources list (next to CMakeLists.txt)
+    """
+    return _SOURCES_FRAGMENT_FILE_NAME
+
+
+def get_unity_fragment_file_name() -> str:
+    """
+    :returns str: name of the cmake fragment holding the unity build batches (next to CMakeLists.txt)
+    """
+    return _UNITY_FRAGMENT_FILE_NAME
+
+
+def get_components_fragment_file_name() -> str:
+    """
+    :returns str: name of the cmake fragment holding the component libraries (next to CMakeLists.txt)
+    """
+    return _COMPONENTS_FRAGMENT_FILE_NAME
+
+
+def get_build_root_dir_path(project_root_path: str) -> str:
     """
     :param project_root_path: full path to the project
-    :returns str: full path to the build directory
+    :returns str: full path to the directory holding the build directory of each build type
     """
     return os.path.join(project_root_path, _PROJECT_BUILD_DIR_NAME).replace("\\", "/")
 
 
-def get_project_source_files(dir_path: str, ignored_dirs: list[str]) -> list[str]:
+def get_build_dir_path(project_root_path: str, build_type_name: str) -> str:
+    """
+    Each build type has its own build directory, so switching between them is an incremental build
+
+    :param project_root_path: full path to the project
+    :param build_type_name: value of `CMAKE_BUILD_TYPE` (`Debug`, `Release`)
+    :returns str: full path to the build directory of the build type
+    """
+    return os.path.join(get_build_root_dir_path(project_root_path), build_type_name).replace("\\", "/")
+
+
+def get_configure_settings_file_path(build_dir_path: str) -> str:
+    """
+    Kept inside the build directory: it describes the cmake cache next to it and goes away with it
+
+    :param build_dir_path: full path to the build directory (of a build type or of a matrix cell)
+    :returns str: full path to the settings the build directory was configured with
+    """
+    return os.path.join(build_dir_path, _CONFIGURE_SETTINGS_FILE_NAME).replace("\\", "/")
+
+
+def get_pyforge_dir_path(project_root_path: str) -> str:
+    """
+    Directory holding PyForge state that must survive a build directory wipe (never scanned for sources)
+
+    :param project_root_path: full path to the project
+    :returns str: full path to the PyForge state directory
+    """
+    return os.path.join(project_root_path, _PYFORGE_DIR_NAME).replace("\\", "/")
+
+
+def get_include_graph_file_path(project_root_path: str) -> str:
+    """
+    :param project_root_path: full path to the project
+    :returns str: full path to the persisted include graph
+    """
+    return os.path.join(get_pyforge_dir_path(project_root_path), _INCLUDE_GRAPH_FILE_NAME).replace("\\", "/")
+
+
+def get_compiler_cache_dir_name() -> str:
+    """
+    :returns str: default compiler cache directory, relative to the project (inside the PyForge state directory)
+    """
+    return f"{_PYFORGE_DIR_NAME}/{_COMPILER_CACHE_DIR_NAME}"
+
+
+def get_artifact_cache_dir_name() -> str:
+    """
+    :returns str: default artifact cache directory, relative to the project (inside the PyForge state directory)
+    """
+    return f"{_PYFORGE_DIR_NAME}/{_ARTIFACT_CACHE_DIR_NAME}"
+
+
+def get_file_hashes_file_path(project_root_path: str) -> str:
+    """
+    :param project_root_path: full path to the project
+    :returns str: full path to the persisted content digests of the project files
+    """
+    return os.path.join(get_pyforge_dir_path(project_root_path), _FILE_HASHES_FILE_NAME).replace("\\", "/")
+
+
+def get_build_output_dir_names() -> list[str]:
+    """
+    :returns list[str]: directories of the build directory holding the executables and libraries
+    """
+    return list(_BUILD_OUTPUT_DIR_NAMES)
+
+
+def get_linker_probe_file_path(project_root_path: str) -> str:
+    """
+    :param project_root_path: full path to the project
+    :returns str: full path to the persisted fast linker probe results (by compiler)
+    """
+    return os.path.join(get_pyforge_dir_path(project_root_path), _LINKER_PROBE_FILE_NAME).replace("\\", "/")
+
+
+def get_link_times_file_path(project_root_path: str) -> str:
+    """
+    :param project_root_path: full path to the project
+    :returns str: full path to the persisted link times of each build mode
+    """
+    return os.path.join(get_pyforge_dir_path(project_root_path), _LINK_TIMES_FILE_NAME).replace("\\", "/")
+
+
+def get_job_memory_file_path(project_root_path: str) -> str:
+    """
+    :param project_root_path: full path to the project
+    :returns str: full path to the persisted peak memory of the build processes of each build type
+    """
+    return os.path.join(get_pyforge_dir_path(project_root_path), _JOB_MEMORY_FILE_NAME).replace("\\", "/")
+
+
+def get_edge_times_file_path(project_root_path: str) -> str:
+    """
+    :param project_root_path: full path to the project
+    :returns str: full path to the persisted duration of each build step of each build type
+    """
+    return os.path.join(get_pyforge_dir_path(project_root_path), _EDGE_TIMES_FILE_NAME).replace("\\", "/")
+
+
+def get_build_report_file_path(project_root_path: str, build_type_name: str) -> str:
+    """
+    :param project_root_path: full path to the project
+    :param build_type_name: value of `CMAKE_BUILD_TYPE` (`Debug`, `Release`)
+    :returns str: full path to the report of the last build of the build type (json)
+    """
+    return os.path.join(get_pyforge_dir_path(project_root_path), _BUILD_REPORTS_DIR_NAME, f"{build_type_name}.json").replace("\\", "/")
+
+
+def get_time_trace_build_dir_path(project_root_path: str, build_type_name: str) -> str:
+    """
+    :param project_root_path: full path to the project
+    :param build_type_name: value of `CMAKE_BUILD_TYPE` (`Debug`)
+    :returns str: full path to the build directory compiled with the compile time traces for the build type
+    """
+    return os.path.join(get_pyforge_dir_path(project_root_path), _TIME_TRACE_DIR_NAME, _TIME_TRACE_BUILD_DIR_NAME, build_type_name).replace("\\", "/")
+
+
+def get_time_trace_include_file_path(project_root_path: str) -> str:
+    """
+    :param project_root_path: full path to the project
+    :returns str: full path to the cmake file adding the compile time trace options (only included by the time trace build directories)
+    """
+    return os.path.join(get_pyforge_dir_path(project_root_path), _TIME_TRACE_DIR_NAME, _TIME_TRACE_INCLUDE_FILE_NAME).replace("\\", "/")
+
+
+def get_compile_time_report_file_path(project_root_path: str, build_type_name: str) -> str:
     """
-    Walks a directory tree, skipping ignored directories.
+    :param project_root_path: full path to the project
+    :param build_type_name: value of `CMAKE_BUILD_TYPE` (`Debug`)
+    :returns str: full path to the last compile time report of the build type (json)
+    """
+    return os.path.join(get_pyforge_dir_path(project_root_path), _TIME_TRACE_DIR_NAME, f"{build_type_name}.json").replace("\\", "/")
+
+
+def get_matrix_build_root_dir_path(project_root_path: str) -> str:
+    """
+    :param project_root_path: full path to the project
+    :returns str: full path to the directory holding the build directories of the matrix cells
+    """
+    return os.path.join(get_pyforge_dir_path(project_root_path), _MATRIX_DIR_NAME, _MATRIX_BUILD_DIR_NAME).replace("\\", "/")
+
+
+def get_matrix_build_dir_path(project_root_path: str, cell_name: str) -> str:
+    """
+    Each cell (compiler and build type) of the build matrix has its own build directory, kept between runs
+
+    :param project_root_path: full path to the project
+    :param cell_name: name of the matrix cell (`g++-Release`)
+    :returns str: full path to the build directory of the matrix cell
+    """
+    return os.path.join(get_matrix_build_root_dir_path(project_root_path), cell_name).replace("\\", "/")
+
+
+def get_pgo_build_dir_path(project_root_path: str, build_type_name: str) -> str:
+    """
+    :param project_root_path: full path to the project
+    :param build_type_name: value of `CMAKE_BUILD_TYPE` (`Release`)
+    :returns str: full path to the build directory of the PGO instrumented binaries of the build type
+    """
+    return os.path.join(get_pyforge_dir_path(project_root_path), _PGO_DIR_NAME, _PGO_BUILD_DIR_NAME, build_type_name).replace("\\", "/")
+
+
+def get_pgo_raw_profile_dir_path(project_root_path: str) -> str:
+    """
+    :param project_root_path: full path to the project
+    :returns str: full path to the directory written by the PGO instrumented binaries during training
+    """
+    return os.path.join(get_pyforge_dir_path(project_root_path), _PGO_DIR_NAME, _PGO_RAW_PROFILE_DIR_NAME).replace("\\", "/")
+
+
+def get_pgo_profiles_dir_path(project_root_path: str) -> str:
+    """
+    :param project_root_path: full path to the project
+    :returns str: full path to the versioned PGO profiles
+    """
+    return os.path.join(get_pyforge_dir_path(project_root_path), _PGO_DIR_NAME, _PGO_PROFILES_DIR_NAME).replace("\\", "/")
+
+
+def get_pgo_file_hashes_file_path(project_root_path: str) -> str:
+    """
+    :param project_root_path: full path to the project
+    :returns str: full path to the persisted content digests used to measure the drift of the PGO profiles
+    """
+    return os.path.join(get_pyforge_dir_path(project_root_path), _PGO_DIR_NAME, _FILE_HASHES_FILE_NAME).replace("\\", "/")
+
+
+def write_file_if_changed(file_path: str, content: str) -> bool:
+    """
+    Replace the file atomically only if its content hash differs (the mtime of an identical file is kept)
+
+    :param file_path: full path to the file
+    :param content: new text content (written with LF line endings)
+    :returns bool: `True` if the file was written
+    """
+
+    new_content = content.encode("utf-8")
+
+    try:
+        with open(file_path, "rb") as current_file:
+            if hashlib.sha256(current_file.read()).digest() == hashlib.sha256(new_content).digest():
+                return False
+    except OSError:
+        # missing or unreadable: write it
+        pass
+
+    temp_file_path = f"{file_path}.tmp"
+    with open(temp_file_path, "wb") as temp_file:
+        temp_file.write(new_content)
+    os.replace(temp_file_path, file_path)
+    return True
+
+
+def get_file_sizes(project_root_path: str, relative_paths: list[str]) -> list[tuple[str, int]]:
+    """
+    :param project_root_path: full path to the project
+    :param relative_paths: relative paths to files
+    :returns list[tuple[str, int]]: pairs (relative path, size in bytes); missing files have size 0
+    """
+
+    file_sizes = []
+    for relative_path in relative_paths:
+        try:
+            size = os.stat(os.path.join(project_root_path, relative_path)).st_size
+        except OSError:
+            size = 0
+        file_sizes.append((relative_path, size))
+    return file_sizes
+
+
+def get_source_file_extensions() -> tuple[str, ...]:
+    """
+    :returns tuple[str, ...]: extensions of the files compiled as sources
+    """
+    return _SOURCE_EXTENSIONS
+
+
+def get_header_file_extensions() -> tuple[str, ...]:
+    """
+    :returns tuple[str, ...]: extensions of the files considered headers
+    """
+    return _HEADER_EXTENSIONS
+
+
+def get_project_ignore_patterns(ignore_patterns: list[str]) -> list[str]:
+    """
+    :param ignore_patterns: gitignore-style patterns set by the user
+    :returns list[str]: user patterns and the PyForge state directory
+    """
+    return [*ignore_patterns, _PYFORGE_DIR_NAME]
+
+
+def create_project_ignore_matcher(project_root_path: str, ignore_patterns: list[str], use_gitignore: bool=False) -> IgnoreMatcher:
+    """
+    Compile the ignore rules of the project root once (nested `.gitignore` files are not included)
+
+    :param project_root_path: full path to the project
+    :param ignore_patterns: gitignore-style patterns set by the user
+    :param use_gitignore: `True` to also apply the root `.gitignore` file
+    :returns IgnoreMatcher: matcher for POSIX-style paths relative to the project root
+    """
+
+    matcher = IgnoreMatcher(get_project_ignore_patterns(ignore_patterns))
+    if use_gitignore:
+        matcher = matcher.with_gitignore_file(get_gitignore_file_path(project_root_path), "")
+    return matcher
+
+
+def get_project_source_files(dir_path: str,
+                             ignore_patterns: list[str],
+                             max_workers: int=None,
+                             use_gitignore: bool=False
+) -> list[str]:
+    """
+    Walks a directory tree in parallel, skipping ignored directories and files.
+
+    :param dir_path: root directory of the tree
+    :param ignore_patterns: gitignore-style patterns of the directories and files to ignore (`name`, `*.ext`, `a/*/b`, `**/dir/`, `!name`)
+    :param max_workers: maximum number of scanning threads (default based on cpu count)
+    :param use_gitignore: `True` to also apply the `.gitignore` files found in the tree
+    :returns list[str]: A sorted list of relative paths to source files
+    """
+
+    scanner = ParallelSourceScanner(_SOURCE_EXTENSIONS, IgnoreMatcher(ignore_patterns), max_workers, use_gitignore=use_gitignore)
+    return scanner.scan(dir_path)
+
+
+def get_indexed_project_source_files(project_root_path: str,
+                                     ignore_patterns: list[str],
+                                     force_rescan: bool=False,
+                                     use_gitignore: bool=False
+) -> list[str]:
+    """
+    Same as `get_project_source_files`, but only lists directories whose mtime changed since the previous call.
+    The index is stored in the PyForge state directory of the project.
+
+    :param project_root_path: full path to the project
+    :param ignore_patterns: gitignore-style patterns of the directories and files to ignore
+    :param force_rescan: `True` to discard the stored index and list every directory again
+    :param use_gitignore: `True` to also apply the `.gitignore` files found in the tree
+    :returns list[str]: A sorted list of relative paths to source files
+    """
+
+    index_file_path = os.path.join(get_pyforge_dir_path(project_root_path), _SOURCE_INDEX_FILE_NAME)
+    source_index = SourceIndex(index_file_path, _SOURCE_EXTENSIONS, get_project_ignore_patterns(ignore_patterns), use_gitignore)
+    return source_index.get_source_files(project_root_path, force_rescan)
+
+
+def get_git_project_source_files(project_root_path: str,
+                                 ignore_patterns: list[str],
+                                 include_untracked: bool=False,
+                                 force_rescan: bool=False,
+                                 use_gitignore: bool=False
+) -> list[str]:
+    """
+    Enumerate source files from the git index instead of walking the disk.
+    Reads `.git/index` directly when possible, else uses `git ls-files -z`.
+    Falls back to `get_indexed_project_source_files` when the project is not a git repository (or git can't be used).
+
+    :param project_root_path: full path to the project (can be a subdirectory of the work tree)
+    :param ignore_patterns: gitignore-style patterns of the directories and files to ignore
+    :param include_untracked: `True` to merge untracked files that are not ignored by git (requires git)
+    :param force_rescan: `True` to discard the stored index of the filesystem fallback
+    :param use_gitignore: `True` to also apply the root `.gitignore` file
+    :returns list[str]: A sorted list of relative paths to source files
+    """
+
+    try:
+        git_files = _get_git_files(project_root_path, include_untracked)
+    except GitIndexError:
+        return get_indexed_project_source_files(project_root_path, ignore_patterns, force_rescan, use_gitignore)
+
+    matcher = create_project_ignore_matcher(project_root_path, ignore_patterns, use_gitignore)
+    ignored_dirs_cache: dict[str, bool] = {"": False}
+    src_files = []
+
+    for relative_path in git_files:
+        if not relative_path.endswith(_SOURCE_EXTENSIONS):
+            continue
+
+        if _is_dir_ignored(matcher, relative_path.rpartition("/")[0], ignored_dirs_cache):
+            continue
+
+        if matcher.is_ignored(relative_path, False):
+            continue
+
+        src_files.append(relative_path)
+
+    # a file deleted without staging the deletion is still in the index
+    src_files = _drop_deleted_files(project_root_path, src_files)
+    src_files.sort()
+    return src_files
+
+
+def get_project_input_files(project_root_path: str,
+                            ignore_patterns: list[str],
+                            use_gitignore: bool=False,
+                            extra_dir_names: list[str]=None
+) -> list[str]:
+    """
+    Every file a build reads from the project: sources and headers (not ignored), the generated cmake files
+    and the headers of `extra_dir_names` (searched even if ignored, like imported libraries include directories)
+
+    :param project_root_path: full path to the project
+    :param ignore_patterns: gitignore-style patterns of the directories and files to ignore
+    :param use_gitignore: `True` to also apply the `.gitignore` files found in the tree
+    :param extra_dir_names: relative paths to directories whose headers are added
+    :returns list[str]: A sorted list of relative paths
+    """
+
+    input_extensions = _SOURCE_EXTENSIONS + _HEADER_EXTENSIONS
+    input_files = ParallelSourceScanner(input_extensions, IgnoreMatcher(get_project_ignore_patterns(ignore_patterns)), use_gitignore=use_gitignore).scan(project_root_path)
+
+    for extra_dir_name in extra_dir_names or []:
+        extra_dir_path = os.path.join(project_root_path, extra_dir_name)
+        if os.path.isdir(extra_dir_path):
+            extra_prefix = os.path.normpath(extra_dir_name).replace("\\", "/")
+            input_files += [f"{extra_prefix}/{relative_path}" for relative_path in ParallelSourceScanner(_HEADER_EXTENSIONS, IgnoreMatcher()).scan(extra_dir_path)]
+
+    for file_name in (_CMAKELISTS_FILE_NAME, _SOURCES_FRAGMENT_FILE_NAME, _UNITY_FRAGMENT_FILE_NAME, _COMPONENTS_FRAGMENT_FILE_NAME):
+        if os.path.isfile(os.path.join(project_root_path, file_name)):
+            input_files.append(file_name)
+
+    return sorted(set(input_files))
+
+
+def measure_project_source_discovery(dir_path: str, ignored_dirs: list[str], max_workers: int=None, rounds: int=3) -> dict[str, float]:
+    """
+    Run both the sequential `os.walk` walker and the parallel scanner on the same tree.
+    An untimed pass warms the filesystem cache first, then the walkers alternate their order each round
+    (neither one always runs first) and the best round of each is kept.
 
     :param dir_path: root directory of the tree
     :param ignored_dirs: name of the directories to ignore (recursive)
-    :returns list[str]: A list of relative paths to source files
+    :param max_workers: maximum number of scanning threads for the parallel scanner
+    :param rounds: timed runs of each walker
+    :returns dict[str, float]: files/sec for each walker (keys: `walk`, `scandir`) and the number of files found (`files`)
+    """
+
+    scanner = ParallelSourceScanner(_SOURCE_EXTENSIONS, IgnoreMatcher(ignored_dirs), max_workers)
+
+    def _time_walk() -> float:
+        start_time = time.perf_counter()
+        _walk_project_source_files(dir_path, ignored_dirs)
+        return time.perf_counter() - start_time
+
+    def _time_scan() -> float:
+        start_time = time.perf_counter()
+        scanner.scan(dir_path)
+        return time.perf_counter() - start_time
+
+    files_count = len(_walk_project_source_files(dir_path, ignored_dirs))
+    best_seconds = {"walk": float("inf"), "scandir": float("inf")}
+
+    for round_index in range(max(1, rounds)):
+        timed_walkers = [("walk", _time_walk), ("scandir", _time_scan)]
+        if round_index % 2:
+            timed_walkers.reverse()
+        for name, time_walker in timed_walkers:
+            best_seconds[name] = min(best_seconds[name], time_walker())
+
+    return {"files": files_count,
+            "walk": files_count / best_seconds["walk"] if best_seconds["walk"] > 0 else 0.0,
+            "scandir": files_count / best_seconds["scandir"] if best_seconds["scandir"] > 0 else 0.0
+            }
+
+
+def _walk_project_source_files(dir_path: str, ignored_dirs: list[str]) -> list[str]:
+    """
+    Sequential reference walker (kept for comparison with the parallel scanner).
+
+    :param dir_path: root directory of the tree
+    :param ignored_dirs: name of the directories to ignore (recursive)
+    :returns list[str]: A sorted list of relative paths to source files
     """
 
     src_files = []
@@ -53,4 +569,71 @@ def get_project_source_files(dir_path: str, ignored_dirs: list[str]) -> list[str
                 src_files.append(relative_path)
             # ignore any other files
 
+    src_files.sort()
     return src_files
+
+
+def _get_git_files(project_root_path: str, include_untracked: bool) -> list[str]:
+    """
+    :raises GitIndexError: if the git index can't be used
+    """
+
+    if include_untracked:
+        # untracked files are only known by git
+        find_git_top_dir(project_root_path)
+        return list_git_files(project_root_path, include_tracked=True, include_untracked=True)
+
+    top_dir_path, git_dir_path = find_git_top_dir(project_root_path)
+
+    try:
+        git_files = read_git_index(git_dir_path)
+    except GitIndexError:
+        return list_git_files(project_root_path, include_tracked=True, include_untracked=False)
+
+    # index paths are relative to the work tree top directory
+    relative_root = os.path.relpath(os.path.abspath(project_root_path), top_dir_path).replace("\\", "/")
+    if relative_root == ".":
+        return git_files
+
+    prefix = relative_root + "/"
+    return [path[len(prefix):] for path in git_files if path.startswith(prefix)]
+
+
+def _drop_deleted_files(project_root_path: str, relative_paths: list[str]) -> list[str]:
+    """
+    Keep the files still on disk: one directory listing per directory instead of one stat per file
+    """
+
+    file_names_by_dir: dict[str, set[str]] = {}
+    existing_paths: list[str] = []
+
+    for relative_path in relative_paths:
+        relative_dir_path, _, file_name = relative_path.rpartition("/")
+
+        file_names = file_names_by_dir.get(relative_dir_path)
+        if file_names is None:
+            try:
+                with os.scandir(os.path.join(project_root_path, relative_dir_path)) as entries:
+                    file_names = {entry.name for entry in entries if not entry.is_dir()}
+            except OSError:
+                file_names = set()
+            file_names_by_dir[relative_dir_path] = file_names
+
+        if file_name in file_names:
+            existing_paths.append(relative_path)
+
+    return existing_paths
+
+
+def _is_dir_ignored(matcher: IgnoreMatcher, relative_dir_path: str, cache: dict[str, bool]) -> bool:
+    """
+    A directory is ignored if it or any of its parents is ignored (results are cached per directory)
+    """
+
+    ignored = cache.get(relative_dir_path)
+    if ignored is None:
+        parent_dir_path = relative_dir_path.rpartition("/")[0]
+        ignored = _is_dir_ignored(matcher, parent_dir_path, cache) or matcher.is_ignored(relative_dir_path, True)
+        cache[relative_dir_path] = ignored
+
+    return ignored
@@ -0,0 +1,3 @@
+from ._impl_fswatch import *
+
+__all__ = (_impl_fswatch.__all__)
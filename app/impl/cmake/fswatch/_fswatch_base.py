@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from enum import Enum, auto
+
+
+# Implemented the filesystem event source interface (inotify or polling)
+
+
+class ChangeKind(Enum):
+    ADDED = auto()
+    REMOVED = auto()
+    MODIFIED = auto()
+    OVERFLOW = auto()   # events were lost, the whole tree must be considered changed
+
+
+class IEventSource(ABC):
+    """
+    Interface for filesystem event source.
+    Events are pairs of (ChangeKind, relative POSIX-style path). Directory paths end with '/'.
+    """
+
+    @abstractmethod
+    def read_events(self, timeout: float) -> list[tuple[ChangeKind, str]]:
+        """
+        Block at most `timeout` seconds and return the available events (empty list if none)
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
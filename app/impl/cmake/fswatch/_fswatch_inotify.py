@@ -0,0 +1,158 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+from typing import Callable
+
+from ._fswatch_base import ChangeKind, IEventSource
+
+
+# Implemented the Linux inotify event source (through libc, no extra dependencies)
+
+
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+_EVENT_HEADER = struct.Struct("iIII")   # wd, mask, cookie, len
+_READ_BUFFER_SIZE = 1024 * 1024
+
+
+def _load_libc():
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+class InotifyEventSource(IEventSource):
+    """
+    Recursive inotify watcher. One watch is added for each directory that is not ignored.
+    Directories created while watching are added on the fly.
+    """
+
+    def __init__(self,
+                 dir_path: str,
+                 is_ignored: Callable[[str, bool], bool],
+                 watched_extensions: tuple[str, ...]
+    ):
+        """
+        :param dir_path: root directory of the tree
+        :param is_ignored: function(relative path, is directory) returning `True` for the paths to skip
+        :param watched_extensions: file extensions reported as events
+        :raises OSError: if inotify is not available
+        """
+
+        self._dir_path = dir_path
+        self._is_ignored = is_ignored
+        self._watched_extensions = watched_extensions
+        self._libc = _load_libc()
+        self._wd_prefixes: dict[int, str] = {}
+
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+
+        self._add_watch_recursive(dir_path, "", None)
+
+    def read_events(self, timeout: float) -> list[tuple[ChangeKind, str]]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+
+        try:
+            data = os.read(self._fd, _READ_BUFFER_SIZE)
+        except BlockingIOError:
+            return []
+
+        events: list[tuple[ChangeKind, str]] = []
+        offset = 0
+
+        while offset < len(data):
+            wd, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b"\0").decode(errors="surrogateescape")
+            offset += name_len
+
+            if mask & _IN_Q_OVERFLOW:
+                events.append((ChangeKind.OVERFLOW, ""))
+                continue
+
+            if mask & _IN_IGNORED:
+                self._wd_prefixes.pop(wd, None)
+                continue
+
+            prefix = self._wd_prefixes.get(wd)
+            if prefix is None or not name:
+                continue
+
+            if mask & _IN_ISDIR:
+                self._handle_dir_event(mask, prefix, name, events)
+            elif name.endswith(self._watched_extensions) and not self._is_ignored(f"{prefix}{name}", False):
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    events.append((ChangeKind.ADDED, f"{prefix}{name}"))
+                elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                    events.append((ChangeKind.REMOVED, f"{prefix}{name}"))
+                elif mask & _IN_CLOSE_WRITE:
+                    events.append((ChangeKind.MODIFIED, f"{prefix}{name}"))
+
+        return events
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _handle_dir_event(self, mask: int, prefix: str, name: str, events: list[tuple[ChangeKind, str]]) -> None:
+        if self._is_ignored(f"{prefix}{name}", True):
+            return
+
+        if mask & (_IN_CREATE | _IN_MOVED_TO):
+            # files may be created before the watch exists: report everything found while adding it
+            dir_relative_prefix = f"{prefix}{name}/"
+            events.append((ChangeKind.ADDED, dir_relative_prefix))
+            self._add_watch_recursive(os.path.join(self._dir_path, dir_relative_prefix), dir_relative_prefix, events)
+        elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+            events.append((ChangeKind.REMOVED, f"{prefix}{name}/"))
+
+    def _add_watch_recursive(self, dir_path: str, relative_prefix: str, events: list[tuple[ChangeKind, str]] | None) -> None:
+        pending = [(dir_path, relative_prefix)]
+
+        while pending:
+            current_dir_path, current_prefix = pending.pop()
+
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(current_dir_path), _WATCH_MASK)
+            if wd < 0:
+                # directory vanished or watch limit reached: skip it, like an unreadable directory
+                continue
+            self._wd_prefixes[wd] = current_prefix
+
+            try:
+                with os.scandir(current_dir_path) as entries:
+                    for entry in entries:
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False)
+                        except OSError:
+                            is_dir = False
+
+                        if is_dir:
+                            if not self._is_ignored(f"{current_prefix}{entry.name}", True):
+                                pending.append((entry.path, f"{current_prefix}{entry.name}/"))
+                        elif (events is not None
+                              and entry.name.endswith(self._watched_extensions)
+                              and not self._is_ignored(f"{current_prefix}{entry.name}", False)):
+                            events.append((ChangeKind.ADDED, f"{current_prefix}{entry.name}"))
+            except OSError:
+                pass
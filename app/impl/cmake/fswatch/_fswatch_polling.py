@@ -0,0 +1,88 @@
+import os
+import time
+from typing import Callable
+
+from ._fswatch_base import ChangeKind, IEventSource
+
+
+# Implemented the portable polling event source (fallback when inotify is not available)
+
+
+class PollingEventSource(IEventSource):
+    """
+    Takes a snapshot (path -> mtime) of the watched files at a fixed interval and reports the differences
+    """
+
+    def __init__(self,
+                 dir_path: str,
+                 is_ignored: Callable[[str, bool], bool],
+                 watched_extensions: tuple[str, ...],
+                 poll_interval: float=1.0
+    ):
+        """
+        :param dir_path: root directory of the tree
+        :param is_ignored: function(relative path, is directory) returning `True` for the paths to skip
+        :param watched_extensions: file extensions reported as events
+        :param poll_interval: seconds between two snapshots
+        """
+
+        self._dir_path = dir_path
+        self._is_ignored = is_ignored
+        self._watched_extensions = watched_extensions
+        self._poll_interval = poll_interval
+        self._snapshot = self._take_snapshot()
+        self._next_poll_time = time.monotonic() + poll_interval
+
+    def read_events(self, timeout: float) -> list[tuple[ChangeKind, str]]:
+        wait_time = self._next_poll_time - time.monotonic()
+        if wait_time > timeout:
+            time.sleep(timeout)
+            return []
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+        self._next_poll_time = time.monotonic() + self._poll_interval
+
+        new_snapshot = self._take_snapshot()
+        events: list[tuple[ChangeKind, str]] = []
+
+        for path, mtime_ns in new_snapshot.items():
+            old_mtime_ns = self._snapshot.get(path)
+            if old_mtime_ns is None:
+                events.append((ChangeKind.ADDED, path))
+            elif old_mtime_ns != mtime_ns:
+                events.append((ChangeKind.MODIFIED, path))
+
+        for path in self._snapshot.keys() - new_snapshot.keys():
+            events.append((ChangeKind.REMOVED, path))
+
+        self._snapshot = new_snapshot
+        return events
+
+    def close(self) -> None:
+        self._snapshot = {}
+
+    def _take_snapshot(self) -> dict[str, int]:
+        snapshot: dict[str, int] = {}
+        pending = [(self._dir_path, "")]
+
+        while pending:
+            current_dir_path, current_prefix = pending.pop()
+
+            try:
+                with os.scandir(current_dir_path) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if not self._is_ignored(f"{current_prefix}{entry.name}", True):
+                                    pending.append((entry.path, f"{current_prefix}{entry.name}/"))
+                            elif (entry.name.endswith(self._watched_extensions)
+                                  and not self._is_ignored(f"{current_prefix}{entry.name}", False)):
+                                snapshot[f"{current_prefix}{entry.name}"] = entry.stat().st_mtime_ns
+                        except OSError:
+                            # file vanished between listing and stat
+                            pass
+            except OSError:
+                pass
+
+        return snapshot
@@ -0,0 +1,142 @@
+import platform
+import threading
+from typing import Callable
+
+from ._fswatch_base import ChangeKind, IEventSource
+from ._fswatch_inotify import InotifyEventSource
+from ._fswatch_polling import PollingEventSource
+
+
+__all__ = ["ChangeKind",
+           "ChangeBatch",
+           "watch_tree"
+           ]
+
+
+class ChangeBatch:
+    """
+    Coalesced filesystem events collected during one debounce window
+    """
+
+    def __init__(self, source_extensions: tuple[str, ...]):
+        """
+        :param source_extensions: file extensions whose addition/removal changes the project structure
+        """
+
+        self._source_extensions = source_extensions
+        self._added: set[str] = set()
+        self._removed: set[str] = set()
+        self._modified: set[str] = set()
+        self._overflow = False
+
+    @property
+    def events_count(self) -> int:
+        return len(self._added) + len(self._removed) + len(self._modified)
+
+    @property
+    def structure_changed(self) -> bool:
+        """
+        `True` if source files (or directories) were added or removed (the CMakeLists.txt must be generated again)
+        """
+        return self._overflow or any(self._is_structural(path) for path in self._added | self._removed)
+
+    @property
+    def content_changed(self) -> bool:
+        """
+        `True` if existing files were edited or headers were added/removed (an incremental build is needed)
+        """
+        return (self._overflow
+                or bool(self._modified - self._added)
+                or any(not self._is_structural(path) for path in self._added | self._removed))
+
+    def add_events(self, events: list[tuple[ChangeKind, str]]) -> None:
+        for kind, path in events:
+            match kind:
+                case ChangeKind.ADDED:
+                    # removed then added again in the same window: just an edit
+                    if path in self._removed:
+                        self._removed.discard(path)
+                        self._modified.add(path)
+                    else:
+                        self._added.add(path)
+
+                case ChangeKind.REMOVED:
+                    # added then removed in the same window: nothing happened
+                    if path in self._added:
+                        self._added.discard(path)
+                        self._modified.discard(path)
+                    else:
+                        self._removed.add(path)
+
+                case ChangeKind.MODIFIED:
+                    self._modified.add(path)
+
+                case ChangeKind.OVERFLOW:
+                    self._overflow = True
+
+    def _is_structural(self, path: str) -> bool:
+        return path.endswith("/") or path.endswith(self._source_extensions)
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+def _create_event_source(dir_path: str,
+                         is_ignored: Callable[[str, bool], bool],
+                         watched_extensions: tuple[str, ...],
+                         use_polling: bool
+) -> IEventSource:
+    if not use_polling and platform.system() == "Linux":
+        try:
+            return InotifyEventSource(dir_path, is_ignored, watched_extensions)
+        except (OSError, AttributeError):
+            # inotify not available (old libc, no permissions): fall back to polling
+            pass
+
+    return PollingEventSource(dir_path, is_ignored, watched_extensions)
+
+
+def watch_tree(dir_path: str,
+               is_ignored: Callable[[str, bool], bool],
+               source_extensions: tuple[str, ...],
+               header_extensions: tuple[str, ...],
+               on_change: Callable[[ChangeBatch], None],
+               debounce_seconds: float=0.5,
+               stop_event: threading.Event=None,
+               use_polling: bool=False
+) -> None:
+    """
+    Watch a directory tree and call `on_change` once per burst of events.
+    A burst ends when no new event arrives for `debounce_seconds`.
+
+    :param dir_path: root directory of the tree
+    :param is_ignored: function(relative path, is directory) returning `True` for the paths to skip
+    :param source_extensions: file extensions of source files
+    :param header_extensions: file extensions of header files
+    :param on_change: function called with the coalesced events of each burst
+    :param debounce_seconds: quiet period that ends a burst
+    :param stop_event: set it to stop watching (runs until interrupted if `None`)
+    :param use_polling: `True` to force the polling event source
+    """
+
+    event_source = _create_event_source(dir_path, is_ignored, source_extensions + header_extensions, use_polling)
+
+    try:
+        while stop_event is None or not stop_event.is_set():
+            events = event_source.read_events(timeout=debounce_seconds)
+            if not events:
+                continue
+
+            batch = ChangeBatch(source_extensions)
+            batch.add_events(events)
+
+            # keep collecting until the tree is quiet
+            while events:
+                events = event_source.read_events(timeout=debounce_seconds)
+                batch.add_events(events)
+
+            if batch.structure_changed or batch.content_changed:
+                on_change(batch)
+    finally:
+        event_source.close()
@@ -12,6 +12,12 @@ class IGeneratorPart(ABC):
     def run(self, file) -> None:
         pass
 
+    def get_fragments(self) -> dict[str, str]:
+        """
+        :returns dict[str, str]: content of the separate cmake files (by file name) written by this part
+        """
+        return {}
+
 
 class Generator:
     """
@@ -25,5 +31,11 @@ class Generator:
         for part in self._parts:
             part.run(file)
 
+    def get_fragments(self) -> dict[str, str]:
+        fragments: dict[str, str] = {}
+        for part in self._parts:
+            fragments.update(part.get_fragments())
+        return fragments
+
     def add_part(self, part: IGeneratorPart) -> None:
         self._parts.append(part)
@@ -31,6 +31,8 @@ class GeneratorBuilder:
                    language_standard: int,
                    language_standard_required: bool,
                    compiler_extensions_required: bool,
+                   compiler_launcher_program: str=None,
+                   compiler_launcher_env: list[tuple[str, str]]=None
     ) -> None:
         """
         Append Header part to generator
@@ -41,6 +43,8 @@ class GeneratorBuilder:
         :param language_standard: int for C/C++ language standard
         :param language_standard_required: `False` to use lower standard
         :param compiler_extensions_required: `True` to use optional compiler specific extensions
+        :param compiler_launcher_program: name of the program wrapping every compilation (ccache, sccache), searched by cmake
+        :param compiler_launcher_env: pairs of str (first: variable name, second: value) set for the launcher
         """
 
         part = HeaderGeneratorPart(project_name,
@@ -48,10 +52,34 @@ class GeneratorBuilder:
                                    project_language,
                                    language_standard,
                                    language_standard_required,
-                                   compiler_extensions_required
+                                   compiler_extensions_required,
+                                   compiler_launcher_program,
+                                   compiler_launcher_env
                                    )
         self._generator.add_part(part)
 
+    def add_linker_selection(self,
+                             project_language: Language,
+                             linker_names: list[str]
+    ) -> None:
+        """
+        Append Linker Selection part to generator (must be added before the targets)
+
+        :param project_language: language C or CPP
+        :param linker_names: linkers to try in order (`mold`, `lld`, `gold`), the default linker is used if none works
+        """
+
+        part = LinkerSelectionGeneratorPart(project_language, linker_names)
+        self._generator.add_part(part)
+
+    def add_job_pools(self) -> None:
+        """
+        Append Job Pools part to generator (pool sizes set at configuration with `JOB_POOL_COMPILE_SIZE` and `JOB_POOL_LINK_SIZE`)
+        """
+
+        part = JobPoolsGeneratorPart()
+        self._generator.add_part(part)
+
     def add_library(self,
                     name: str,
                     type: CMakeLibraryType,
@@ -129,6 +157,7 @@ class GeneratorBuilder:
                            cmake_target_var_name: str,
                            visibility: CMakeTargetVisibility,
                            source_files: list[str],
+                           fragment_file_name: str=None
     ) -> None:
         """
         Append Sources part to generator
@@ -136,9 +165,10 @@ class GeneratorBuilder:
         :param cmake_target_var_name: name of target to add headers to (returned from `add_library`, `add_imported_library`, `add_executable`)
         :param visibility: cmake forward visibility
         :param source_files: list of relative paths to source files
+        :param fragment_file_name: write the sources in this separate cmake file (included from CMakeLists.txt) if set
         """
 
-        part = SourceGeneratorPart(cmake_target_var_name, visibility, source_files)
+        part = SourceGeneratorPart(cmake_target_var_name, visibility, source_files, fragment_file_name)
         self._generator.add_part(part)
 
     def add_target_compile_definitions(self,
@@ -172,3 +202,137 @@ class GeneratorBuilder:
 
         part = LinkerGeneratorPart(cmake_target_var_name, visibility, *cmake_lib_var_names)
         self._generator.add_part(part)
+
+    def add_target_properties(self,
+                              cmake_target_var_name: str,
+                              properties: list[tuple[str, str]]
+    ) -> None:
+        """
+        Append Target Properties part to generator
+
+        :param cmake_target_var_name: name of target to set properties on (returned from `add_library`, `add_executable`)
+        :param properties: list of pairs of str (first: property name, second: property value)
+        """
+
+        part = TargetPropertiesGeneratorPart(cmake_target_var_name, properties)
+        self._generator.add_part(part)
+
+    def add_component_libraries(self,
+                                project_name: str,
+                                sources_by_component: dict[str, list[str]],
+                                shared_build_types: list[str],
+                                position_independent_code: bool,
+                                fragment_file_name: str=None
+    ) -> list[str]:
+        """
+        Append Component Libraries part to generator
+
+        :param project_name: str with project name (prefix of the component library names)
+        :param sources_by_component: relative paths to source files by component directory name
+        :param shared_build_types: values of `CMAKE_BUILD_TYPE` that build the components as internal shared libraries
+        :param position_independent_code: `True` if the objects are linked in a shared library
+        :param fragment_file_name: write the components in this separate cmake file (included from CMakeLists.txt) if set
+        :returns list[str]: cmake variable names of the component libraries (sorted by component)
+        (used in `add_target_include_directories`, `add_target_compile_definitions`, `add_target_linker`)
+        """
+
+        part = ComponentLibrariesGeneratorPart(project_name, sources_by_component, shared_build_types, position_independent_code, fragment_file_name)
+        self._generator.add_part(part)
+        return part.cmake_variable_names
+
+    def add_target_unity_build(self,
+                               cmake_target_var_names: list[str],
+                               source_file_sizes: list[tuple[str, int]],
+                               batch_max_size: int,
+                               excluded_source_files: list[str],
+                               fragment_file_name: str=None
+    ) -> None:
+        """
+        Append Unity Build part to generator
+
+        :param cmake_target_var_names: names of targets to enable unity build for (returned from `add_library`, `add_executable`)
+        :param source_file_sizes: list of pairs (relative path to source file, size in bytes)
+        :param batch_max_size: maximum size in bytes of the sources merged in one unity file
+        :param excluded_source_files: relative paths to sources that break under unity builds (compiled alone)
+        :param fragment_file_name: write the batches in this separate cmake file (included from CMakeLists.txt) if set
+        """
+
+        part = UnityBuildGeneratorPart(cmake_target_var_names, source_file_sizes, batch_max_size, excluded_source_files, fragment_file_name)
+        self._generator.add_part(part)
+
+    def add_target_precompiled_headers(self,
+                                       cmake_target_var_name: str,
+                                       visibility: CMakeTargetVisibility,
+                                       header_files: list[str]
+    ) -> None:
+        """
+        Append Precompiled Headers part to generator
+
+        :param cmake_target_var_name: name of target to precompile headers for (returned from `add_library`, `add_executable`)
+        :param visibility: cmake forward visibility
+        :param header_files: list of `<system>` headers or relative paths to header files
+        """
+
+        part = PrecompiledHeaderGeneratorPart(cmake_target_var_name, visibility, header_files)
+        self._generator.add_part(part)
+
+    def add_targets_interprocedural_optimization(self,
+                                                 cmake_target_var_names: list[str],
+                                                 project_language: Language,
+                                                 build_type_names: list[str],
+                                                 thin_lto: bool,
+                                                 lto_jobs: int
+    ) -> None:
+        """
+        Append Interprocedural Optimization (LTO) part to generator
+
+        :param cmake_target_var_names: names of targets compiled with LTO (returned from `add_library`, `add_executable`)
+        :param project_language: language C or CPP
+        :param build_type_names: values of `CMAKE_BUILD_TYPE` using LTO (`Release`, `MinSizeRel`)
+        :param thin_lto: `True` for ThinLTO (clang only)
+        :param lto_jobs: number of parallel LTO jobs at link time (`0` for automatic)
+        """
+
+        part = InterproceduralOptimizationGeneratorPart(cmake_target_var_names, project_language, build_type_names, thin_lto, lto_jobs)
+        self._generator.add_part(part)
+
+    def add_targets_profile_guided_optimization(self,
+                                                cmake_target_var_names: list[str],
+                                                project_language: Language
+    ) -> None:
+        """
+        Append Profile Guided Optimization part to generator (phase set at configuration with `PGO_MODE` and `PGO_PROFILE_PATH`)
+
+        :param cmake_target_var_names: names of targets compiled with PGO (returned from `add_library`, `add_executable`)
+        :param project_language: language C or CPP
+        """
+
+        part = ProfileGuidedOptimizationGeneratorPart(cmake_target_var_names, project_language)
+        self._generator.add_part(part)
+
+    def add_targets_fast_debug_link(self,
+                                    cmake_target_var_names: list[str],
+                                    project_language: Language,
+                                    build_type_names: list[str]
+    ) -> None:
+        """
+        Append Fast Debug Link part to generator (split DWARF, compressed debug sections and gdb index when supported)
+
+        :param cmake_target_var_names: names of targets compiled with the options (returned from `add_library`, `add_executable`)
+        :param project_language: language C or CPP
+        :param build_type_names: values of `CMAKE_BUILD_TYPE` with debug info (`Debug`, `RelWithDebInfo`)
+        """
+
+        part = FastDebugLinkGeneratorPart(cmake_target_var_names, project_language, build_type_names)
+        self._generator.add_part(part)
+
+    def add_compile_time_trace(self, project_language: Language) -> None:
+        """
+        Append Compile Time Trace part to generator (its product is the `CMAKE_PROJECT_INCLUDE` file of the time trace builds,
+        it traces every target of the project)
+
+        :param project_language: language C or CPP
+        """
+
+        part = CompileTimeTraceGeneratorPart(project_language)
+        self._generator.add_part(part)
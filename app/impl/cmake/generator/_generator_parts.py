@@ -1,3 +1,6 @@
+import io
+import posixpath
+import re
 from enum import Enum, auto
 from ._generator_base import IGeneratorPart
 
@@ -15,7 +18,17 @@ __all__ = ["CMakeLibraryType",
            "IncludeGeneratorPart",
            "SourceGeneratorPart",
            "DefinitionGeneratorPart",
-           "LinkerGeneratorPart"
+           "LinkerGeneratorPart",
+           "TargetPropertiesGeneratorPart",
+           "ComponentLibrariesGeneratorPart",
+           "UnityBuildGeneratorPart",
+           "PrecompiledHeaderGeneratorPart",
+           "InterproceduralOptimizationGeneratorPart",
+           "ProfileGuidedOptimizationGeneratorPart",
+           "LinkerSelectionGeneratorPart",
+           "FastDebugLinkGeneratorPart",
+           "JobPoolsGeneratorPart",
+           "CompileTimeTraceGeneratorPart"
            ]
 
 
@@ -23,6 +36,7 @@ class CMakeLibraryType(Enum):
     STATIC = "STATIC"
     SHARED = "SHARED"
     INTERFACE = "INTERFACE"
+    OBJECT = "OBJECT"
 
 
 class CMakeTargetVisibility(Enum):
@@ -77,7 +91,9 @@ class HeaderGeneratorPart(IGeneratorPart):
             project_language: Language,
             language_standard: int,
             language_standard_required: bool,
-            compiler_extensions_required: bool
+            compiler_extensions_required: bool,
+            compiler_launcher_program: str=None,
+            compiler_launcher_env: list[tuple[str, str]]=None
     ):
         """
         Create Header part to append to generator
@@ -88,6 +104,8 @@ class HeaderGeneratorPart(IGeneratorPart):
         :param language_standard: int for C/C++ language standard
         :param language_standard_required: `False` to use lower standard
         :param compiler_extensions_required: `True` to use optional compiler specific extensions
+        :param compiler_launcher_program: name of the program wrapping every compilation (ccache, sccache), searched by cmake
+        :param compiler_launcher_env: pairs of str (first: variable name, second: value) set for the launcher
         """
 
         self._project_name = project_name
@@ -96,11 +114,14 @@ class HeaderGeneratorPart(IGeneratorPart):
         self._language_standard = language_standard
         self._language_standard_required = language_standard_required
         self._compiler_extensions_required = compiler_extensions_required
+        self._compiler_launcher_program = compiler_launcher_program
+        self._compiler_launcher_env = compiler_launcher_env or []
 
     def run(self, file) -> None:
         self._write_cmake_minimum_required_version(file)
         self._write_project_specifications(file)
         self._write_language_specifications(file)
+        self._write_compiler_launcher(file)
         self._write_destination_specifications(file)
 
     def _write_cmake_minimum_required_version(self, file) -> None:
@@ -125,6 +146,21 @@ class HeaderGeneratorPart(IGeneratorPart):
                     f"set({cmake_compiler_settings_names_dict[_COMPILER_SETTINGS_NAMES.COMPILER_EXTENSION_REQUIRED]} {_adapt_to_cmake_bool(self._compiler_extensions_required)})\n\n"
                     )
 
+    def _write_compiler_launcher(self, file) -> None:
+        if not self._compiler_launcher_program:
+            return
+
+        # a missing launcher only disables the cache, the build still works
+        file.write( f"find_program(COMPILER_LAUNCHER_PROGRAM {self._compiler_launcher_program})\n"
+                    f"if(COMPILER_LAUNCHER_PROGRAM)\n"
+                    f"set(CMAKE_{self._project_language.value}_COMPILER_LAUNCHER ${{CMAKE_COMMAND}} -E env\n"
+                    )
+        for name, value in self._compiler_launcher_env:
+            file.write(f"\"{name}={value}\"\n")
+        file.write( f"${{COMPILER_LAUNCHER_PROGRAM}})\n"
+                    f"endif()\n\n"
+                    )
+
     def _write_destination_specifications(self, file) -> None:
         file.write( f"set(CMAKE_RUNTIME_OUTPUT_DIRECTORY ${{CMAKE_BINARY_DIR}}/bin)\n"
                     f"set(CMAKE_LIBRARY_OUTPUT_DIRECTORY ${{CMAKE_BINARY_DIR}}/lib)\n"
@@ -289,22 +325,40 @@ class SourceGeneratorPart(IGeneratorPart):
     def __init__(self,
                  cmake_target_var_name: str,
                  visibility: CMakeTargetVisibility,
-                 source_files: list[str]
+                 source_files: list[str],
+                 fragment_file_name: str=None
     ):
         """
         Create Sources part to append to generator
 
         :param cmake_target_var_name: name of target to add headers to (returned from `add_library`, `add_imported_library`, `add_executable`)
         :param visibility: cmake forward visibility
-        :param source_files: list of relative paths to source files
+        :param source_files: list of relative paths to source files (written in sorted order)
+        :param fragment_file_name: write the sources in this separate cmake file (included from CMakeLists.txt) if set
         """
 
         self._cmake_target_var_name = cmake_target_var_name
         self._visibility = visibility
-        self._source_files = source_files
+        self._source_files = sorted(set(source_files))
+        self._fragment_file_name = fragment_file_name
 
     def run(self, file):
-        self._write_target_sources(file)
+        if self._fragment_file_name:
+            self._write_fragment_include(file)
+        else:
+            self._write_target_sources(file)
+
+    def get_fragments(self) -> dict[str, str]:
+        if not self._fragment_file_name:
+            return {}
+
+        fragment = io.StringIO()
+        self._write_target_sources(fragment)
+        return {self._fragment_file_name: fragment.getvalue()}
+
+    def _write_fragment_include(self, file) -> None:
+        # adding/removing a source only changes the fragment, CMakeLists.txt stays the same
+        file.write(f"include(${{CMAKE_CURRENT_LIST_DIR}}/{self._fragment_file_name})\n\n")
 
     def _write_target_sources(self, file) -> None:
         if not self._source_files:
@@ -386,3 +440,590 @@ class LinkerGeneratorPart(IGeneratorPart):
             for lib in self._cmake_lib_var_names:
                 file.write(f"${{{lib}}}\n")
             file.write(f")\n\n")
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+class TargetPropertiesGeneratorPart(IGeneratorPart):
+    def __init__(self,
+                 cmake_target_var_name: str,
+                 properties: list[tuple[str, str]]
+    ):
+        """
+        Create Target Properties part to append to generator
+
+        :param cmake_target_var_name: name of target to set properties on (returned from `add_library`, `add_executable`)
+        :param properties: list of pairs of str (first: property name, second: property value)
+        """
+
+        self._cmake_target_var_name = cmake_target_var_name
+        self._properties = properties
+
+    def run(self, file) -> None:
+        self._write_set_target_properties(file)
+
+    def _write_set_target_properties(self, file) -> None:
+        if not self._properties:
+            return
+
+        file.write(f"set_target_properties(${{{self._cmake_target_var_name}}} PROPERTIES\n")
+        for name, value in self._properties:
+            file.write(f"{name} {value}\n")
+        file.write(f")\n\n")
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+class ComponentLibrariesGeneratorPart(IGeneratorPart):
+    def __init__(self,
+                 project_name: str,
+                 sources_by_component: dict[str, list[str]],
+                 shared_build_types: list[str],
+                 position_independent_code: bool,
+                 fragment_file_name: str=None
+    ):
+        """
+        Create Component Libraries part to append to generator.
+        Each component is an OBJECT library (SHARED for the build types in `shared_build_types`) holding the sources of one directory.
+
+        :param project_name: str with project name (prefix of the component library names)
+        :param sources_by_component: relative paths to source files by component directory name
+        :param shared_build_types: values of `CMAKE_BUILD_TYPE` that build the components as internal shared libraries
+        :param position_independent_code: `True` if the objects are linked in a shared library
+        :param fragment_file_name: write the components in this separate cmake file (included from CMakeLists.txt) if set
+        """
+
+        self._project_name = project_name
+        self._sources_by_component = {component: sorted(set(sources)) for component, sources in sorted(sources_by_component.items())}
+        self._shared_build_types = shared_build_types
+        self._position_independent_code = position_independent_code
+        self._fragment_file_name = fragment_file_name
+
+    @property
+    def cmake_variable_names(self) -> list[str]:
+        return [self._get_cmake_variable_name(component) for component in self._sources_by_component]
+
+    def run(self, file) -> None:
+        self._write_component_library_type(file)
+        if self._fragment_file_name:
+            file.write(f"include(${{CMAKE_CURRENT_LIST_DIR}}/{self._fragment_file_name})\n\n")
+        else:
+            self._write_component_libraries(file)
+
+    def get_fragments(self) -> dict[str, str]:
+        if not self._fragment_file_name:
+            return {}
+
+        fragment = io.StringIO()
+        self._write_component_libraries(fragment)
+        return {self._fragment_file_name: fragment.getvalue()}
+
+    def _get_library_name(self, component: str) -> str:
+        return f"{self._project_name}_{re.sub(r'[^A-Za-z0-9_]', '_', component)}"
+
+    def _get_cmake_variable_name(self, component: str) -> str:
+        return self._get_library_name(component).upper() + "_LIB_NAME"
+
+    def _write_component_library_type(self, file) -> None:
+        if not self._shared_build_types:
+            file.write(f"set(COMPONENT_LIBRARY_TYPE {CMakeLibraryType.OBJECT.value})\n\n")
+            return
+
+        build_types_condition = " OR ".join(f"CMAKE_BUILD_TYPE STREQUAL \"{build_type}\"" for build_type in self._shared_build_types)
+        file.write( f"if({build_types_condition})\n"
+                    f"set(COMPONENT_LIBRARY_TYPE {CMakeLibraryType.SHARED.value})\n"
+                    f"else()\n"
+                    f"set(COMPONENT_LIBRARY_TYPE {CMakeLibraryType.OBJECT.value})\n"
+                    f"endif()\n\n"
+                    )
+
+    def _write_component_libraries(self, file) -> None:
+        for component, sources in self._sources_by_component.items():
+            cmake_variable_name = self._get_cmake_variable_name(component)
+
+            file.write( f"set({cmake_variable_name} {self._get_library_name(component)})\n"
+                        f"add_library(${{{cmake_variable_name}}} ${{COMPONENT_LIBRARY_TYPE}})\n"
+                        )
+            if self._position_independent_code:
+                file.write(f"set_target_properties(${{{cmake_variable_name}}} PROPERTIES POSITION_INDEPENDENT_CODE ON)\n")
+
+            file.write(f"target_sources(${{{cmake_variable_name}}} PRIVATE\n")
+            for source in sources:
+                file.write(f"${{CMAKE_SOURCE_DIR}}/{source}\n")
+            file.write(f")\n\n")
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+class UnityBuildGeneratorPart(IGeneratorPart):
+    def __init__(self,
+                 cmake_target_var_names: list[str],
+                 source_file_sizes: list[tuple[str, int]],
+                 batch_max_size: int,
+                 excluded_source_files: list[str],
+                 fragment_file_name: str=None
+    ):
+        """
+        Create Unity Build part to append to generator.
+        Sources are batched per directory, a batch is closed when adding the next file would exceed `batch_max_size`.
+        A batch not full yet goes on in the next sibling directory (never across top level directories).
+
+        :param cmake_target_var_names: names of targets to enable unity build for (returned from `add_library`, `add_executable`)
+        :param source_file_sizes: list of pairs (relative path to source file, size in bytes)
+        :param batch_max_size: maximum size in bytes of the sources merged in one unity file
+        :param excluded_source_files: relative paths to sources that break under unity builds (compiled alone)
+        :param fragment_file_name: write the batches in this separate cmake file (included from CMakeLists.txt) if set
+        """
+
+        self._cmake_target_var_names = cmake_target_var_names
+        self._batch_max_size = batch_max_size
+        self._fragment_file_name = fragment_file_name
+        self._batches, self._skipped_files = self._make_batches(source_file_sizes, set(excluded_source_files))
+
+    def run(self, file) -> None:
+        self._write_target_unity_properties(file)
+        if self._fragment_file_name:
+            file.write(f"include(${{CMAKE_CURRENT_LIST_DIR}}/{self._fragment_file_name})\n\n")
+        else:
+            self._write_source_unity_groups(file)
+
+    def get_fragments(self) -> dict[str, str]:
+        if not self._fragment_file_name:
+            return {}
+
+        fragment = io.StringIO()
+        self._write_source_unity_groups(fragment)
+        return {self._fragment_file_name: fragment.getvalue()}
+
+    def _make_batches(self,
+                      source_file_sizes: list[tuple[str, int]],
+                      excluded_source_files: set[str]
+    ) -> tuple[dict[str, list[str]], list[str]]:
+        """
+        :returns tuple: (batches by unity group name, sources compiled alone)
+        """
+
+        sources_by_dir: dict[str, list[tuple[str, int]]] = {}
+        skipped_files: list[str] = []
+
+        for source, size in sorted(source_file_sizes):
+            if source in excluded_source_files:
+                skipped_files.append(source)
+            else:
+                sources_by_dir.setdefault(posixpath.dirname(source), []).append((source, size))
+
+        # (parent directory of the batch sources, `None` for the root and top level directories, sources)
+        dir_batches: list[tuple[str | None, list[str]]] = []
+        current_size = 0
+
+        # sibling directories follow each other: a batch goes on in the next sibling while it is not full.
+        # top level directories stay apart (components are top level directories, each one is its own target)
+        for dir_name in sorted(sources_by_dir, key=lambda dir_name: (posixpath.dirname(dir_name), dir_name)):
+            parent = posixpath.dirname(dir_name) if "/" in dir_name else None
+            if not dir_batches or parent is None or dir_batches[-1][0] != parent:
+                dir_batches.append((parent, []))
+                current_size = 0
+
+            for source, size in sources_by_dir[dir_name]:
+                if dir_batches[-1][1] and current_size + size > self._batch_max_size:
+                    dir_batches.append((parent, []))
+                    current_size = 0
+                dir_batches[-1][1].append(source)
+                current_size += size
+
+        batches: dict[str, list[str]] = {}
+
+        for parent, batch in dir_batches:
+            batch_dir_names = {posixpath.dirname(source) for source in batch}
+            group_dir_name = batch_dir_names.pop() if len(batch_dir_names) == 1 else parent
+            batches[f"{re.sub(r'[^A-Za-z0-9_]', '_', group_dir_name) or 'root'}_{len(batches)}"] = batch
+
+        # a batch of one file gains nothing: compile it alone
+        for group_name in [group_name for group_name, batch in batches.items() if len(batch) == 1]:
+            skipped_files += batches.pop(group_name)
+
+        return batches, sorted(skipped_files)
+
+    def _write_target_unity_properties(self, file) -> None:
+        for cmake_target_var_name in self._cmake_target_var_names:
+            file.write(f"set_target_properties(${{{cmake_target_var_name}}} PROPERTIES UNITY_BUILD ON UNITY_BUILD_MODE GROUP)\n")
+        file.write(f"\n")
+
+    def _write_source_unity_groups(self, file) -> None:
+        for group_name, batch in self._batches.items():
+            file.write(f"set_source_files_properties(\n")
+            for source in batch:
+                file.write(f"${{CMAKE_SOURCE_DIR}}/{source}\n")
+            file.write(f"PROPERTIES UNITY_GROUP \"{group_name}\")\n\n")
+
+        if self._skipped_files:
+            file.write(f"set_source_files_properties(\n")
+            for source in self._skipped_files:
+                file.write(f"${{CMAKE_SOURCE_DIR}}/{source}\n")
+            file.write(f"PROPERTIES SKIP_UNITY_BUILD_INCLUSION ON)\n\n")
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+class PrecompiledHeaderGeneratorPart(IGeneratorPart):
+    def __init__(self,
+                 cmake_target_var_name: str,
+                 visibility: CMakeTargetVisibility,
+                 header_files: list[str]
+    ):
+        """
+        Create Precompiled Headers part to append to generator
+
+        :param cmake_target_var_name: name of target to precompile headers for (returned from `add_library`, `add_executable`)
+        :param visibility: cmake forward visibility
+        :param header_files: list of `<system>` headers or relative paths to header files (kept in the given order)
+        """
+
+        self._cmake_target_var_name = cmake_target_var_name
+        self._visibility = visibility
+        self._header_files = list(dict.fromkeys(header_files))
+
+    def run(self, file) -> None:
+        self._write_target_precompile_headers(file)
+
+    def _write_target_precompile_headers(self, file) -> None:
+        if not self._header_files:
+            return
+
+        file.write(f"target_precompile_headers(${{{self._cmake_target_var_name}}} {self._visibility.value}\n")
+        for header in self._header_files:
+            if header.startswith("<"):
+                file.write(f"{header}\n")
+            else:
+                file.write(f"${{CMAKE_SOURCE_DIR}}/{header}\n")
+        file.write(f")\n\n")
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+class InterproceduralOptimizationGeneratorPart(IGeneratorPart):
+    def __init__(self,
+                 cmake_target_var_names: list[str],
+                 project_language: Language,
+                 build_type_names: list[str],
+                 thin_lto: bool,
+                 lto_jobs: int
+    ):
+        """
+        Create Interprocedural Optimization (LTO) part to append to generator.
+        Support is checked by cmake (`CheckIPOSupported`): without it the targets build normally with a warning.
+
+        :param cmake_target_var_names: names of targets compiled with LTO (returned from `add_library`, `add_executable`)
+        :param project_language: language C or CPP
+        :param build_type_names: values of `CMAKE_BUILD_TYPE` using LTO (`Release`, `MinSizeRel`)
+        :param thin_lto: `True` for ThinLTO (clang only, gcc always partitions the LTO work)
+        :param lto_jobs: number of parallel LTO jobs at link time (`0` for automatic)
+        """
+
+        self._cmake_target_var_names = cmake_target_var_names
+        self._project_language = project_language
+        self._build_type_names = build_type_names
+        self._thin_lto = thin_lto
+        self._lto_jobs = lto_jobs
+
+    def run(self, file) -> None:
+        if not self._cmake_target_var_names or not self._build_type_names:
+            return
+
+        file.write( f"include(CheckIPOSupported)\n"
+                    f"check_ipo_supported(RESULT IPO_SUPPORTED OUTPUT IPO_OUTPUT LANGUAGES {self._project_language.value})\n"
+                    f"if(IPO_SUPPORTED)\n"
+                    )
+        self._write_target_ipo_properties(file)
+        self._write_target_lto_options(file)
+        file.write( f"else()\n"
+                    f"message(WARNING \"Interprocedural optimization not supported: ${{IPO_OUTPUT}}\")\n"
+                    f"endif()\n\n"
+                    )
+
+    def _write_target_ipo_properties(self, file) -> None:
+        for cmake_target_var_name in self._cmake_target_var_names:
+            file.write(f"set_target_properties(${{{cmake_target_var_name}}} PROPERTIES\n")
+            for build_type_name in self._build_type_names:
+                file.write(f"INTERPROCEDURAL_OPTIMIZATION_{build_type_name.upper()} ON\n")
+            file.write(f")\n")
+
+    def _write_target_lto_options(self, file) -> None:
+        config_condition = f"$<CONFIG:{','.join(self._build_type_names)}>"
+        compiler_id = f"CMAKE_{self._project_language.value}_COMPILER_ID"
+
+        clang_options = [f"-flto={'thin' if self._thin_lto else 'full'}"]
+        clang_link_options = clang_options + ([f"-flto-jobs={self._lto_jobs}"] if self._lto_jobs > 0 else [])
+        gcc_link_options = [f"-flto={self._lto_jobs if self._lto_jobs > 0 else 'auto'}"]
+
+        file.write(f"if({compiler_id} MATCHES \"Clang\")\n")
+        for cmake_target_var_name in self._cmake_target_var_names:
+            file.write(f"target_compile_options(${{{cmake_target_var_name}}} PRIVATE $<{config_condition}:{';'.join(clang_options)}>)\n"
+                       f"target_link_options(${{{cmake_target_var_name}}} PRIVATE $<{config_condition}:{';'.join(clang_link_options)}>)\n")
+        file.write(f"elseif({compiler_id} STREQUAL \"GNU\")\n")
+        for cmake_target_var_name in self._cmake_target_var_names:
+            file.write(f"target_link_options(${{{cmake_target_var_name}}} PRIVATE $<{config_condition}:{';'.join(gcc_link_options)}>)\n")
+        file.write(f"endif()\n")
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+class ProfileGuidedOptimizationGeneratorPart(IGeneratorPart):
+    def __init__(self,
+                 cmake_target_var_names: list[str],
+                 project_language: Language
+    ):
+        """
+        Create Profile Guided Optimization part to append to generator.
+        The phase is chosen at configuration time with the `PGO_MODE` cache variable:
+        `GENERATE` builds instrumented targets writing their raw profiles in `PGO_PROFILE_PATH` (directory),
+        `USE` optimizes with the merged profile `PGO_PROFILE_PATH` (`.profdata` file for clang, `.gcda` directory for gcc),
+        empty builds normally.
+
+        :param cmake_target_var_names: names of targets compiled with PGO (returned from `add_library`, `add_executable`)
+        :param project_language: language C or CPP
+        """
+
+        self._cmake_target_var_names = cmake_target_var_names
+        self._project_language = project_language
+
+    def run(self, file) -> None:
+        if not self._cmake_target_var_names:
+            return
+
+        compiler_id = f"CMAKE_{self._project_language.value}_COMPILER_ID"
+
+        # gcc names the .gcda files after the object paths: strip the build directory so that
+        # the instrumented and the optimized build directories find the same profiles
+        file.write( f"set(PGO_MODE \"\" CACHE STRING \"Profile guided optimization phase (GENERATE, USE or empty)\")\n"
+                    f"set(PGO_PROFILE_PATH \"\" CACHE PATH \"Raw profiles directory (GENERATE) or merged profile (USE)\")\n"
+                    f"set(PGO_OPTIONS \"\")\n"
+                    f"if(PGO_MODE STREQUAL \"GENERATE\")\n"
+                    f"if({compiler_id} MATCHES \"Clang\")\n"
+                    f"set(PGO_OPTIONS -fprofile-generate=${{PGO_PROFILE_PATH}})\n"
+                    f"elseif({compiler_id} STREQUAL \"GNU\")\n"
+                    f"set(PGO_OPTIONS -fprofile-generate=${{PGO_PROFILE_PATH}} -fprofile-update=prefer-atomic -fprofile-prefix-path=${{CMAKE_BINARY_DIR}})\n"
+                    f"endif()\n"
+                    f"elseif(PGO_MODE STREQUAL \"USE\")\n"
+                    f"if({compiler_id} MATCHES \"Clang\")\n"
+                    f"set(PGO_OPTIONS -fprofile-use=${{PGO_PROFILE_PATH}} -Wno-profile-instr-out-of-date -Wno-profile-instr-unprofiled)\n"
+                    f"elseif({compiler_id} STREQUAL \"GNU\")\n"
+                    f"set(PGO_OPTIONS -fprofile-use=${{PGO_PROFILE_PATH}} -fprofile-partial-training -fprofile-prefix-path=${{CMAKE_BINARY_DIR}} -Wno-missing-profile)\n"
+                    f"endif()\n"
+                    f"endif()\n"
+                    )
+
+        for cmake_target_var_name in self._cmake_target_var_names:
+            file.write(f"target_compile_options(${{{cmake_target_var_name}}} PRIVATE ${{PGO_OPTIONS}})\n"
+                       f"target_link_options(${{{cmake_target_var_name}}} PRIVATE ${{PGO_OPTIONS}})\n")
+        file.write("\n")
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+class LinkerSelectionGeneratorPart(IGeneratorPart):
+    def __init__(self,
+                 project_language: Language,
+                 linker_names: list[str]
+    ):
+        """
+        Create Linker Selection part to append to generator (before the targets: it sets the default of every target).
+        The first linker passing a test link (`check_linker_flag`, cached by cmake) is used, else the default linker.
+
+        :param project_language: language C or CPP
+        :param linker_names: linkers to try in order (`mold`, `lld`, `gold`)
+        """
+
+        self._project_language = project_language
+        self._linker_names = linker_names
+
+    def run(self, file) -> None:
+        if not self._linker_names:
+            return
+
+        # CMAKE_LINKER_TYPE (cmake 3.29) knows the linker specific flags, older versions use the driver option
+        file.write( f"include(CheckLinkerFlag)\n"
+                    f"set(PROJECT_LINKER \"\")\n"
+                    f"foreach(LINKER_CANDIDATE {' '.join(self._linker_names)})\n"
+                    f"check_linker_flag({self._project_language.value} \"-fuse-ld=${{LINKER_CANDIDATE}}\" LINKER_${{LINKER_CANDIDATE}}_SUPPORTED)\n"
+                    f"if(LINKER_${{LINKER_CANDIDATE}}_SUPPORTED)\n"
+                    f"set(PROJECT_LINKER ${{LINKER_CANDIDATE}})\n"
+                    f"break()\n"
+                    f"endif()\n"
+                    f"endforeach()\n"
+                    f"if(PROJECT_LINKER)\n"
+                    f"if(CMAKE_VERSION VERSION_GREATER_EQUAL 3.29)\n"
+                    f"string(TOUPPER ${{PROJECT_LINKER}} CMAKE_LINKER_TYPE)\n"
+                    f"else()\n"
+                    f"add_link_options(-fuse-ld=${{PROJECT_LINKER}})\n"
+                    f"endif()\n"
+                    f"message(STATUS \"Linker: ${{PROJECT_LINKER}}\")\n"
+                    f"else()\n"
+                    f"message(STATUS \"Linker: default (no fast linker passed the test link)\")\n"
+                    f"endif()\n\n"
+                    )
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+class FastDebugLinkGeneratorPart(IGeneratorPart):
+    def __init__(self,
+                 cmake_target_var_names: list[str],
+                 project_language: Language,
+                 build_type_names: list[str]
+    ):
+        """
+        Create Fast Debug Link part to append to generator.
+        Debug info is split in `.dwo` files next to the objects (`-gsplit-dwarf`), compressed in the objects (`-gz`)
+        and indexed at link time for the debugger (`--gdb-index`), so the linker reads and copies much less data.
+        Each option is only used if the toolchain passes its check (bfd ld has no `--gdb-index`).
+
+        :param cmake_target_var_names: names of targets compiled with the options (returned from `add_library`, `add_executable`)
+        :param project_language: language C or CPP
+        :param build_type_names: values of `CMAKE_BUILD_TYPE` with debug info (`Debug`, `RelWithDebInfo`)
+        """
+
+        self._cmake_target_var_names = cmake_target_var_names
+        self._project_language = project_language
+        self._build_type_names = build_type_names
+
+    def run(self, file) -> None:
+        if not self._cmake_target_var_names or not self._build_type_names:
+            return
+
+        language = self._project_language.value
+        config_condition = f"$<CONFIG:{','.join(self._build_type_names)}>"
+
+        # the gdb index check links with the linker picked by the Linker Selection part (if any)
+        file.write( f"include(CheckCompilerFlag)\n"
+                    f"include(CheckLinkerFlag)\n"
+                    f"check_compiler_flag({language} -gsplit-dwarf SPLIT_DWARF_SUPPORTED)\n"
+                    f"check_compiler_flag({language} -gz COMPRESSED_DEBUG_SECTIONS_SUPPORTED)\n"
+                    f"set(GDB_INDEX_CHECK_OPTIONS LINKER:--gdb-index)\n"
+                    f"if(PROJECT_LINKER)\n"
+                    f"list(PREPEND GDB_INDEX_CHECK_OPTIONS -fuse-ld=${{PROJECT_LINKER}})\n"
+                    f"endif()\n"
+                    f"check_linker_flag({language} \"${{GDB_INDEX_CHECK_OPTIONS}}\" GDB_INDEX_${{PROJECT_LINKER}}_SUPPORTED)\n"
+                    )
+
+        for check_name, option_kind, option in (("SPLIT_DWARF_SUPPORTED", "compile", "-gsplit-dwarf"),
+                                                ("COMPRESSED_DEBUG_SECTIONS_SUPPORTED", "compile", "-gz"),
+                                                ("GDB_INDEX_${PROJECT_LINKER}_SUPPORTED", "link", "LINKER:--gdb-index")):
+            file.write(f"if({check_name})\n")
+            for cmake_target_var_name in self._cmake_target_var_names:
+                file.write(f"target_{option_kind}_options(${{{cmake_target_var_name}}} PRIVATE $<{config_condition}:{option}>)\n")
+            file.write(f"endif()\n")
+        file.write("\n")
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+class JobPoolsGeneratorPart(IGeneratorPart):
+    def __init__(self):
+        """
+        Create Job Pools part to append to generator (before the targets: it sets the pools of every target).
+        Compile and link steps run in separate ninja pools, sized at configuration with `JOB_POOL_COMPILE_SIZE` and `JOB_POOL_LINK_SIZE`
+        (a smaller link pool keeps the memory hungry links from running all at once).
+        """
+        pass
+
+    def run(self, file) -> None:
+        file.write( f"set(JOB_POOL_COMPILE_SIZE 0 CACHE STRING \"Parallel compile steps (0 for no limit)\")\n"
+                    f"set(JOB_POOL_LINK_SIZE 0 CACHE STRING \"Parallel link steps (0 for no limit)\")\n"
+                    f"if(JOB_POOL_COMPILE_SIZE GREATER 0)\n"
+                    f"set_property(GLOBAL APPEND PROPERTY JOB_POOLS compile_pool=${{JOB_POOL_COMPILE_SIZE}})\n"
+                    f"set(CMAKE_JOB_POOL_COMPILE compile_pool)\n"
+                    f"set(CMAKE_JOB_POOL_PRECOMPILE_HEADER compile_pool)\n"
+                    f"endif()\n"
+                    f"if(JOB_POOL_LINK_SIZE GREATER 0)\n"
+                    f"set_property(GLOBAL APPEND PROPERTY JOB_POOLS link_pool=${{JOB_POOL_LINK_SIZE}})\n"
+                    f"set(CMAKE_JOB_POOL_LINK link_pool)\n"
+                    f"endif()\n"
+                    f"message(STATUS \"Job pools: compile ${{JOB_POOL_COMPILE_SIZE}}, link ${{JOB_POOL_LINK_SIZE}}\")\n\n"
+                    )
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+# cmake -P script used as compiler launcher by gcc: runs the compiler and saves its `-ftime-report` (stderr) next to the object
+# (the diagnostics are only printed if the compilation fails)
+_TIME_REPORT_LAUNCHER_SCRIPT = """set(COMMAND_ARGS "")
+set(OBJECT_PATH "")
+set(PREVIOUS_ARG "")
+math(EXPR LAST_ARG_INDEX "${CMAKE_ARGC} - 1")
+foreach(ARG_INDEX RANGE 4 ${LAST_ARG_INDEX})
+set(ARG "${CMAKE_ARGV${ARG_INDEX}}")
+list(APPEND COMMAND_ARGS "${ARG}")
+if(PREVIOUS_ARG STREQUAL "-o")
+set(OBJECT_PATH "${ARG}")
+endif()
+set(PREVIOUS_ARG "${ARG}")
+endforeach()
+execute_process(COMMAND ${COMMAND_ARGS} RESULT_VARIABLE COMMAND_RESULT ERROR_FILE "${OBJECT_PATH}.time-report.txt")
+if(NOT COMMAND_RESULT EQUAL 0)
+execute_process(COMMAND "${CMAKE_COMMAND}" -E cat "${OBJECT_PATH}.time-report.txt")
+message(FATAL_ERROR "Compilation of ${OBJECT_PATH} failed")
+endif()
+"""
+
+
+class CompileTimeTraceGeneratorPart(IGeneratorPart):
+    def __init__(self, project_language: Language):
+        """
+        Create Compile Time Trace part to append to generator. The product is not part of CMakeLists.txt:
+        it is only included by the time trace build directories (`CMAKE_PROJECT_INCLUDE`, right after `project()`)
+        and defers the trace options to the end of CMakeLists.txt, once every target is declared.
+        clang writes a trace next to each object (`-ftime-trace`), gcc prints a time report (`-ftime-report`)
+        saved next to each object by a launcher script. The compiler cache is bypassed: a cached compilation has no timings.
+
+        :param project_language: language C or CPP
+        """
+
+        self._project_language = project_language
+
+    def run(self, file) -> None:
+        language = self._project_language.value
+        compiler_id = f"CMAKE_{language}_COMPILER_ID"
+
+        file.write( f"function(trace_compile_times)\n"
+                    f"if({compiler_id} MATCHES \"Clang\")\n"
+                    f"set(TIME_TRACE_OPTIONS -ftime-trace)\n"
+                    f"set(TIME_TRACE_LAUNCHER \"\")\n"
+                    f"elseif({compiler_id} STREQUAL \"GNU\")\n"
+                    f"file(WRITE ${{CMAKE_BINARY_DIR}}/time_report_launcher.cmake [=[\n{_TIME_REPORT_LAUNCHER_SCRIPT}]=])\n"
+                    f"set(TIME_TRACE_OPTIONS -ftime-report)\n"
+                    f"set(TIME_TRACE_LAUNCHER ${{CMAKE_COMMAND}} -P ${{CMAKE_BINARY_DIR}}/time_report_launcher.cmake --)\n"
+                    f"else()\n"
+                    f"message(WARNING \"Compile time trace is not supported by ${{{compiler_id}}}\")\n"
+                    f"endif()\n"
+                    f"get_property(TIME_TRACE_TARGETS DIRECTORY ${{CMAKE_SOURCE_DIR}} PROPERTY BUILDSYSTEM_TARGETS)\n"
+                    f"foreach(TIME_TRACE_TARGET ${{TIME_TRACE_TARGETS}})\n"
+                    f"get_target_property(TIME_TRACE_TARGET_TYPE ${{TIME_TRACE_TARGET}} TYPE)\n"
+                    f"if(NOT TIME_TRACE_TARGET_TYPE MATCHES \"^(INTERFACE_LIBRARY|UTILITY)$\")\n"
+                    f"target_compile_options(${{TIME_TRACE_TARGET}} PRIVATE ${{TIME_TRACE_OPTIONS}})\n"
+                    f"set_target_properties(${{TIME_TRACE_TARGET}} PROPERTIES {language}_COMPILER_LAUNCHER \"${{TIME_TRACE_LAUNCHER}}\")\n"
+                    f"endif()\n"
+                    f"endforeach()\n"
+                    f"endfunction()\n"
+                    f"cmake_language(DEFER DIRECTORY ${{CMAKE_SOURCE_DIR}} CALL trace_compile_times)\n"
+                    )
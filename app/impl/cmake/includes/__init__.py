@@ -0,0 +1,3 @@
+from ._impl_includes import *
+
+__all__ = (_impl_includes.__all__)
@@ -0,0 +1,260 @@
+import json
+import os
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+
+from ._includes_graph import IncludeGraph, NodeKind
+from ._includes_parser import parse_includes, parse_includes_batch
+
+
+__all__ = ["NodeKind",
+           "IncludeGraph",
+           "IncludeReport",
+           "scan_include_graph",
+           "load_include_graph",
+           "select_precompiled_headers"
+           ]
+
+
+_CACHE_FORMAT_VERSION = 1
+
+# a header reached by a single translation unit gains nothing from being precompiled
+_PRECOMPILED_HEADER_MIN_FAN_IN = 2
+
+# below this number of files the process pool startup costs more than it saves
+_PROCESS_POOL_MIN_FILES = 256
+_PROCESS_POOL_BATCH_SIZE = 64
+
+
+class IncludeReport:
+    """
+    Headers ranked by fan-in and translation units ranked by transitive include cost
+    """
+
+    def __init__(self, graph: IncludeGraph):
+        """
+        :param graph: scanned include graph
+        """
+
+        fan_in = graph.compute_fan_in()
+        costs = graph.compute_translation_unit_costs()
+
+        # (header, number of TUs reaching it), most included first
+        self.headers_fan_in: list[tuple[str, int]] = sorted(fan_in.items(), key=lambda item: (-item[1], item[0]))
+
+        # (TU, headers count, headers bytes), most expensive first
+        self.translation_unit_costs: list[tuple[str, int, int]] = sorted(((tu, count, size) for tu, (count, size) in costs.items()),
+                                                                         key=lambda item: (-item[2], -item[1], item[0]))
+
+    def to_text(self, top_count: int=20) -> str:
+        lines = [f"Top {top_count} headers by fan-in (translation units reached):"]
+        lines += [f"{fan_in:>8}  {header}" for header, fan_in in self.headers_fan_in[:top_count]]
+        lines += ["", f"Top {top_count} translation units by transitive include cost (headers, KiB):"]
+        lines += [f"{count:>8}  {size / 1024:>10.1f}  {tu}" for tu, count, size in self.translation_unit_costs[:top_count]]
+        return "\n".join(lines)
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+class _IncludeResolver:
+    """
+    Resolves include names to project-relative paths (results are cached, every lookup is a stat call)
+    """
+
+    def __init__(self, project_root_path: str, include_dir_names: list[str], imported_include_dir_names: list[str]):
+        self._project_root_path = os.path.abspath(project_root_path)
+        self._search_dirs = [(self._to_node_name(os.path.join(self._project_root_path, name)), NodeKind.HEADER) for name in include_dir_names]
+        self._search_dirs += [(self._to_node_name(os.path.join(self._project_root_path, name)), NodeKind.IMPORTED) for name in imported_include_dir_names]
+        self._imported_prefixes = tuple(f"{dir_name}/" for dir_name, kind in self._search_dirs if kind == NodeKind.IMPORTED)
+        self._exists_cache: dict[str, bool] = {}
+        self._search_cache: dict[str, tuple[str, NodeKind]] = {}
+
+    def resolve(self, includer_name: str, included_name: str, is_angle: bool) -> tuple[str, NodeKind]:
+        """
+        :returns tuple[str, NodeKind]: (node name, node kind) of the included file
+        """
+
+        if not is_angle:
+            # quoted form: directory of the including file first
+            candidate = posixpath.normpath(posixpath.join(posixpath.dirname(includer_name), included_name))
+            if self._exists(candidate):
+                return candidate, NodeKind.IMPORTED if candidate.startswith(self._imported_prefixes) else NodeKind.HEADER
+
+        resolved = self._search_cache.get(included_name)
+        if resolved is None:
+            resolved = (f"<{included_name}>", NodeKind.SYSTEM)
+            for dir_name, kind in self._search_dirs:
+                candidate = posixpath.normpath(posixpath.join(dir_name, included_name))
+                if self._exists(candidate):
+                    resolved = (candidate, kind)
+                    break
+            self._search_cache[included_name] = resolved
+
+        return resolved
+
+    def get_full_path(self, node_name: str) -> str:
+        return os.path.join(self._project_root_path, node_name)
+
+    def _exists(self, node_name: str) -> bool:
+        exists = self._exists_cache.get(node_name)
+        if exists is None:
+            exists = os.path.isfile(self.get_full_path(node_name))
+            self._exists_cache[node_name] = exists
+        return exists
+
+    def _to_node_name(self, full_path: str) -> str:
+        return os.path.relpath(full_path, self._project_root_path).replace("\\", "/")
+
+
+def _load_cache(cache_file_path: str) -> dict[str, list]:
+    try:
+        with open(cache_file_path, "r") as cache_file:
+            cache_data = json.load(cache_file)
+        if cache_data.get("version") == _CACHE_FORMAT_VERSION:
+            return cache_data["files"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return {}
+
+
+def _save_cache(cache_file_path: str, parsed_files: dict[str, list], graph: IncludeGraph) -> None:
+    os.makedirs(os.path.dirname(cache_file_path), exist_ok=True)
+    temp_file_path = f"{cache_file_path}.tmp"
+    with open(temp_file_path, "w") as cache_file:
+        json.dump({"version": _CACHE_FORMAT_VERSION, "files": parsed_files, "graph": graph.to_json()}, cache_file, separators=(",", ":"))
+    os.replace(temp_file_path, cache_file_path)
+
+
+def _parse_files(full_paths: list[str], max_workers: int) -> list[tuple[int, int, list[tuple[str, bool]]]]:
+    if len(full_paths) < _PROCESS_POOL_MIN_FILES:
+        return [parse_includes(full_path) for full_path in full_paths]
+
+    batches = [full_paths[start:start + _PROCESS_POOL_BATCH_SIZE] for start in range(0, len(full_paths), _PROCESS_POOL_BATCH_SIZE)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return [result for batch_results in executor.map(parse_includes_batch, batches) for result in batch_results]
+
+
+def scan_include_graph(project_root_path: str,
+                       source_files: list[str],
+                       include_dir_names: list[str],
+                       imported_include_dir_names: list[str],
+                       cache_file_path: str=None,
+                       max_workers: int=None
+) -> IncludeGraph:
+    """
+    Parse the sources, follow their includes and build the include graph.
+    Files are parsed across a process pool; unchanged files (same mtime and size) are reused from the cache file.
+
+    :param project_root_path: full path to the project
+    :param source_files: relative paths to the translation units
+    :param include_dir_names: relative paths to the project include directories
+    :param imported_include_dir_names: relative paths to the imported libraries include directories
+    :param cache_file_path: full path to the file where the parsed includes and the graph are persisted (`None` for no cache)
+    :param max_workers: maximum number of parsing processes (default cpu count)
+    :returns IncludeGraph: the include graph
+    """
+
+    resolver = _IncludeResolver(project_root_path, include_dir_names, imported_include_dir_names)
+    cached_files = _load_cache(cache_file_path) if cache_file_path else {}
+    parsed_files: dict[str, list] = {}
+
+    graph = IncludeGraph()
+    frontier = [(source_file, graph.add_node(source_file, NodeKind.SOURCE)) for source_file in source_files]
+
+    # breadth-first: each round parses the files discovered by the previous one
+    while frontier:
+        to_parse: list[tuple[str, int]] = []
+
+        for node_name, node_index in frontier:
+            cached_entry = cached_files.get(node_name)
+            if cached_entry is not None:
+                try:
+                    file_stat = os.stat(resolver.get_full_path(node_name))
+                except OSError:
+                    file_stat = None
+                if file_stat is not None and cached_entry[0] == file_stat.st_mtime_ns and cached_entry[1] == file_stat.st_size:
+                    parsed_files[node_name] = cached_entry
+                    continue
+            to_parse.append((node_name, node_index))
+
+        results = _parse_files([resolver.get_full_path(node_name) for node_name, _ in to_parse], max_workers)
+        for (node_name, _), (mtime_ns, size, includes) in zip(to_parse, results):
+            parsed_files[node_name] = [mtime_ns, size, includes]
+
+        next_frontier: list[tuple[str, int]] = []
+
+        for node_name, node_index in frontier:
+            _, size, includes = parsed_files[node_name]
+            graph.set_node_size(node_index, size)
+
+            included_indexes = []
+            for included_name, is_angle in includes:
+                child_name, child_kind = resolver.resolve(node_name, included_name, is_angle)
+                known = graph.nodes_count
+                child_index = graph.add_node(child_name, child_kind)
+                if child_index == known and child_kind != NodeKind.SYSTEM:
+                    next_frontier.append((child_name, child_index))
+                included_indexes.append(child_index)
+
+            graph.set_edges(node_index, included_indexes)
+
+        frontier = next_frontier
+
+    if cache_file_path:
+        _save_cache(cache_file_path, parsed_files, graph)
+
+    return graph
+
+
+def load_include_graph(cache_file_path: str) -> IncludeGraph | None:
+    """
+    :param cache_file_path: full path to the file written by `scan_include_graph`
+    :returns IncludeGraph | None: the persisted graph, `None` if missing or invalid
+    """
+
+    try:
+        with open(cache_file_path, "r") as cache_file:
+            cache_data = json.load(cache_file)
+        if cache_data.get("version") == _CACHE_FORMAT_VERSION:
+            return IncludeGraph.from_json(cache_data["graph"])
+    except (OSError, ValueError, KeyError, AttributeError, TypeError):
+        pass
+    return None
+
+
+def select_precompiled_headers(graph: IncludeGraph,
+                               max_count: int,
+                               size_budget: int=0,
+                               excluded_headers: list[str]=None
+) -> list[str]:
+    """
+    Pick the stable headers (system and imported libraries) included by the most translation units.
+    Project headers are never picked: editing one would rebuild the precompiled header and every translation unit.
+
+    :param graph: scanned include graph
+    :param max_count: maximum number of headers
+    :param size_budget: maximum sum of the headers sizes in bytes (`0` for no limit, system headers size is unknown and counts as 0)
+    :param excluded_headers: node names never picked
+    :returns list[str]: node names, most included first
+    """
+
+    excluded = set(excluded_headers or ())
+    selected: list[str] = []
+    total_size = 0
+
+    for header, fan_in in IncludeReport(graph).headers_fan_in:
+        if len(selected) >= max_count or fan_in < _PRECOMPILED_HEADER_MIN_FAN_IN:
+            break
+        if header in excluded or graph.get_kind(header) not in (NodeKind.SYSTEM, NodeKind.IMPORTED):
+            continue
+
+        size = graph.get_size(header)
+        if size_budget and total_size + size > size_budget:
+            continue
+
+        selected.append(header)
+        total_size += size
+
+    return selected
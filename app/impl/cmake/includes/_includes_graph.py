@@ -0,0 +1,234 @@
+from enum import Enum
+
+
+# Implemented the include graph and its analytics (fan-in, transitive include cost)
+
+
+class NodeKind(Enum):
+    SOURCE = "source"           # translation unit
+    HEADER = "header"           # project header
+    IMPORTED = "imported"       # header found in an imported library include directory
+    SYSTEM = "system"           # not resolved in the project (standard library, system headers)
+
+
+class IncludeGraph:
+    """
+    Directed graph: an edge A -> B means A includes B.
+    Nodes are POSIX-style paths relative to the project root (`<name>` for system headers).
+    """
+
+    def __init__(self):
+        self._nodes: list[str] = []
+        self._kinds: list[NodeKind] = []
+        self._sizes: list[int] = []
+        self._edges: list[list[int]] = []
+        self._indexes: dict[str, int] = {}
+
+    @property
+    def nodes_count(self) -> int:
+        return len(self._nodes)
+
+    def add_node(self, name: str, kind: NodeKind, size: int=0) -> int:
+        """
+        :returns int: index of the node (existing one if already added)
+        """
+
+        index = self._indexes.get(name)
+        if index is None:
+            index = len(self._nodes)
+            self._indexes[name] = index
+            self._nodes.append(name)
+            self._kinds.append(kind)
+            self._sizes.append(size)
+            self._edges.append([])
+        return index
+
+    def set_node_size(self, index: int, size: int) -> None:
+        self._sizes[index] = size
+
+    def set_edges(self, index: int, included_indexes: list[int]) -> None:
+        # the same header included twice counts once
+        self._edges[index] = list(dict.fromkeys(included_indexes))
+
+    def get_kind(self, name: str) -> NodeKind:
+        return self._kinds[self._indexes[name]]
+
+    def get_size(self, name: str) -> int:
+        return self._sizes[self._indexes[name]]
+
+    def get_includes(self, name: str) -> list[str]:
+        return [self._nodes[child] for child in self._edges[self._indexes[name]]]
+
+    def get_nodes(self, *kinds: NodeKind) -> list[str]:
+        return [node for node, kind in zip(self._nodes, self._kinds) if not kinds or kind in kinds]
+
+    def to_json(self) -> dict:
+        return {"nodes": [[node, kind.value, size] for node, kind, size in zip(self._nodes, self._kinds, self._sizes)],
+                "edges": self._edges
+                }
+
+    @staticmethod
+    def from_json(json_data: dict) -> "IncludeGraph":
+        graph = IncludeGraph()
+        for node, kind, size in json_data["nodes"]:
+            graph.add_node(node, NodeKind(kind), size)
+        graph._edges = [list(children) for children in json_data["edges"]]
+        return graph
+
+    def compute_fan_in(self) -> dict[str, int]:
+        """
+        :returns dict[str, int]: for each header, the number of translation units that include it (directly or not)
+        """
+
+        components, component_of = self._compute_components()
+        source_bits = self._get_bits(NodeKind.SOURCE)
+
+        # parents of each component (condensed graph)
+        component_parents: list[set[int]] = [set() for _ in components]
+        for node, children in enumerate(self._edges):
+            for child in children:
+                if component_of[child] != component_of[node]:
+                    component_parents[component_of[child]].add(component_of[node])
+
+        # components are produced children first: walk them backwards so parents are done before children
+        reaching: list[int] = [0] * len(components)     # TUs reaching the component (members excluded)
+        members_bits: list[int] = [0] * len(components)
+
+        for component_index in reversed(range(len(components))):
+            members = components[component_index]
+            members_bits[component_index] = sum(source_bits.get(member, 0) for member in members)
+
+            bits = 0
+            for parent in component_parents[component_index]:
+                bits |= reaching[parent] | members_bits[parent]
+            if len(members) > 1:
+                # inside a cycle every member reaches the others
+                bits |= members_bits[component_index]
+            reaching[component_index] = bits
+
+        return {self._nodes[node]: reaching[component_of[node]].bit_count()
+                for node, kind in enumerate(self._kinds) if kind != NodeKind.SOURCE}
+
+    def compute_translation_unit_costs(self) -> dict[str, tuple[int, int]]:
+        """
+        :returns dict[str, tuple[int, int]]: for each translation unit, (number of headers, bytes of headers) included transitively
+        (system headers count as one header of unknown size)
+        """
+
+        components, component_of = self._compute_components()
+        header_bits = self._get_bits(NodeKind.HEADER, NodeKind.IMPORTED, NodeKind.SYSTEM)
+
+        # components are produced children first: closures of children are always ready
+        closures: list[int] = [0] * len(components)
+        for component_index, members in enumerate(components):
+            bits = 0
+            for member in members:
+                for child in self._edges[member]:
+                    child_component = component_of[child]
+                    if child_component != component_index:
+                        bits |= closures[child_component]
+                    bits |= header_bits.get(child, 0)
+            closures[component_index] = bits
+
+        size_tables = self._build_size_tables(header_bits)
+        costs: dict[str, tuple[int, int]] = {}
+
+        for node, kind in enumerate(self._kinds):
+            if kind != NodeKind.SOURCE:
+                continue
+
+            closure = closures[component_of[node]]
+            closure_bytes = closure.to_bytes((closure.bit_length() + 7) // 8, "little")
+            total_size = sum(size_tables[chunk][value] for chunk, value in enumerate(closure_bytes) if value)
+            costs[self._nodes[node]] = (closure.bit_count(), total_size)
+
+        return costs
+
+    def _get_bits(self, *kinds: NodeKind) -> dict[int, int]:
+        """
+        :returns dict[int, int]: node index -> single bit mask, for the nodes of the given kinds
+        """
+
+        bits: dict[int, int] = {}
+        for node, kind in enumerate(self._kinds):
+            if kind in kinds:
+                bits[node] = 1 << len(bits)
+        return bits
+
+    def _build_size_tables(self, header_bits: dict[int, int]) -> list[list[int]]:
+        """
+        Sum of sizes for every value of every 8 bit chunk of a header mask (turns a per-bit loop into per-byte lookups)
+        """
+
+        sizes_by_bit = [0] * len(header_bits)
+        for node, bit in header_bits.items():
+            sizes_by_bit[bit.bit_length() - 1] = self._sizes[node]
+
+        tables: list[list[int]] = []
+        for chunk_start in range(0, len(sizes_by_bit), 8):
+            chunk_sizes = sizes_by_bit[chunk_start:chunk_start + 8]
+            table = [0] * 256
+            for value in range(1, 256):
+                lowest_bit = (value & -value).bit_length() - 1
+                table[value] = table[value & (value - 1)] + (chunk_sizes[lowest_bit] if lowest_bit < len(chunk_sizes) else 0)
+            tables.append(table)
+
+        return tables
+
+    def _compute_components(self) -> tuple[list[list[int]], list[int]]:
+        """
+        Strongly connected components (iterative Tarjan). Include cycles are legal with include guards.
+
+        :returns tuple: (components in reverse topological order: children first, component index of each node)
+        """
+
+        nodes_count = len(self._nodes)
+        indexes = [-1] * nodes_count
+        low_links = [0] * nodes_count
+        on_stack = [False] * nodes_count
+        stack: list[int] = []
+        components: list[list[int]] = []
+        component_of = [-1] * nodes_count
+        counter = 0
+
+        for root in range(nodes_count):
+            if indexes[root] != -1:
+                continue
+
+            work = [(root, 0)]
+            while work:
+                node, child_position = work.pop()
+
+                if child_position == 0:
+                    indexes[node] = low_links[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                else:
+                    # returning from the previous child
+                    previous_child = self._edges[node][child_position - 1]
+                    low_links[node] = min(low_links[node], low_links[previous_child])
+
+                children = self._edges[node]
+                while child_position < len(children):
+                    child = children[child_position]
+                    child_position += 1
+                    if indexes[child] == -1:
+                        work.append((node, child_position))
+                        work.append((child, 0))
+                        break
+                    if on_stack[child]:
+                        low_links[node] = min(low_links[node], indexes[child])
+                else:
+                    if low_links[node] == indexes[node]:
+                        component: list[int] = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component_of[member] = len(components)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+
+        return components, component_of
@@ -0,0 +1,3 @@
+from ._impl_jobpool import *
+
+__all__ = (_impl_jobpool.__all__)
@@ -0,0 +1,149 @@
+import json
+import os
+import sys
+
+
+# Implemented the sizing of the compile and link job pools from the available memory and the memory measured in previous builds
+
+
+__all__ = ["JobMemoryHistory",
+           "get_available_memory_bytes",
+           "compute_job_pool_sizes"
+           ]
+
+
+_DEFAULT_COMPILE_JOB_BYTES = 1 * 2**30   # per job estimates before anything was measured
+_DEFAULT_LINK_JOB_BYTES = 2 * 2**30
+_USABLE_MEMORY_FRACTION = 0.9            # headroom for the rest of the machine
+
+
+class JobMemoryHistory:
+    """
+    Peak memory of the largest build process (usually a link) of the last builds of each build type, persisted between runs
+    """
+
+    _FORMAT_VERSION = 1
+    _MAX_SAMPLES = 5
+
+    def __init__(self, history_file_path: str):
+        """
+        :param history_file_path: full path to the persisted peaks
+        """
+
+        self._history_file_path = history_file_path
+        self._peaks: dict[str, list[int]] = self._load()
+
+    def get(self, build_type_name: str) -> int | None:
+        """
+        :param build_type_name: value of `CMAKE_BUILD_TYPE`
+        :returns int | None: largest peak of the last builds in bytes, `None` if never measured
+        """
+
+        peaks = self._peaks.get(build_type_name)
+        return max(peaks) if peaks else None
+
+    def add(self, build_type_name: str, peak_rss_bytes: int) -> None:
+        """
+        Remember the peak of a build (saved immediately, only the last builds are kept)
+
+        :param build_type_name: value of `CMAKE_BUILD_TYPE`
+        :param peak_rss_bytes: peak resident memory of the largest build process
+        """
+
+        peaks = self._peaks.setdefault(build_type_name, [])
+        peaks.append(peak_rss_bytes)
+        del peaks[:-JobMemoryHistory._MAX_SAMPLES]
+
+        os.makedirs(os.path.dirname(self._history_file_path), exist_ok=True)
+        temp_file_path = f"{self._history_file_path}.tmp"
+        with open(temp_file_path, "w") as history_file:
+            json.dump({"version": JobMemoryHistory._FORMAT_VERSION, "peaks": self._peaks}, history_file, indent=1)
+        os.replace(temp_file_path, self._history_file_path)
+
+    def _load(self) -> dict[str, list[int]]:
+        try:
+            with open(self._history_file_path, "r") as history_file:
+                history_data = json.load(history_file)
+            if history_data.get("version") == JobMemoryHistory._FORMAT_VERSION:
+                return history_data["peaks"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        return {}
+
+
+def get_available_memory_bytes() -> int | None:
+    """
+    :returns int | None: physical memory available without swapping, `None` if unknown
+    """
+
+    if sys.platform == "win32":
+        try:
+            import ctypes
+
+            class _MemoryStatusEx(ctypes.Structure):
+                _fields_ = [("dwLength", ctypes.c_ulong),
+                            ("dwMemoryLoad", ctypes.c_ulong),
+                            ("ullTotalPhys", ctypes.c_ulonglong),
+                            ("ullAvailPhys", ctypes.c_ulonglong),
+                            ("ullTotalPageFile", ctypes.c_ulonglong),
+                            ("ullAvailPageFile", ctypes.c_ulonglong),
+                            ("ullTotalVirtual", ctypes.c_ulonglong),
+                            ("ullAvailVirtual", ctypes.c_ulonglong),
+                            ("ullAvailExtendedVirtual", ctypes.c_ulonglong)
+                            ]
+
+            status = _MemoryStatusEx()
+            status.dwLength = ctypes.sizeof(status)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+                return status.ullAvailPhys
+        except (OSError, AttributeError):
+            pass
+        return None
+
+    # MemAvailable counts the reclaimable page cache, unlike the free pages
+    try:
+        with open("/proc/meminfo", "r") as meminfo_file:
+            for line in meminfo_file:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def compute_job_pool_sizes(available_memory_bytes: int | None,
+                           measured_job_bytes: int | None,
+                           cpu_count: int,
+                           compile_jobs: int=0,
+                           link_jobs: int=0
+) -> tuple[int, int]:
+    """
+    A link job is expected to use the measured peak, a compile job the smaller of the measured peak and a default estimate.
+
+    :param available_memory_bytes: returned by `get_available_memory_bytes` (`None` to only use the CPU count)
+    :param measured_job_bytes: returned by `JobMemoryHistory.get` (`None` for the default estimates)
+    :param cpu_count: logical CPUs of the machine
+    :param compile_jobs: compile pool size forced in the manifest (`0` for automatic)
+    :param link_jobs: link pool size forced in the manifest (`0` for automatic)
+    :returns tuple[int, int]: compile pool size, link pool size (the link pool is never larger than the compile pool)
+    """
+
+    cpu_count = max(1, cpu_count)
+    link_job_bytes = measured_job_bytes or _DEFAULT_LINK_JOB_BYTES
+    compile_job_bytes = min(link_job_bytes, _DEFAULT_COMPILE_JOB_BYTES)
+
+    if available_memory_bytes:
+        usable_memory_bytes = available_memory_bytes * _USABLE_MEMORY_FRACTION
+        auto_compile_jobs = max(1, min(cpu_count, int(usable_memory_bytes // compile_job_bytes)))
+        auto_link_jobs = max(1, int(usable_memory_bytes // link_job_bytes))
+    else:
+        auto_compile_jobs = cpu_count
+        auto_link_jobs = max(1, cpu_count // 4)
+
+    compile_pool_size = compile_jobs if compile_jobs > 0 else auto_compile_jobs
+    link_pool_size = link_jobs if link_jobs > 0 else min(auto_link_jobs, compile_pool_size)
+    return compile_pool_size, link_pool_size
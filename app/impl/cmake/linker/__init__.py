@@ -0,0 +1,3 @@
+from ._impl_linker import *
+
+__all__ = (_impl_linker.__all__)
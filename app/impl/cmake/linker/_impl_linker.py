@@ -0,0 +1,116 @@
+import json
+import os
+import subprocess
+import tempfile
+from enum import Enum
+
+
+# Implemented the fast linker detection (mold, lld, gold) with a probe cached per compiler
+
+
+__all__ = ["LinkerType",
+           "probe_linkers",
+           "get_linker_candidates"
+           ]
+
+
+class LinkerType(Enum):
+    # preference order of the automatic selection
+    MOLD = "mold"
+    LLD = "lld"
+    GOLD = "gold"
+
+
+_PROBE_FORMAT_VERSION = 1
+_PROBE_SOURCE = "int main(void) { return 0; }\n"
+_PROBE_TIMEOUT_SECONDS = 60
+
+
+def _get_compiler_key(compiler_path: str) -> str:
+    """
+    Identity of the compiler binary (an upgraded compiler is probed again)
+    """
+
+    real_path = os.path.realpath(compiler_path)
+    compiler_stat = os.stat(real_path)
+    return f"{real_path}|{compiler_stat.st_mtime_ns}|{compiler_stat.st_size}"
+
+
+def _load_probe_cache(cache_file_path: str) -> dict[str, list[str]]:
+    try:
+        with open(cache_file_path, "r") as cache_file:
+            cache_data = json.load(cache_file)
+        if cache_data.get("version") == _PROBE_FORMAT_VERSION:
+            return cache_data["compilers"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return {}
+
+
+def _save_probe_cache(cache_file_path: str, compilers: dict[str, list[str]]) -> None:
+    os.makedirs(os.path.dirname(cache_file_path), exist_ok=True)
+    temp_file_path = f"{cache_file_path}.tmp"
+    with open(temp_file_path, "w") as cache_file:
+        json.dump({"version": _PROBE_FORMAT_VERSION, "compilers": compilers}, cache_file, indent=1)
+    os.replace(temp_file_path, cache_file_path)
+
+
+def _test_link(compiler_path: str, source_extension: str, linker_type: LinkerType) -> bool:
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        source_path = os.path.join(temp_dir_path, f"probe{source_extension}")
+        with open(source_path, "w") as source_file:
+            source_file.write(_PROBE_SOURCE)
+
+        try:
+            subprocess.run([compiler_path, f"-fuse-ld={linker_type.value}", source_path, "-o", os.path.join(temp_dir_path, "probe")],
+                           stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL,
+                           timeout=_PROBE_TIMEOUT_SECONDS,
+                           check=True
+                           )
+        except (OSError, subprocess.SubprocessError):
+            return False
+    return True
+
+
+def probe_linkers(compiler_path: str, source_extension: str, cache_file_path: str=None) -> list[LinkerType]:
+    """
+    Test link an empty program with each fast linker. The result is cached per compiler binary.
+
+    :param compiler_path: full path to the compiler driving the links
+    :param source_extension: extension of the test source (`.c` or `.cpp`)
+    :param cache_file_path: full path to the persisted probe results (`None` to probe every time)
+    :returns list[LinkerType]: the linkers that work with this compiler, in preference order
+    """
+
+    try:
+        compiler_key = f"{_get_compiler_key(compiler_path)}|{source_extension}"
+    except OSError:
+        return []
+
+    compilers = _load_probe_cache(cache_file_path) if cache_file_path else {}
+    if compiler_key in compilers:
+        return [LinkerType(name) for name in compilers[compiler_key] if name in {linker_type.value for linker_type in LinkerType}]
+
+    available = [linker_type for linker_type in LinkerType if _test_link(compiler_path, source_extension, linker_type)]
+
+    if cache_file_path:
+        compilers[compiler_key] = [linker_type.value for linker_type in available]
+        _save_probe_cache(cache_file_path, compilers)
+
+    return available
+
+
+def get_linker_candidates(requested_linker: LinkerType | None, available_linkers: list[LinkerType] | None) -> list[LinkerType]:
+    """
+    Linkers tried in order at configuration (the first one passing the cmake test link is used, else the default linker)
+
+    :param requested_linker: linker set in the manifest, `None` for automatic selection
+    :param available_linkers: returned by `probe_linkers`, `None` if the compiler is not known yet (every linker is tried)
+    :returns list[LinkerType]: the requested linker first, then the available ones
+    """
+
+    candidates = list(LinkerType) if available_linkers is None else list(available_linkers)
+    if requested_linker is None:
+        return candidates
+    return [requested_linker] + [linker_type for linker_type in candidates if linker_type is not requested_linker]
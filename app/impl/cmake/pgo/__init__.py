@@ -0,0 +1,3 @@
+from ._impl_pgo import *
+
+__all__ = (_impl_pgo.__all__)
@@ -0,0 +1,249 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+from enum import Enum
+
+
+# Implemented the profile guided optimization profiles: training run, merge and versioned storage
+
+
+__all__ = ["ProfileKind",
+           "PgoProfile",
+           "PgoProfileStore",
+           "detect_profile_kind",
+           "find_llvm_profdata",
+           "run_training"
+           ]
+
+
+class ProfileKind(Enum):
+    LLVM = "llvm"   # .profraw files merged by llvm-profdata
+    GCC = "gcc"     # .gcda files (the gcc runtime merges the counters of every run)
+
+
+class PgoProfile:
+    """
+    A stored profile version with the content digests of the project files it was trained on
+    """
+
+    def __init__(self, version: int, kind: ProfileKind, profile_path: str, created: str, build_type_name: str, file_digests: dict[str, str]):
+        """
+        :param version: version number (increases with each training)
+        :param kind: compiler family that wrote the profile
+        :param profile_path: full path to the merged profile (`.profdata` file for clang, `.gcda` directory for gcc)
+        :param created: local time of the training
+        :param build_type_name: value of `CMAKE_BUILD_TYPE` of the instrumented build (the profile only matches the same optimizations)
+        :param file_digests: digest by relative path of the project files at training time
+        """
+
+        self.version = version
+        self.kind = kind
+        self.profile_path = profile_path
+        self.created = created
+        self.build_type_name = build_type_name
+        self.file_digests = file_digests
+
+    def get_drift(self, file_digests: dict[str, str]) -> float:
+        """
+        :param file_digests: digest by relative path of the current project files
+        :returns float: fraction (0 to 1) of the files added, removed or edited since the training
+        """
+
+        all_paths = self.file_digests.keys() | file_digests.keys()
+        if not all_paths:
+            return 0.0
+
+        changed_count = sum(1 for path in all_paths if self.file_digests.get(path) != file_digests.get(path))
+        return changed_count / len(all_paths)
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+class PgoProfileStore:
+    """
+    Versioned profiles, one directory per training (`v1`, `v2`, ...).
+    A version is written in a temporary directory and renamed when complete, only the newest versions are kept.
+    """
+
+    _FORMAT_VERSION = 1
+    _METADATA_FILE_NAME = "profile.json"
+    _LLVM_PROFILE_NAME = "default.profdata"
+    _GCC_PROFILE_NAME = "gcda"
+    _VERSION_DIR_PATTERN = re.compile(r"^v(\d+)$")
+
+    def __init__(self, store_dir_path: str, max_versions: int=3):
+        """
+        :param store_dir_path: full path to the profiles directory
+        :param max_versions: number of versions kept (older ones are deleted when a new one is added)
+        """
+
+        self._store_dir_path = store_dir_path
+        self._max_versions = max(1, max_versions)
+
+    def get_latest(self) -> PgoProfile | None:
+        """
+        :returns PgoProfile | None: the newest readable version, `None` if nothing was trained yet
+        """
+
+        for version in self._get_versions():
+            profile = self._load(version)
+            if profile is not None:
+                return profile
+        return None
+
+    def add(self,
+            raw_profile_dir_path: str,
+            kind: ProfileKind,
+            build_type_name: str,
+            file_digests: dict[str, str],
+            llvm_profdata_path: str=None
+    ) -> PgoProfile:
+        """
+        Merge the raw profiles of a training in a new version
+
+        :param raw_profile_dir_path: full path to the directory written by the instrumented binaries
+        :param kind: returned by `detect_profile_kind`
+        :param build_type_name: value of `CMAKE_BUILD_TYPE` of the instrumented build
+        :param file_digests: digest by relative path of the project files the instrumented binaries were built from
+        :param llvm_profdata_path: full path to llvm-profdata (required for `ProfileKind.LLVM`)
+        :returns PgoProfile: the new version
+        :raises subprocess.CalledProcessError: if the merge fails
+        """
+
+        versions = self._get_versions()
+        version = versions[0] + 1 if versions else 1
+        version_dir_path = self._get_version_dir_path(version)
+        temp_dir_path = f"{version_dir_path}.tmp"
+
+        shutil.rmtree(temp_dir_path, ignore_errors=True)
+        os.makedirs(temp_dir_path)
+
+        match kind:
+            case ProfileKind.LLVM:
+                profile_name = PgoProfileStore._LLVM_PROFILE_NAME
+                raw_files = [os.path.join(current_dir_path, file_name)
+                             for current_dir_path, _, file_names in os.walk(raw_profile_dir_path)
+                             for file_name in sorted(file_names) if file_name.endswith(".profraw")]
+                subprocess.check_call([llvm_profdata_path, "merge", f"-output={os.path.join(temp_dir_path, profile_name)}", *raw_files])
+            case ProfileKind.GCC:
+                profile_name = PgoProfileStore._GCC_PROFILE_NAME
+                shutil.copytree(raw_profile_dir_path, os.path.join(temp_dir_path, profile_name))
+
+        metadata = {"version": PgoProfileStore._FORMAT_VERSION,
+                    "kind": kind.value,
+                    "profile": profile_name,
+                    "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "build_type": build_type_name,
+                    "files": file_digests
+                    }
+        with open(os.path.join(temp_dir_path, PgoProfileStore._METADATA_FILE_NAME), "w") as metadata_file:
+            json.dump(metadata, metadata_file, separators=(",", ":"))
+
+        os.replace(temp_dir_path, version_dir_path)
+
+        for old_version in self._get_versions()[self._max_versions:]:
+            shutil.rmtree(self._get_version_dir_path(old_version), ignore_errors=True)
+
+        return self._load(version)
+
+    def _get_versions(self) -> list[int]:
+        """
+        :returns list[int]: stored version numbers, newest first
+        """
+
+        try:
+            dir_names = os.listdir(self._store_dir_path)
+        except OSError:
+            return []
+
+        versions = [int(match.group(1)) for match in map(PgoProfileStore._VERSION_DIR_PATTERN.match, dir_names) if match]
+        return sorted(versions, reverse=True)
+
+    def _get_version_dir_path(self, version: int) -> str:
+        return os.path.join(self._store_dir_path, f"v{version}").replace("\\", "/")
+
+    def _load(self, version: int) -> PgoProfile | None:
+        version_dir_path = self._get_version_dir_path(version)
+        try:
+            with open(os.path.join(version_dir_path, PgoProfileStore._METADATA_FILE_NAME), "r") as metadata_file:
+                metadata = json.load(metadata_file)
+            if metadata.get("version") != PgoProfileStore._FORMAT_VERSION:
+                return None
+            return PgoProfile(version,
+                              ProfileKind(metadata["kind"]),
+                              f"{version_dir_path}/{metadata['profile']}",
+                              metadata["created"],
+                              metadata["build_type"],
+                              metadata["files"]
+                              )
+        except (OSError, ValueError, KeyError, AttributeError):
+            return None
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+def detect_profile_kind(raw_profile_dir_path: str) -> ProfileKind | None:
+    """
+    :param raw_profile_dir_path: full path to the directory written by the instrumented binaries
+    :returns ProfileKind | None: kind of the raw profiles found, `None` if the directory holds none
+    """
+
+    for _, _, file_names in os.walk(raw_profile_dir_path):
+        for file_name in file_names:
+            if file_name.endswith(".profraw"):
+                return ProfileKind.LLVM
+            if file_name.endswith(".gcda"):
+                return ProfileKind.GCC
+    return None
+
+
+def find_llvm_profdata(compiler_paths: list[str]) -> str | None:
+    """
+    Search llvm-profdata next to the clang compiler (same version suffix, `clang-17` -> `llvm-profdata-17`), then in PATH
+
+    :param compiler_paths: full paths to the compilers used by the instrumented build
+    :returns str | None: full path to llvm-profdata, `None` if not found
+    """
+
+    candidates: list[str] = []
+    for compiler_path in compiler_paths:
+        compiler_dir_path, compiler_name = os.path.split(compiler_path)
+        version_suffix = re.search(r"(-\d+(?:\.\d+)*)?(?:\.exe)?$", compiler_name).group(1) or ""
+        candidates += [os.path.join(compiler_dir_path, f"llvm-profdata{version_suffix}"),
+                       os.path.join(compiler_dir_path, "llvm-profdata")
+                       ]
+        candidates += [f"llvm-profdata{version_suffix}", "llvm-profdata"]
+
+    for candidate in candidates + ["llvm-profdata"]:
+        found_path = shutil.which(candidate)
+        if found_path:
+            return found_path
+    return None
+
+
+def run_training(training_command: str | list[str], working_dir_path: str, placeholders: dict[str, str]) -> None:
+    """
+    Run the training workload on the instrumented binaries
+
+    :param training_command: shell command line, or program and arguments
+    :param working_dir_path: full path to the directory the command is run from
+    :param placeholders: values replacing `{name}` in the command (like `{bin_dir}`)
+    :raises subprocess.CalledProcessError: if the command fails
+    """
+
+    def _expand(text: str) -> str:
+        for name, value in placeholders.items():
+            text = text.replace(f"{{{name}}}", value)
+        return text
+
+    if isinstance(training_command, str):
+        subprocess.check_call(_expand(training_command), shell=True, cwd=working_dir_path)
+    else:
+        subprocess.check_call([_expand(arg) for arg in training_command], cwd=working_dir_path)
@@ -0,0 +1,3 @@
+from ._impl_timetrace import *
+
+__all__ = (_impl_timetrace.__all__)
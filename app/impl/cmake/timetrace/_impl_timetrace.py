@@ -0,0 +1,186 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from ._timetrace_parser import CLANG_TRACE_EXTENSION, GCC_REPORT_EXTENSION, parse_time_trace, parse_time_trace_batch
+
+
+# Implemented the compile time report: traces of every translation unit aggregated across a process pool
+
+
+__all__ = ["TranslationUnitTime",
+           "CompileTimeReport",
+           "find_time_traces",
+           "aggregate_compile_times"
+           ]
+
+
+_OBJECT_EXTENSIONS = (".o", ".obj")
+_OBJECT_DIR_PATTERN = re.compile(r"^CMakeFiles/[^/]+\.dir/")   # objects of a target: CMakeFiles/<target>.dir/<source path>.o
+_PROCESS_POOL_MIN_FILES = 64
+_PROCESS_POOL_BATCH_SIZE = 16
+
+
+class TranslationUnitTime:
+    """
+    Where the compilation time of one translation unit went
+    """
+
+    def __init__(self, name: str, frontend_seconds: float, backend_seconds: float, templates_seconds: float):
+        """
+        :param name: source path (relative to the project) compiled in the translation unit
+        :param frontend_seconds: preprocessing, parsing and semantic analysis (template instantiations included)
+        :param backend_seconds: optimization and code generation
+        :param templates_seconds: template instantiations (part of the frontend)
+        """
+
+        self.name = name
+        self.frontend_seconds = frontend_seconds
+        self.backend_seconds = backend_seconds
+        self.templates_seconds = templates_seconds
+
+    @property
+    def total_seconds(self) -> float:
+        return self.frontend_seconds + self.backend_seconds
+
+    def to_json(self) -> dict:
+        return {"name": self.name,
+                "frontend_seconds": self.frontend_seconds,
+                "backend_seconds": self.backend_seconds,
+                "templates_seconds": self.templates_seconds
+                }
+
+
+class CompileTimeReport:
+    """
+    Headers ranked by total parse time, templates by total instantiation time and translation units by compile time (frontend vs backend)
+    """
+
+    def __init__(self, translation_units: list[TranslationUnitTime], header_seconds: dict[str, float], template_seconds: dict[str, float]):
+        """
+        :param translation_units: time of each translation unit
+        :param header_seconds: parse time of each header summed over the translation units (clang only)
+        :param template_seconds: instantiation time of each template summed over the translation units (clang only)
+        """
+
+        self.translation_units: list[TranslationUnitTime] = sorted(translation_units, key=lambda tu: (-tu.total_seconds, tu.name))
+        # (name, seconds), most expensive first
+        self.headers: list[tuple[str, float]] = sorted(header_seconds.items(), key=lambda item: (-item[1], item[0]))
+        self.templates: list[tuple[str, float]] = sorted(template_seconds.items(), key=lambda item: (-item[1], item[0]))
+
+    def to_text(self, top_count: int=20) -> str:
+        if not self.translation_units:
+            return "Compile time report: no trace found (clang or gcc required)"
+
+        frontend_seconds = sum(tu.frontend_seconds for tu in self.translation_units)
+        backend_seconds = sum(tu.backend_seconds for tu in self.translation_units)
+        templates_seconds = sum(tu.templates_seconds for tu in self.translation_units)
+        lines = [f"Compile time report: {len(self.translation_units)} translation units, "
+                 f"frontend {frontend_seconds:.2f} s (templates {templates_seconds:.2f} s), backend {backend_seconds:.2f} s"]
+
+        lines += ["", f"Top {top_count} translation units (total, frontend, backend, templates s):"]
+        lines += [f"{tu.total_seconds:>8.2f}  {tu.frontend_seconds:>8.2f}  {tu.backend_seconds:>8.2f}  {tu.templates_seconds:>9.2f}  {tu.name}"
+                  for tu in self.translation_units[:top_count]]
+
+        if self.headers:
+            lines += ["", f"Top {top_count} headers by total parse time, included headers counted (s):"]
+            lines += [f"{seconds:>8.2f}  {name}" for name, seconds in self.headers[:top_count]]
+
+        if self.templates:
+            lines += ["", f"Top {top_count} templates by total instantiation time, nested instantiations counted (s):"]
+            lines += [f"{seconds:>8.2f}  {name}" for name, seconds in self.templates[:top_count]]
+
+        if not self.headers and not self.templates:
+            lines += ["", "Headers and templates details are only traced by clang (-ftime-trace)"]
+
+        return "\n".join(lines)
+
+    def to_json(self, top_count: int=100) -> dict:
+        return {"translation_units": [tu.to_json() for tu in self.translation_units],
+                "headers": [{"name": name, "seconds": seconds} for name, seconds in self.headers[:top_count]],
+                "templates": [{"name": name, "seconds": seconds} for name, seconds in self.templates[:top_count]]
+                }
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+def find_time_traces(build_dir_path: str, since_time: float=0) -> list[str]:
+    """
+    :param build_dir_path: full path to the build directory compiled with the traces
+    :param since_time: only the traces written after this time (`time.time()` before the build), older ones belong to deleted sources
+    :returns list[str]: full paths to the clang traces and gcc reports next to the objects
+    """
+
+    trace_paths: list[str] = []
+    for current_dir_path, _, file_names in os.walk(build_dir_path):
+        for file_name in file_names:
+            if not file_name.endswith(_OBJECT_EXTENSIONS):
+                continue
+
+            object_path = os.path.join(current_dir_path, file_name)
+            for trace_path in (object_path + GCC_REPORT_EXTENSION, os.path.splitext(object_path)[0] + CLANG_TRACE_EXTENSION):
+                try:
+                    if os.path.getmtime(trace_path) >= since_time:
+                        trace_paths.append(trace_path)
+                        break
+                except OSError:
+                    continue
+
+    return sorted(trace_paths)
+
+
+def _get_translation_unit_name(trace_path: str, build_dir_path: str) -> str:
+    object_name = os.path.relpath(trace_path, build_dir_path).replace("\\", "/")
+    for extension in (GCC_REPORT_EXTENSION, CLANG_TRACE_EXTENSION, *_OBJECT_EXTENSIONS):
+        object_name = object_name.removesuffix(extension)
+    return _OBJECT_DIR_PATTERN.sub("", object_name)
+
+
+def _get_header_name(header_path: str, project_root_path: str) -> str:
+    header_path = os.path.normpath(header_path)
+    if header_path.startswith(os.path.join(project_root_path, "")):
+        return os.path.relpath(header_path, project_root_path).replace("\\", "/")
+    return header_path.replace("\\", "/")
+
+
+def aggregate_compile_times(trace_paths: list[str], build_dir_path: str, project_root_path: str, max_workers: int=None) -> CompileTimeReport:
+    """
+    Parse the traces across a process pool (in the current process for a few traces) and sum them by header and template
+
+    :param trace_paths: returned by `find_time_traces`
+    :param build_dir_path: full path to the build directory compiled with the traces
+    :param project_root_path: full path to the project (headers are shown relative to it)
+    :param max_workers: maximum number of parsing processes (default cpu count)
+    :returns CompileTimeReport: the aggregated report
+    """
+
+    if len(trace_paths) < _PROCESS_POOL_MIN_FILES:
+        results = [parse_time_trace(trace_path) for trace_path in trace_paths]
+    else:
+        batches = [trace_paths[start:start + _PROCESS_POOL_BATCH_SIZE] for start in range(0, len(trace_paths), _PROCESS_POOL_BATCH_SIZE)]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = [result for batch_results in executor.map(parse_time_trace_batch, batches) for result in batch_results]
+
+    project_root_path = os.path.normpath(os.path.abspath(project_root_path))
+    translation_units: list[TranslationUnitTime] = []
+    header_seconds: dict[str, float] = {}
+    template_seconds: dict[str, float] = {}
+
+    for result in results:
+        if result is None:
+            continue
+
+        translation_units.append(TranslationUnitTime(_get_translation_unit_name(result["trace"], build_dir_path),
+                                                     result["frontend"],
+                                                     result["backend"],
+                                                     result["templates_total"]
+                                                     ))
+        for header_path, seconds in result["headers"].items():
+            header_name = _get_header_name(header_path, project_root_path)
+            header_seconds[header_name] = header_seconds.get(header_name, 0.0) + seconds
+        for template_name, seconds in result["templates"].items():
+            template_seconds[template_name] = template_seconds.get(template_name, 0.0) + seconds
+
+    return CompileTimeReport(translation_units, header_seconds, template_seconds)
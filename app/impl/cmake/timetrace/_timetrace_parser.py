@@ -0,0 +1,115 @@
+import json
+import re
+
+
+# Implemented the parsing of the per translation unit compile time traces (clang -ftime-trace, gcc -ftime-report)
+
+
+CLANG_TRACE_EXTENSION = ".json"              # written by clang next to the object (`a.cpp.o` -> `a.cpp.json`)
+GCC_REPORT_EXTENSION = ".time-report.txt"    # written by the time report launcher next to the object (`a.cpp.o.time-report.txt`)
+
+_CLANG_TEMPLATE_EVENT_NAMES = ("InstantiateClass", "InstantiateFunction")
+
+# wall time column of `-ftime-report` (`name : usr (%) sys (%) wall (%) GGC`)
+_GCC_REPORT_LINE_PATTERN = re.compile(r"^ (?P<name>[^|:][^:]*?)\s*:\s*[\d.]+\s*\(\s*\d+%\)\s*[\d.]+\s*\(\s*\d+%\)\s*(?P<wall>[\d.]+)")
+_GCC_FRONTEND_PHASES = ("phase setup", "phase parsing", "phase lang. deferred", "phase late parsing cleanups")
+_GCC_BACKEND_PHASES = ("phase opt and generate", "phase last asm", "phase finalize", "phase stream in", "phase stream out")
+_GCC_TEMPLATE_TIMER = "template instantiation"
+
+
+def _create_result(trace_path: str) -> dict:
+    return {"trace": trace_path, "frontend": 0.0, "backend": 0.0, "templates_total": 0.0, "headers": {}, "templates": {}}
+
+
+def parse_clang_time_trace(trace_path: str) -> dict | None:
+    """
+    Headers (`Source` events) and template instantiations are inclusive: a header includes the time of the headers it includes
+
+    :param trace_path: full path to the chrome trace written by `-ftime-trace`
+    :returns dict | None: seconds by phase (`frontend`, `backend`, `templates_total`), by header and by template, `None` if unreadable
+    """
+
+    try:
+        with open(trace_path, "r", errors="replace") as trace_file:
+            events = json.load(trace_file)["traceEvents"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    result = _create_result(trace_path)
+    template_intervals: list[tuple[int, int]] = []
+
+    for event in events:
+        if not isinstance(event, dict) or event.get("ph") != "X":
+            continue
+
+        name = event.get("name", "")
+        seconds = event.get("dur", 0) / 1e6
+
+        if name == "Frontend":
+            result["frontend"] += seconds
+        elif name == "Backend":
+            result["backend"] += seconds
+        elif name == "Source":
+            detail = event.get("args", {}).get("detail", "")
+            result["headers"][detail] = result["headers"].get(detail, 0.0) + seconds
+        elif name in _CLANG_TEMPLATE_EVENT_NAMES:
+            detail = event.get("args", {}).get("detail", "")
+            result["templates"][detail] = result["templates"].get(detail, 0.0) + seconds
+            template_intervals.append((event.get("ts", 0), event.get("dur", 0)))
+
+    # only the outermost instantiations count in the total, the nested ones are already in their time
+    outermost_end = None
+    for start, duration in sorted(template_intervals):
+        if outermost_end is None or start >= outermost_end:
+            result["templates_total"] += duration / 1e6
+            outermost_end = start + duration
+
+    return result
+
+
+def parse_gcc_time_report(report_path: str) -> dict | None:
+    """
+    gcc only reports phases and timers for the whole translation unit (no header or template details)
+
+    :param report_path: full path to the `-ftime-report` output saved by the launcher
+    :returns dict | None: seconds by phase (`frontend`, `backend`, `templates_total`), `None` if unreadable or without report
+    """
+
+    try:
+        with open(report_path, "r", errors="replace") as report_file:
+            lines = report_file.readlines()
+    except OSError:
+        return None
+
+    result = _create_result(report_path)
+    found = False
+    for line in lines:
+        match = _GCC_REPORT_LINE_PATTERN.match(line)
+        if not match:
+            continue
+
+        found = True
+        name = match.group("name").strip()
+        seconds = float(match.group("wall"))
+
+        if name in _GCC_FRONTEND_PHASES:
+            result["frontend"] += seconds
+        elif name in _GCC_BACKEND_PHASES:
+            result["backend"] += seconds
+        elif name == _GCC_TEMPLATE_TIMER:
+            result["templates_total"] += seconds
+
+    return result if found else None
+
+
+def parse_time_trace(trace_path: str) -> dict | None:
+    if trace_path.endswith(GCC_REPORT_EXTENSION):
+        return parse_gcc_time_report(trace_path)
+    return parse_clang_time_trace(trace_path)
+
+
+def parse_time_trace_batch(trace_paths: list[str]) -> list[dict | None]:
+    """
+    Process pool entry point: parse several traces in one task to amortize the inter-process overhead
+    """
+    return [parse_time_trace(trace_path) for trace_path in trace_paths]
@@ -0,0 +1,3 @@
+from ._impl_trash import *
+
+__all__ = (_impl_trash.__all__)
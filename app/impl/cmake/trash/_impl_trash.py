@@ -0,0 +1,185 @@
+import os
+import queue
+import stat
+import threading
+import time
+from typing import Callable
+
+
+# Implemented the non blocking directory removal: rename to a tombstone, then parallel bottom-up delete in background threads
+
+
+__all__ = ["move_to_trash",
+           "remove_leftover_trash",
+           "wait_for_trash_removal"
+           ]
+
+
+_TOMBSTONE_MARKER = ".pyforge-trash-"
+_WORKERS_COUNT = min(8, os.cpu_count() or 1)
+
+
+class _DirNode:
+    """
+    Directory being removed: deleted once its own files and all its subdirectories are gone
+    """
+
+    def __init__(self, dir_path: str, parent: "_DirNode | None"):
+        self.dir_path = dir_path
+        self.parent = parent
+        self.pending_count = 1   # the scan of the directory itself
+
+
+class _TreeRemover:
+    """
+    Daemon worker threads sharing a queue of directories to empty.
+    Each directory is scanned by one worker (files unlinked, subdirectories queued), the last finished child removes its parent.
+    Nothing blocks the exit: a tombstone left behind is removed by `remove_leftover_trash` on the next run.
+    """
+
+    def __init__(self, workers_count: int):
+        self._tasks: queue.Queue[_DirNode] = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers_count = workers_count
+        self._workers: list[threading.Thread] = []
+
+    def remove(self, dir_path: str) -> None:
+        self._start_workers()
+        self._tasks.put(_DirNode(dir_path, None))
+
+    def wait(self, timeout: float=None) -> bool:
+        """
+        :returns bool: `True` if every queued removal finished
+        """
+
+        if timeout is None:
+            self._tasks.join()
+            return True
+
+        deadline = time.monotonic() + timeout
+        while self._tasks.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _start_workers(self) -> None:
+        with self._lock:
+            if self._workers:
+                return
+            for index in range(self._workers_count):
+                worker = threading.Thread(target=self._work, name=f"pyforge-trash-{index}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def _work(self) -> None:
+        while True:
+            node = self._tasks.get()
+            try:
+                self._empty_dir(node)
+            finally:
+                self._tasks.task_done()
+
+    def _empty_dir(self, node: _DirNode) -> None:
+        subdir_paths: list[str] = []
+        try:
+            with os.scandir(node.dir_path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdir_paths.append(entry.path)
+                    else:
+                        _call_writable(os.unlink, entry.path)
+        except OSError:
+            pass
+
+        # count the children before releasing the directory itself
+        with self._lock:
+            node.pending_count += len(subdir_paths)
+        for subdir_path in subdir_paths:
+            self._tasks.put(_DirNode(subdir_path, node))
+
+        self._release(node)
+
+    def _release(self, node: _DirNode | None) -> None:
+        while node is not None:
+            with self._lock:
+                node.pending_count -= 1
+                if node.pending_count:
+                    return
+            _call_writable(os.rmdir, node.dir_path)
+            node = node.parent
+
+
+def _call_writable(remove_function: Callable[[str], None], path: str) -> None:
+    """
+    Remove a file or an empty directory, clearing the read-only attribute if needed (windows). Errors are ignored.
+    """
+
+    try:
+        remove_function(path)
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        try:
+            os.chmod(path, stat.S_IWRITE)
+            remove_function(path)
+        except OSError:
+            pass
+    except OSError:
+        pass
+
+
+_remover = _TreeRemover(_WORKERS_COUNT)
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+def move_to_trash(dir_path: str) -> bool:
+    """
+    Rename the directory to a tombstone next to it (atomic, same filesystem) and delete it in the background
+
+    :param dir_path: full path to the directory to remove
+    :returns bool: `True` if the directory existed
+    :raises OSError: if the directory can't be renamed (like a file held open on windows)
+    """
+
+    if not os.path.isdir(dir_path):
+        return False
+
+    parent_dir_path, dir_name = os.path.split(os.path.normpath(dir_path))
+    tombstone_path = os.path.join(parent_dir_path, f".{dir_name}{_TOMBSTONE_MARKER}{os.getpid()}-{time.time_ns()}")
+
+    os.rename(dir_path, tombstone_path)
+    _remover.remove(tombstone_path)
+    return True
+
+
+def remove_leftover_trash(parent_dir_path: str) -> int:
+    """
+    Delete in the background the tombstones an interrupted run left in a directory
+
+    :param parent_dir_path: full path to the directory holding the removed directories
+    :returns int: number of tombstones found
+    """
+
+    try:
+        with os.scandir(parent_dir_path) as entries:
+            tombstone_paths = [entry.path for entry in entries
+                               if _TOMBSTONE_MARKER in entry.name and entry.is_dir(follow_symlinks=False)]
+    except OSError:
+        return 0
+
+    for tombstone_path in tombstone_paths:
+        _remover.remove(tombstone_path)
+    return len(tombstone_paths)
+
+
+def wait_for_trash_removal(timeout: float=None) -> bool:
+    """
+    :param timeout: maximum seconds to wait, `None` to wait until done
+    :returns bool: `True` if every tombstone was deleted
+    """
+
+    return _remover.wait(timeout)
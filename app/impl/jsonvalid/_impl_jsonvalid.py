@@ -1,7 +1,8 @@
+import copy
 import json
 
 
-__all__ = ["JSONStructureError", "load"]
+__all__ = ["JSONStructureError", "Optional", "load"]
 
 
 class JSONStructureError(Exception):
@@ -11,6 +12,21 @@ class JSONStructureError(Exception):
         super().__init__(message)
 
 
+class Optional:
+    """
+    Marks a key of the expected structure as optional. A missing key is filled with `default`.
+    """
+
+    def __init__(self, expected_type, default):
+        """
+        :param expected_type: expected type or nested expected structure (dict)
+        :param default: value used when the key is missing (validated against `expected_type`)
+        """
+
+        self.expected_type = expected_type
+        self.default = default
+
+
 def _check_json_structure(json_data:dict, expected_json_structure:dict, path="") -> None:
     """
     Recursively validate a JSON object against the expected structure.
@@ -27,12 +43,18 @@ def _check_json_structure(json_data:dict, expected_json_structure:dict, path="")
     for expected_key, expected_type in expected_json_structure.items():
         current_path = f"{path}.{expected_key}" if path else expected_key  # Track the nested key
 
+        if isinstance(expected_type, Optional):
+            if expected_key not in json_data:
+                json_data[expected_key] = copy.deepcopy(expected_type.default)
+            expected_type = expected_type.expected_type
+
         if expected_key not in json_data:
             raise JSONStructureError(f"Missing key: '{current_path}'")
 
-        if not isinstance(expected_type, dict): # Validate primitive types
+        if not isinstance(expected_type, dict): # Validate primitive types (or tuple of accepted types)
             if not isinstance(json_data[expected_key], expected_type):
-                raise JSONStructureError(f"Incorrect type for '{current_path}': Expected {expected_type.__name__}, got {type(json_data[expected_key]).__name__}")
+                expected_type_names = " or ".join(t.__name__ for t in expected_type) if isinstance(expected_type, tuple) else expected_type.__name__
+                raise JSONStructureError(f"Incorrect type for '{current_path}': Expected {expected_type_names}, got {type(json_data[expected_key]).__name__}")
         else:   # Recurse for nested structures
             _check_json_structure(json_data[expected_key], expected_type, current_path)
 
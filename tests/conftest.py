@@ -0,0 +1,6 @@
+import os
+import sys
+
+
+# the application modules are imported from `app` (like the frozen executable does)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "app"))
@@ -0,0 +1,216 @@
+import hashlib
+import http.server
+import os
+import socket
+import stat
+import threading
+
+import pytest
+
+from impl.cmake.artifacts import HttpArtifactStorage, LocalArtifactStorage, restore_artifacts, store_artifacts
+from impl.cmake.artifacts._artifacts_hash import hash_file
+
+
+class _CacheServerHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Local stand-in of an HTTP cache server: `GET`/`PUT`/`HEAD` on `/ac/<key>` and `/cas/<key>`, contents kept in memory
+    """
+
+    def do_GET(self):
+        content = self._get_content()
+        if content is None:
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_HEAD(self):
+        content = self._get_content()
+        if content is None:
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+
+    def do_PUT(self):
+        if self._get_key() is None:
+            return
+        self.server.contents[self.path] = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.put_paths.append(self.path)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _get_key(self) -> str | None:
+        kind, _, key = self.path.lstrip("/").partition("/")
+        if kind not in ("ac", "cas") or not key or "/" in key:
+            self.send_error(400)
+            return None
+        return key
+
+    def _get_content(self) -> bytes | None:
+        if self._get_key() is None:
+            return None
+        content = self.server.contents.get(self.path)
+        if content is None:
+            self.send_error(404)
+        return content
+
+
+@pytest.fixture
+def cache_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _CacheServerHandler)
+    server.contents = {}
+    server.put_paths = []
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=["local", "http"])
+def storage(request, tmp_path):
+    if request.param == "local":
+        return LocalArtifactStorage(str(tmp_path / "artifacts"))
+    server = request.getfixturevalue("cache_server")
+    return HttpArtifactStorage(f"http://127.0.0.1:{server.server_address[1]}")
+
+
+_OUTPUT_DIR_NAMES = ["bin", "lib"]
+
+
+def _write_files(dir_path, contents: dict[str, bytes]) -> None:
+    for relative_path, content in contents.items():
+        file_path = dir_path / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(content)
+
+
+def _create_outputs(build_dir_path) -> dict[str, bytes]:
+    contents = {"bin/app": b"\x7fELF executable", "lib/libcore.a": b"!<arch>\n", "lib/sub/libextra.so": b"\x7fELF shared"}
+    _write_files(build_dir_path, contents)
+    os.chmod(build_dir_path / "bin/app", 0o755)
+    return contents
+
+
+def test_store_then_restore_round_trip(storage, tmp_path):
+    build_dir_path = tmp_path / "build"
+    contents = _create_outputs(build_dir_path)
+
+    assert store_artifacts(storage, "f" * 64, str(build_dir_path), list(contents)) == len(contents)
+
+    restored_dir_path = tmp_path / "restored"
+    assert restore_artifacts(storage, "f" * 64, str(restored_dir_path), _OUTPUT_DIR_NAMES) == len(contents)
+
+    for relative_path, content in contents.items():
+        assert (restored_dir_path / relative_path).read_bytes() == content
+    if os.name != "nt":
+        assert stat.S_IMODE(os.stat(restored_dir_path / "bin/app").st_mode) == 0o755
+
+
+def test_unknown_fingerprint_is_a_miss(storage, tmp_path):
+    assert restore_artifacts(storage, "0" * 64, str(tmp_path / "restored"), _OUTPUT_DIR_NAMES) is None
+
+
+def test_only_the_listed_outputs_are_stored(storage, tmp_path):
+    build_dir_path = tmp_path / "build"
+    _create_outputs(build_dir_path)
+    # left by a configuration with another product
+    _write_files(build_dir_path, {"lib/libold_shared.so": b"\x7fELF old"})
+
+    assert store_artifacts(storage, "f" * 64, str(build_dir_path), ["bin/app"]) == 1
+
+    restored_dir_path = tmp_path / "restored"
+    assert restore_artifacts(storage, "f" * 64, str(restored_dir_path), _OUTPUT_DIR_NAMES) == 1
+    assert sorted(os.listdir(restored_dir_path)) == ["bin"]
+
+
+def test_missing_output_is_not_stored(storage, tmp_path):
+    build_dir_path = tmp_path / "build"
+    _create_outputs(build_dir_path)
+
+    with pytest.raises(OSError):
+        store_artifacts(storage, "f" * 64, str(build_dir_path), ["bin/app", "bin/never_built"])
+
+    assert restore_artifacts(storage, "f" * 64, str(tmp_path / "restored"), _OUTPUT_DIR_NAMES) is None
+
+
+def test_restore_replaces_the_output_directories(storage, tmp_path):
+    build_dir_path = tmp_path / "build"
+    contents = _create_outputs(build_dir_path)
+    store_artifacts(storage, "f" * 64, str(build_dir_path), list(contents))
+
+    restored_dir_path = tmp_path / "restored"
+    _write_files(restored_dir_path, {"bin/app": b"stale", "lib/libold_shared.so": b"\x7fELF old", "CMakeFiles/keep.o": b"object"})
+
+    assert restore_artifacts(storage, "f" * 64, str(restored_dir_path), _OUTPUT_DIR_NAMES) == len(contents)
+
+    assert not (restored_dir_path / "lib/libold_shared.so").exists()
+    assert (restored_dir_path / "bin/app").read_bytes() == contents["bin/app"]
+    # only the output directories are emptied
+    assert (restored_dir_path / "CMakeFiles/keep.o").read_bytes() == b"object"
+
+
+def test_stored_blobs_are_not_sent_again(cache_server, tmp_path):
+    storage = HttpArtifactStorage(f"http://127.0.0.1:{cache_server.server_address[1]}")
+    build_dir_path = tmp_path / "build"
+    _create_outputs(build_dir_path)
+
+    contents = _create_outputs(build_dir_path)
+
+    store_artifacts(storage, "a" * 64, str(build_dir_path), list(contents))
+    blob_puts_count = sum(1 for path in cache_server.put_paths if path.startswith("/cas/"))
+    store_artifacts(storage, "b" * 64, str(build_dir_path), list(contents))
+
+    assert blob_puts_count == 3
+    assert sum(1 for path in cache_server.put_paths if path.startswith("/cas/")) == blob_puts_count
+    assert sum(1 for path in cache_server.put_paths if path.startswith("/ac/")) == 2
+
+
+def test_missing_blob_is_a_miss_without_touching_outputs(cache_server, tmp_path):
+    storage = HttpArtifactStorage(f"http://127.0.0.1:{cache_server.server_address[1]}")
+    build_dir_path = tmp_path / "build"
+    contents = _create_outputs(build_dir_path)
+    store_artifacts(storage, "f" * 64, str(build_dir_path), list(contents))
+
+    del cache_server.contents[next(path for path in cache_server.contents if path.startswith("/cas/"))]
+
+    restored_dir_path = tmp_path / "restored"
+    _write_files(restored_dir_path, {"bin/app": b"current"})
+    assert restore_artifacts(storage, "f" * 64, str(restored_dir_path), _OUTPUT_DIR_NAMES) is None
+    assert (restored_dir_path / "bin/app").read_bytes() == b"current"
+
+
+def test_unreachable_server(tmp_path):
+    # a port nothing listens on
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe_socket:
+        probe_socket.bind(("127.0.0.1", 0))
+        port = probe_socket.getsockname()[1]
+    storage = HttpArtifactStorage(f"http://127.0.0.1:{port}", timeout=2.0)
+
+    build_dir_path = tmp_path / "build"
+    contents = _create_outputs(build_dir_path)
+
+    # a miss on restore, an OSError (reported by the caller) on store
+    assert restore_artifacts(storage, "f" * 64, str(tmp_path / "restored"), _OUTPUT_DIR_NAMES) is None
+    assert not storage.has_blob("0" * 64)
+    with pytest.raises(OSError):
+        store_artifacts(storage, "f" * 64, str(build_dir_path), list(contents))
+
+
+@pytest.mark.parametrize("size", [0, 5, 3 * 1024 * 1024 + 7])
+def test_hash_file_without_file_digest(tmp_path, monkeypatch, size):
+    file_path = tmp_path / "blob"
+    file_path.write_bytes(bytes(range(256)) * (size // 256) + b"x" * (size % 256))
+    expected = hashlib.sha256(file_path.read_bytes()).hexdigest()
+
+    assert hash_file(str(file_path)) == expected
+
+    # Python 3.10 has no `hashlib.file_digest`
+    monkeypatch.delattr(hashlib, "file_digest", raising=False)
+    assert hash_file(str(file_path)) == expected
@@ -0,0 +1,223 @@
+import shutil
+import subprocess
+
+import pytest
+
+from impl.cmake.buildlog import (BuildReport, EdgeKind, NinjaLogEntry, get_ninja_log_size, parse_ninja_graph, read_ninja_graph, read_ninja_log,
+                                 read_ninja_outputs)
+
+
+requires_ninja = pytest.mark.skipif(shutil.which("ninja") is None, reason="ninja executable not found")
+
+_OUTPUT_DIR_NAMES = ["bin", "lib"]
+
+
+def _write_ninja_log(build_dir_path, lines: list[str], mode: str="w") -> None:
+    with open(build_dir_path / ".ninja_log", mode) as log_file:
+        log_file.writelines(f"{line}\n" for line in lines)
+
+
+def _report(edges: list[tuple[int, int, str]], inputs_by_output: dict[str, list[str]] | None) -> BuildReport:
+    return BuildReport([NinjaLogEntry(start_ms, end_ms, output) for start_ms, end_ms, output in edges], _OUTPUT_DIR_NAMES, 2, inputs_by_output)
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+def test_read_ninja_log_skips_comments_and_invalid_lines(tmp_path):
+    _write_ninja_log(tmp_path, ["# ninja log v5",
+                                "0\t120\t0\tCMakeFiles/a.dir/a.cpp.o\t1a2b",
+                                "not a log line",
+                                "x\t10\t0\tbroken.o\t1a2b",
+                                "120\t300\t0\tbin/demo\t3c4d"
+                                ])
+
+    entries = read_ninja_log(str(tmp_path))
+
+    assert [(entry.start_ms, entry.end_ms, entry.output) for entry in entries] == [(0, 120, "CMakeFiles/a.dir/a.cpp.o"), (120, 300, "bin/demo")]
+    assert entries[1].duration_seconds == pytest.approx(0.18)
+
+
+def test_read_ninja_log_from_offset(tmp_path):
+    _write_ninja_log(tmp_path, ["# ninja log v5", "0\t120\t0\told.o\t1a2b"])
+    offset = get_ninja_log_size(str(tmp_path))
+    _write_ninja_log(tmp_path, ["5\t50\t0\tnew.o\t5e6f"], mode="a")
+
+    assert [entry.output for entry in read_ninja_log(str(tmp_path), offset)] == ["new.o"]
+
+
+def test_read_ninja_log_recompacted_or_missing(tmp_path):
+    assert read_ninja_log(str(tmp_path)) == []
+    assert get_ninja_log_size(str(tmp_path)) == 0
+
+    _write_ninja_log(tmp_path, ["# ninja log v5", "0\t120\t0\ta.o\t1a2b"])
+
+    # ninja rewrote a smaller log since the offset was taken
+    assert read_ninja_log(str(tmp_path), 10_000) == []
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+# `ninja -t graph bin/demo` of a cmake project: one ellipse node per edge with several inputs, a phony arrow
+_GRAPH_TEXT = """digraph ninja {
+rankdir="LR"
+node [fontsize=10, shape=box, height=0.25]
+edge [fontsize=10]
+"0x01" [label="bin/demo"]
+"0x02" [label="CXX_EXECUTABLE_LINKER__demo_Debug", shape=ellipse]
+"0x02" -> "0x01"
+"0x03" -> "0x02" [arrowhead=none]
+"0x04" -> "0x02" [arrowhead=none]
+"0x03" [label="CMakeFiles/demo.dir/src/main.cpp.o"]
+"0x05" [label="CXX_COMPILER__demo_Debug", shape=ellipse]
+"0x05" -> "0x03"
+"0x06" -> "0x05" [arrowhead=none]
+"0x07" -> "0x05" [arrowhead=none style=dotted]
+"0x06" [label="/project/src/main.cpp"]
+"0x07" [label="cmake_object_order_depends_target_demo"]
+"0x08" -> "0x07" [label=" phony"]
+"0x08" [label="CMakeFiles/demo.dir"]
+"0x04" [label="CMakeFiles/demo.dir/src/work.cpp.o"]
+}
+"""
+
+
+def test_parse_ninja_graph():
+    inputs_by_output = parse_ninja_graph(_GRAPH_TEXT)
+
+    assert inputs_by_output == {"bin/demo": ["CMakeFiles/demo.dir/src/main.cpp.o", "CMakeFiles/demo.dir/src/work.cpp.o"],
+                                "CMakeFiles/demo.dir/src/main.cpp.o": ["/project/src/main.cpp", "cmake_object_order_depends_target_demo"],
+                                "cmake_object_order_depends_target_demo": ["CMakeFiles/demo.dir"]
+                                }
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+# three independent compiles on two job slots, then the link: b.cpp.o waited for a free slot, it doesn't depend on a.cpp.o
+_SLOT_BOUND_EDGES = [(0, 330, "CMakeFiles/demo.dir/a.cpp.o"),
+                     (0, 1170, "CMakeFiles/demo.dir/main.cpp.o"),
+                     (340, 1160, "CMakeFiles/demo.dir/b.cpp.o"),
+                     (1180, 1520, "bin/demo")
+                     ]
+_SLOT_BOUND_GRAPH = {"bin/demo": ["CMakeFiles/demo.dir/a.cpp.o", "CMakeFiles/demo.dir/b.cpp.o", "CMakeFiles/demo.dir/main.cpp.o"],
+                     "CMakeFiles/demo.dir/a.cpp.o": ["a.cpp"],
+                     "CMakeFiles/demo.dir/b.cpp.o": ["b.cpp"],
+                     "CMakeFiles/demo.dir/main.cpp.o": ["main.cpp"]
+                     }
+
+
+def test_critical_path_follows_the_graph_not_the_job_slots():
+    report = _report(_SLOT_BOUND_EDGES, _SLOT_BOUND_GRAPH)
+
+    assert [edge.output for edge in report.critical_path] == ["CMakeFiles/demo.dir/main.cpp.o", "bin/demo"]
+    assert report.critical_path_seconds == pytest.approx(1.17 + 0.34)
+    assert [edge.kind for edge in report.critical_path] == [EdgeKind.COMPILE, EdgeKind.LINK]
+
+
+def test_critical_path_through_up_to_date_and_phony_nodes():
+    # the library is archived from one object, the executable waits for the library through a phony target
+    edges = [(0, 400, "CMakeFiles/core.dir/core.cpp.o"),
+             (0, 900, "CMakeFiles/demo.dir/main.cpp.o"),
+             (400, 500, "lib/libcore.a"),
+             (900, 1000, "bin/demo")
+             ]
+    graph = {"bin/demo": ["CMakeFiles/demo.dir/main.cpp.o", "core"],
+             "core": ["lib/libcore.a"],
+             "lib/libcore.a": ["CMakeFiles/core.dir/core.cpp.o", "CMakeFiles/core.dir/up_to_date.cpp.o"],
+             "CMakeFiles/demo.dir/main.cpp.o": ["main.cpp"]
+             }
+
+    report = _report(edges, graph)
+
+    assert [edge.output for edge in report.critical_path] == ["CMakeFiles/demo.dir/main.cpp.o", "bin/demo"]
+
+    # a slower library chain takes over
+    edges[0] = (0, 1500, "CMakeFiles/core.dir/core.cpp.o")
+    edges[2] = (1500, 1600, "lib/libcore.a")
+    edges[3] = (1600, 1700, "bin/demo")
+
+    report = _report(edges, graph)
+
+    assert [edge.output for edge in report.critical_path] == ["CMakeFiles/core.dir/core.cpp.o", "lib/libcore.a", "bin/demo"]
+    assert report.critical_path_seconds == pytest.approx(1.7)
+
+
+def test_outputs_of_one_command_are_one_edge():
+    edges = [(0, 100, "gen/a.h"), (0, 100, "gen/a.cpp"), (100, 300, "CMakeFiles/demo.dir/gen/a.cpp.o")]
+    graph = {"CMakeFiles/demo.dir/gen/a.cpp.o": ["gen/a.cpp"], "gen/a.cpp": ["gen.py"], "gen/a.h": ["gen.py"]}
+
+    report = _report(edges, graph)
+
+    assert [edge.outputs for edge in report.edges] == [["gen/a.h", "gen/a.cpp"], ["CMakeFiles/demo.dir/gen/a.cpp.o"]]
+    assert [edge.output for edge in report.critical_path] == ["gen/a.h", "CMakeFiles/demo.dir/gen/a.cpp.o"]
+
+
+def test_no_graph_no_critical_path():
+    report = _report(_SLOT_BOUND_EDGES, None)
+
+    assert report.critical_path is None
+    assert "Critical path" not in report.to_text()
+    assert report.to_json()["critical_path"] is None
+    assert report.parallelism == pytest.approx((0.33 + 1.17 + 0.82 + 0.34) / 1.52)
+
+
+def test_nothing_built():
+    report = _report([], {})
+
+    assert report.critical_path == []
+    assert report.to_text() == "Build report: nothing was built"
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+@requires_ninja
+def test_critical_path_of_a_ninja_build(tmp_path):
+    # a.o and b.o are independent, only one job: ninja runs them one after the other
+    (tmp_path / "build.ninja").write_text("rule slow\n"
+                                          "  command = sleep $seconds && touch $out\n"
+                                          "build a.o: slow\n"
+                                          "  seconds = 0.1\n"
+                                          "build b.o: slow\n"
+                                          "  seconds = 0.3\n"
+                                          "build bin/demo: slow a.o b.o\n"
+                                          "  seconds = 0.1\n"
+                                          "build all: phony bin/demo\n"
+                                          "default all\n"
+                                          )
+    (tmp_path / "bin").mkdir()
+    subprocess.run(["ninja", "-C", str(tmp_path), "-j", "1"], check=True, capture_output=True)
+
+    entries = read_ninja_log(str(tmp_path))
+    inputs_by_output = read_ninja_graph(shutil.which("ninja"), str(tmp_path), [entry.output for entry in entries])
+    report = BuildReport(entries, _OUTPUT_DIR_NAMES, 1, inputs_by_output)
+
+    assert sorted(inputs_by_output["bin/demo"]) == ["a.o", "b.o"]
+    assert [edge.output for edge in report.critical_path] == ["b.o", "bin/demo"]
+
+
+@requires_ninja
+def test_read_ninja_graph_fails(tmp_path):
+    assert read_ninja_graph(shutil.which("ninja"), str(tmp_path)) is None
+
+
+@requires_ninja
+def test_read_ninja_outputs_lists_the_current_commands(tmp_path):
+    (tmp_path / "build.ninja").write_text("rule cc\n"
+                                          "  command = touch $out\n"
+                                          "build obj/a.o: cc a.c\n"
+                                          "build bin/demo lib/demo.map: cc obj/a.o\n"
+                                          "build demo: phony bin/demo\n"
+                                          )
+    # left by another configuration: not in the manifest
+    (tmp_path / "bin").mkdir()
+    (tmp_path / "bin" / "old_demo").write_text("old")
+
+    assert sorted(read_ninja_outputs(shutil.which("ninja"), str(tmp_path))) == ["bin/demo", "lib/demo.map", "obj/a.o"]
+    assert read_ninja_outputs(shutil.which("ninja"), str(tmp_path / "missing")) is None
@@ -0,0 +1,119 @@
+import io
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from impl.cmake import BuildType, Language, ProductType, generate, has_split_debug_info
+from impl.cmake.generator import GeneratorBuilder
+
+
+requires_cmake = pytest.mark.skipif(shutil.which("cmake") is None or shutil.which("ninja") is None,
+                                    reason="cmake or ninja executable not found"
+                                    )
+
+
+def _create_project(root_path: str, source_files: dict[str, str]) -> None:
+    for relative_path, content in source_files.items():
+        path = os.path.join(root_path, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(content)
+
+
+def _generate(root_path: str, product_types: list[ProductType], components_enabled: bool) -> str:
+    generate(project_root_path=root_path,
+             project_include_dir_names=[],
+             project_source_ignore_patterns=["build"],
+             project_use_gitignore=False,
+             project_use_git_index=False,
+             project_git_include_untracked=False,
+             project_imported_static_libs=[],
+             project_imported_shared_libs=[],
+             project_name="demo",
+             project_product_types=product_types,
+             project_version="1.0.0",
+             project_language=Language.CPP,
+             language_standard=17,
+             language_standard_required=True,
+             compiler_extensions_required=False,
+             cmake_compile_definitions=[],
+             components_enabled=components_enabled
+             )
+
+    with open(os.path.join(root_path, "CMakeLists.txt")) as file:
+        return file.read()
+
+
+_COMPONENT_SOURCES = {"src/main.cpp": "int work();\nint main() { return work(); }\n",
+                      "src/work.cpp": "int work() { return 0; }\n"
+                      }
+
+
+def test_several_products_with_every_source_in_a_component_link_the_components(tmp_path):
+    _create_project(str(tmp_path), _COMPONENT_SOURCES)
+
+    cmakelists = _generate(str(tmp_path), [ProductType.EXE, ProductType.LIB], components_enabled=True)
+
+    assert "demo_objects" not in cmakelists
+    for cmake_product_var_name in ("DEMO_EXE_NAME", "DEMO_STATIC_LIB_NAME"):
+        assert f"target_link_libraries(${{{cmake_product_var_name}}} PRIVATE\n${{DEMO_SRC_LIB_NAME}}\n" in cmakelists
+
+
+def test_several_products_with_root_sources_share_the_objects_library(tmp_path):
+    _create_project(str(tmp_path), {**_COMPONENT_SOURCES, "root.cpp": "int root() { return 0; }\n"})
+
+    cmakelists = _generate(str(tmp_path), [ProductType.EXE, ProductType.LIB], components_enabled=True)
+
+    assert "add_library(${DEMO_OBJECTS_LIB_NAME} OBJECT)" in cmakelists
+    with open(os.path.join(tmp_path, "sources.cmake")) as file:
+        assert file.read() == "target_sources(${DEMO_OBJECTS_LIB_NAME} PRIVATE\n${CMAKE_SOURCE_DIR}/root.cpp\n)\n\n"
+
+
+@requires_cmake
+@pytest.mark.parametrize("product_types", [[ProductType.EXE], [ProductType.EXE, ProductType.LIB], [ProductType.EXE, ProductType.LIB, ProductType.DLL]])
+def test_components_configure_and_build(tmp_path, product_types):
+    _create_project(str(tmp_path), _COMPONENT_SOURCES)
+    _generate(str(tmp_path), product_types, components_enabled=True)
+
+    build_dir_path = os.path.join(tmp_path, "build")
+    subprocess.run(["cmake", "-S", str(tmp_path), "-B", build_dir_path, "-G", "Ninja"], check=True, capture_output=True)
+    subprocess.run(["cmake", "--build", build_dir_path], check=True, capture_output=True)
+
+
+@pytest.mark.parametrize("build_type, fast_debug_link, expected", [(BuildType.DEBUGG, True, True),
+                                                                  (BuildType.DBGRELEASE, True, True),
+                                                                  (BuildType.RELEASE, True, False),
+                                                                  (BuildType.MINRELEASE, True, False),
+                                                                  (BuildType.DEBUGG, False, False)])
+def test_split_debug_info_build_types(build_type, fast_debug_link, expected):
+    # their outputs can't be restored from the artifact cache without the `.dwo` files
+    assert has_split_debug_info(build_type, fast_debug_link) is expected
+
+
+@requires_cmake
+def test_compile_time_trace_is_only_in_the_included_file(tmp_path):
+    _create_project(str(tmp_path), _COMPONENT_SOURCES)
+    cmakelists = _generate(str(tmp_path), [ProductType.EXE, ProductType.LIB], components_enabled=True)
+
+    assert "-ftime" not in cmakelists and "trace" not in cmakelists.lower()
+
+    builder = GeneratorBuilder()
+    builder.add_compile_time_trace(Language.CPP)
+    include_content = io.StringIO()
+    builder.generator_product.run(include_content)
+    include_file_path = tmp_path / "time_trace.cmake"
+    include_file_path.write_text(include_content.getvalue())
+
+    build_dir_path = tmp_path / "build"
+    subprocess.run(["cmake", "-S", str(tmp_path), "-B", str(build_dir_path), "-G", "Ninja", f"-DCMAKE_PROJECT_INCLUDE={include_file_path}"],
+                   check=True,
+                   capture_output=True
+                   )
+
+    # every compiled target (the component too) is traced, the options are added after the targets are declared
+    build_ninja = (build_dir_path / "build.ninja").read_text()
+    compile_lines = [line for line in build_ninja.splitlines() if line.strip().startswith("FLAGS =")]
+    assert compile_lines
+    assert all("-ftime-trace" in line or "-ftime-report" in line for line in compile_lines)
@@ -0,0 +1,79 @@
+import pytest
+
+from impl.cmake import BuildType, MatrixSummary, create_matrix_cells
+from impl.cmake._cmake_matrix import MatrixCellResult, MatrixCellStatus
+from impl.cmake.cmd import CMDStepResult
+
+
+_DEBUG, _RELEASE = BuildType.DEBUGG, BuildType.RELEASE
+
+
+@pytest.mark.parametrize("compiler_paths, build_types, expected", [
+    (["/usr/bin/g++", "/usr/bin/clang++"], [_DEBUG, _RELEASE], ["g++-Debug", "g++-Release", "clang++-Debug", "clang++-Release"]),
+    # the compiler found by cmake
+    ([""], [_RELEASE], ["default-Release"]),
+    # duplicated compilers and build types are built once
+    (["/usr/bin/g++", "/usr/bin/g++"], [_DEBUG, _DEBUG], ["g++-Debug"]),
+    # same file name in different directories
+    (["/usr/bin/g++", "/opt/gcc-13/bin/g++", "/opt/gcc-14/bin/g++"], [_DEBUG], ["g++-Debug", "g++.2-Debug", "g++.3-Debug"]),
+    # versions stay in the name, only the executable extension is dropped
+    (["/usr/bin/gcc-13.2", "/usr/bin/gcc-13.3", "C:/llvm/bin/clang.EXE"], [_DEBUG], ["gcc-13.2-Debug", "gcc-13.3-Debug", "clang-Debug"]),
+])
+def test_create_matrix_cells_names(compiler_paths, build_types, expected):
+    cells = create_matrix_cells(compiler_paths, build_types)
+
+    assert [cell.name for cell in cells] == expected
+
+
+def test_create_matrix_cells_settings():
+    cells = create_matrix_cells(["/usr/bin/g++", ""], [_RELEASE, _DEBUG])
+
+    assert [(cell.compiler_path, cell.build_type) for cell in cells] == [("/usr/bin/g++", _RELEASE),
+                                                                         ("/usr/bin/g++", _DEBUG),
+                                                                         ("", _RELEASE),
+                                                                         ("", _DEBUG)
+                                                                         ]
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+def _step(exit_code: int=0, cancelled: bool=False, wall_seconds: float=1.0, peak_rss_bytes: int | None=None) -> CMDStepResult:
+    return CMDStepResult(["cmake"], exit_code, wall_seconds, peak_rss_bytes, [], cancelled)
+
+
+@pytest.mark.parametrize("configure_result, build_result, expected", [
+    (_step(), _step(), MatrixCellStatus.OK),
+    (_step(), _step(exit_code=1), MatrixCellStatus.FAILED),
+    (_step(exit_code=1), None, MatrixCellStatus.FAILED),
+    # stopped by the failure of another cell: killed programs exit with an error code
+    (_step(), _step(exit_code=-15, cancelled=True), MatrixCellStatus.CANCELLED),
+    (_step(exit_code=-15, cancelled=True), None, MatrixCellStatus.CANCELLED),
+    (_step(), None, MatrixCellStatus.SKIPPED),
+    (None, None, MatrixCellStatus.SKIPPED),
+])
+def test_matrix_cell_status(configure_result, build_result, expected):
+    cell = create_matrix_cells(["/usr/bin/g++"], [_DEBUG])[0]
+
+    assert MatrixCellResult(cell, configure_result, build_result).status is expected
+
+
+def test_matrix_summary():
+    cells = create_matrix_cells(["/usr/bin/g++", "/usr/bin/clang++"], [_DEBUG, _RELEASE])
+    cell_results = [MatrixCellResult(cells[0], _step(wall_seconds=1.5), _step(wall_seconds=10.0, peak_rss_bytes=300 * 2**20)),
+                    MatrixCellResult(cells[1], _step(wall_seconds=1.0), _step(exit_code=1, wall_seconds=2.0)),
+                    MatrixCellResult(cells[2], _step(wall_seconds=1.0), _step(exit_code=-15, cancelled=True, wall_seconds=0.5)),
+                    MatrixCellResult(cells[3], None, None)
+                    ]
+
+    summary = MatrixSummary(cell_results, 12.0, 2, 4, 8 * 2**30)
+    lines = summary.to_text().splitlines()
+
+    assert summary.failed_cell_names == ["g++-Release"]
+    assert lines[0] == "Build matrix: 4 cells, 2 at a time (up to 4 build steps and 8.0 GiB each)"
+    assert lines[1] == "Wall time: 12.00 s (cells total 16.00 s)"
+    assert lines[4].split() == ["g++-Debug", "ok", "1.50", "10.00", "300"]
+    assert lines[5].split() == ["g++-Release", "failed", "1.00", "2.00", "-"]
+    assert lines[6].split() == ["clang++-Debug", "cancelled", "1.00", "0.50", "-"]
+    assert lines[7].split() == ["clang++-Release", "skipped", "-", "-", "-"]
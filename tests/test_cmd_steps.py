@@ -0,0 +1,162 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from impl.cmake.cmd import IOutputSink, NullOutputSink
+from impl.cmake.cmd._cmd_base import CMDList, ICMDPart
+
+
+class _PythonPart(ICMDPart):
+    def __init__(self, code: str):
+        self._code = code
+
+    def get_cmd_args(self) -> list[str]:
+        return [sys.executable, "-c", self._code]
+
+
+class _RecordingSink(IOutputSink):
+    def __init__(self):
+        self.lines: list[tuple[int, str]] = []
+
+    def write_line(self, step_index: int, line: str) -> None:
+        self.lines.append((step_index, line))
+
+
+def _print_step(text: str, exit_code: int=0) -> _PythonPart:
+    return _PythonPart(f"import sys; print({text!r}); sys.exit({exit_code})")
+
+
+def _wait_file_step(create_path, wait_path) -> _PythonPart:
+    # only succeeds if the other step runs at the same time
+    return _PythonPart(f"import os, sys, time\n"
+                       f"open({str(create_path)!r}, 'w').close()\n"
+                       f"deadline = time.monotonic() + 10\n"
+                       f"while not os.path.exists({str(wait_path)!r}):\n"
+                       f"    if time.monotonic() > deadline: sys.exit(3)\n"
+                       f"    time.sleep(0.01)\n"
+                       )
+
+
+def test_steps_run_in_order_by_default():
+    cmd_list = CMDList()
+    for index in range(3):
+        cmd_list.add_part(_print_step(f"step {index}"))
+    sink = _RecordingSink()
+
+    results = cmd_list.run(sink)
+
+    assert sink.lines == [(0, "step 0"), (1, "step 1"), (2, "step 2")]
+    assert [(result.exit_code, result.output_tail, result.cancelled) for result in results] == [(0, [f"step {index}"], False) for index in range(3)]
+    assert all(result.wall_seconds > 0 for result in results)
+    if hasattr(os, "wait4"):
+        assert all(result.peak_rss_bytes > 0 for result in results)
+
+
+def test_independent_steps_run_concurrently(tmp_path):
+    cmd_list = CMDList()
+    first = cmd_list.add_part(_wait_file_step(tmp_path / "a", tmp_path / "b"), depends_on=[])
+    second = cmd_list.add_part(_wait_file_step(tmp_path / "b", tmp_path / "a"), depends_on=[])
+    cmd_list.add_part(_print_step("joined"), depends_on=[first, second])
+    sink = _RecordingSink()
+
+    results = cmd_list.run(sink)
+
+    assert [result.exit_code for result in results] == [0, 0, 0]
+    assert sink.lines == [(2, "joined")]
+
+
+def test_max_parallel_steps():
+    cmd_list = CMDList()
+    for index in range(4):
+        cmd_list.add_part(_PythonPart("import time; print(time.monotonic()); time.sleep(0.3); print(time.monotonic())"), depends_on=[])
+
+    results = cmd_list.run(NullOutputSink(), max_parallel_steps=2)
+
+    # never more than two intervals overlap at any start time
+    intervals = [(float(result.output_tail[0]), float(result.output_tail[1])) for result in results]
+    for start, _ in intervals:
+        assert sum(1 for other_start, other_end in intervals if other_start <= start < other_end) <= 2
+
+
+def test_failure_skips_the_dependent_steps():
+    cmd_list = CMDList()
+    cmd_list.add_part(_print_step("configure"))
+    cmd_list.add_part(_print_step("broken build", exit_code=2))
+    cmd_list.add_part(_print_step("install"))
+
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        cmd_list.run(NullOutputSink())
+
+    assert error.value.returncode == 2
+    assert error.value.output == "broken build"
+
+    results = cmd_list.run(NullOutputSink(), check=False)
+
+    assert [result.exit_code if result else None for result in results] == [0, 2, None]
+
+
+def test_failure_cancels_the_running_steps_and_their_children(tmp_path):
+    child_pid_path = tmp_path / "child.pid"
+    cmd_list = CMDList()
+    # a long step running a child process (like ninja running a compiler), and an independent step failing
+    cmd_list.add_part(_PythonPart(f"import subprocess, sys\n"
+                                  f"child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+                                  f"open({str(child_pid_path)!r}, 'w').write(str(child.pid))\n"
+                                  f"child.wait()\n"
+                                  ), depends_on=[])
+    cmd_list.add_part(_PythonPart(f"import os, sys, time\n"
+                                  f"while not os.path.exists({str(child_pid_path)!r}): time.sleep(0.01)\n"
+                                  f"time.sleep(0.1)\n"
+                                  f"sys.exit(1)\n"
+                                  ), depends_on=[])
+    cmd_list.add_part(_print_step("never"), depends_on=[0])
+
+    start_time = time.monotonic()
+    results = cmd_list.run(NullOutputSink(), check=False)
+
+    assert time.monotonic() - start_time < 30
+    assert results[0].cancelled and results[0].exit_code != 0
+    assert not results[1].cancelled and results[1].exit_code == 1
+    assert results[2] is None
+
+    if os.name != "nt":
+        child_pid = int(child_pid_path.read_text())
+        deadline = time.monotonic() + 10
+        while _is_running(child_pid) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not _is_running(child_pid)
+
+
+def _is_running(pid: int) -> bool:
+    # the orphaned child is reaped by init, a zombie counts as stopped
+    try:
+        with open(f"/proc/{pid}/stat") as stat_file:
+            return stat_file.read().split(") ", 1)[1][0] != "Z"
+    except OSError:
+        return False
+
+
+def test_failing_sink_doesnt_stall_the_steps():
+    class _FailingSink(IOutputSink):
+        def write_line(self, step_index: int, line: str) -> None:
+            raise RuntimeError("sink broken")
+
+    cmd_list = CMDList()
+    cmd_list.add_part(_PythonPart("for index in range(5000): print(index)"))
+
+    results = cmd_list.run(_FailingSink())
+
+    assert results[0].exit_code == 0
+    assert results[0].output_tail[-1] == "4999"
+    assert len(results[0].output_tail) == 50
+
+
+def test_invalid_dependencies():
+    cmd_list = CMDList()
+    cmd_list.add_part(_print_step("first"))
+
+    with pytest.raises(ValueError):
+        cmd_list.add_part(_print_step("second"), depends_on=[1])
@@ -0,0 +1,187 @@
+import hashlib
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from impl.cmake.devfiles import get_git_project_source_files
+from impl.cmake.devfiles import _devfiles_git
+from impl.cmake.devfiles._devfiles_git import GitIndexError, find_git_top_dir, read_git_index, _read_offset_varint
+
+
+requires_git = pytest.mark.skipif(shutil.which("git") is None, reason="git executable not found")
+
+# shared prefixes exercise the v4 path compression, the long name the padding of v2/v3 entries
+_TRACKED_FILES = ["include/project/config.h",
+                  "include/project/core.h",
+                  "src/a/one.cpp",
+                  "src/a/one_test.cpp",
+                  "src/a/two.cpp",
+                  "src/b.cpp",
+                  "src/" + "very_long_directory_name/" * 8 + "deep.cpp",
+                  "src/été.cpp",
+                  "top.c"
+                  ]
+
+
+def _git(work_dir_path, *args) -> bytes:
+    return subprocess.run(["git", "-C", str(work_dir_path), *args], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True).stdout
+
+
+def _create_repository(work_dir_path, index_version: int) -> None:
+    _git(work_dir_path, "init", "-q")
+    for relative_path in _TRACKED_FILES:
+        file_path = work_dir_path / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text("int x;\n")
+    (work_dir_path / "untracked.cpp").write_text("int y;\n")
+
+    _git(work_dir_path, "add", *_TRACKED_FILES[1:])
+    # version 3 is only written with extended entry flags (intent to add)
+    _git(work_dir_path, "add", *(["--intent-to-add"] if index_version == 3 else []), _TRACKED_FILES[0])
+    _git(work_dir_path, "update-index", "--index-version", str(index_version))
+
+
+def _list_git_files(work_dir_path) -> list[str]:
+    return [path.decode("utf-8") for path in _git(work_dir_path, "ls-files", "-z").split(b"\0") if path]
+
+
+# encoded bytes, decoded value (git "offset" varint)
+_VARINT_CASES = [
+    (b"\x00", 0),
+    (b"\x05", 5),
+    (b"\x7f", 127),
+    (b"\x80\x00", 128),
+    (b"\xff\x7f", 16511),
+    (b"\x80\x80\x00", 16512),
+]
+
+
+@pytest.mark.parametrize("encoded, expected", _VARINT_CASES)
+def test_read_offset_varint(encoded, expected):
+    assert _read_offset_varint(b"\xaa" + encoded + b"\xbb", 1) == (expected, 1 + len(encoded))
+
+
+@requires_git
+@pytest.mark.parametrize("index_version", [2, 3, 4])
+def test_read_git_index_matches_git_ls_files(tmp_path, index_version):
+    _create_repository(tmp_path, index_version)
+
+    with open(tmp_path / ".git" / "index", "rb") as index_file:
+        assert int.from_bytes(index_file.read(8)[4:], "big") == index_version
+
+    assert read_git_index(str(tmp_path / ".git")) == _list_git_files(tmp_path)
+    assert sorted(read_git_index(str(tmp_path / ".git"))) == sorted(_TRACKED_FILES)
+
+
+@requires_git
+def test_split_index_is_not_supported(tmp_path):
+    _create_repository(tmp_path, 2)
+    _git(tmp_path, "update-index", "--split-index")
+
+    with pytest.raises(GitIndexError):
+        read_git_index(str(tmp_path / ".git"))
+
+
+@requires_git
+@pytest.mark.parametrize("include_untracked", [False, True])
+def test_git_project_source_files_skip_unstaged_deletions(tmp_path, include_untracked):
+    _create_repository(tmp_path, 2)
+    (tmp_path / "src" / "b.cpp").unlink()
+    (tmp_path / "src" / "a" / "one.cpp").unlink()
+
+    expected = sorted(path for path in _TRACKED_FILES if path.endswith((".c", ".cpp")) and path not in ("src/b.cpp", "src/a/one.cpp"))
+    if include_untracked:
+        expected = sorted(expected + ["untracked.cpp"])
+
+    assert get_git_project_source_files(str(tmp_path), [], include_untracked) == expected
+
+
+@pytest.mark.parametrize("index_content", [b"", b"DIRC\x00\x00", b"DIRC\x00\x00\x00\x05\x00\x00\x00\x00", b"XXXX\x00\x00\x00\x02\x00\x00\x00\x00"])
+def test_invalid_index_is_not_supported(tmp_path, index_content):
+    (tmp_path / "index").write_bytes(index_content)
+
+    with pytest.raises(GitIndexError):
+        read_git_index(str(tmp_path))
+
+
+def _with_checksum(index_content: bytes) -> bytes:
+    return index_content + hashlib.sha1(index_content).digest()
+
+
+@requires_git
+@pytest.mark.parametrize("index_version", [2, 3, 4])
+def test_index_cut_inside_an_entry_is_rejected(tmp_path, index_version):
+    _create_repository(tmp_path, index_version)
+    index_content = (tmp_path / ".git" / "index").read_bytes()[:-20]
+
+    # valid checksums: only the bounds checks can reject the cut entries
+    for cut_size in range(13, len(index_content), 7):
+        (tmp_path / "index").write_bytes(_with_checksum(index_content[:cut_size]))
+        try:
+            paths = read_git_index(str(tmp_path))
+        except GitIndexError:
+            continue
+        # a cut in the extensions after the last entry can still list every entry
+        assert paths == _list_git_files(tmp_path), f"cut at {cut_size} bytes"
+
+
+@requires_git
+def test_index_checksum_is_verified(tmp_path):
+    _create_repository(tmp_path, 2)
+    index_content = bytearray((tmp_path / ".git" / "index").read_bytes())
+
+    (tmp_path / "index").write_bytes(index_content[:-40] + index_content[-20:])
+    with pytest.raises(GitIndexError):
+        read_git_index(str(tmp_path))
+
+    index_content[100] ^= 0xFF
+    (tmp_path / "index").write_bytes(index_content)
+    with pytest.raises(GitIndexError):
+        read_git_index(str(tmp_path))
+
+
+@requires_git
+def test_index_without_checksum_is_read(tmp_path):
+    _create_repository(tmp_path, 2)
+    index_content = (tmp_path / ".git" / "index").read_bytes()
+
+    # `index.skipHash` writes a null checksum
+    (tmp_path / "index").write_bytes(index_content[:-20] + bytes(20))
+
+    assert read_git_index(str(tmp_path)) == _list_git_files(tmp_path)
+
+
+def test_missing_index_is_not_supported(tmp_path):
+    with pytest.raises(GitIndexError):
+        read_git_index(str(tmp_path))
+
+
+def test_find_git_top_dir_from_subdirectory(tmp_path):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "src" / "a").mkdir(parents=True)
+
+    assert find_git_top_dir(str(tmp_path / "src" / "a")) == (str(tmp_path), os.path.join(str(tmp_path), ".git"))
+
+
+def test_find_git_top_dir_follows_gitdir_file(tmp_path):
+    (tmp_path / "worktree").mkdir()
+    (tmp_path / "worktree" / ".git").write_text("gitdir: ../main/.git/worktrees/wt\n")
+
+    top_dir_path, git_dir_path = find_git_top_dir(str(tmp_path / "worktree"))
+
+    assert top_dir_path == str(tmp_path / "worktree")
+    assert git_dir_path == os.path.normpath(str(tmp_path / "main" / ".git" / "worktrees" / "wt"))
+
+
+def test_find_git_top_dir_unreadable_gitdir_file(tmp_path, monkeypatch):
+    (tmp_path / ".git").write_text("gitdir: elsewhere\n")
+
+    def _open(*args, **kwargs):
+        raise PermissionError("denied")
+
+    monkeypatch.setattr(_devfiles_git, "open", _open, raising=False)
+
+    with pytest.raises(GitIndexError):
+        find_git_top_dir(str(tmp_path))
@@ -0,0 +1,73 @@
+import pytest
+
+from impl.cmake.devfiles._devfiles_ignore import IgnoreMatcher
+
+
+# patterns, relative path, is directory, expected ignored
+_IGNORE_CASES = [
+    # plain names match at any depth
+    (["build"], "build", True, True),
+    (["build"], "src/build", True, True),
+    (["build"], "src/build.cpp", False, False),
+    (["*.o"], "src/deep/main.o", False, True),
+    (["*.o"], "src/main.cpp", False, False),
+    # directory only patterns
+    (["out/"], "out", True, True),
+    (["out/"], "src/out", True, True),
+    (["out/"], "out", False, False),
+    (["gen*/"], "src/generated", True, True),
+    (["gen*/"], "src/generated", False, False),
+    # anchored patterns (leading or middle slash)
+    (["/build"], "build", True, True),
+    (["/build"], "src/build", True, False),
+    (["src/*.cpp"], "src/main.cpp", False, True),
+    (["src/*.cpp"], "lib/src/main.cpp", False, False),
+    (["src/*.cpp"], "src/sub/main.cpp", False, False),
+    # `**`
+    (["**/generated/*_test.cpp"], "generated/a_test.cpp", False, True),
+    (["**/generated/*_test.cpp"], "a/b/generated/a_test.cpp", False, True),
+    (["**/generated/*_test.cpp"], "a/generated/sub/a_test.cpp", False, False),
+    (["third_party/**"], "third_party/x/y.cpp", False, True),
+    (["third_party/**"], "src/third_party/y.cpp", False, False),
+    (["a/**/b"], "a/b", True, True),
+    (["a/**/b"], "a/x/y/b", True, True),
+    # `?` and character classes never match `/`
+    (["file?.cpp"], "file1.cpp", False, True),
+    (["file?.cpp"], "file10.cpp", False, False),
+    (["[ab].cpp"], "b.cpp", False, True),
+    (["[!ab].cpp"], "b.cpp", False, False),
+    (["[!ab].cpp"], "c.cpp", False, True),
+    # negation: the last matching pattern wins
+    (["*.cpp", "!keep.cpp"], "keep.cpp", False, False),
+    (["*.cpp", "!keep.cpp"], "drop.cpp", False, True),
+    (["!keep.cpp", "*.cpp"], "keep.cpp", False, True),
+    (["*.cpp", "!keep.cpp", "src/keep.cpp"], "src/keep.cpp", False, True),
+    # escapes, comments and blank lines
+    (["\\!important.cpp"], "!important.cpp", False, True),
+    (["\\#hash.cpp"], "#hash.cpp", False, True),
+    (["# comment.cpp", ""], "# comment.cpp", False, False),
+    (["trailing.cpp   "], "trailing.cpp", False, True),
+]
+
+
+@pytest.mark.parametrize("patterns, relative_path, is_dir, expected", _IGNORE_CASES)
+def test_is_ignored(patterns, relative_path, is_dir, expected):
+    assert IgnoreMatcher(patterns).is_ignored(relative_path, is_dir) is expected
+
+
+def test_nested_gitignore_file_is_anchored_to_its_directory(tmp_path):
+    gitignore_file_path = tmp_path / ".gitignore"
+    gitignore_file_path.write_text("/local.cpp\n!keep.o\n")
+
+    matcher = IgnoreMatcher(["*.o"]).with_gitignore_file(str(gitignore_file_path), "sub/")
+
+    assert matcher.is_ignored("sub/local.cpp", False)
+    assert not matcher.is_ignored("local.cpp", False)
+    assert not matcher.is_ignored("sub/keep.o", False)
+    assert matcher.is_ignored("other.o", False)
+
+
+def test_missing_gitignore_file_keeps_matcher(tmp_path):
+    matcher = IgnoreMatcher(["*.o"])
+
+    assert matcher.with_gitignore_file(str(tmp_path / ".gitignore"), "") is matcher
@@ -0,0 +1,105 @@
+import json
+import os
+import time
+
+from impl.cmake.devfiles._devfiles_index import SourceIndex
+
+
+_SOURCE_EXTENSIONS = (".c", ".cpp")
+
+
+def _create_files(root_path, relative_paths: list[str]) -> None:
+    for relative_path in relative_paths:
+        path = root_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+
+
+def _age_tree(root_path, seconds: int=60) -> None:
+    # directories modified within the racy mtime window are not stored in the index
+    old_time = time.time() - seconds
+    for dir_path, _, file_names in os.walk(root_path):
+        for name in file_names:
+            os.utime(os.path.join(dir_path, name), (old_time, old_time))
+        os.utime(dir_path, (old_time, old_time))
+
+
+def _index(tmp_path, ignore_patterns: list[str]=None, use_gitignore: bool=False) -> SourceIndex:
+    return SourceIndex(str(tmp_path / "index" / "sources.json"), _SOURCE_EXTENSIONS, ignore_patterns or [], use_gitignore)
+
+
+def test_rescan_lists_only_modified_directories(tmp_path):
+    project_path = tmp_path / "project"
+    _create_files(project_path, ["main.cpp", "src/a.cpp", "lib/b.cpp", "lib/sub/c.cpp"])
+    _age_tree(project_path)
+
+    assert _index(tmp_path).get_source_files(str(project_path)) == ["lib/b.cpp", "lib/sub/c.cpp", "main.cpp", "src/a.cpp"]
+
+    index = _index(tmp_path)
+    assert index.get_source_files(str(project_path)) == ["lib/b.cpp", "lib/sub/c.cpp", "main.cpp", "src/a.cpp"]
+    assert index.last_scanner.reused_dirs_count == 4
+
+    # adding and removing files changes the mtime of their directory only
+    (project_path / "src" / "new.cpp").write_text("")
+    (project_path / "lib" / "sub" / "c.cpp").unlink()
+
+    index = _index(tmp_path)
+    assert index.get_source_files(str(project_path)) == ["lib/b.cpp", "main.cpp", "src/a.cpp", "src/new.cpp"]
+    assert index.last_scanner.reused_dirs_count == 2
+
+
+def test_recently_modified_directories_are_not_stored(tmp_path):
+    project_path = tmp_path / "project"
+    _create_files(project_path, ["src/a.cpp"])
+    _age_tree(project_path)
+    os.utime(project_path / "src")
+
+    _index(tmp_path).get_source_files(str(project_path))
+
+    with open(tmp_path / "index" / "sources.json") as index_file:
+        assert list(json.load(index_file)["dirs"]) == [""]
+
+
+def test_settings_change_invalidates_the_index(tmp_path):
+    project_path = tmp_path / "project"
+    _create_files(project_path, ["src/a.cpp", "gen/b.cpp"])
+    _age_tree(project_path)
+    _index(tmp_path).get_source_files(str(project_path))
+
+    index = _index(tmp_path, ignore_patterns=["gen"])
+    assert index.get_source_files(str(project_path)) == ["src/a.cpp"]
+    assert index.last_scanner.reused_dirs_count == 0
+
+
+def test_gitignore_change_invalidates_the_subtree(tmp_path):
+    project_path = tmp_path / "project"
+    _create_files(project_path, ["src/a.cpp", "src/sub/gen.cpp", "lib/b.cpp"])
+    (project_path / "src" / ".gitignore").write_text("# nothing yet\n")
+    _age_tree(project_path)
+    _index(tmp_path, use_gitignore=True).get_source_files(str(project_path))
+
+    # editing a .gitignore doesn't change the directory mtime
+    (project_path / "src" / ".gitignore").write_text("gen.cpp\n")
+    os.utime(project_path / "src" / ".gitignore", (time.time() - 30, time.time() - 30))
+
+    index = _index(tmp_path, use_gitignore=True)
+    assert index.get_source_files(str(project_path)) == ["lib/b.cpp", "src/a.cpp"]
+    # root and lib are reused, src and src/sub are listed again
+    assert index.last_scanner.reused_dirs_count == 2
+
+
+def test_force_rescan_and_corrupted_index(tmp_path):
+    project_path = tmp_path / "project"
+    _create_files(project_path, ["src/a.cpp"])
+    _age_tree(project_path)
+    _index(tmp_path).get_source_files(str(project_path))
+
+    index = _index(tmp_path)
+    assert index.get_source_files(str(project_path), force_rescan=True) == ["src/a.cpp"]
+    assert index.last_scanner.reused_dirs_count == 0
+
+    (tmp_path / "index" / "sources.json").write_text("{not json")
+
+    index = _index(tmp_path)
+    assert index.get_source_files(str(project_path)) == ["src/a.cpp"]
+    assert index.last_scanner.reused_dirs_count == 0
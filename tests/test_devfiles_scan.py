@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from impl.cmake.devfiles._devfiles_ignore import IgnoreMatcher
+from impl.cmake.devfiles._devfiles_scan import DirectoryEntry, ParallelSourceScanner
+
+
+_SOURCE_EXTENSIONS = (".c", ".cpp")
+
+
+def _create_files(root_path, relative_paths: list[str]) -> None:
+    for relative_path in relative_paths:
+        path = root_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+
+
+def _walk_source_files(root_path, ignore_matcher: IgnoreMatcher) -> list[str]:
+    # reference implementation: os.walk with the same pruning
+    src_files: list[str] = []
+    for dir_path, dir_names, file_names in os.walk(root_path):
+        relative_dir = os.path.relpath(dir_path, root_path).replace(os.sep, "/")
+        prefix = "" if relative_dir == "." else f"{relative_dir}/"
+        dir_names[:] = [name for name in dir_names if not ignore_matcher.is_ignored(f"{prefix}{name}", True)]
+        src_files += [f"{prefix}{name}" for name in file_names
+                      if name.endswith(_SOURCE_EXTENSIONS) and not ignore_matcher.is_ignored(f"{prefix}{name}", False)]
+    return sorted(src_files)
+
+
+_TREE = ["main.cpp",
+         "notes.txt",
+         "src/a.cpp",
+         "src/a.h",
+         "src/util/b.c",
+         "src/util/deep/er/c.cpp",
+         "build/gen.cpp",
+         "src/build/gen2.cpp",
+         "third_party/lib/x.cpp",
+         "src/skip_me.cpp"
+         ]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2, 8])
+def test_scan_matches_os_walk(tmp_path, max_workers):
+    _create_files(tmp_path, _TREE)
+    ignore_matcher = IgnoreMatcher(["build", "/third_party", "skip_*.cpp"])
+
+    scanner = ParallelSourceScanner(_SOURCE_EXTENSIONS, ignore_matcher, max_workers)
+    src_files = scanner.scan(str(tmp_path))
+
+    assert src_files == _walk_source_files(tmp_path, ignore_matcher)
+    assert src_files == ["main.cpp", "src/a.cpp", "src/util/b.c", "src/util/deep/er/c.cpp"]
+    assert scanner.files_count == 4
+    # ignored directories are pruned, not listed: root, src, src/util, src/util/deep, src/util/deep/er
+    assert scanner.dirs_count == 5
+    assert sorted(scanner.scanned_dirs) == ["", "src/", "src/util/", "src/util/deep/", "src/util/deep/er/"]
+
+
+def test_scan_applies_gitignore_files(tmp_path):
+    _create_files(tmp_path, ["a.cpp", "gen/g.cpp", "src/b.cpp", "src/local.cpp", "src/sub/local.cpp"])
+    (tmp_path / ".gitignore").write_text("gen/\n")
+    (tmp_path / "src" / ".gitignore").write_text("/local.cpp\n")
+
+    assert ParallelSourceScanner(_SOURCE_EXTENSIONS, IgnoreMatcher(), use_gitignore=True).scan(str(tmp_path)) == ["a.cpp",
+                                                                                                                    "src/b.cpp",
+                                                                                                                    "src/sub/local.cpp"
+                                                                                                                    ]
+    assert len(ParallelSourceScanner(_SOURCE_EXTENSIONS, IgnoreMatcher()).scan(str(tmp_path))) == 5
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink") or os.name == "nt", reason="symlinks not available")
+def test_scan_does_not_follow_symlinked_directories(tmp_path):
+    _create_files(tmp_path, ["src/a.cpp"])
+    os.symlink(tmp_path / "src", tmp_path / "link")
+
+    assert ParallelSourceScanner(_SOURCE_EXTENSIONS, IgnoreMatcher()).scan(str(tmp_path)) == ["src/a.cpp"]
+
+
+def test_scan_reuses_unchanged_directories(tmp_path):
+    _create_files(tmp_path, ["src/a.cpp", "lib/b.cpp"])
+    first_scanner = ParallelSourceScanner(_SOURCE_EXTENSIONS, IgnoreMatcher())
+    first_scanner.scan(str(tmp_path))
+
+    # a stale cached listing is trusted as long as the directory mtime didn't change
+    cached_dirs = dict(first_scanner.scanned_dirs)
+    lib_entry = cached_dirs["lib/"]
+    cached_dirs["lib/"] = DirectoryEntry(lib_entry.mtime_ns, ["cached.cpp"], [])
+    cached_dirs["src/"] = DirectoryEntry(0, ["stale.cpp"], [])
+
+    scanner = ParallelSourceScanner(_SOURCE_EXTENSIONS, IgnoreMatcher(), cached_dirs=cached_dirs)
+
+    assert scanner.scan(str(tmp_path)) == ["lib/cached.cpp", "src/a.cpp"]
+    assert scanner.reused_dirs_count == 2
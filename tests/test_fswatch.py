@@ -0,0 +1,118 @@
+import os
+import threading
+
+import pytest
+
+from impl.cmake.fswatch import ChangeBatch, ChangeKind, watch_tree
+from impl.cmake.fswatch import _impl_fswatch
+from impl.cmake.fswatch._fswatch_base import IEventSource
+from impl.cmake.fswatch._fswatch_polling import PollingEventSource
+
+
+_SOURCE_EXTENSIONS = (".c", ".cpp")
+_HEADER_EXTENSIONS = (".h", ".hpp")
+
+_ADDED, _REMOVED, _MODIFIED, _OVERFLOW = ChangeKind.ADDED, ChangeKind.REMOVED, ChangeKind.MODIFIED, ChangeKind.OVERFLOW
+
+
+# events, expected (structure changed, content changed, events count)
+_BATCH_CASES = [
+    ([(_MODIFIED, "src/a.cpp")], (False, True, 1)),
+    ([(_MODIFIED, "src/a.cpp"), (_MODIFIED, "src/a.cpp")], (False, True, 1)),
+    ([(_ADDED, "src/new.cpp")], (True, False, 1)),
+    ([(_REMOVED, "src/old.cpp")], (True, False, 1)),
+    ([(_ADDED, "src/sub/")], (True, False, 1)),
+    # headers never change the CMakeLists.txt, but the sources including them must be rebuilt
+    ([(_ADDED, "include/a.h")], (False, True, 1)),
+    ([(_REMOVED, "include/a.h")], (False, True, 1)),
+    # editors saving through a temporary file: removed then added again is an edit
+    ([(_REMOVED, "src/a.cpp"), (_ADDED, "src/a.cpp")], (False, True, 1)),
+    # created, edited and deleted in the same window: nothing happened
+    ([(_ADDED, "src/tmp.cpp"), (_MODIFIED, "src/tmp.cpp"), (_REMOVED, "src/tmp.cpp")], (False, False, 0)),
+    # a new file being written is not an edit of an existing one
+    ([(_ADDED, "src/new.cpp"), (_MODIFIED, "src/new.cpp")], (True, False, 2)),
+    # lost events: everything may have changed
+    ([(_OVERFLOW, "")], (True, True, 0)),
+]
+
+
+@pytest.mark.parametrize("events, expected", _BATCH_CASES)
+def test_change_batch_coalescing(events, expected):
+    batch = ChangeBatch(_SOURCE_EXTENSIONS)
+    batch.add_events(events)
+
+    assert (batch.structure_changed, batch.content_changed, batch.events_count) == expected
+
+
+def test_change_batch_coalescing_across_reads():
+    batch = ChangeBatch(_SOURCE_EXTENSIONS)
+    batch.add_events([(_ADDED, "src/tmp.cpp")])
+    batch.add_events([])
+    batch.add_events([(_REMOVED, "src/tmp.cpp")])
+
+    assert not batch.structure_changed and not batch.content_changed
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+class _ScriptedEventSource(IEventSource):
+    """
+    Returns one prepared list of events per `read_events` call, then sets the stop event
+    """
+
+    def __init__(self, reads: list[list[tuple[ChangeKind, str]]], stop_event: threading.Event):
+        self._reads = list(reads)
+        self._stop_event = stop_event
+        self.closed = False
+
+    def read_events(self, timeout: float) -> list[tuple[ChangeKind, str]]:
+        if not self._reads:
+            self._stop_event.set()
+            return []
+        return self._reads.pop(0)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_watch_tree_calls_once_per_burst(monkeypatch):
+    stop_event = threading.Event()
+    # two bursts separated by a quiet read, the third one cancels itself
+    event_source = _ScriptedEventSource([[(_MODIFIED, "src/a.cpp")],
+                                         [(_MODIFIED, "src/b.cpp"), (_ADDED, "src/c.cpp")],
+                                         [],
+                                         [(_ADDED, "include/d.h")],
+                                         [],
+                                         [(_ADDED, "src/tmp.cpp")],
+                                         [(_REMOVED, "src/tmp.cpp")],
+                                         []
+                                         ], stop_event)
+    monkeypatch.setattr(_impl_fswatch, "_create_event_source", lambda *args: event_source)
+
+    batches: list[ChangeBatch] = []
+    watch_tree("/project", lambda path, is_dir: False, _SOURCE_EXTENSIONS, _HEADER_EXTENSIONS, batches.append, stop_event=stop_event)
+
+    assert [(batch.structure_changed, batch.content_changed, batch.events_count) for batch in batches] == [(True, True, 3), (False, True, 1)]
+    assert event_source.closed
+
+
+def test_polling_event_source_reports_the_differences(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.cpp").write_text("")
+    (tmp_path / "src" / "b.cpp").write_text("")
+    (tmp_path / "build").mkdir()
+
+    event_source = PollingEventSource(str(tmp_path), lambda path, is_dir: path == "build", _SOURCE_EXTENSIONS, poll_interval=0.0)
+    (tmp_path / "src" / "b.cpp").unlink()
+    (tmp_path / "src" / "c.cpp").write_text("")
+    (tmp_path / "src" / "notes.txt").write_text("")
+    (tmp_path / "build" / "gen.cpp").write_text("")
+    os.utime(tmp_path / "src" / "a.cpp", ns=(0, 0))
+
+    assert sorted(event_source.read_events(timeout=1.0), key=lambda event: event[1]) == [(_MODIFIED, "src/a.cpp"),
+                                                                                          (_REMOVED, "src/b.cpp"),
+                                                                                          (_ADDED, "src/c.cpp")
+                                                                                          ]
+    assert event_source.read_events(timeout=1.0) == []
@@ -0,0 +1,79 @@
+import io
+import re
+
+import pytest
+
+from impl.cmake.generator._generator_parts import UnityBuildGeneratorPart
+
+
+_KB = 1024
+
+
+def _unity_groups(source_file_sizes: list[tuple[str, int]],
+                  batch_max_size: int=4 * _KB,
+                  excluded_source_files: list[str]=None
+) -> tuple[dict[str, list[str]], list[str]]:
+    """
+    :returns tuple: (sources by unity group name, sources compiled alone) as written in CMakeLists.txt
+    """
+    part = UnityBuildGeneratorPart(["DEMO_TARGET"], source_file_sizes, batch_max_size, excluded_source_files or [])
+    file = io.StringIO()
+    part.run(file)
+
+    groups: dict[str, list[str]] = {}
+    skipped_files: list[str] = []
+    for sources, properties in re.findall(r"set_source_files_properties\(\n(.*?)PROPERTIES (.*?)\)\n", file.getvalue(), re.DOTALL):
+        sources = [source.removeprefix("${CMAKE_SOURCE_DIR}/") for source in sources.splitlines()]
+        if properties == "SKIP_UNITY_BUILD_INCLUSION ON":
+            skipped_files += sources
+        else:
+            groups[re.fullmatch(r'UNITY_GROUP "(\w+)"', properties).group(1)] = sources
+    return groups, skipped_files
+
+
+def test_batches_are_closed_at_the_size_limit():
+    groups, skipped_files = _unity_groups([("src/a.cpp", 2 * _KB), ("src/b.cpp", 2 * _KB), ("src/c.cpp", 1 * _KB), ("src/d.cpp", 1 * _KB)])
+
+    assert groups == {"src_0": ["src/a.cpp", "src/b.cpp"], "src_1": ["src/c.cpp", "src/d.cpp"]}
+    assert skipped_files == []
+
+
+def test_batches_go_on_in_sibling_directories():
+    groups, skipped_files = _unity_groups([("src/net/a.cpp", 1 * _KB),
+                                           ("src/io/b.cpp", 1 * _KB),
+                                           ("src/io/c.cpp", 1 * _KB),
+                                           ("src/ui/d.cpp", 1 * _KB),
+                                           ("src/ui/e.cpp", 1 * _KB),
+                                           ("src/ui/f.cpp", 1 * _KB)
+                                           ])
+
+    # siblings in name order, a batch in one directory keeps its name
+    assert groups == {"src_0": ["src/io/b.cpp", "src/io/c.cpp", "src/net/a.cpp", "src/ui/d.cpp"], "src_ui_1": ["src/ui/e.cpp", "src/ui/f.cpp"]}
+    assert skipped_files == []
+
+
+@pytest.mark.parametrize("source_file_sizes", [[("src/a.cpp", 1 * _KB), ("src/util/b.cpp", 1 * _KB)],
+                                               [("core/a.cpp", 1 * _KB), ("net/b.cpp", 1 * _KB)],
+                                               [("main.cpp", 1 * _KB), ("src/b.cpp", 1 * _KB)]])
+def test_batches_dont_merge_parent_or_top_level_directories(source_file_sizes):
+    # a parent and its subdirectory are not siblings, top level directories can be separate component targets
+    groups, skipped_files = _unity_groups(source_file_sizes)
+
+    assert groups == {}
+    assert skipped_files == sorted(source for source, _ in source_file_sizes)
+
+
+def test_single_file_batches_and_excluded_files_are_compiled_alone():
+    groups, skipped_files = _unity_groups([("src/a.cpp", 3 * _KB), ("src/b.cpp", 3 * _KB), ("src/c.cpp", 1 * _KB), ("src/d.cpp", 1 * _KB)],
+                                          excluded_source_files=["src/d.cpp"]
+                                          )
+
+    assert groups == {"src_1": ["src/b.cpp", "src/c.cpp"]}
+    assert skipped_files == ["src/a.cpp", "src/d.cpp"]
+
+
+def test_file_larger_than_the_limit():
+    groups, skipped_files = _unity_groups([("src/big.cpp", 10 * _KB), ("src/x.cpp", 1 * _KB), ("src/y.cpp", 1 * _KB)])
+
+    assert groups == {"src_1": ["src/x.cpp", "src/y.cpp"]}
+    assert skipped_files == ["src/big.cpp"]
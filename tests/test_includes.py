@@ -0,0 +1,183 @@
+import pytest
+
+from impl.cmake.includes import IncludeGraph, IncludeReport, NodeKind, load_include_graph, scan_include_graph
+from impl.cmake.includes import _impl_includes
+from impl.cmake.includes._includes_parser import parse_includes
+
+
+def _create_files(root_path, files: dict[str, str]) -> None:
+    for relative_path, content in files.items():
+        path = root_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content.encode())
+
+
+def test_parse_includes_directive_forms(tmp_path):
+    source = ("#include <vector>\n"
+              "  #  include \"local.h\"\r\n"
+              "\t#include<map>\n"
+              "#include \"spaced name.h\" // trailing comment\n"
+              "// #include \"commented.h\"\n"
+              "int x; #include \"not_a_directive.h\"\n"
+              "#define X 1\n"
+              "#  include_next <ignored.h>\n"
+              "#import \"objc.h\"\n"
+              )
+    _create_files(tmp_path, {"a.cpp": source})
+
+    mtime_ns, size, includes = parse_includes(str(tmp_path / "a.cpp"))
+
+    assert mtime_ns >= 0
+    assert size == len(source.encode())
+    assert includes == [("vector", True), ("local.h", False), ("map", True), ("spaced name.h", False)]
+
+
+@pytest.mark.parametrize("content", ["", "int main() { return 0; }\n"])
+def test_parse_includes_without_directives(tmp_path, content):
+    _create_files(tmp_path, {"a.cpp": content})
+
+    assert parse_includes(str(tmp_path / "a.cpp"))[1:] == (len(content), [])
+
+
+def test_parse_includes_missing_file(tmp_path):
+    assert parse_includes(str(tmp_path / "missing.cpp")) == (-1, 0, [])
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+def _graph(nodes: list[tuple[str, NodeKind, int]], edges: dict[str, list[str]]) -> IncludeGraph:
+    graph = IncludeGraph()
+    indexes = {name: graph.add_node(name, kind, size) for name, kind, size in nodes}
+    for name, children in edges.items():
+        graph.set_edges(indexes[name], [indexes[child] for child in children])
+    return graph
+
+
+_S, _H, _I, _SYS = NodeKind.SOURCE, NodeKind.HEADER, NodeKind.IMPORTED, NodeKind.SYSTEM
+
+
+def test_fan_in_and_costs_of_a_diamond():
+    # a.cpp -> a.h -> common.h, b.cpp -> b.h -> common.h -> <vector>, common.h included twice by a.cpp
+    graph = _graph([("a.cpp", _S, 10), ("b.cpp", _S, 10), ("a.h", _H, 100), ("b.h", _H, 200), ("common.h", _H, 1000), ("<vector>", _SYS, 0)],
+                   {"a.cpp": ["a.h", "common.h", "common.h"], "b.cpp": ["b.h"], "a.h": ["common.h"], "b.h": ["common.h"], "common.h": ["<vector>"]}
+                   )
+
+    assert graph.get_includes("a.cpp") == ["a.h", "common.h"]
+    assert graph.compute_fan_in() == {"a.h": 1, "b.h": 1, "common.h": 2, "<vector>": 2}
+    assert graph.compute_translation_unit_costs() == {"a.cpp": (3, 1100), "b.cpp": (3, 1200)}
+
+    report = IncludeReport(graph)
+    assert report.headers_fan_in[:2] == [("<vector>", 2), ("common.h", 2)]
+    assert [tu for tu, _, _ in report.translation_unit_costs] == ["b.cpp", "a.cpp"]
+
+
+def test_fan_in_and_costs_with_an_include_cycle():
+    # x.h and y.h include each other (include guards), only y.h is reached from b.cpp
+    graph = _graph([("a.cpp", _S, 0), ("b.cpp", _S, 0), ("x.h", _H, 1), ("y.h", _H, 2), ("z.h", _H, 4)],
+                   {"a.cpp": ["x.h"], "b.cpp": ["y.h"], "x.h": ["y.h"], "y.h": ["x.h", "z.h"]}
+                   )
+
+    assert graph.compute_fan_in() == {"x.h": 2, "y.h": 2, "z.h": 2}
+    assert graph.compute_translation_unit_costs() == {"a.cpp": (3, 7), "b.cpp": (3, 7)}
+
+
+def test_costs_with_more_than_eight_headers():
+    # the per byte size tables span several chunks of the header masks
+    headers = [(f"h{index}.h", _H, 1 << index) for index in range(20)]
+    graph = _graph([("a.cpp", _S, 0), ("b.cpp", _S, 0)] + headers,
+                   {"a.cpp": [name for name, _, _ in headers], "b.cpp": [name for name, _, _ in headers[9:12]]}
+                   )
+
+    assert graph.compute_translation_unit_costs() == {"a.cpp": (20, (1 << 20) - 1), "b.cpp": (3, (1 << 9) + (1 << 10) + (1 << 11))}
+
+
+def test_graph_json_round_trip():
+    graph = _graph([("a.cpp", _S, 10), ("a.h", _H, 20), ("<map>", _SYS, 0)], {"a.cpp": ["a.h", "<map>"], "a.h": ["<map>"]})
+
+    loaded = IncludeGraph.from_json(graph.to_json())
+
+    assert loaded.get_nodes() == ["a.cpp", "a.h", "<map>"]
+    assert loaded.get_nodes(_SYS) == ["<map>"]
+    assert loaded.get_includes("a.cpp") == ["a.h", "<map>"]
+    assert loaded.get_size("a.h") == 20
+    assert loaded.compute_fan_in() == graph.compute_fan_in()
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+_PROJECT_FILES = {"src/main.cpp": "#include \"util.h\"\n#include <api.h>\n#include <vector>\n",
+                  "src/other.cpp": "#include \"detail/impl.h\"\n#include <util.h>\n",
+                  "src/util.h": "#pragma once\n#include <string>\n",
+                  "src/detail/impl.h": "#include \"../util.h\"\n",
+                  "include/util.h": "// shadowed by src/util.h for the quoted form\n",
+                  "third_party/api/include/api.h": "#include \"api_detail.h\"\n",
+                  "third_party/api/include/api_detail.h": "#include <cstdint>\n"
+                  }
+
+
+def _scan(tmp_path, cache_file_path=None) -> IncludeGraph:
+    return scan_include_graph(str(tmp_path), ["src/main.cpp", "src/other.cpp"], ["include"], ["third_party/api/include"], cache_file_path)
+
+
+def test_scan_include_graph_resolves_includes(tmp_path):
+    _create_files(tmp_path, _PROJECT_FILES)
+
+    graph = _scan(tmp_path)
+
+    # quoted includes look next to the including file first, angle includes only in the include directories
+    assert graph.get_includes("src/main.cpp") == ["src/util.h", "third_party/api/include/api.h", "<vector>"]
+    assert graph.get_includes("src/other.cpp") == ["src/detail/impl.h", "include/util.h"]
+    assert graph.get_includes("src/detail/impl.h") == ["src/util.h"]
+    assert graph.get_includes("third_party/api/include/api.h") == ["third_party/api/include/api_detail.h"]
+
+    assert graph.get_kind("src/util.h") == NodeKind.HEADER
+    assert graph.get_kind("third_party/api/include/api_detail.h") == NodeKind.IMPORTED
+    assert graph.get_kind("<cstdint>") == NodeKind.SYSTEM
+    assert graph.get_size("src/util.h") == len(_PROJECT_FILES["src/util.h"])
+    assert graph.compute_fan_in()["src/util.h"] == 2
+
+
+def test_scan_include_graph_reuses_unchanged_files(tmp_path, monkeypatch):
+    _create_files(tmp_path, _PROJECT_FILES)
+    cache_file_path = str(tmp_path / ".cache" / "includes.json")
+    first_graph = _scan(tmp_path, cache_file_path)
+
+    parsed_paths: list[str] = []
+    original_parse_includes = _impl_includes.parse_includes
+
+    def parse_includes_spy(file_path: str):
+        parsed_paths.append(file_path)
+        return original_parse_includes(file_path)
+
+    monkeypatch.setattr(_impl_includes, "parse_includes", parse_includes_spy)
+
+    assert _scan(tmp_path, cache_file_path).to_json() == first_graph.to_json()
+    assert parsed_paths == []
+
+    # an edited file is parsed again, and the headers it now includes are followed
+    _create_files(tmp_path, {"src/util.h": "#include \"detail/new.h\"\n", "src/detail/new.h": ""})
+    graph = _scan(tmp_path, cache_file_path)
+
+    assert sorted(parsed_paths) == [str(tmp_path / "src/detail/new.h"), str(tmp_path / "src/util.h")]
+    assert graph.get_includes("src/util.h") == ["src/detail/new.h"]
+    assert load_include_graph(cache_file_path).to_json() == graph.to_json()
+
+
+def test_scan_include_graph_with_the_process_pool(tmp_path, monkeypatch):
+    _create_files(tmp_path, _PROJECT_FILES)
+    monkeypatch.setattr(_impl_includes, "_PROCESS_POOL_MIN_FILES", 1)
+    monkeypatch.setattr(_impl_includes, "_PROCESS_POOL_BATCH_SIZE", 1)
+
+    assert scan_include_graph(str(tmp_path), ["src/main.cpp", "src/other.cpp"], ["include"], ["third_party/api/include"], max_workers=2).to_json() \
+           == _scan(tmp_path).to_json()
+
+
+def test_load_include_graph_missing_or_invalid(tmp_path):
+    assert load_include_graph(str(tmp_path / "missing.json")) is None
+
+    (tmp_path / "invalid.json").write_text("{\"version\": 1, \"graph\": {\"nodes\": [[\"a.cpp\", \"unknown kind\", 0]]}}")
+    assert load_include_graph(str(tmp_path / "invalid.json")) is None
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from impl.cmake.jobpool import JobMemoryHistory, compute_job_pool_sizes, get_available_memory_bytes
+
+
+_GB = 2**30
+
+
+# available memory, measured peak, cpu count, forced compile jobs, forced link jobs, expected (compile pool, link pool)
+_POOL_SIZE_CASES = [
+    # nothing measured: 1 GiB per compile, 2 GiB per link, 90% of the memory is usable
+    (32 * _GB, None, 8, 0, 0, (8, 8)),
+    (8 * _GB, None, 16, 0, 0, (7, 3)),
+    # the CPU count caps the compile pool, not the link pool (then capped by the compile pool)
+    (64 * _GB, None, 4, 0, 0, (4, 4)),
+    # a measured peak larger than the default makes the links the scarce resource
+    (16 * _GB, 6 * _GB, 16, 0, 0, (14, 2)),
+    # a measured peak smaller than the default applies to compiles too
+    (4 * _GB, _GB // 2, 16, 0, 0, (7, 7)),
+    # never less than one job, even when a single job doesn't fit
+    (_GB // 2, 8 * _GB, 8, 0, 0, (1, 1)),
+    # unknown memory: CPU count for the compiles, a quarter for the links
+    (None, None, 8, 0, 0, (8, 2)),
+    (None, 6 * _GB, 2, 0, 0, (2, 1)),
+    (0, None, 0, 0, 0, (1, 1)),
+    # manifest sizes win, the automatic link pool still follows the forced compile pool
+    (32 * _GB, None, 16, 3, 0, (3, 3)),
+    (32 * _GB, None, 16, 0, 1, (16, 1)),
+    (8 * _GB, None, 16, 12, 6, (12, 6)),
+]
+
+
+@pytest.mark.parametrize("available_memory_bytes, measured_job_bytes, cpu_count, compile_jobs, link_jobs, expected", _POOL_SIZE_CASES)
+def test_compute_job_pool_sizes(available_memory_bytes, measured_job_bytes, cpu_count, compile_jobs, link_jobs, expected):
+    assert compute_job_pool_sizes(available_memory_bytes, measured_job_bytes, cpu_count, compile_jobs, link_jobs) == expected
+
+
+def test_get_available_memory_bytes():
+    available_memory_bytes = get_available_memory_bytes()
+
+    assert available_memory_bytes is None or available_memory_bytes > 0
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+def test_job_memory_history_keeps_the_last_peaks(tmp_path):
+    history_file_path = str(tmp_path / "pyforge" / "job_memory.json")
+    history = JobMemoryHistory(history_file_path)
+
+    assert history.get("Debug") is None
+
+    for peak_rss_bytes in (9 * _GB, 1 * _GB, 2 * _GB, 3 * _GB, 2 * _GB, 1 * _GB):
+        history.add("Debug", peak_rss_bytes)
+    history.add("Release", 4 * _GB)
+
+    # the 9 GiB outlier dropped out of the last 5 builds
+    assert history.get("Debug") == 3 * _GB
+    assert JobMemoryHistory(history_file_path).get("Debug") == 3 * _GB
+    assert JobMemoryHistory(history_file_path).get("Release") == 4 * _GB
+
+
+@pytest.mark.parametrize("content", ["{not json", json.dumps({"version": 0, "peaks": {"Debug": [1]}}), json.dumps([1, 2])])
+def test_job_memory_history_ignores_invalid_files(tmp_path, content):
+    history_file_path = tmp_path / "job_memory.json"
+    history_file_path.write_text(content)
+
+    assert JobMemoryHistory(str(history_file_path)).get("Debug") is None
@@ -0,0 +1,117 @@
+import os
+
+import pytest
+
+from impl.cmake import Language, ProductType, generate
+from impl.cmake.includes import IncludeGraph, NodeKind, select_precompiled_headers
+
+
+_S, _H, _I, _SYS = NodeKind.SOURCE, NodeKind.HEADER, NodeKind.IMPORTED, NodeKind.SYSTEM
+
+
+def _graph(headers: list[tuple[str, NodeKind, int, int]]) -> IncludeGraph:
+    """
+    :param headers: (name, kind, size, number of translation units including it)
+    """
+    graph = IncludeGraph()
+    sources = [graph.add_node(f"src/tu{index}.cpp", _S) for index in range(max(fan_in for _, _, _, fan_in in headers))]
+    includes: dict[int, list[int]] = {source: [] for source in sources}
+    for name, kind, size, fan_in in headers:
+        header = graph.add_node(name, kind, size)
+        for source in sources[:fan_in]:
+            includes[source].append(header)
+    for source, included in includes.items():
+        graph.set_edges(source, included)
+    return graph
+
+
+_HEADERS = [("<vector>", _SYS, 0, 5),
+            ("src/config.h", _H, 100, 5),
+            ("lib/json/json.hpp", _I, 900 * 1024, 4),
+            ("<string>", _SYS, 0, 3),
+            ("lib/fmt/format.h", _I, 200 * 1024, 2),
+            ("<regex>", _SYS, 0, 1)
+            ]
+
+
+def test_only_stable_headers_shared_by_several_units_are_picked():
+    # project headers change too often, a header of a single unit gains nothing
+    assert select_precompiled_headers(_graph(_HEADERS), max_count=10) == ["<vector>", "lib/json/json.hpp", "<string>", "lib/fmt/format.h"]
+
+
+@pytest.mark.parametrize("max_count, size_budget, excluded_headers, expected", [
+    (2, 0, [], ["<vector>", "lib/json/json.hpp"]),
+    (0, 0, [], []),
+    # a header over the budget is skipped, the smaller ones after it are still picked
+    (10, 512 * 1024, [], ["<vector>", "<string>", "lib/fmt/format.h"]),
+    (10, 1024 * 1024, [], ["<vector>", "lib/json/json.hpp", "<string>"]),
+    (10, 0, ["<vector>", "lib/fmt/format.h"], ["lib/json/json.hpp", "<string>"]),
+])
+def test_selection_limits(max_count, size_budget, excluded_headers, expected):
+    assert select_precompiled_headers(_graph(_HEADERS), max_count, size_budget, excluded_headers) == expected
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+def _create_project(root_path: str, source_files: dict[str, str]) -> None:
+    for relative_path, content in source_files.items():
+        path = os.path.join(root_path, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(content)
+
+
+def _generate_precompiled_headers(root_path: str, max_count: int, pinned: list[str], excluded: list[str], override: list[str]) -> list[str]:
+    generate(project_root_path=root_path,
+             project_include_dir_names=["include"],
+             project_source_ignore_patterns=["build"],
+             project_use_gitignore=False,
+             project_use_git_index=False,
+             project_git_include_untracked=False,
+             project_imported_static_libs=[],
+             project_imported_shared_libs=[],
+             project_name="demo",
+             project_product_types=[ProductType.EXE],
+             project_version="1.0.0",
+             project_language=Language.CPP,
+             language_standard=17,
+             language_standard_required=True,
+             compiler_extensions_required=False,
+             cmake_compile_definitions=[],
+             precompiled_headers_enabled=True,
+             precompiled_headers_max_count=max_count,
+             precompiled_headers_pinned=pinned,
+             precompiled_headers_excluded=excluded,
+             precompiled_headers_override=override
+             )
+
+    with open(os.path.join(root_path, "CMakeLists.txt")) as file:
+        cmakelists = file.read()
+
+    if "target_precompile_headers(" not in cmakelists:
+        return []
+    block = cmakelists.split("target_precompile_headers(", 1)[1].split(")\n", 1)[0]
+    return block.splitlines()[1:]
+
+
+_PROJECT_FILES = {"src/main.cpp": "#include <vector>\n#include <map>\n#include \"app.h\"\nint main() { return 0; }\n",
+                  "src/a.cpp": "#include <vector>\n#include <map>\n#include \"app.h\"\n",
+                  "src/b.cpp": "#include <vector>\n#include <memory>\n",
+                  "include/app.h": "#pragma once\n#include <string>\n"
+                  }
+
+
+@pytest.mark.parametrize("max_count, pinned, excluded, override, expected", [
+    (8, [], [], [], ["<vector>", "<map>", "<string>"]),
+    (2, [], ["<map>"], [], ["<vector>", "<string>"]),
+    # pinned headers come first and count in the maximum
+    (2, ["<memory>"], [], [], ["<memory>", "<vector>"]),
+    # the override list replaces the selection
+    (8, ["<memory>"], [], ["<cstdio>", "include/app.h"], ["<cstdio>", "${CMAKE_SOURCE_DIR}/include/app.h"]),
+])
+def test_generate_writes_the_selected_headers(tmp_path, max_count, pinned, excluded, override, expected):
+    _create_project(str(tmp_path), _PROJECT_FILES)
+
+    assert _generate_precompiled_headers(str(tmp_path), max_count, pinned, excluded, override) == expected
@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+from impl.cmake.trash import move_to_trash, remove_leftover_trash, wait_for_trash_removal
+from impl.cmake.trash._impl_trash import _TreeRemover
+
+
+def _create_tree(root_path, depth: int, width: int, files_per_dir: int) -> int:
+    """
+    :returns int: number of directories created (root included)
+    """
+    root_path.mkdir(parents=True, exist_ok=True)
+    for index in range(files_per_dir):
+        (root_path / f"file{index}.o").write_bytes(b"x" * index)
+    if depth == 0:
+        return 1
+    return 1 + sum(_create_tree(root_path / f"dir{index}", depth - 1, width, files_per_dir) for index in range(width))
+
+
+@pytest.mark.parametrize("workers_count", [1, 4])
+def test_tree_remover_deletes_the_whole_tree(tmp_path, workers_count):
+    trees = [tmp_path / "a" / "build", tmp_path / "b"]
+    for tree_path in trees:
+        _create_tree(tree_path, depth=4, width=3, files_per_dir=5)
+    # empty directories and a chain of single directories
+    (tmp_path / "b" / "empty").mkdir()
+    (tmp_path / "b" / "x" / "y" / "z").mkdir(parents=True)
+
+    remover = _TreeRemover(workers_count)
+    for tree_path in trees:
+        remover.remove(str(tree_path))
+
+    assert remover.wait(timeout=30)
+    assert not any(tree_path.exists() for tree_path in trees)
+    assert (tmp_path / "a").is_dir()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="symlinks need privileges on windows")
+def test_tree_remover_doesnt_follow_symlinks(tmp_path):
+    outside_path = tmp_path / "outside"
+    _create_tree(outside_path, depth=1, width=2, files_per_dir=2)
+    _create_tree(tmp_path / "build", depth=1, width=1, files_per_dir=1)
+    os.symlink(outside_path, tmp_path / "build" / "linked_dir")
+    os.symlink(outside_path / "file0.o", tmp_path / "build" / "linked_file.o")
+
+    remover = _TreeRemover(2)
+    remover.remove(str(tmp_path / "build"))
+
+    assert remover.wait()
+    assert not (tmp_path / "build").exists()
+    assert sorted(path.name for path in outside_path.iterdir()) == ["dir0", "dir1", "file0.o", "file1.o"]
+
+
+def test_tree_remover_missing_directory(tmp_path):
+    remover = _TreeRemover(2)
+    remover.remove(str(tmp_path / "missing"))
+
+    assert remover.wait(timeout=10)
+
+
+# ==========================================================================================================================
+# ==========================================================================================================================
+
+
+def test_move_to_trash_frees_the_path_immediately(tmp_path):
+    build_dir_path = tmp_path / "build" / "Debug"
+    _create_tree(build_dir_path, depth=3, width=3, files_per_dir=3)
+
+    assert move_to_trash(str(build_dir_path))
+
+    # the path can be configured again while the tombstone is being deleted
+    assert not build_dir_path.exists()
+    build_dir_path.mkdir()
+
+    assert wait_for_trash_removal(timeout=30)
+    assert [path.name for path in (tmp_path / "build").iterdir()] == ["Debug"]
+
+
+def test_move_to_trash_missing_directory(tmp_path):
+    (tmp_path / "file").write_text("")
+
+    assert not move_to_trash(str(tmp_path / "missing"))
+    assert not move_to_trash(str(tmp_path / "file"))
+    assert (tmp_path / "file").is_file()
+
+
+def test_remove_leftover_trash(tmp_path):
+    # tombstones of an interrupted run, next to kept directories and files
+    _create_tree(tmp_path / ".Debug.pyforge-trash-123-456", depth=2, width=2, files_per_dir=2)
+    _create_tree(tmp_path / ".Release.pyforge-trash-123-789", depth=1, width=2, files_per_dir=2)
+    _create_tree(tmp_path / "MinSizeRel", depth=1, width=1, files_per_dir=1)
+    (tmp_path / "notes.pyforge-trash-1").write_text("a file, not a tombstone")
+
+    assert remove_leftover_trash(str(tmp_path)) == 2
+    assert wait_for_trash_removal(timeout=30)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["MinSizeRel", "notes.pyforge-trash-1"]
+
+    assert remove_leftover_trash(str(tmp_path / "missing")) == 0